@@ -0,0 +1,82 @@
+"""
+Text column casting : multi-pass parsers (formatters) vs inferred single-pass parse (casting).
+
+    python -m bench.bench_casting [n_rows]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import statistics
+import numpy as np
+import polars as pl
+
+from src.utils.casting import cast_date_column, cast_numeric_column, forget_formats
+from src.utils.formatters import date_cast_expr_from_utf8, numeric_cast_expr_from_utf8
+
+
+def _make_columns (n_rows : int) -> dict :
+
+    rng = np.random.default_rng(0)
+
+    dates = pl.date_range(pl.date(2000, 1, 1), pl.date(2000, 1, 1) + pl.duration(days=n_rows - 1), eager=True)
+    amounts = pl.Series(rng.normal(scale=1e6, size=n_rows)).round(2)
+
+    return {
+
+        "dates dd/mm/yyyy" : dates.dt.strftime("%d/%m/%Y"),
+        "dates yyyy.mm.dd (4th format)" : dates.dt.strftime("%Y.%m.%d"),
+        "numbers plain" : amounts.cast(pl.Utf8),
+        "numbers 1,234.56 with €" : pl.Series([f"€{v:,.2f}" for v in amounts.to_list()]),
+        "numbers 1.234,56 (EU)" : pl.Series([f"{v:,.2f}".replace(",", " ").replace(".", ",").replace(" ", ".") for v in amounts.to_list()]),
+
+    }
+
+
+def _timeit (fn, repeat : int = 3) -> float :
+
+    timings = []
+
+    for _ in range(repeat) :
+
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main (n_rows : int = 1_000_000) :
+
+    columns = _make_columns(n_rows)
+
+    print(f"Casting {n_rows:,} text rows (median of 3, ms) : multi-pass / inferred (first load) / remembered")
+
+    for name, series in columns.items() :
+
+        series = series.alias("v")
+
+        if name.startswith("dates") :
+
+            old = lambda : series.to_frame().select(date_cast_expr_from_utf8("v")).to_series()
+            new = lambda : cast_date_column(series, source="/bench/report.xlsx")
+
+        else :
+
+            old = lambda : series.to_frame().select(numeric_cast_expr_from_utf8("v", pl.Float64)).to_series()
+            new = lambda : cast_numeric_column(series, pl.Float64, source="/bench/report.xlsx")
+
+        def first () :
+
+            forget_formats()
+            new()
+
+        forget_formats()
+        new()
+
+        print(f"  {name:<32} {_timeit(old) * 1000:>9.1f} {_timeit(first) * 1000:>9.1f} {_timeit(new) * 1000:>9.1f}")
+
+
+if __name__ == "__main__" :
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,97 @@
+"""
+Display formatting of a 200k cells table : map_elements + pandas applymap vs Polars string expressions.
+
+    python -m bench.bench_display_format [n_rows] [n_cols]
+"""
+from __future__ import annotations
+
+import sys
+import math
+import time
+import numpy as np
+import polars as pl
+
+from src.utils.display import SIGN_SUFFIX, format_display
+from src.utils.formatters import colorize_dataframe_positive_negatif_vals
+
+
+def _make_table (n_rows : int, n_cols : int) -> pl.DataFrame :
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(scale=1e5, size=(n_rows, n_cols))
+    values[rng.random((n_rows, n_cols)) < 0.02] = np.nan
+
+    return pl.DataFrame({f"c{i}" : values[:, i] for i in range(n_cols)})
+
+
+def _per_cell (dataframe : pl.DataFrame) -> None :
+    """
+    Previous path : Python formatting per cell, then a pandas Styler parsing every string back.
+    """
+    formatted = dataframe.with_columns([
+        pl.col(col).map_elements(lambda x : " - " if x is None or math.isnan(x) else f"{x:,.2f}", return_dtype=pl.Utf8)
+        for col in dataframe.columns
+    ])
+
+    def colorize (val) :
+
+        try :
+            return "color: green;" if float(str(val).replace(",", "")) >= 0 else "color: red;"
+
+        except ValueError :
+            return ""
+
+    (
+        formatted.to_pandas()
+        .style
+        .map(colorize)
+        .set_table_styles([{"selector" : "td", "props" : [("text-align", "center")]}])
+        .set_properties(**{"text-align" : "center"})
+        ._compute()
+    )
+
+
+def _vectorized (dataframe : pl.DataFrame) -> None :
+
+    formatted = format_display(dataframe, sign_suffix=SIGN_SUFFIX)
+    colorize_dataframe_positive_negatif_vals(formatted)._compute()
+
+
+def _timed (function, dataframe : pl.DataFrame) -> float :
+
+    start = time.perf_counter()
+    function(dataframe)
+
+    return time.perf_counter() - start
+
+
+def main (n_rows : int = 20_000, n_cols : int = 10) :
+
+    dataframe = _make_table(n_rows, n_cols)
+    cells = n_rows * n_cols
+
+    start = time.perf_counter()
+    formatted = format_display(dataframe)
+    format_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mapped = dataframe.with_columns([
+        pl.col(col).map_elements(lambda x : " - " if x is None or math.isnan(x) else f"{x:,.2f}", return_dtype=pl.Utf8)
+        for col in dataframe.columns
+    ])
+    map_seconds = time.perf_counter() - start
+
+    # Expected differences : ties of the scaled value (half away from zero vs the exact binary value) and "-0.00"
+    differing = sum(formatted.select((pl.col(col) != mapped[col]).sum()).item() for col in dataframe.columns)
+
+    print(f"{cells:,} cells, strings only : map_elements {map_seconds * 1e3:.0f} ms, expressions {format_seconds * 1e3:.0f} ms ({map_seconds / format_seconds:.0f}x), differing strings : {differing}")
+
+    slow = _timed(_per_cell, dataframe)
+    fast = _timed(_vectorized, dataframe)
+
+    print(f"{cells:,} cells, strings + colours : per cell {slow * 1e3:.0f} ms, vectorized {fast * 1e3:.0f} ms ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__" :
+
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,82 @@
+"""
+Fingerprint cost : CSV / Parquet round-trip MD5 (previous loaders) vs file identity and native row hashing.
+
+    python -m bench.bench_fingerprint [n_rows]
+"""
+from __future__ import annotations
+
+import io
+import os
+import sys
+import time
+import hashlib
+import tempfile
+import statistics
+import numpy as np
+import polars as pl
+
+from src.utils.fingerprint import file_fingerprint, frame_fingerprint
+
+
+def _make_frame (n_rows : int) -> pl.DataFrame :
+
+    rng = np.random.default_rng(0)
+
+    return pl.DataFrame(
+        {
+            "Date" : pl.date_range(pl.date(2000, 1, 1), pl.date(2000, 1, 1) + pl.duration(days=n_rows - 1), eager=True),
+            "Fund" : rng.choice(["HV", "WR"], n_rows),
+            "Underlying" : [f"UND{i % 500}" for i in range(n_rows)],
+            **{f"Value {i}" : rng.normal(size=n_rows) for i in range(12)},
+        }
+    )
+
+
+def _timeit (fn, repeat : int = 5) -> float :
+
+    timings = []
+
+    for _ in range(repeat) :
+
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main (n_rows : int = 100_000) :
+
+    df = _make_frame(n_rows)
+
+    with tempfile.TemporaryDirectory() as tmp :
+
+        path = os.path.join(tmp, "frame.parquet")
+        df.write_parquet(path)
+
+        def parquet_md5 () :
+
+            buffer = io.BytesIO()
+            df.write_parquet(buffer)
+
+            return hashlib.md5(buffer.getvalue()).hexdigest()
+
+        cases = {
+
+            "csv md5 (old loaders)" : lambda : hashlib.md5(df.write_csv().encode("utf-8")).hexdigest(),
+            "parquet md5 (old nav / market)" : parquet_md5,
+            "file identity (stat)" : lambda : file_fingerprint(path, "Sheet1", None),
+            "row hash (derived frame)" : lambda : str(frame_fingerprint(df)),
+            "lazy, never asked" : lambda : frame_fingerprint(df),
+
+        }
+
+        print(f"Fingerprint cost on {n_rows:,} rows x {df.width} columns (median of 5)")
+
+        for name, fn in cases.items() :
+            print(f"  {name:<32} {_timeit(fn) * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__" :
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
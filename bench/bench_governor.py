@@ -0,0 +1,133 @@
+"""
+Latency of interactive group_bys under concurrent synthetic sessions, with background warming
+running at the same time : no governor vs the governor (concurrency cap + priority queue).
+
+    POLARS_THREADS=8 python -m bench.bench_governor [n_sessions] [n_rows] [max_concurrent]
+"""
+from __future__ import annotations
+
+from src.config.env import configure_polars_threads
+configure_polars_threads()
+
+import sys
+import time
+import threading
+import statistics
+import numpy as np
+import polars as pl
+
+from src.utils.governor import Governor, INTERACTIVE, BACKGROUND
+
+
+REQUESTS_PER_SESSION = 5
+WARMERS = 2
+
+
+def _make_frame (n_rows : int) -> pl.DataFrame :
+
+    rng = np.random.default_rng(0)
+
+    return pl.DataFrame({
+
+        "fund" : rng.integers(0, 4, n_rows),
+        "underlying" : rng.integers(0, 2_000, n_rows),
+        "date" : rng.integers(0, 250, n_rows),
+        "delta" : rng.normal(size=n_rows),
+        "vega" : rng.normal(size=n_rows),
+
+    })
+
+
+def _groupby (frame : pl.DataFrame) -> pl.DataFrame :
+
+    return (
+        frame.lazy()
+        .group_by("fund", "underlying", "date")
+        .agg(pl.col("delta").sum(), pl.col("vega").std(), pl.len())
+        .sort("fund", "underlying", "date")
+        .collect()
+    )
+
+
+def _run (frame : pl.DataFrame, n_sessions : int, governor : Governor) -> dict :
+    """
+    n_sessions threads issuing interactive requests while WARMERS threads loop on background work.
+    """
+    latencies, lock = [], threading.Lock()
+    done = threading.Event()
+
+    def session () :
+
+        for _ in range(REQUESTS_PER_SESSION) :
+
+            start = time.perf_counter()
+
+            with governor.slot("groupby", INTERACTIVE) :
+                _groupby(frame)
+
+            with lock :
+                latencies.append(time.perf_counter() - start)
+
+            time.sleep(0.01)        # user think time
+
+    def warmer () :
+
+        while not done.is_set() :
+
+            with governor.slot("warm", BACKGROUND) :
+                _groupby(frame)
+
+    warmers = [threading.Thread(target=warmer) for _ in range(WARMERS)]
+    sessions = [threading.Thread(target=session) for _ in range(n_sessions)]
+
+    start = time.perf_counter()
+
+    for thread in warmers + sessions :
+        thread.start()
+
+    for thread in sessions :
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+    done.set()
+
+    for thread in warmers :
+        thread.join()
+
+    latencies.sort()
+
+    return {
+
+        "p50" : statistics.median(latencies),
+        "p95" : latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "max" : latencies[-1],
+        "elapsed" : elapsed,
+        "usage" : governor.usage(),
+
+    }
+
+
+def main (n_sessions : int = 10, n_rows : int = 1_000_000, max_concurrent : int = 2) :
+
+    frame = _make_frame(n_rows)
+    _groupby(frame)     # warm-up
+
+    print(f"{n_sessions} sessions x {REQUESTS_PER_SESSION} group_bys on {n_rows:,} rows, {WARMERS} background warmers, Polars pool of {pl.thread_pool_size()} threads")
+    print(f"{'mode':<28} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'wall s':>7} {'max queue':>10}")
+
+    for label, governor in (
+
+        ("no governor", Governor(enabled=False)),
+        (f"governor ({max_concurrent} slots)", Governor(max_concurrent=max_concurrent, enabled=True)),
+
+    ) :
+
+        r = _run(frame, n_sessions, governor)
+
+        print(f"{label:<28} {r['p50'] * 1e3:>8.1f} {r['p95'] * 1e3:>8.1f} {r['max'] * 1e3:>8.1f} {r['elapsed']:>7.2f} {r['usage']['max_queue_depth']:>10}")
+
+
+if __name__ == "__main__" :
+
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,53 @@
+"""
+Realized vol after a new day : full rolling pass over the history vs incremental state update.
+
+    python -m bench.bench_rolling_vol [n_days] [n_updates]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import datetime as dt
+import numpy as np
+import polars as pl
+
+from src.utils.rolling_vol import RollingVolState, rolling_realized_vol
+
+
+def _make_history (n_days : int) -> pl.DataFrame :
+
+    rng = np.random.default_rng(0)
+    dates = [dt.date(2000, 1, 3) + dt.timedelta(days=i) for i in range(n_days)]
+
+    return pl.DataFrame({"date" : dates, "nav" : 100 * np.cumprod(1 + rng.normal(0, 0.01, n_days))})
+
+
+def main (n_days : int = 5_000, n_updates : int = 250) :
+
+    history = _make_history(n_days + n_updates)
+    base, new_days = history.head(n_days), list(history.tail(n_updates).iter_rows())
+
+    rolling_realized_vol(base, "nav")       # warm-up
+
+    start = time.perf_counter()
+    for i in range(n_updates) :
+        full = rolling_realized_vol(history.head(n_days + i + 1), "nav")
+    full_seconds = (time.perf_counter() - start) / n_updates
+
+    start = time.perf_counter()
+    state = RollingVolState.from_history(base, "nav")
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for date, value in new_days :
+        row = state.update(date, value)
+    update_seconds = (time.perf_counter() - start) / n_updates
+
+    print(f"{n_days:,} days history, 4 windows + EWMA, per new day : full pass {full_seconds * 1e3:.2f} ms, incremental {update_seconds * 1e6:.1f} us ({full_seconds / update_seconds:.0f}x)")
+    print(f"State built once from the history in {build_seconds * 1e3:.1f} ms")
+    print(f"Last vol_252d (full / incremental) : {full['vol_252d'][-1]:.10f} / {row['vol_252d']:.10f}")
+
+
+if __name__ == "__main__" :
+
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,93 @@
+"""
+Subscriptions / redemptions conversion to EUR : row by row rate resolution vs one rate table and one join.
+
+    python -m bench.bench_subred_fx [n_legs]
+"""
+from __future__ import annotations
+
+import io
+import sys
+import time
+import contextlib
+import numpy as np
+import polars as pl
+
+from src.utils.fx import build_fx_rate_table, convert_to_base_ccy
+
+
+QUOTES = {"USD" : 1.08, "GBP" : 0.86, "CHF" : 0.97, "JPY" : 162.0, "EUR" : 1.0}
+BOOKS = {"HV" : [f"HV_{i}" for i in range(20)], "WR" : [f"WR_{i}" for i in range(20)]}
+
+
+def _make_legs (n_legs : int) -> pl.DataFrame :
+
+    rng = np.random.default_rng(0)
+    books = [book for fund_books in BOOKS.values() for book in fund_books]
+
+    return pl.DataFrame({
+
+        "bookName" : rng.choice(books, n_legs),
+        "currency" : rng.choice(["EUR", "USD", "GBP", "CHF", "JPY"], n_legs),
+        "signed_notional" : rng.normal(scale=1e6, size=n_legs),
+
+    })
+
+
+def _row_by_row (legs : pl.DataFrame) -> dict :
+    """
+    Previous algorithm : to_dicts, one rate lookup (and log line) per row, Python loops per fund.
+    """
+    def resolve (ccy : str) -> float :
+
+        if ccy == "EUR" :
+            return 1.0
+
+        rate = QUOTES.get(ccy)
+        print(f"[+] [local] {ccy} -> EUR : {rate}")
+
+        return rate if rate else 1.0
+
+    converted = {}
+
+    for row in legs.to_dicts() :
+        converted.setdefault(row["bookName"], 0.0)
+        converted[row["bookName"]] += row["signed_notional"] / resolve(row["currency"])
+
+    return {fund : sum(converted.get(book, 0.0) for book in books) for fund, books in BOOKS.items()}
+
+
+def _vectorized (legs : pl.DataFrame) -> dict :
+
+    rates = build_fx_rate_table(legs["currency"].unique().to_list(), "EUR", QUOTES)
+    converted, _ = convert_to_base_ccy(legs, rates, ("signed_notional",), missing_rate=1.0)
+
+    books = pl.DataFrame([(f, b) for f, bs in BOOKS.items() for b in bs], schema={"fund" : pl.Utf8, "bookName" : pl.Utf8}, orient="row")
+    totals = books.join(converted, on="bookName", how="left").group_by("fund").agg(pl.col("signed_notional").sum())
+
+    return dict(totals.iter_rows())
+
+
+def main (n_legs : int = 50_000) :
+
+    legs = _make_legs(n_legs)
+
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()) :
+        slow = _row_by_row(legs)
+
+    row_seconds = time.perf_counter() - start
+
+    _vectorized(legs)       # warm-up
+    start = time.perf_counter()
+    fast = _vectorized(legs)
+    vec_seconds = time.perf_counter() - start
+
+    print(f"{n_legs:,} legs : row by row {row_seconds * 1e3:.1f} ms, rate table + join {vec_seconds * 1e3:.1f} ms ({row_seconds / vec_seconds:.0f}x)")
+
+    print("Totals (row by row / vectorized) :", {fund : (round(slow[fund]), round(fast[fund])) for fund in BOOKS})
+
+
+if __name__ == "__main__" :
+
+    main(*[int(a) for a in sys.argv[1:]])
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+# Before anything imports polars
+from src.config.env import configure_polars_threads
+configure_polars_threads()
+
 from src.ui.app import app
 
 def main () :
@@ -1,3 +1,29 @@
+import os
+import sys
+
 from dotenv import load_dotenv
 
-load_dotenv()
\ No newline at end of file
+load_dotenv()
+
+
+def configure_polars_threads () -> bool :
+    """
+    Size the Polars thread pool shared by every session from POLARS_THREADS (Polars' own default, one thread per core, if unset).
+
+    Polars sizes its pool once, when it is first imported : this must run before any module importing polars.
+    An explicit POLARS_MAX_THREADS wins.
+
+    Returns:
+        applied (bool) : False if polars was already imported.
+    """
+    threads = os.getenv("POLARS_THREADS", "").strip()
+
+    if not threads :
+        return True
+
+    if "polars" in sys.modules :
+        return False
+
+    os.environ.setdefault("POLARS_MAX_THREADS", str(max(1, int(threads))))
+
+    return True
@@ -1388,4 +1388,85 @@ AGGREGATED_POSITIONS_COLUMNS = {
     "Termination Date" : pl.Datetime,
     "MV" : pl.Float64,
 
-}
\ No newline at end of file
+}
+
+# -------------- Local caches --------------
+
+# Columnar sidecar copies of parsed Excel files (Arrow IPC, memory-mapped on read)
+SIDECAR_CACHE_ENABLED = os.getenv("SIDECAR_CACHE_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+SIDECAR_CACHE_MAX_BYTES = int(os.getenv("SIDECAR_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# Directory catalog : rebuilt when the directory mtime moves, or after this age (some network shares report it lazily)
+CATALOG_MAX_AGE_SECONDS = float(os.getenv("CATALOG_MAX_AGE_SECONDS", "300"))
+
+# Background watcher on the report directories : "auto" (native notifications if watchdog is installed), "native" or "poll"
+WATCHER_ENABLED = os.getenv("WATCHER_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+WATCHER_BACKEND = os.getenv("WATCHER_BACKEND", "auto").strip().lower()
+WATCHER_POLL_SECONDS = float(os.getenv("WATCHER_POLL_SECONDS", "30"))
+WATCHER_SETTLE_SECONDS = float(os.getenv("WATCHER_SETTLE_SECONDS", "5"))
+
+# Concurrent loads of independent report files (load_many)
+LOAD_MANY_MAX_WORKERS = int(os.getenv("LOAD_MANY_MAX_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+# Header probes (sheet names, dimensions, header row) kept in memory, per file identity
+EXCEL_PROBE_CACHE_MAX_ENTRIES = int(os.getenv("EXCEL_PROBE_CACHE_MAX_ENTRIES", "1024"))
+
+# Distinct values sampled to infer the date format / numeric locale of a text column
+CAST_SNIFF_SAMPLE_SIZE = int(os.getenv("CAST_SNIFF_SAMPLE_SIZE", "500"))
+
+# Scoped result cache (charts, computations) shared by every session : least recently used evicted first,
+# once over the entry count or the byte budget. Entries expire after the TTL (0 for none)
+SCOPED_CACHE_MAX_ENTRIES = int(os.getenv("SCOPED_CACHE_MAX_ENTRIES", "512"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(1024 ** 3)))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+
+# Computed results of persisted functions spilled to disk (Arrow IPC + manifest), reloaded after a restart
+RESULT_STORE_ENABLED = os.getenv("RESULT_STORE_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+RESULT_STORE_MAX_BYTES = int(os.getenv("RESULT_STORE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# Local mirror of the network-share files (copied on first read, checked against the share by size and mtime)
+MIRROR_ENABLED = os.getenv("MIRROR_ENABLED", "0").strip().lower() not in ("0", "false", "no", "off")
+MIRROR_MAX_BYTES = int(os.getenv("MIRROR_MAX_BYTES", str(5 * 1024 ** 3)))
+MIRROR_VERIFY_SECONDS = float(os.getenv("MIRROR_VERIFY_SECONDS", "10"))
+MIRROR_HOT_ACCESSES = int(os.getenv("MIRROR_HOT_ACCESSES", "3"))
+MIRROR_REFRESH_SECONDS = float(os.getenv("MIRROR_REFRESH_SECONDS", "60"))
+MIRROR_MAX_FAILURES = int(os.getenv("MIRROR_MAX_FAILURES", "3"))
+MIRROR_COOLDOWN_SECONDS = float(os.getenv("MIRROR_COOLDOWN_SECONDS", "300"))
+
+# Heavy Polars operations (parses, large collects) running at once across the sessions, the rest queue by priority.
+# The size of the Polars thread pool itself is POLARS_THREADS (see src.config.env.configure_polars_threads)
+GOVERNOR_ENABLED = os.getenv("GOVERNOR_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+GOVERNOR_MAX_CONCURRENT = int(os.getenv("GOVERNOR_MAX_CONCURRENT", str(max(2, (os.cpu_count() or 1) // 2))))
+
+# Load-time dtype compaction (load_excel_to_dataframe(compact=<source>)) : low-cardinality strings to Categorical,
+# ratios to Float32, counters to the narrowest integer. Only the columns listed are touched
+COMPACTION_ENABLED = os.getenv("COMPACTION_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+COMPACTION_HINTS = {
+
+    "greeks" : {
+
+        "categorical" : ["Underlying"],
+        "float32" : ["Delta % NAV", "Gamma % NAV", "Vega % NAV", "Theta % NAV"],
+
+    },
+
+    # "Trade Legs" workbook shared by the screeners and the aggregated positions
+    "trade_legs" : {
+
+        "categorical" : [
+            "Portfolio Name", "Underlying Asset", "Instrument Type", "Buy/Sell", "Call/Put 1",
+            "Asset Class", "Counterparty", "Trade Type", "Product Name",
+        ],
+        "shrink_int" : ["FX Remaining Number of Fixings", "FX Projected Number of Expiries Remaining"],
+
+    },
+
+    "trade_recap" : {
+
+        "categorical" : ["assetClass", "tradeType", "bookName", "counterparty", "instrument.instrumentType", "originatingAction"],
+        "shrink_int" : ["bookId"],
+
+    },
+
+}
@@ -327,3 +327,19 @@ TRADE_RECAP_ABS_PATH=os.getenv("TRADE_RECAP_ABS_PATH")
 TREADE_RECAP_DATA_RAW_DIR_ABS_PATH=os.getenv("TREADE_RECAP_DATA_RAW_DIR_ABS_PATH")
 TREADE_RECAP_DATA_DIR_ABS_PATH=os.getenv("TREADE_RECAP_DATA_DIR_ABS_PATH")
 
+
+
+# --------- Local caches ------------
+
+CACHE_DIR_ABS_PATH=os.getenv("CACHE_DIR_ABS_PATH", ".cache")
+
+SIDECAR_DIR_ABS_PATH=os.getenv("SIDECAR_DIR_ABS_PATH", os.path.join(CACHE_DIR_ABS_PATH, "sidecar"))
+
+# Local copies of the network-share files (MIRROR_ENABLED), on a local SSD
+MIRROR_DIR_ABS_PATH=os.getenv("MIRROR_DIR_ABS_PATH", os.path.join(CACHE_DIR_ABS_PATH, "mirror"))
+
+# Computed results persisted by the result cache (manifest keyed by source fingerprints)
+RESULT_STORE_DIR_ABS_PATH=os.getenv("RESULT_STORE_DIR_ABS_PATH", os.path.join(CACHE_DIR_ABS_PATH, "results"))
+
+# SIMM history store (Parquet, partitioned by fund and month). Point it to the shared drive so every session sees the same history
+SIMM_STORE_DIR_ABS_PATH=os.getenv("SIMM_STORE_DIR_ABS_PATH", os.path.join(CACHE_DIR_ABS_PATH, "simm_store"))
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import hashlib
 import datetime as dt
 import streamlit as st
 import polars as pl
@@ -13,9 +12,12 @@ from src.core.api.client import get_ice_calculator, get_trade_manager
 
 from src.utils.logger import log
 from src.utils.formatters import date_to_str
+from src.utils.fingerprint import frame_fingerprint
+from src.utils.single_flight import deduplicated
 
 
 @st.cache_resource
+@deduplicated(namespace="ice")
 def fetch_raw_market_value_data (
         
         date : Optional[str | dt.datetime | dt.date] = None,
@@ -40,6 +42,6 @@ def fetch_raw_market_value_data (
         return None
 
     df_mv_greeks = pl.json_normalize(mv_n_greeks)
-    md5_hash = hashlib.md5(df_mv_greeks.write_parquet()).hexdigest()
+    md5_hash = frame_fingerprint(df_mv_greeks)
 
     return df_mv_greeks, md5_hash
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import hashlib
-
 import polars as pl
 import datetime as dt
 
@@ -10,6 +8,7 @@ from typing import Optional, Dict, List
 from src.config.parameters import FUND_HV, FUND_NAME_MAP, SIMM_RENAME_COLUMNS, SIMM_COLUMNS
 from src.utils.formatters import date_to_str, str_to_date
 from src.utils.logger import log
+from src.utils.fingerprint import frame_fingerprint
 
 from src.core.api.client import get_ice_calculator
 
@@ -139,7 +138,7 @@ def convert_raw_simm_to_dataframe (
         .select(final_cols)
     )
 
-    md5 = hashlib.md5(dataframe.write_csv().encode()).hexdigest()
+    md5 = frame_fingerprint(dataframe)
 
     return dataframe, md5
 
@@ -15,6 +15,8 @@ from src.core.api.client import get_trade_manager
 from src.config.parameters import FUND_HV, SUBRED_BOOKS_FUNDS, SUBRED_STRUCT_COLUMNS, SUBRED_COLS_NEEDED
 from src.config.paths import CASH_UPDATER_FX_VALUES_PATH
 from src.utils.formatters import date_to_str, str_to_date, format_numeric_columns_to_string
+from src.utils.fx import build_fx_rate_table, convert_to_base_ccy
+from src.utils.logger import log
 
 
 def get_subred_by_date (
@@ -34,8 +36,8 @@ def get_subred_by_date (
 
     dataframe, md5 = fetch_subred_by_date(date, books_by_fund, schema_overrides) if dataframe is None else (dataframe, md5)
     
-    df_grouped = _clean_response_api(dataframe, books_by_fund)
-    df_converted = _convert_to_base_ccy(df_grouped, base_ccy="EUR")
+    df_legs = _clean_response_api(dataframe, books_by_fund)
+    df_converted = _convert_to_base_ccy(df_legs, base_ccy="EUR")
     #df_grouped = format_numeric_columns_to_string(df_grouped)
 
     aum_dict = _build_fund_dictionary(df_converted, books_by_fund)
@@ -125,7 +127,7 @@ def _clean_response_api (
 
     ) -> Optional[pl.DataFrame] :
     """
-    
+    One row per SUBRED leg : bookName, currency and the notional signed by the leg code (redemptions negative).
     """
     if dataframe is None :
         
@@ -136,34 +138,21 @@ def _clean_response_api (
     df_sort = dataframe.sort(pl.col("instrument").struct.field("deliveryDate").str.to_date(format))
     df_filter = df_sort.filter(pl.col("tradeType") == "SUBRED")
 
-    df = df_filter.with_columns(
-
-        [
-            pl.when(pl.col("tradeLegCode") == "RED")
-                .then(-pl.col("instrument").struct.field("notional"))
-                .otherwise(pl.col("instrument").struct.field("notional"))
-                .alias("signed_notional")
-        ]
-
-    )
-
-    df_grouped = (
-        
-        df.group_by("bookName")
-        .agg(
+    # Legs stay separate until converted : a book may hold subscriptions in several currencies
+    df_legs = df_filter.select(
 
-            [
-                pl.col("signed_notional").sum().alias("total_signed_notional").cast(pl.Int128),
-                pl.col("instrument").struct.field("currency").first().alias("currency"),
+        pl.col("bookName"),
+        pl.col("instrument").struct.field("currency").alias("currency"),
 
-            ]
-        )
+        pl.when(pl.col("tradeLegCode") == "RED")
+            .then(-pl.col("instrument").struct.field("notional"))
+            .otherwise(pl.col("instrument").struct.field("notional"))
+            .cast(pl.Float64)
+            .alias("signed_notional"),
 
     )
 
-    print(df_grouped)
-
-    return df_grouped
+    return df_legs
 
 
 def _convert_to_base_ccy (
@@ -172,11 +161,15 @@ def _convert_to_base_ccy (
         
         base_ccy    : str = "EUR",
         fx_filepath : Optional[str] = None,
+
+        amount_col  : str = "signed_notional",
+        fetch_missing : bool = True,
     
     ) -> Optional[pl.DataFrame] :
     """
-    Converts the total_signed_notional of each book row to base_ccy in-place.
-    Adds a 'converted_notional' column and normalizes 'currency' to base_ccy.
+    Converts the amount of every leg to base_ccy with one rate table (local FX cache, inverse and
+    cross rates via USD / EUR, yfinance once per currency still missing) and one join.
+    Legs whose currency has no rate at all keep a rate of 1.0, reported in one batch.
     """
     if dataframe is None :
         return None
@@ -184,31 +177,17 @@ def _convert_to_base_ccy (
     fx_filepath  = CASH_UPDATER_FX_VALUES_PATH if fx_filepath is None else fx_filepath
     local_rates  = _load_local_fx_rates(fx_filepath)
 
-    def convert_row (notional : float, ccy : str) -> float :
-        """
-        
-        """
-        rate = resolve_fx_rate(ccy, base_ccy, local_rates=local_rates)
-        
-        if rate is None or rate == 0.0 :
+    rates = build_fx_rate_table(
 
-            print(f"[-] No FX rate for {ccy}, using 1.0")
-            rate = 1.0
+        dataframe["currency"].unique().to_list(),
+        base_ccy,
+        local_rates,
+        fetch_missing=_get_fx_rate_yfinance if fetch_missing else None,
 
-        return notional / rate
-
-    converted = [
-        convert_row(row["total_signed_notional"], row["currency"])
-        for row in dataframe.to_dicts()
-    ]
-
-    dataframe = dataframe.with_columns(
-        [
-            pl.Series("total_signed_notional", converted, dtype=pl.Float64),
-            pl.lit(base_ccy).alias("currency"),
-        ]
     )
 
+    dataframe, _ = convert_to_base_ccy(dataframe, rates, (amount_col,), "currency", base_ccy, missing_rate=1.0)
+
     return dataframe
 
 
@@ -217,35 +196,41 @@ def _build_fund_dictionary (
         dataframe     : Optional[pl.DataFrame] = None,
         books_by_fund : Optional[Dict] = None,
         base_ccy      : str = "EUR",
+
+        amount_col    : str = "signed_notional",
     
     ) -> Optional[Dict] :
-
+    """
+    Total converted amount per fund, from the books each fund is made of.
+    """
     books_by_fund = SUBRED_BOOKS_FUNDS if books_by_fund is None else books_by_fund
 
-    aum = {row["bookName"] : row for row in dataframe.to_dicts()}
-    result = {}
+    books = pl.DataFrame(
 
-    for fund, books in books_by_fund.items() :
+        [(fund, book) for fund, fund_books in books_by_fund.items() for book in fund_books],
+        schema={"fund" : pl.Utf8, "bookName" : pl.Utf8},
+        orient="row",
 
-        total        = 0.0
-        missing_books = []
+    )
 
-        for book in books :
+    totals = (
+        books.join(dataframe.select("bookName", amount_col, pl.lit(True).alias("found")), on="bookName", how="left")
+        .group_by("fund", maintain_order=True)
+        .agg(
+            pl.col(amount_col).sum().alias("total"),
+            pl.col("bookName").filter(pl.col("found").is_null()).unique(maintain_order=True).alias("missing_books"),
+        )
+    )
+
+    result = {}
 
-            dict_by_book = aum.get(book)
-            
-            if dict_by_book is None :
-            
-                missing_books.append(book)
-                continue
-            
-            total += float(dict_by_book["total_signed_notional"])
+    for fund, total, missing_books in totals.iter_rows() :
 
         if missing_books :
-            print(f"[!] Fund '{fund}' — books not found: {missing_books}")
+            log(f"[!] [SUBRED] Fund '{fund}' : books not found {missing_books}", "warning")
 
         result[fund] = {
-            "amount"  :  f"{round(total, 2):,.2f}",
+            "amount"  :  f"{round(total or 0.0, 2):,.2f}",
             "currency": base_ccy,
         }
 
@@ -262,9 +247,9 @@ def resolve_fx_rate (
     
     ) -> Optional[float] :
     """
-    Resolve FX rate from_ccy -> to_ccy.
+    Resolve FX rate from_ccy -> to_ccy (1 from_ccy = rate to_ccy).
     1. Returns 1.0 immediately if same currency.
-    2. Tries local JSON rates file.
+    2. Tries local JSON rates file (direct, inverse or cross via USD / EUR).
     3. Falls back to yfinance live rate.
     """
     if from_ccy == to_ccy :
@@ -274,19 +259,9 @@ def resolve_fx_rate (
     fx_filepath = CASH_UPDATER_FX_VALUES_PATH if fx_filepath is None else fx_filepath
     local_rates = _load_local_fx_rates(fx_filepath) if local_rates is None else local_rates
 
-    if local_rates is not None :
-
-        rate = local_rates.get(from_ccy)
+    rates = build_fx_rate_table([from_ccy], to_ccy, local_rates, fetch_missing=_get_fx_rate_yfinance)
 
-        if rate is not None:
-        
-            print(f"[+] [local] {from_ccy} -> {to_ccy} : {rate}")
-            return rate
-        
-    # Fallback to yfinance
-    print(f"[!] {from_ccy} not in local rates, falling back to yfinance...")
-    
-    return _get_fx_rate_yfinance(from_ccy, to_ccy)
+    return rates["rate"][0]
 
 
 
@@ -294,7 +269,7 @@ def _load_local_fx_rates (file_abs_path : Optional[str] = None) -> Dict[str, flo
     """
     Load FX rates from a local JSON file.
     Expected format: { "USD": 1.08, "GBP": 0.86, "CHF": 0.97, ... }
-    Keys are currencies, values are rate TO EUR (i.e. 1 CCY = X EUR).
+    Keys are currencies, values are quoted against EUR (i.e. 1 EUR = X CCY).
     """
     file_abs_path = CASH_UPDATER_FX_VALUES_PATH if file_abs_path is None else file_abs_path
 
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import os
 import json
-import hashlib
 import datetime as dt
 import polars as pl
 
@@ -13,7 +12,9 @@ from src.config.parameters import CASH_COLUMNS, COLLATERAL_COLUMNS
 
 from src.utils.logger import log
 from src.utils.data_io import load_excel_to_dataframe
+from src.utils.load_plan import planned_load
 from src.utils.formatters import date_to_str, str_to_date
+from src.utils.fingerprint import frame_fingerprint
 
 # --------- Cash ----------
 
@@ -68,8 +69,7 @@ def load_cash_by_date (
 
     df_date = dataframe.filter(pl.col("Date") == date)
 
-    csv_bytes = df_date.write_csv().encode("utf-8")
-    md5_hash_date = hashlib.md5(csv_bytes).hexdigest()
+    md5_hash_date = frame_fingerprint(df_date)
 
     return df_date, md5_hash_date
 
@@ -208,7 +208,8 @@ def load_all_collateral (
     if filename is None :
         return None, None
     
-    dataframe, md5 = load_excel_to_dataframe(filename, specific_cols=columns, schema_overrides=schema_override, cast_num=False)
+    # Every collateral section of a page shares one parse through the active plan
+    dataframe, md5 = planned_load(filename, "Sheet1", schema_override, columns, cast_num=False)
 
     return dataframe, md5
 
@@ -234,7 +235,10 @@ def load_collateral_by_date (
     if filename is None :
         return None, None
     
-    dataframe, md5 = load_excel_to_dataframe(filename, specific_cols=columns, schema_overrides=schema_override, cast_num=False)
+    dataframe, md5 = planned_load(filename, "Sheet1", schema_override, columns, cast_num=False)
+
+    if dataframe is None :
+        return None, None
 
     df_date = dataframe.filter(pl.col("Date") == date)
 
@@ -11,6 +11,7 @@ from src.config.parameters import FUND_HV, CONCENTRATION_COLUMNS, CONCENTRATION_
 from src.config.paths import *
 from src.utils.data_io import load_excel_to_dataframe
 from src.utils.formatters import date_to_str, str_to_date
+from src.utils.catalog import catalog_lookup, parse_date_hh_mm
 from src.utils.logger import log
 
 
@@ -66,62 +67,17 @@ def find_most_recent_file_by_date (
 
     ) -> Tuple[Optional[str], Tuple[str]] :
     """
-    
+    Return the latest file of the target date, or the most recent file of the directory otherwise.
     """
-    if not os.path.isdir(dir_abs_path) :
-        return None, None
-    
-    date = date_to_str(date)
     regex = CONCENTRATION_REGEX  if regex is None else regex
 
-    # Best pour la date cible
-    best_target_key: Optional[tuple] = None   # (hh, mm, mtime)
-    best_target_name: Optional[str] = None
-
-    best_global_key: Optional[tuple] = None   # (date_str, hh, mm, mtime)
-    best_global_name: Optional[str] = None
-
-    date = date_to_str(date)
-
-    with os.scandir(dir_abs_path) as it : # 
-        
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-
-            m = regex.match(entry.name)
-
-            if not m :
-                continue
-
-            date_str, hh, mm = m.groups()
-
-            hh_i = int(hh)
-            mm_i = int(mm)
-            mtime = entry.stat().st_mtime
-
-            if date_str == date :
-
-                key_t = (hh_i, mm_i, mtime)
-                
-                if best_target_key is None or key_t > best_target_key :
-
-                    best_target_key = key_t
-                    best_target_name = entry.name
-
-            key_g = (date_str, hh_i, mm_i, mtime)
-
-            if best_global_key is None or key_g > best_global_key :
-
-                best_global_key = key_g
-                best_global_name = entry.name
-
-    if best_target_name is not None :
-        return best_target_name, date
+    entry = catalog_lookup(dir_abs_path, regex, date, mode="eq", parser=parse_date_hh_mm)
 
     # Most recent file otherwise
-    if best_global_name is not None :
-        return best_global_name, key_g[0]
+    if entry is None :
+        entry = catalog_lookup(dir_abs_path, regex, mode="latest", parser=parse_date_hh_mm)
+
+    if entry is None :
+        return None, None
 
-    return None, None
+    return entry.name, date_to_str(entry.date)
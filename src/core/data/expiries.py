@@ -12,6 +12,7 @@ from typing import Optional, List, Dict, Any, Tuple
 from src.utils.logger import log
 from src.utils.formatters import date_to_str, get_most_recent_file, get_most_recent_file_for_date
 from src.utils.data_io import load_excel_to_dataframe
+from src.utils.catalog import catalog_lookup, parse_date_hhmm
 
 from src.config.parameters import FUND_HV, EXPIRIES_COLUMNS, EXPIRIES_COLUMNS_HV, FUND_NAME_MAP, EXPIRIES_FILENAME_REGEX
 from src.config.paths import EXPIRIES_FUNDS_DIR_PATHS
@@ -86,7 +87,7 @@ def get_upcomming_expiries_file_by_date (
 
     ) -> Optional[str] :
     """
-    
+    Latest expiries file of the target date, or the latest one before it.
     """
     exp_dict_paths = EXPIRIES_FUNDS_DIR_PATHS if exp_dict_paths is None else exp_dict_paths
     regex = EXPIRIES_FILENAME_REGEX if regex is None else regex
@@ -98,69 +99,13 @@ def get_upcomming_expiries_file_by_date (
 
     if not dir_abs_path:
             return None
-    
-    base = Path(dir_abs_path)
-
-    if not base.exists() or not base.is_dir() :
-        return None
-    
-    best_exact: Optional[Tuple[Tuple[int, int], float, str]] = None
-    best_before: Optional[Tuple[Tuple[int, int, int, int], float, str]] = None
-
-    with os.scandir(base) as it :
-
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-
-            m = regex.match(entry.name)
-
-            if not m :
-                continue
 
-            file_date_s = m.group(1)        # 'YYYY-MM-DD'
-            hhmm_s = m.group(2)              # 'HH-MM' (strict)
-            parts = hhmm_s.split("-")
+    entry = catalog_lookup(dir_abs_path, regex, target_date, mode="le", parser=parse_date_hhmm)
 
-            if len(parts) != 2 :
-                continue
-
-            try :
-
-                file_date = dt.datetime.strptime(file_date_s, "%Y-%m-%d").date()
-                hh, mm = int(parts[0]), int(parts[1])
-            
-            except ValueError :
-                continue
-
-            mtime = entry.stat().st_mtime
-
-            if file_date == target_date :
-
-                key_exact = (hh, mm)
-                
-                if (best_exact is None) or (key_exact > best_exact[0]) or (
-                    key_exact == best_exact[0] and mtime > best_exact[1]
-                ) :
-                    best_exact = (key_exact, mtime, entry.path)
-
-            elif file_date < target_date :
-
-                key_before = (file_date.year, file_date.month, file_date.day, hh * 100 + mm)
-                
-                if (best_before is None) or (key_before > best_before[0]) or (
-                    key_before == best_before[0] and mtime > best_before[1]
-                ):
-                    best_before = (key_before, mtime, entry.path)
-
-    if best_exact is not None :
-        return str(Path(best_exact[2]).resolve())
-
-    if best_before is not None :
-        return str(Path(best_before[2]).resolve())
+    if entry is None :
+        return None
 
-    return None
+    return str(Path(entry.path).resolve())
 
 
 
@@ -2,17 +2,22 @@ from __future__ import annotations
 
 import os
 import re
+import contextvars
 import polars as pl
 import datetime as dt
 
-
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Tuple
 
 from src.utils.logger import log
 from src.utils.formatters import date_to_str, str_to_date
 from src.utils.data_io import load_excel_to_dataframe
+from src.utils.catalog import catalog_lookup, parse_date_hh_mm
+from src.utils.excel_probe import validate_excel_columns
+from src.utils.load_plan import planned_load
+from src.utils.cache import scoped_cache
 from src.config.parameters import (
-    FUND_HV,
+    FUND_HV, LOAD_MANY_MAX_WORKERS,
     GREEKS_ALL_FILENAME, GREEKS_COLUMNS, GREEKS_REGEX, GREEKS_OVERVIEW_COLUMNS,
     GREEKS_GAMMA_PNL_COLUMNS, GREEKS_GAMMA_PNL_REGEX,
     GREEKS_VEGA_BUCKET_COLUMNS, GREEKS_VEGA_STRESS_PNL_COLUMNS, GREEKS_VEGA_STRESS_PNL_REGEX,
@@ -57,8 +62,9 @@ def read_history_greeks (
     dir_abs = greeks_paths.get(fund)
     full_path = os.path.join(dir_abs, filename)
 
+    # Planned load : header probe first, drifted columns are dropped instead of failing the whole parse
     try :
-        dataframe, md5 = load_excel_to_dataframe(full_path, schema_overrides=schema_overrides, specific_cols=specific_cols)
+        dataframe, md5 = planned_load(full_path, "Sheet1", schema_overrides, specific_cols, compact="greeks")
 
     except Exception as e :
         
@@ -68,6 +74,7 @@ def read_history_greeks (
     return dataframe, md5
 
 
+@scoped_cache(persist=True)
 def read_greeks_by_date (
         
         date : Optional[str | dt.datetime | dt.date] = None,
@@ -101,9 +108,13 @@ def read_greeks_by_date (
         return None, None, None
 
     full_path = os.path.join(dir_abs, filename)
+    ok, specific_cols, _ = validate_excel_columns(full_path, specific_cols)
+
+    if not ok :
+        return None, None, None
 
     try :
-        dataframe, md5 = load_excel_to_dataframe(full_path, schema_overrides=schema_overrides, specific_cols=specific_cols)
+        dataframe, md5 = load_excel_to_dataframe(full_path, schema_overrides=schema_overrides, specific_cols=specific_cols, compact="greeks")
 
     except Exception as e :
         
@@ -124,78 +135,18 @@ def find_most_recent_file_by_date (
     
     ) -> Tuple[Optional[str], Tuple[str]] :
     """
-    Return
+    Return the best file (latest intraday version) for the target date, resolved with mode :
+    "eq" exact date only, "le" latest date <= target, "ge" earliest date >= target.
     """
-    date_str_target = date_to_str(date)
-
-    if not os.path.isdir(dir_abs_path) :
-        return None, None
-    
-    # Best pour la date cible
-    best_per_date: Dict[str, Tuple[int, int, float, str]] = {}
-
-    with os.scandir(dir_abs_path) as it : # 
-        
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-            
-            m = regex.match(entry.name)
-
-            if not m :
-                continue
-
-            date_str, hh, mm = m.groups()
-
-            hh_i = int(hh)
-            mm_i = int(mm)
-
-            mtime = entry.stat().st_mtime
-
-            key = (hh_i, mm_i, mtime)
-
-            current = best_per_date.get(date_str)
-
-            if current is None or key > current[:3] :
-                best_per_date[date_str] = (hh_i, mm_i, mtime, entry.name)
-
-    if not best_per_date:
-        return None, None
-    
-    # Si on a exactement la date cible, on la privilégie pour tous les modes
-    if date_str_target in best_per_date:
-        _, _, _, fname = best_per_date[date_str_target]
-        return fname, date_str_target
+    if mode not in ("eq", "le", "ge") :
+        raise ValueError(f"Unknown mode '{mode}'. Use 'eq', 'le' or 'ge'.")
 
-    # Pas de fichier pour la date exacte -> on applique le "mode"
-    all_dates = sorted(best_per_date.keys())  # tri lexical = tri chronologique
+    entry = catalog_lookup(dir_abs_path, regex, date, mode=mode, parser=parse_date_hh_mm)
 
-    if mode == "eq":
-        # strict : rien trouvé à la date exacte
+    if entry is None :
         return None, None
 
-    elif mode == "le":
-        # last date <= date target
-        candidates = [d for d in all_dates if d <= date_str_target]
-
-        if not candidates:
-            return None, None
-        chosen_date = candidates[-1]
-
-    elif mode == "ge":
-        # First date >= date Target
-        candidates = [d for d in all_dates if d >= date_str_target]
-        if not candidates:
-            return None, None
-        chosen_date = candidates[0]
-
-    else:
-        raise ValueError(f"Unknown mode '{mode}'. Use 'eq', 'le' or 'ge'.")
-
-    _, _, _, fname = best_per_date[chosen_date]
-
-    return fname, chosen_date
+    return entry.name, date_to_str(entry.date)
 
 
 # ----------------- Scripts and analysis -----------------
@@ -397,15 +348,24 @@ def volatility_analysis (
         fund : Optional[str] = None,
     ) :
     """
-    Docstring for volatility_analysis
+    Vega stress PnL and vega bucket reports of the latest date <= date.
+
+    Returns:
+        (df_stress, md5_stress, real_date_stress, df_bucket, md5_bucket, real_date_bucket)
     """
-    date = date_to_str(date)
+    date = str_to_date(date)
     fund = FUND_HV if fund is None else fund
-    
-    df_1, md5_1, real_date_1 = vega_stress_pnl(date, fund)
-    df_2, md5_2, real_date_2 = vega_bucket(date, fund)
 
-    return df_1, md5_1, real_date_1, df_2, md5_2, real_date_2
+    readers = (vega_stress_pnl, vega_bucket)
+    workers = max(1, min(LOAD_MANY_MAX_WORKERS, len(readers)))
+
+    # Both reports are independent : read side by side, through the same cached reader as every other greeks file
+    with ThreadPoolExecutor(max_workers=workers) as executor :
+
+        futures = [executor.submit(contextvars.copy_context().run, reader, date, fund) for reader in readers]
+        outputs = [future.result() for future in futures]
+
+    return tuple(value for output in outputs for value in output)
 
     
 def vega_stress_pnl (
@@ -422,7 +382,7 @@ def vega_stress_pnl (
         mode : str = "le"
     ) :
     """
-    Docstring for vega_stress_pnl
+    Vega stress PnL report, without its "Total" row.
     """
     date = str_to_date(date)
     fund = FUND_HV if fund is None else fund
@@ -432,7 +392,11 @@ def vega_stress_pnl (
 
     schema_overrides = GREEKS_VEGA_STRESS_PNL_COLUMNS if schema_overrides is None else schema_overrides
 
-    dataframe, md5, real_date = read_greeks_by_date(date, fund, None, path_by_fund, schema_overrides, regex, mode)
+    dataframe, md5, real_date = read_greeks_by_date(date, fund, filename, path_by_fund, schema_overrides, regex, mode)
+
+    if dataframe is None :
+        return None, None, None
+
     dataframe = dataframe.filter(pl.col("Underlying") != "Total")
 
     return dataframe, md5, real_date
@@ -452,7 +416,9 @@ def vega_bucket (
         mode : str = "le"
     
     ) :
-
+    """
+    Vega bucket report, without its "Total" row.
+    """
     date = str_to_date(date)
     fund = FUND_HV if fund is None else fund
 
@@ -461,12 +427,14 @@ def vega_bucket (
 
     schema_overrides = GREEKS_VEGA_BUCKET_COLUMNS if schema_overrides is None else schema_overrides
 
-    dataframe, md5, real_date = read_greeks_by_date(date, fund, None, path_by_fund, schema_overrides, regex, mode)
-    dataframe = dataframe.filter(pl.col("Underlying Asset") != "Total")
+    dataframe, md5, real_date = read_greeks_by_date(date, fund, filename, path_by_fund, schema_overrides, regex, mode)
 
-    return dataframe, md5, real_date
+    if dataframe is None :
+        return None, None, None
 
+    dataframe = dataframe.filter(pl.col("Underlying Asset") != "Total")
 
+    return dataframe, md5, real_date
 
 
 def greeks_risk_analysis (
@@ -7,9 +7,10 @@ import datetime as dt
 
 from typing import Optional, Dict, List, Tuple
 
-from src.utils.data_io import load_excel_to_dataframe
+from src.utils.data_io import load_excel_to_dataframe, scan_excel_to_lazyframe
 from src.utils.logger import log
 from src.utils.formatters import date_to_str, str_to_date
+from src.utils.catalog import catalog_lookup, parse_date_hh_mm
 
 from src.config.parameters import (
     LEVERAGES_COLUMNS, LEVERAGES_UNDERL_COLUMNS, LEVERAGES_TRADE_COLUMNS, 
@@ -58,6 +59,38 @@ def read_history_leverages (
     return dataframe, md5
 
 
+def scan_history_leverages (
+        
+        date : Optional[str | dt.datetime | dt.date] = None,
+        fund : Optional[str] = None,
+
+        filename : Optional[str] = None,
+        leverages_paths : Optional[Dict] = None,
+        
+        schema_overrides : Optional[Dict] = None,
+
+    ) -> Tuple[Optional[pl.LazyFrame], Optional[str]] : 
+    """
+    Lazy variant of read_history_leverages, to chain date / column selections before collecting.
+    """
+    fund = FUND_HV if fund is None else fund
+
+    schema_overrides = LEVERAGES_COLUMNS if schema_overrides is None else schema_overrides
+    specific_cols = list(schema_overrides.keys())
+
+    filename = LEVERAGES_ALL_FILENAME if filename is None else filename
+    
+    leverages_paths = LEVERAGES_FUNDS_DIR_PATHS if leverages_paths is None else leverages_paths
+    path = leverages_paths.get(fund)
+
+    if path is None :
+        return None, None
+
+    full_path = os.path.join(path, filename)
+
+    return scan_excel_to_lazyframe(full_path, specific_cols=specific_cols, schema_overrides=schema_overrides)
+
+
 def read_underlying_leverages (
         
         date : Optional[str | dt.datetime | dt.date] = None,
@@ -162,62 +195,18 @@ def find_most_recent_file_by_date (
     
     ) -> Tuple[Optional[str], Tuple[str]] :
     """
-    Return
+    Return the latest file of the target date, or the most recent file of the directory otherwise.
     """
-    if not os.path.isdir(dir_abs_path) :
-        return None, None
-    
-    # Best pour la date cible
-    best_target_key: Optional[tuple] = None   # (hh, mm, mtime)
-    best_target_name: Optional[str] = None
-
-    best_global_key: Optional[tuple] = None   # (date_str, hh, mm, mtime)
-    best_global_name: Optional[str] = None
-
-    date = date_to_str(date)
-
-    with os.scandir(dir_abs_path) as it : # 
-        
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-
-            m = regex.match(entry.name)
-
-            if not m :
-                continue
-
-            date_str, hh, mm = m.groups()
-
-            hh_i = int(hh)
-            mm_i = int(mm)
-            mtime = entry.stat().st_mtime
-
-            if date_str == date :
-
-                key_t = (hh_i, mm_i, mtime)
-                
-                if best_target_key is None or key_t > best_target_key :
-
-                    best_target_key = key_t
-                    best_target_name = entry.name
-
-            key_g = (date_str, hh_i, mm_i, mtime)
-
-            if best_global_key is None or key_g > best_global_key :
-
-                best_global_key = key_g
-                best_global_name = entry.name
-
-    if best_target_name is not None :
-        return best_target_name, date
+    entry = catalog_lookup(dir_abs_path, regex, date, mode="eq", parser=parse_date_hh_mm)
 
     # Most recent file otherwise
-    if best_global_name is not None :
-        return best_global_name, key_g[0]
+    if entry is None :
+        entry = catalog_lookup(dir_abs_path, regex, mode="latest", parser=parse_date_hh_mm)
+
+    if entry is None :
+        return None, None
 
-    return None, None
+    return entry.name, date_to_str(entry.date)
     
 
 
@@ -2,9 +2,6 @@ from __future__ import annotations
 
 import os
 import re
-import math
-import hashlib
-import calendar
 import polars as pl
 import datetime as dt
 import streamlit as st
@@ -14,6 +11,12 @@ from typing import List, Optional, Dict, Tuple
 from src.utils.logger import log
 from src.utils.data_io import load_excel_to_dataframe
 from src.utils.formatters import date_to_str, str_to_date, str_to_datetime
+from src.utils.fingerprint import frame_fingerprint, file_fingerprint
+from src.utils.dag import ComputeGraph
+from src.utils.returns import SINCE_INCEPTION, compute_returns, calendar_grid
+from src.utils.period_stats import period_statistics
+from src.utils.cache import cached_call
+from src.utils.catalog import catalog_lookup, parse_date_hh_mm
 #from src.core.data.volatility import compute_realized_vol_by_dates
 from src.config.parameters import (
     FUND_HV, NAV_HISTORY_COLUMNS, NAV_HIST_NAME_DEFAULT, NAV_CUTOFF_DATE,
@@ -91,15 +94,14 @@ def read_nav_estimate_by_fund (
     
     ) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
     """
-    
+    NAV estimates history of a fund. With the default file and schema, served from the NAV graph.
     """
     fundation = FUND_HV if fundation is None else fundation
-    fund_dict = NAV_ESTIMATE_FUNDS_DIR_PATHS if fund_dict is None else fund_dict
 
-    dir_abs_path = fund_dict.get(fundation)
-    filename = NAV_ESTIMATE_HIST_NAME_DEFAULT if filename is None else filename
+    if filename is None and fund_dict is None and schema_override is None :
+        return NAV_GRAPH.get("estimates", fund=fundation)
 
-    fullname = os.path.join(dir_abs_path, filename)
+    fullname = get_nav_estimate_path_by_fund(fundation, fund_dict, filename)
     schema_override = NAV_ESTIMATE_COLUMNS if schema_override is None else schema_override
     columns = list(schema_override.keys())
 
@@ -108,6 +110,21 @@ def read_nav_estimate_by_fund (
     return dataframe, md5
 
 
+def get_nav_estimate_path_by_fund (
+
+        fundation : Optional[str] = None,
+        fund_dict : Optional[Dict[str, str]] = None,
+        filename : Optional[str] = None,
+
+    ) -> str :
+
+    fundation = FUND_HV if fundation is None else fundation
+    fund_dict = NAV_ESTIMATE_FUNDS_DIR_PATHS if fund_dict is None else fund_dict
+    filename = NAV_ESTIMATE_HIST_NAME_DEFAULT if filename is None else filename
+
+    return os.path.join(fund_dict.get(fundation), filename)
+
+
 def rename_nav_estimate_columns (
         
         dataframe : Optional[pl.DataFrame] = None,
@@ -121,9 +138,12 @@ def rename_nav_estimate_columns (
 
     ) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
     """
-    
+    NAV estimates with the display names. Without a frame and with the defaults, served from the NAV graph.
     """
-    dataframe, md5 = read_nav_estimate_by_fund(fundation) if dataframe is None else dataframe, md5
+    if dataframe is None and original_cols is None and rename_cols is None and forward_fill :
+        return NAV_GRAPH.get("estimates_renamed", fund=FUND_HV if fundation is None else fundation)
+
+    dataframe, md5 = read_nav_estimate_by_fund(fundation) if dataframe is None else (dataframe, md5)
 
     original_cols = NAV_ESTIMATE_COLUMNS if original_cols is None else original_cols
     rename_cols = NAV_ESTIMATE_RENAME_COLUMNS if rename_cols is None else rename_cols
@@ -190,11 +210,14 @@ def gav_performance_normalized_base_100 (
         fund : Optional[str] = None,
 
         rename_cols : Optional[Dict] = None,
-        
+
+        dataframe : Optional[pl.DataFrame] = None,
+        md5 : Optional[str] = None,
 
     ) :
     """
-    Docstring for gav_performance_normalized_base_100
+    GAV / NAV estimates between two dates, rebased to 100 on the first date.
+    Without a frame (renamed estimates) and with the default columns, served from the NAV graph.
     """
 
     start_date = str_to_date(start_date)
@@ -202,11 +225,13 @@ def gav_performance_normalized_base_100 (
 
     fund = FUND_HV if fund is None else fund
 
+    if dataframe is None and rename_cols is None :
+        return NAV_GRAPH.get("gav_rebased_100", fund=fund, start_date=start_date, end_date=end_date)
+
     rename_cols = NAV_ESTIMATE_RENAME_COLUMNS if rename_cols is None else rename_cols
     columns = list(rename_cols.values())
 
-    dataframe, md5 = read_nav_estimate_by_fund(fund)
-    rename_df , md5 = rename_nav_estimate_columns(dataframe, md5)
+    rename_df, md5 = rename_nav_estimate_columns(fundation=fund) if dataframe is None else (dataframe, md5)
 
     df_filtered = rename_df.filter(
         
@@ -248,17 +273,25 @@ def index_performance_normalized_base_0 (
         fund : Optional[str] = None,
         column : Optional[str] = None,
 
+        dataframe : Optional[pl.DataFrame] = None,
+        md5 : Optional[str] = None,
+
     ) :
     """
-    
+    Index values between two dates, rebased to 100 on their first value.
+    Without a frame (index values) and with the default date column, served from the NAV graph.
     """
     start_date = str_to_datetime(start_date)
     end_date = str_to_datetime(end_date)
 
     fund = FUND_HV if fund is None else fund
+
+    if dataframe is None and column is None :
+        return NAV_GRAPH.get("index_rebased_0", start_date=start_date, end_date=end_date)
+
     column = "Dates" if column is None else column
 
-    dataframe, md5 = read_index_values_by_date()
+    dataframe, md5 = read_index_values_by_date() if dataframe is None else (dataframe, md5)
 
     df_filtered = dataframe.filter(
         (pl.col(column) >= pl.lit(start_date)) & (pl.col(column) <= pl.lit(end_date))
@@ -297,7 +330,11 @@ def read_index_values_by_date (
 
     ) :
     """
+    Index performance file. With the default file and columns, served from the NAV graph.
     """
+    if file_abs_path is None and columns is None and rename_columns is None :
+        return NAV_GRAPH.get("index_values")
+
     file_abs_path = NAV_INDEX_PERF_ABS_PATH if file_abs_path is None else file_abs_path
     columns = NAV_INDEX_PERF_COLUMNS if columns is None else columns
     rename_columns = {"column_0": "Dates"} if rename_columns is None else rename_columns
@@ -339,7 +376,7 @@ def treat_string_nav_cols_df (
         )
     )
 
-    md5_new = hashlib.md5(_df.write_parquet()).hexdigest()
+    md5_new = frame_fingerprint(_df)
 
     return _df, md5_new
 
@@ -520,8 +557,6 @@ def find_most_recent_nav_by_date(
 
     :return: (filename, chosen_date_str) or (None, None)
     """
-
-    date_str_target = date_to_str(date)           # "YYYY-MM-DD"
     fund = FUND_HV if fund is None else fund
     nav_fund_paths = NAV_PORTFOLIO_FUNDS_DIR_PATHS if nav_fund_paths is None else nav_fund_paths
     dir_abs_path = nav_fund_paths.get(fund)
@@ -530,74 +565,19 @@ def find_most_recent_nav_by_date(
         return None, None
 
     if regex is None:
-        # À adapter à ton pattern réel
         # Exemple: r"^NAV_(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})\.xlsx$"
         raise ValueError("regex must be provided")
 
-    # Pour chaque date, on garde le *meilleur* fichier (heure + mtime)
-    # best_per_date[date_str] = (hh, mm, mtime, filename)
-    best_per_date: Dict[str, Tuple[int, int, float, str]] = {}
-
-    with os.scandir(dir_abs_path) as it :
-
-        for entry in it :
-        
-            if not entry.is_file() :
-                continue
-
-            m = regex.match(entry.name)
-            
-            if not m :
-                continue
-
-            date_str, hh, mm = m.groups()
-            
-            hh_i = int(hh)
-            mm_i = int(mm)
-            
-            mtime = entry.stat().st_mtime
-
-            key = (hh_i, mm_i, mtime)
-
-            current = best_per_date.get(date_str)
-            if current is None or key > current[:3]:
-                # On stocke hh, mm, mtime + filename
-                best_per_date[date_str] = (hh_i, mm_i, mtime, entry.name)
-
-    if not best_per_date:
-        return None, None
-
-    # Si on a exactement la date cible, on la privilégie pour tous les modes
-    if date_str_target in best_per_date:
-        _, _, _, fname = best_per_date[date_str_target]
-        return fname, date_str_target
+    if mode not in ("eq", "le", "ge") :
+        raise ValueError(f"Unknown mode '{mode}'. Use 'eq', 'le' or 'ge'.")
 
-    # Pas de fichier pour la date exacte -> on applique le "mode"
-    all_dates = sorted(best_per_date.keys())  # tri lexical = tri chronologique
+    # Best file per date (hh, mm, mtime), indexed once per directory change
+    entry = catalog_lookup(dir_abs_path, regex, date, mode=mode, parser=parse_date_hh_mm)
 
-    if mode == "eq":
-        # strict : rien trouvé à la date exacte
+    if entry is None:
         return None, None
 
-    elif mode == "le":
-        # Dernière date <= date cible
-        candidates = [d for d in all_dates if d <= date_str_target]
-        if not candidates:
-            return None, None
-        chosen_date = candidates[-1]
-
-    elif mode == "ge":
-        # Première date >= date cible
-        candidates = [d for d in all_dates if d >= date_str_target]
-        if not candidates:
-            return None, None
-        chosen_date = candidates[0]
-
-    else:
-        raise ValueError(f"Unknown mode '{mode}'. Use 'eq', 'le' or 'ge'.")
-
-    _, _, _, fname = best_per_date[chosen_date]
-    return fname, chosen_date
+    return entry.name, date_to_str(entry.date)
 
 
 def estimated_gross_performance (
@@ -612,11 +592,16 @@ def estimated_gross_performance (
     
     ) :
     """
-    
+    Estimates up to max_date, one row per date, with year and month columns.
+    Without a frame and with the default columns, served from the NAV graph.
     """
     max_date = str_to_date(max_date)
 
     fund = FUND_HV if fund is None else fund
+
+    if dataframe is None and columns_fund is None :
+        return NAV_GRAPH.get("gross_performance", fund=fund, max_date=max_date)
+
     dataframe, md5 = read_nav_estimate_by_fund(fund) if dataframe is None else (dataframe, md5)
     
     columns_fund = NAV_FUNDS_COLUMNS if columns_fund is None else columns_fund
@@ -638,150 +623,128 @@ def estimated_gross_performance (
     return df, md5
 
 
-def compute_monthly_returns (
-        
+def compute_period_returns (
+
         dataframe : Optional[pl.DataFrame] = None,
         md5 : Optional[str] = None,
 
         fund :  Optional[str] = None,
         columns_fund : Optional[Dict] = None,
 
-        year_month : List = ["year", "month"],
-        hardcoded : Optional[Dict] = None,
+        frequencies : Tuple[str, ...] = ("daily", "weekly", "monthly", "quarterly", "yearly", SINCE_INCEPTION),
+        max_date : Optional[str | dt.datetime | dt.date] = None,
+
     ) :
     """
-    Docstring for compute_monthly_returns
-    
-    :param dataframe: Description
-    :type dataframe: Optional[pl.DataFrame]
-    :param md5: Description
-    :type md5: Optional[str]
+    Long table of the fund's gross performance returns at every frequency (see src.utils.returns).
+    Without a frame and with the default columns, served from the NAV graph.
     """
-
     fund = FUND_HV if fund is None else fund
-    dataframe, md5 = estimated_gross_performance(fund=fund, columns_fund=columns_fund) if dataframe is None else (dataframe, md5)
+
+    if dataframe is None and columns_fund is None :
+
+        returns, md5 = NAV_GRAPH.get("period_returns", fund=fund, max_date=str_to_date(max_date))
+        return (returns.filter(pl.col("frequency").is_in(frequencies)) if returns is not None else None), md5
+
+    dataframe, md5 = estimated_gross_performance(fund=fund, columns_fund=columns_fund, max_date=max_date) if dataframe is None else (dataframe, md5)
+
+    if dataframe is None :
+        return None, None
 
     columns_fund = NAV_FUNDS_COLUMNS if columns_fund is None else columns_fund
-    column = columns_fund.get(fund)
 
-    monthly = (
+    return compute_returns(dataframe, columns_fund.get(fund), frequencies=frequencies), md5
 
-        dataframe
-        .group_by(year_month)
-        .agg(
-            pl.count().alias("rows_in_month"),
-            pl.col(column).first().alias("first_nav"),
-            pl.col(column).last().alias("last_nav"),
-        )
-        .sort(year_month)
 
-    )
+def compute_funds_returns (
+
+        funds : Optional[List[str]] = None,
+        columns_fund : Optional[Dict] = None,
 
-    # --- previous group values (raw) ---
-    monthly = monthly.with_columns(
+        frequencies : Tuple[str, ...] = ("daily", "weekly", "monthly", "quarterly", "yearly", SINCE_INCEPTION),
+        max_date : Optional[str | dt.datetime | dt.date] = None,
 
-        pl.col(year_month[0]).shift(1).alias("prev_year"),
-        pl.col(year_month[1]).shift(1).alias("prev_month"),
-        pl.col("last_nav").shift(1).alias("prev_last_nav_raw"),
+    ) -> pl.DataFrame :
+    """
+    Returns of several funds in one pass : their gross performance series stacked with a "fund"
+    column, then one compute_returns query split by fund.
+    """
+    columns_fund = NAV_FUNDS_COLUMNS if columns_fund is None else columns_fund
+    funds = list(columns_fund) if funds is None else funds
 
-    )
+    series = []
 
-    # --- expected (M-1) ---
-    monthly = monthly.with_columns(
+    for fund in funds :
 
-        pl.when(pl.col(year_month[1]) == 1)
-          .then(pl.col(year_month[0]) - 1)
-          .otherwise(pl.col(year_month[0]))
-          .alias("prev_year_expected"),
+        gross, _ = estimated_gross_performance(fund=fund, max_date=max_date)
 
-        pl.when(pl.col(year_month[1]) == 1)
-          .then(pl.lit(12))
-          .otherwise(pl.col(year_month[1]) - 1)
-          .alias("prev_month_expected"),
+        if gross is None :
+            continue
 
-    )
+        series.append(gross.select(pl.lit(fund).alias("fund"), "date", pl.col(columns_fund.get(fund)).cast(pl.Float64).alias("nav")))
 
-    # --- keep prev_last_nav only if the previous group is STRICTLY (M-1) ---
-    monthly = monthly.with_columns(
+    if not series :
+        return None
 
-        pl.when(
-            (pl.col("prev_year") == pl.col("prev_year_expected")) &
-            (pl.col("prev_month") == pl.col("prev_month_expected"))
-        )
-        .then(pl.col("prev_last_nav_raw"))
-        .otherwise(pl.lit(None))
-        .alias("prev_last_nav")
+    return compute_returns(pl.concat(series), "nav", by=["fund"], frequencies=frequencies)
 
-    )
 
-    # --- start nav: last(M-1) if exists, else first(M) ---
-    monthly = monthly.with_columns(
+def compute_period_statistics (
 
-        pl.when(pl.col("prev_last_nav").is_not_null())
-          .then(pl.col("prev_last_nav"))
-          .otherwise(pl.col("first_nav"))
-          .alias("start_nav")
+        as_of : Optional[str | dt.datetime | dt.date] = None,
 
-    )
+        funds : Optional[List[str]] = None,
+        columns_fund : Optional[Dict] = None,
 
-    # valid month: either >=2 points in M, or 1 point in M but we have last(M-1)
-    valid_month = (
+        with_indices : bool = True,
+        risk_free : float = 0.0,
 
-        (pl.col("rows_in_month") >= 2) |
-        ((pl.col("rows_in_month") == 1) & pl.col("prev_last_nav").is_not_null())
-   
-    )
+    ) -> Optional[pl.DataFrame] :
+    """
+    WTD / MTD / QTD / YTD / ITD statistics (see src.utils.period_stats) of the funds' gross performance
+    and of the indices, one row per (series, period), computed in one query and cached on the input files.
+    """
+    as_of = str_to_date(as_of)
 
-    monthly = monthly.with_columns(
+    columns_fund = NAV_FUNDS_COLUMNS if columns_fund is None else columns_fund
+    funds = list(columns_fund) if funds is None else funds
 
-        pl.when(valid_month)
-          .then(((pl.col("last_nav") / pl.col("start_nav")) - 1.0) * 100.0)
-          .otherwise(pl.lit(None))
-          .alias("monthly_return")
+    frames, md5s = [], []
 
-    )
+    for fund in funds :
 
-    result: Dict[int, Dict[int, float]] = {}
+        gross, md5 = estimated_gross_performance(fund=fund, max_date=as_of)
 
-    for year, month, perf in monthly.select(year_month + ["monthly_return"]).iter_rows() :
+        if gross is None :
+            continue
 
-        year_int = int(year)
-        month_int = int(month)
+        frames.append(gross.select(pl.lit(fund).alias("series"), "date", pl.col(columns_fund.get(fund)).cast(pl.Float64).alias("value")))
+        md5s.append(md5)
 
-        if perf is None :
-            perf_value = math.nan
-        
-        else :
-            perf_value = float(perf)
+    if with_indices :
 
-        result.setdefault(year_int, {})[month_int] = perf_value
+        index_df, md5 = read_index_values_by_date()
 
-    # Ensure all years appear in result
-    for year in dataframe.select(pl.col(year_month[0])).unique().to_series().to_list() :
-        result.setdefault(int(year), {})
+        if index_df is not None :
 
-    month_abbrs = [calendar.month_abbr[m] for m in range(1, 13)]
-    rows = []
+            index_cols = [c for c in NAV_INDEX_PERF_COLUMNS if c in index_df.columns]
 
-    for year, month_dict in result.items() :
+            frames.append(
+                index_df.unpivot(index="Dates", on=index_cols, variable_name="series", value_name="value")
+                .select("series", pl.col("Dates").alias("date"), pl.col("value").cast(pl.Float64))
+            )
+            md5s.append(md5)
 
-        row = {"Year": year}
-        
-        for m, abbr in enumerate(month_abbrs, start=1) :
-        
-            value = month_dict.get(m, math.nan)  # missing month -> NaN
-            row[abbr] = value
-        
-        rows.append(row)
+    if not frames :
+        return None
 
-    perf_df = pl.DataFrame(rows).sort("Year")
-    print("Hello Xorld")
-    print(perf_df)
+    arguments = {"as_of" : as_of, "funds" : funds, "with_indices" : with_indices, "risk_free" : risk_free, "md5" : tuple(md5s)}
+    compute = lambda : period_statistics(pl.concat(frames), "value", as_of, by=["series"], risk_free=risk_free)
 
-    return perf_df, md5
+    return cached_call("nav.compute_period_statistics", arguments, compute)
 
 
-def compute_yearly_returns (
+def compute_monthly_returns (
         
         dataframe : Optional[pl.DataFrame] = None,
         md5 : Optional[str] = None,
@@ -789,88 +752,62 @@ def compute_yearly_returns (
         fund :  Optional[str] = None,
         columns_fund : Optional[Dict] = None,
 
-        date_col : str = "date",
-        year_col : str = "Year",
+        hardcoded : Optional[Dict] = None,
 
+        max_date : Optional[str | dt.datetime | dt.date] = None,
     ) :
     """
+    Monthly returns grid (Year, Jan..Dec in %, NaN without a return) of the gross performance.
+    Without a frame and with the default columns, served from the NAV graph.
     """
     fund = FUND_HV if fund is None else fund
 
-    columns_fund = NAV_FUNDS_COLUMNS if columns_fund is None else columns_fund
-    nav_col = columns_fund.get(fund)
-
-    dataframe, md5 = compute_monthly_returns(None, None, fund, columns_fund) if dataframe is None else (dataframe, md5)
-    print("Lecture")
-    print(dataframe)
-    source_df, source_md5 = estimated_gross_performance(None, None, fund, columns_fund)
-    print("Lecture 2")
-    print(source_df)
-    
-    source_df = (
+    if dataframe is None and columns_fund is None :
+        return NAV_GRAPH.get("monthly_returns", fund=fund, max_date=str_to_date(max_date))
 
-        source_df
-        .sort(date_col)
-        .with_columns(pl.col(date_col).dt.year().alias(year_col))
-
-    )
+    returns, md5 = compute_period_returns(dataframe, md5, fund, columns_fund, ("monthly",), max_date)
 
-    yearly = (
-
-        source_df
-        .group_by(year_col)
-        .agg(
-            pl.count().alias("rows_in_year"),
-            pl.col(nav_col).first().alias("first_nav"),
-            pl.col(nav_col).last().alias("last_nav"),
-        )
-        .sort(year_col)
-
-    )
-
-    yearly = yearly.with_columns(
-
-        pl.col(year_col).shift(1).alias("prev_year"),
-        pl.col("last_nav").shift(1).alias("prev_last_nav_raw"),
-
-    )
+    if returns is None :
+        return None, None
 
-    yearly = yearly.with_columns(
+    return calendar_grid(returns, "monthly", total_col=None), md5
 
-        pl.when(pl.col("prev_year") == (pl.col(year_col) - 1))
-          .then(pl.col("prev_last_nav_raw"))
-          .otherwise(pl.lit(None))
-          .alias("prev_last_nav")
 
-    )
+def compute_yearly_returns (
+        
+        dataframe : Optional[pl.DataFrame] = None,
+        md5 : Optional[str] = None,
 
-    yearly = yearly.with_columns(
+        fund :  Optional[str] = None,
+        columns_fund : Optional[Dict] = None,
 
-        pl.when(pl.col("prev_last_nav").is_not_null())
-          .then(pl.col("prev_last_nav"))
-          .otherwise(pl.col("first_nav"))
-          .alias("start_nav")
+        date_col : str = "date",
 
-    )
+        gross_df : Optional[pl.DataFrame] = None,
+        max_date : Optional[str | dt.datetime | dt.date] = None,
 
-    valid_year = (
+    ) :
+    """
+    Monthly returns table with the yearly "Total" column. Without frames and with the
+    default columns, served from the NAV graph (both grids come from one returns table).
+    """
+    fund = FUND_HV if fund is None else fund
 
-        (pl.col("rows_in_year") >= 2) |
-        ((pl.col("rows_in_year") == 1) & pl.col("prev_last_nav").is_not_null())
+    if dataframe is None and columns_fund is None :
+        return NAV_GRAPH.get("yearly_returns", fund=fund, max_date=str_to_date(max_date))
 
-    )
+    columns_fund = NAV_FUNDS_COLUMNS if columns_fund is None else columns_fund
 
-    yearly = yearly.with_columns(
+    dataframe, md5 = compute_monthly_returns(None, None, fund, columns_fund, max_date=max_date) if dataframe is None else (dataframe, md5)
+    source_df, _ = estimated_gross_performance(None, None, fund, columns_fund, max_date) if gross_df is None else (gross_df, None)
 
-        pl.when(valid_year)
-          .then(((pl.col("last_nav") / pl.col("start_nav")) - 1.0) * 100.0)
-          .otherwise(pl.lit(None))
-          .alias("Total")
+    yearly = compute_returns(source_df, columns_fund.get(fund), date_col=date_col, frequencies=("yearly",))
 
+    yearly = yearly.select(
+        pl.col("period").dt.year().cast(pl.Int64).alias("Year"),
+        (pl.col("return") * 100.0).alias("Total"),
     )
 
-    yearly = yearly.select([pl.col(year_col).alias("Year"), "Total"])
-
     dataframe = dataframe.join(yearly, on="Year", how="left")
 
     return dataframe, md5
@@ -1048,3 +985,59 @@ def hardcode_performance_monthly_values (
     """
     return out, md5
 
+
+# ------------ NAV computation graph ------------
+#
+#   estimates ─┬─ gross_performance ── period_returns ─┬─ monthly_returns
+#              │                                       └─ yearly_returns
+#              └─ estimates_renamed ── gav_rebased_100
+#   index_values ── index_rebased_0
+#
+# Each node is computed once per input fingerprints and shared by every section and session.
+
+NAV_GRAPH = ComputeGraph("nav")
+
+
+@NAV_GRAPH.source("estimates", params=("fund",), fingerprint=lambda fund : file_fingerprint(get_nav_estimate_path_by_fund(fund)))
+def _estimates_node (fund) :
+    return read_nav_estimate_by_fund(fund, fund_dict=NAV_ESTIMATE_FUNDS_DIR_PATHS)
+
+
+@NAV_GRAPH.source("index_values", fingerprint=lambda : file_fingerprint(NAV_INDEX_PERF_ABS_PATH) if NAV_INDEX_PERF_ABS_PATH else None)
+def _index_values_node () :
+    return read_index_values_by_date(NAV_INDEX_PERF_ABS_PATH, NAV_INDEX_PERF_COLUMNS)
+
+
+@NAV_GRAPH.node("estimates_renamed", deps=("estimates",), params=("fund",))
+def _estimates_renamed_node (estimates, fund) :
+    return rename_nav_estimate_columns(estimates, None, NAV_ESTIMATE_COLUMNS, NAV_ESTIMATE_RENAME_COLUMNS, fund)[0]
+
+
+@NAV_GRAPH.node("gross_performance", deps=("estimates",), params=("fund", "max_date"))
+def _gross_performance_node (estimates, fund, max_date) :
+    return estimated_gross_performance(estimates, None, fund, NAV_FUNDS_COLUMNS, max_date)[0]
+
+
+@NAV_GRAPH.node("period_returns", deps=("gross_performance",), params=("fund",), persist=True)
+def _period_returns_node (gross, fund) :
+    return compute_returns(gross, NAV_FUNDS_COLUMNS.get(fund))
+
+
+@NAV_GRAPH.node("monthly_returns", deps=("period_returns",))
+def _monthly_returns_node (returns) :
+    return calendar_grid(returns, "monthly", total_col=None)
+
+
+@NAV_GRAPH.node("yearly_returns", deps=("period_returns",))
+def _yearly_returns_node (returns) :
+    return calendar_grid(returns, "monthly")
+
+
+@NAV_GRAPH.node("gav_rebased_100", deps=("estimates_renamed",), params=("fund", "start_date", "end_date"))
+def _gav_rebased_node (renamed, fund, start_date, end_date) :
+    return gav_performance_normalized_base_100(start_date, end_date, fund, NAV_ESTIMATE_RENAME_COLUMNS, renamed)[0]
+
+
+@NAV_GRAPH.node("index_rebased_0", deps=("index_values",), params=("start_date", "end_date"))
+def _index_rebased_node (index_values, start_date, end_date) :
+    return index_performance_normalized_base_0(start_date, end_date, None, "Dates", index_values)[0]
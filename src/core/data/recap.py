@@ -22,7 +22,10 @@ from src.config.parameters import (
     
     )
 from src.utils.data_io import load_excel_to_dataframe
+from src.utils.excel_probe import validate_excel_columns
 from src.utils.formatters import str_to_date, str_to_datetime
+from src.utils.catalog import catalog_lookup, parse_date_timestamp
+from src.utils.compaction import compact_dataframe
 from src.utils.logger import log
 
 
@@ -60,7 +63,7 @@ def read_trade_recap_by_date (
     schema_overrides = pick_columns_view(light)
 
     regex = TRADE_RECAP_RAW_FILE_REGEX if regex is None else regex
-    filename, real_date = find_most_recent_file_by_date(date, dir_abs_path, regex, format, mode) if filename is None else (filename, None)
+    real_date, filename = find_most_recent_file_by_date(date, dir_abs_path, regex, mode=mode) if filename is None else (None, filename)
 
     if filename is None :
         
@@ -70,38 +73,34 @@ def read_trade_recap_by_date (
     dir_abs_path = TREADE_RECAP_DATA_RAW_DIR_ABS_PATH if dir_abs_path is None else dir_abs_path
     full_path = os.path.join(dir_abs_path, filename)
 
+    # Header probe first : a file without the expected sheet is rejected before the full parse
+    ok, _, missing = validate_excel_columns(full_path, list(schema_overrides.keys()) if schema_overrides is not None else None)
+
+    if not ok :
+
+        log(f"[-] Trade Recap {filename} does not have the expected layout", "error")
+        return None, None, None
+
     dataframe, md5 = load_excel_to_dataframe(
         full_path,
-        schema_overrides=schema_overrides
+        schema_overrides=schema_overrides,
+        compact="trade_recap",
     )
 
     if dataframe is None :
 
         log ("[-] Error reading the Trade Recap dataframe", "error")
         return None, None, None
-    
-    if schema_overrides is not None :
-
-        try :
-            print()
-            #dataframe = dataframe.select(list(schema_overrides.keys()))
-
-        except :
-            
-            expected_cols = list(schema_overrides.keys())
-            existing_cols = set(dataframe.columns)
 
-            missing_cols = [
-            
-                pl.lit(None).cast(dtype).alias(col)
-                for col, dtype in schema_overrides.items() if col not in existing_cols
-            
-            ]
+    # Drifted columns are added empty, so that downstream selections keep working
+    if schema_overrides is not None and missing :
 
-            if missing_cols :
-                dataframe = dataframe.with_columns(missing_cols)
+        dataframe = dataframe.with_columns(
+            [pl.lit(None).cast(schema_overrides[col]).alias(col) for col in missing if col not in dataframe.columns]
+        )
 
-            dataframe = dataframe.select(expected_cols)
+        # Same dtypes as the files that have them
+        dataframe = compact_dataframe(dataframe, "trade_recap", full_path)
 
     return dataframe, md5, real_date
 
@@ -164,63 +163,33 @@ def find_most_recent_file_by_date (
         regex : Optional[re.Pattern] = None,
 
         format : str = "%Y-%m-%d",
-        timestamp_format : str = "%Y_%m_%dT%H_%M",
+        mode : str = "eq",
 
-    ) -> Tuple[Optional[str], Optional[str]] :
+    ) -> Tuple[Optional[dt.datetime], Optional[str]] :
     """
-    Docstring for find_most_recent_file_by_date
+    Find the latest generated recap (by as-of timestamp) for a trade date.
     
-    :param date: Description
+    :param date: Trade date
     :type date: Optional[str | dt.datetime | dt.date]
-    :param dir_abs_path: Description
+    :param dir_abs_path: Recap directory, TREADE_RECAP_DATA_RAW_DIR_ABS_PATH by default
     :type dir_abs_path: Optional[str]
-    :param regex: Description
+    :param regex: Filename regex with groups (trade date, as-of timestamp)
     :type regex: Optional[re.Pattern]
+    :param mode: "eq" exact trade date, "le" latest <= date, "ge" earliest >= date
+    :type mode: str
+    :return: (as-of timestamp, filename) or (None, None)
     """
     date = str_to_date(date, format) if date is not None else None
 
     dir_abs_path = TREADE_RECAP_DATA_RAW_DIR_ABS_PATH if dir_abs_path is None else dir_abs_path
     regex = TRADE_RECAP_RAW_FILE_REGEX if regex is None else regex
 
-    if not os.path.isdir(dir_abs_path) :
-        return None, None
-    
-    # Keep only files matching the selected trade date
-    # value = (as_of_dt, mtime, filename)
-    best_file : Optional[Tuple[dt.datetime, str]] = None
-
-    with os.scandir(dir_abs_path) as it :
-        
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-            
-            m = regex.match(entry.name)
-
-            if not m :
-                continue
+    entry = catalog_lookup(dir_abs_path, regex, date, mode=mode, parser=parse_date_timestamp)
 
-            trade_date_str, timestamp_datetime_str = m.groups()
-
-            trade_date = str_to_date(trade_date_str, format)
-            timestamp_datetime = str_to_datetime(timestamp_datetime_str, timestamp_format)
-
-            if trade_date != date :
-                continue
-            
-            candidate = (timestamp_datetime, entry.name)
-
-            if best_file is None or candidate[0] > best_file[0] :
-                best_file = candidate
-
-
-    if best_file is None :
+    if entry is None :
         return None, None
     
-    print(best_file)
-    
-    return best_file[0], best_file[1]
+    return entry.stamp[0], entry.name
 
 
 
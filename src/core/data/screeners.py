@@ -2,17 +2,15 @@ from __future__ import annotations
 
 import os
 import re
-import time
-import hashlib
 import polars as pl
 import datetime as dt
-import streamlit as st
 
 from typing import Optional, List, Dict, Tuple
 
 from src.utils.logger import log
 from src.utils.formatters import date_to_str, str_to_date, filter_token_col_from_df, exclude_token_cols_from_df, filter_groupby_col_from_df
-from src.utils.data_io import load_excel_to_dataframe
+from src.utils.catalog import catalog_lookup, parse_compact_timestamp
+from src.utils.load_plan import planned_load
 from src.config.parameters import FUND_HV, SCREENERS_COLUMNS_FX, SCREENERS_COLUMNS_TARF, SCREENERS_REGEX, SCREENERS_COLUMNS_TAIL, SCREENER_TOKEN_EXCLUDE, SCREENER_TOKEN_FILTER
 from src.config.paths import SCREENERS_FUNDS_DIR_PATHS
 
@@ -60,7 +58,8 @@ def read_db_gross_data_by_date (
     full_path = os.path.join(dir_path, filename)
     
     try :
-        dataframe, md5 = screeners_load_excel_to_dataframe(full_path, "Trade Legs", specific_cols=specific_cols, schema_overrides=schema_overrides)
+        # Planned load : sections of a page reading this workbook share one parse
+        dataframe, md5 = planned_load(full_path, "Trade Legs", schema_overrides, specific_cols, compact="trade_legs")
 
     except Exception as e :
 
@@ -191,62 +190,19 @@ def find_most_recent_file_by_date (
     
     ) -> Tuple[Optional[str], Optional[str]] :
     """
-    Return
+    Return the latest file of the target date, or the most recent file of the directory otherwise.
+    Filenames carry a compact timestamp, ex: "20241121T093001.123".
     """
-    if not os.path.isdir(dir_abs_path) :
-        return None, None
-    
-    # Best pour la date cible
-    best_target_key: Optional[tuple] = None   # (hh, mm, mtime)
-    best_target_name: Optional[str] = None
-
-    best_global_key: Optional[tuple] = None   # (date_str, hh, mm, mtime)
-    best_global_name: Optional[str] = None
-
-    date = date_to_str(date)
-
-    with os.scandir(dir_abs_path) as it : # 
-        
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-
-            m = regex.match(entry.name)
-
-            if not m :
-                continue
-
-            ts = m.group(1)               # ex: "20241121T093001.123"
-
-            date_str = ts[0:8]            # "20241121"
-            hh = ts[9:11]                 # "09"
-            mm = ts[11:13]                # "30"
-
-            if date_str == date :
-
-                key_t = (date_str, hh, mm)
-                
-                if best_target_key is None or key_t > best_target_key :
-
-                    best_target_key = key_t
-                    best_target_name = entry.name
-
-            key_g = (date_str, hh, mm, ts)
-
-            if best_global_key is None or key_g > best_global_key :
-
-                best_global_key = key_g
-                best_global_name = entry.name
-
-    if best_target_name is not None :
-        return best_target_name, date
+    entry = catalog_lookup(dir_abs_path, regex, date, mode="eq", parser=parse_compact_timestamp)
 
     # Most recent file otherwise
-    if best_global_name is not None :
-        return best_global_name, key_g[0]
+    if entry is None :
+        entry = catalog_lookup(dir_abs_path, regex, mode="latest", parser=parse_compact_timestamp)
+
+    if entry is None :
+        return None, None
 
-    return None, None
+    return entry.name, date_to_str(entry.date)
     
 
 def _merge_all_overrides_schemas (
@@ -321,51 +277,3 @@ def compute_fx_metrics (
     )
 
     return df_added
-
-
-@st.cache_resource()
-def screeners_load_excel_to_dataframe (excel_file : str, sheet_name : str, specific_cols : list, schema_overrides : dict) -> pl.DataFrame :
-    """
-    Docstring for screeners_load_dataframe
-    """
-    if not os.path.isfile(excel_file) :
-        
-        print(f"\n[-] Fichier introuvable : {excel_file}\n")
-        st.cache_resource.clear()
-        return None
-
-    try :
-
-        start = time.time()
-        # sving the time of execution
-        
-        if sheet_name is None :
-            sheet_index = 0
-
-        
-        print("================================1")
-        print()
-        df = pl.read_excel(
-
-            source=excel_file,
-            #sheet_name=sheet_name,
-            columns=specific_cols,
-            schema_overrides=schema_overrides,
-
-        )
-        print("================================2")
-        print(df)
-        
-        csv_bytes = df.write_csv().encode("utf-8")
-        md5_hash = hashlib.md5(csv_bytes).hexdigest()
-
-        print(f"[+] [POLARS] Lecture en {time.time() - start:.2f} secondes de {excel_file}")
-        print(df)
-
-        return df, md5_hash
-    
-    except Exception as e :
-
-        print(f"\n[-] Error while converting the Excel file : {e}\n")
-        return None, None
-
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
 import os
+import json
+import threading
 import polars as pl
 import datetime as dt
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 from src.utils.logger import log
 from src.utils.data_io import load_excel_to_dataframe, export_dataframe_to_excel
-from src.utils.formatters import str_to_date
+from src.utils.formatters import str_to_date, dataframe_fingerprint
+from src.utils.fingerprint import file_fingerprint
+from src.utils.partition_store import upsert_date, scan_store
+from src.utils.cache import scoped_cache, invalidate_namespace
+from src.utils.governor import heavy
 
-from src.config.paths import SIMM_FUNDS_DIR_PATHS
+from src.config.paths import SIMM_FUNDS_DIR_PATHS, SIMM_STORE_DIR_ABS_PATH
 from src.config.parameters import (
     FUND_HV, SIMM_HIST_NAME_DEFAULT, SIMM_CUTOFF_DATE, SIMM_MAPPING_COUNTERPARTIES, SIMM_HISTORY_COLUMNS
 )
 
 
+# (store dir, fund) -> fingerprint of the legacy workbook last synced into the store by this process
+_SYNCED = {}
+_SYNC_LOCK = threading.Lock()
+
+# Per fund, next to its partition : workbook fingerprint and row digest of every date it last imported
+SYNC_STATE_SUFFIX = ".workbook.json"
+
+# Namespace of the cached SIMM reads, evicted whenever dates are written to the store
+SIMM_CACHE_NAMESPACE = "store:simm"
+
+
 def _empty_simm_history_dataframe (
 
         schema_overrides : Optional[Dict] = None
@@ -30,48 +47,221 @@ def _empty_simm_history_dataframe (
     return dataframe 
 
 
+def _sync_state_path (store_dir : str, fund : str) -> str :
+    return os.path.join(store_dir, f"{str(fund).replace(os.sep, '_')}{SYNC_STATE_SUFFIX}")
+
+
+def _read_sync_state (store_dir : str, fund : str) -> Dict :
+
+    try :
+
+        with open(_sync_state_path(store_dir, fund), "r", encoding="utf-8") as f :
+            return json.load(f)
+
+    except (OSError, ValueError) :
+        return {}
+
+
+def _write_sync_state (store_dir : str, fund : str, state : Dict) -> None :
+
+    file_abs_path = _sync_state_path(store_dir, fund)
+    tmp_abs_path = f"{file_abs_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    os.makedirs(store_dir, exist_ok=True)
+
+    with open(tmp_abs_path, "w", encoding="utf-8") as f :
+        json.dump(state, f)
+
+    os.replace(tmp_abs_path, file_abs_path)
+
+
+def _ensure_simm_store (
+
+        fund : Optional[str] = None,
+        paths_by_fund : Optional[Dict] = None,
+
+        schema_overrides : Optional[Dict] = None,
+        store_dir : Optional[str] = None,
+
+    ) -> int :
+    """
+    Sync the legacy history workbook into the store whenever it changed since the last sync.
+
+    Only the dates whose rows differ from the previous import are written, so the dates
+    added by update_simm_history and not present in the workbook are left alone.
+    A failed import is retried on the next call.
+
+    Returns:
+        imported (int) : Number of dates written.
+    """
+    fund = FUND_HV if fund is None else fund
+    paths_by_fund = SIMM_FUNDS_DIR_PATHS if paths_by_fund is None else paths_by_fund
+
+    schema_overrides = SIMM_HISTORY_COLUMNS if schema_overrides is None else schema_overrides
+    store_dir = SIMM_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    key = (os.path.abspath(store_dir), fund)
+    file_abs_path = get_simm_abs_path_by_fund(fund, paths_by_fund)
+
+    # A single stat when nothing changed
+    fingerprint = file_fingerprint(file_abs_path) if file_abs_path else None
+
+    if fingerprint is None or _SYNCED.get(key) == fingerprint :
+        return 0
+
+    with _SYNC_LOCK :
+
+        if _SYNCED.get(key) == fingerprint :
+            return 0
+
+        state = _read_sync_state(store_dir, fund)
+
+        if state.get("fingerprint") == fingerprint :
+
+            _SYNCED[key] = fingerprint
+            return 0
+
+        try :
+            dataframe, _ = load_excel_to_dataframe(file_abs_path, specific_cols=list(schema_overrides.keys()), schema_overrides=schema_overrides)
+
+        except Exception as e :
+
+            log(f"[-] [STORE] Failed to import SIMM history of {fund} : {e}", "error")
+            return 0
+
+        if dataframe is None :
+            return 0
+
+        digests = dict(state.get("dates") or {})
+        imported = 0
+        success = True
+
+        for (date,), rows in dataframe.filter(pl.col("Date").is_not_null()).partition_by("Date", as_dict=True).items() :
+
+            day = str(date)
+            digest = dataframe_fingerprint(rows)
+
+            if digests.get(day) == digest :
+                continue
+
+            if not upsert_date(store_dir, fund, date, rows) :
+
+                success = False
+                continue
+
+            digests[day] = digest
+            imported += 1
+
+        try :
+            _write_sync_state(store_dir, fund, {"fingerprint" : fingerprint if success else None, "dates" : digests})
+
+        except OSError as e :
+
+            log(f"[!] [STORE] Failed to record the SIMM workbook sync of {fund} : {e}", "warning")
+            success = False
+
+        # Marked only once every date landed, a partial import is completed on the next call
+        if success :
+            _SYNCED[key] = fingerprint
+
+    if imported :
+
+        invalidate_namespace(SIMM_CACHE_NAMESPACE)
+        log(f"[+] [STORE] {imported} dates of SIMM history synced for {fund} from {file_abs_path}", "info")
+
+    return imported
+
+
 def get_simm_all_history (
-        
+
         fund : Optional[str ] = None,
         paths_by_fund : Optional[Dict] = None,
-        
+
         schema_overrides : Optional[Dict] = None,
         columns : Optional[List[str]] = None,
 
-        cutoff_date : Optional[str | dt.datetime | dt.date] = None
-        
+        cutoff_date : Optional[str | dt.datetime | dt.date] = None,
+        store_dir : Optional[str] = None,
+
     ) :
     """
-    
+    Full SIMM history of a fund since the cutoff date, read from the store.
+    """
+    lazyframe, md5 = scan_simm_all_history(fund, paths_by_fund, schema_overrides, columns, cutoff_date, store_dir=store_dir)
+
+    if lazyframe is None :
+        return None, None
+
+    try :
+
+        with heavy("simm") :
+            dataframe = lazyframe.collect()
+
+    except Exception as e :
+
+        log(f"[-] [STORE] Failed to read SIMM history of {fund} : {e}", "error")
+        return None, None
+
+    return dataframe, md5
+
+
+def scan_simm_all_history (
+
+        fund : Optional[str ] = None,
+        paths_by_fund : Optional[Dict] = None,
+
+        schema_overrides : Optional[Dict] = None,
+        columns : Optional[List[str]] = None,
+
+        cutoff_date : Optional[str | dt.datetime | dt.date] = None,
+
+        start_date : Optional[str | dt.datetime | dt.date] = None,
+        end_date : Optional[str | dt.datetime | dt.date] = None,
+        store_dir : Optional[str] = None,
+
+    ) -> Tuple[Optional[pl.LazyFrame], Optional[str]] :
+    """
+    Lazy scan over the SIMM history store. Only the files of the dates between
+    max(cutoff_date, start_date) and end_date are opened.
     """
     fund = FUND_HV if fund is None else fund
     paths_by_fund = SIMM_FUNDS_DIR_PATHS if paths_by_fund is None else paths_by_fund
-    
+
     schema_overrides = SIMM_HISTORY_COLUMNS if schema_overrides is None else schema_overrides
     columns = list(schema_overrides.keys()) if columns is None else columns
 
-    file_abs_path = get_simm_abs_path_by_fund(fund)
+    store_dir = SIMM_STORE_DIR_ABS_PATH if store_dir is None else store_dir
 
-    if file_abs_path is None :
-        return _empty_simm_history_dataframe(schema_overrides), None
+    cutoff_date = str_to_date(SIMM_CUTOFF_DATE if cutoff_date is None else cutoff_date)
+    start_date = cutoff_date if start_date is None else max(cutoff_date, str_to_date(start_date))
+    end_date = None if end_date is None else str_to_date(end_date)
 
-    try :
-        dataframe, md5 = load_excel_to_dataframe(file_abs_path, specific_cols=columns, schema_overrides=schema_overrides) 
+    _ensure_simm_store(fund, paths_by_fund, schema_overrides, store_dir)
 
-    except Exception as e :
-        return None, None
-    
-    cutoff_date = str_to_date(SIMM_CUTOFF_DATE if cutoff_date is None else cutoff_date)
+    lazyframe, md5 = scan_store(store_dir, fund, start_date, end_date)
 
-    dataframe = dataframe.filter(pl.col("Date") >= (cutoff_date))
-    
-    return dataframe, md5
+    if lazyframe is None :
+        return _empty_simm_history_dataframe(schema_overrides).select(columns).lazy(), None
+
+    lazyframe = (
+
+        lazyframe
+        .select([pl.col(c) for c in columns])
+        .cast({c : t for c, t in schema_overrides.items() if c in columns}, strict=False)
+        .filter(pl.col("Date") >= start_date)
+
+    )
+
+    if end_date is not None :
+        lazyframe = lazyframe.filter(pl.col("Date") <= end_date)
+
+    return lazyframe, md5
 
 
 def get_simm_by_date_from_history (
-        
+
         date : Optional[str | dt.datetime | dt.date] = None,
-        
+
         dataframe : Optional[pl.DataFrame] = None,
         md5 : Optional[str] = None,
 
@@ -80,8 +270,9 @@ def get_simm_by_date_from_history (
 
         schema_overrides : Optional[Dict] = None,
         columns : Optional[List] = None,
-        
-        cutoff_date : Optional[str] = None
+
+        cutoff_date : Optional[str] = None,
+        store_dir : Optional[str] = None,
 
     ) :
     """
@@ -95,19 +286,52 @@ def get_simm_by_date_from_history (
 
     cutoff_date = str_to_date(SIMM_CUTOFF_DATE if cutoff_date is None else cutoff_date)
 
-    dataframe, md5 = get_simm_all_history(fund, paths_by_fund, schema_overrides, columns, cutoff_date) if dataframe is None else (dataframe, md5)
+    date = str_to_date(date)
 
-    if dataframe is None or dataframe.is_empty() :
+    if dataframe is None :
+
+        # Only the file of the date is opened, md5 follows that file
+        frame, md5 = scan_simm_all_history(fund, paths_by_fund, schema_overrides, columns, cutoff_date, date, date, store_dir)
+
+        if frame is None :
+            return None, None
+
+    elif dataframe.is_empty() :
         return None, None
-    
-    date = str_to_date(date)
-    dataframe = dataframe.filter(pl.col("Date") == date)
 
-    return dataframe, md5
+    else :
+        frame = dataframe
+
+    # Nothing stored for the date yet (or a frame without fingerprint) : not cached, the date may land later
+    if md5 is None :
+        return _simm_rows_by_date(date, frame, None, columns)
+
+    return _cached_simm_rows_by_date(date, frame, md5, columns)
+
+
+def _simm_rows_by_date (
+
+        date : dt.date,
+        _frame : pl.DataFrame | pl.LazyFrame,
+        md5 : Optional[str],
+        columns : List[str],
+
+    ) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
+
+    if isinstance(_frame, pl.LazyFrame) :
+
+        with heavy("simm") :
+            return _frame.collect(), md5
+
+    return _frame.filter(pl.col("Date") == date), md5
+
+
+# Keyed by the fingerprint of the store files read, tagged with them : a partition landing for the date changes the key
+_cached_simm_rows_by_date = scoped_cache(_simm_rows_by_date, namespace=SIMM_CACHE_NAMESPACE, persist=True)
 
 
 def update_simm_history(
-        
+
         new_rows : Optional[pl.DataFrame] = None,
 
         dataframe : Optional[pl.DataFrame] = None,
@@ -121,10 +345,11 @@ def update_simm_history(
 
         cutoff_date : Optional[str | dt.datetime | dt.date] = None,
         sort_result : bool = True,
+        store_dir : Optional[str] = None,
 
     ) -> bool :
     """
-    Update full SIMM history by inserting new rows for a given date.
+    Upsert the SIMM rows of one or several dates into the history store.
 
     Assumption
     ----------
@@ -133,11 +358,12 @@ def update_simm_history(
 
     Behavior
     --------
-    - load full history
-    - optionally overwrite `Date` in `new_rows`
-    - optionally remove existing rows for that date
-    - append new rows
-    - optionally deduplicate / sort
+    - the rows of each date in `new_rows` replace what was stored for that date
+    - nothing else is read or rewritten, replaying an update is a no-op
+    - `dataframe`, `md5`, `cutoff_date` and `sort_result` are kept for existing
+      callers and no longer used, the store is always sorted on read
+
+    The history workbook is no longer written here, see export_simm_history.
     """
     fund = FUND_HV if fund is None else fund
     paths_by_fund = SIMM_FUNDS_DIR_PATHS if paths_by_fund is None else paths_by_fund
@@ -145,36 +371,69 @@ def update_simm_history(
     schema_overrides = SIMM_HISTORY_COLUMNS if schema_overrides is None else schema_overrides
     columns = list(schema_overrides.keys()) if columns is None else columns
 
+    store_dir = SIMM_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
     if new_rows is None or new_rows.is_empty() :
 
         log("[!] New rows are None or empty... Nothing updated", "warning")
         return False
-    
+
     # Normalization
-    new_rows = (new_rows.select(columns).cast(schema_overrides, strict=False))
+    new_rows = (new_rows.select(columns).cast(schema_overrides, strict=False).filter(pl.col("Date").is_not_null()))
 
-    cutoff_date = str_to_date(SIMM_CUTOFF_DATE if cutoff_date is None else cutoff_date)
-    dataframe, md5 = get_simm_all_history(fund, paths_by_fund, schema_overrides, columns, cutoff_date) if dataframe is None else (dataframe, md5)
-    
-    file_abs_path = get_simm_abs_path_by_fund(fund, paths_by_fund)
+    if new_rows.is_empty() :
 
-    if dataframe is None or dataframe.is_empty() :
+        log("[!] New rows have no valid Date... Nothing updated", "warning")
+        return False
 
-        status = export_dataframe_to_excel(new_rows, output_abs_path=file_abs_path)
-        log(f"{status.get("message")}")
+    # The legacy workbook must land in the store before these dates are written over it
+    _ensure_simm_store(fund, paths_by_fund, schema_overrides, store_dir)
 
-        return status.get("success")
-    
-    # Here dataframe already exists and new_rows is in good foramt.
-    dataframe = pl.concat([dataframe, new_rows], how="diagonal_relaxed")
+    success = True
 
-    if sort_result :
-        dataframe = dataframe.sort("Date")
+    for (date,), rows in new_rows.partition_by("Date", as_dict=True).items() :
+        success = upsert_date(store_dir, fund, date, rows) and success
 
-    result = export_dataframe_to_excel(dataframe, output_abs_path=file_abs_path)
-    log(result.get("message"))
-        
-    return result.get("success", False)
+    invalidate_namespace(SIMM_CACHE_NAMESPACE)
+
+    return success
+
+
+def export_simm_history (
+
+        fund : Optional[str] = None,
+        paths_by_fund : Optional[Dict] = None,
+
+        output_abs_path : Optional[str] = None,
+        schema_overrides : Optional[Dict] = None,
+
+        cutoff_date : Optional[str | dt.datetime | dt.date] = None,
+        store_dir : Optional[str] = None,
+
+    ) -> Dict :
+    """
+    Write the SIMM history of a fund to Excel, on demand (the store stays the reference).
+
+    Args:
+        output_abs_path (str) : Target workbook, the legacy history file of the fund by default.
+
+    Returns:
+        response (dict) : Same as export_dataframe_to_excel.
+    """
+    fund = FUND_HV if fund is None else fund
+    paths_by_fund = SIMM_FUNDS_DIR_PATHS if paths_by_fund is None else paths_by_fund
+
+    output_abs_path = get_simm_abs_path_by_fund(fund, paths_by_fund) if output_abs_path is None else output_abs_path
+
+    dataframe, _ = get_simm_all_history(fund, paths_by_fund, schema_overrides, None, cutoff_date, store_dir)
+
+    if dataframe is None :
+        return {"success" : False, "message" : f"No SIMM history for {fund}", "path" : None}
+
+    response = export_dataframe_to_excel(dataframe.sort("Date"), output_abs_path=output_abs_path)
+    log(response.get("message"))
+
+    return response
 
 
 def get_simm_abs_path_by_fund (
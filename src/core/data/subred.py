@@ -17,7 +17,9 @@ from src.config.parameters import (
 )
 from src.config.paths import SUBRED_AUM_CACHE_ABS_PATH
 
+from src.utils.logger import log
 from src.utils.data_io import export_dataframe_to_excel, load_excel_to_dataframe
+from src.utils.excel_probe import validate_excel_columns
 
 def read_aum_from_cache (
         
@@ -84,15 +86,20 @@ def read_detailed_aum_from_cache (
     
     full_path = os.path.join(dir_abs_path, filename)
 
+    # Only the columns of the schema that the file actually has are parsed
+    ok, specific_cols, _ = validate_excel_columns(full_path, specific_cols)
+
+    if not ok :
+        return None, None
+
     try :
-        datafame , md5 = load_excel_to_dataframe(full_path, schema_overrides=schema_overrides)
+        datafame , md5 = load_excel_to_dataframe(full_path, specific_cols=specific_cols, schema_overrides=schema_overrides)
 
-    except :
+    except Exception as e :
 
-        print("[-] Error during reading")
+        log(f"[-] Error during detailed AUM reading : {e}", "error")
         return None, None
 
-    print(datafame)
     return datafame, md5
 
 
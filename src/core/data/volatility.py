@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import re
+import threading
 import polars as pl
 import datetime as dt
 import numpy as np
@@ -12,6 +13,13 @@ from src.core.data.nav import read_nav_estimate_by_fund
 
 from src.config.parameters import VOL_REALIZED_FUNDS_COLS, FUND_HV
 from src.utils.formatters import str_to_date
+from src.utils.rolling_vol import VOL_WINDOWS, EWMA_LAMBDA, RollingVolState, rolling_realized_vol
+from src.utils.logger import log
+
+
+# (fund, column, windows, lambda) -> (state, vols, source md5, identity of the source rows before the state's last day)
+_VOL_STATES : Dict[Tuple, Tuple[RollingVolState, pl.DataFrame, Optional[str], Tuple]] = {}
+_VOL_STATES_LOCK = threading.Lock()
 
 
 def read_realized_vol_by_dates (
@@ -148,6 +156,93 @@ def compute_annualized_realized_vol (
     return round(float(annualized_vol), 2)
 
 
+def compute_rolling_realized_vol (
+
+        dataframe : Optional[pl.DataFrame] = None,
+        md5 : Optional[str] = None,
+
+        fund : Optional[str] = None,
+
+        windows : Tuple[int, ...] = VOL_WINDOWS,
+        ewma_lambda : Optional[float] = EWMA_LAMBDA,
+
+        funds_cols : Optional[Dict] = None,
+
+    ) :
+    """
+    Realized vol time series of the fund (Date, value, return, vol_<window>d..., vol_ewma, in %) over
+    its whole estimate history.
+
+    The rolling state is kept per fund : an unchanged source (same md5) is served as is. When the
+    history only gained days (or its last day was revised) and the rows before the state's last day
+    are unchanged (row hash check, no sort nor daily rebuild), only the rows from that day on are
+    turned into daily values, and each new day updates every window in O(1).
+    """
+    fund = FUND_HV if fund is None else fund
+    funds_cols = VOL_REALIZED_FUNDS_COLS if funds_cols is None else funds_cols
+
+    column = funds_cols.get(fund)
+    dataframe, md5 = read_nav_estimate_by_fund(fund) if dataframe is None else (dataframe, md5)
+
+    if dataframe is None :
+        return None, None
+
+    raw = dataframe.select(["date", column])
+    key = (fund, column, tuple(windows), ewma_lambda)
+
+    with _VOL_STATES_LOCK :
+
+        cached = _VOL_STATES.get(key)
+
+        if cached is not None and md5 is not None and cached[2] == md5 :
+            return cached[1], md5
+
+        if cached is not None :
+
+            state, vols, _, prefix = cached
+            since = pl.col("date").dt.date() >= pl.lit(state.last_date)
+
+            if _rows_identity(raw.filter(~since)) == prefix :
+
+                tail = raw.filter(since)
+                new_days = compute_realized_vol_by_dates(tail, md5, fund, funds_cols=funds_cols)
+
+                # The state's last day must still be there (maybe revised) : its row is the one replaced
+                if new_days.height and new_days["Date"][0] == state.last_date :
+
+                    rows = [state.update(date, value) for date, value in new_days.iter_rows()]
+                    vols = pl.concat([vols.head(vols.height - 1), pl.DataFrame(rows, schema=vols.schema, orient="row")])
+
+                    log(f"[*] [VOL] {fund} realized vol updated incrementally with {len(rows)} days")
+
+                    prefix = _rows_identity(tail.filter(pl.col("date").dt.date() < pl.lit(state.last_date)), prefix)
+                    _VOL_STATES[key] = (state, vols, md5, prefix)
+
+                    return vols, md5
+
+        daily = compute_realized_vol_by_dates(raw, md5, fund, funds_cols=funds_cols)
+        vols = rolling_realized_vol(daily, column, "Date", windows=windows, ewma_lambda=ewma_lambda)
+
+        if vols.height :
+
+            state = RollingVolState.from_history(daily, column, "Date", windows=windows, ewma_lambda=ewma_lambda)
+            prefix = _rows_identity(raw.filter(pl.col("date").dt.date() < pl.lit(state.last_date)))
+
+            _VOL_STATES[key] = (state, vols, md5, prefix)
+
+    return vols, md5
+
+
+def _rows_identity (rows : pl.DataFrame, base : Tuple[int, int] = (0, 0)) -> Tuple[int, int] :
+    """
+    Order-free content identity of source rows : their count and the wrapping sum of their row hashes.
+    Additive, so the identity of a longer prefix extends the previous one with the rows added.
+    """
+    total = rows.hash_rows(seed=0).sum() if rows.height else 0
+
+    return (base[0] + rows.height, (base[1] + total) % 2 ** 64)
+
+
 def calculate_rv_estimated_perf (
         
         dataframe : Optional[pl.DataFrame] = None,
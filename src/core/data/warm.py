@@ -0,0 +1,214 @@
+"""
+Offline cache warming, run before the morning open (outside Streamlit).
+
+Drives the core readers over a date range and a list of funds, so that the Excel
+sidecars, the SIMM store and the persisted result cache are hot when the app starts.
+
+    python -m src.core.data.warm                                # today, every fund
+    python -m src.core.data.warm --start 2025-01-27 --end 2025-01-31 --funds HV WR
+
+Exits with 1 if any step failed (exception or nothing loaded), cron-friendly.
+"""
+from __future__ import annotations
+
+# Before anything imports polars
+from src.config.env import configure_polars_threads
+configure_polars_threads()
+
+import sys
+import time
+import argparse
+import datetime as dt
+
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from src.config.parameters import FUND_HV, FUND_WR, FUND_MAP
+from src.utils.logger import log
+from src.utils.formatters import str_to_date, date_to_str
+from src.utils.dates import previous_business_day
+from src.utils.governor import background_priority, governor_stats
+
+from src.core.data.nav import compute_monthly_returns
+from src.core.data.greeks import read_history_greeks
+from src.core.data.simm import get_simm_all_history
+from src.core.data.leverages import read_history_leverages
+from src.core.data.cash import load_all_cash
+
+
+class WarmStep (NamedTuple) :
+    """
+    One reader to run, once per fund (per_date False) or once per fund and business day.
+    """
+    name : str
+    run : Callable[[str, dt.date], object]
+    per_date : bool
+
+
+class WarmResult (NamedTuple) :
+    step : str
+    fund : str
+    date : Optional[dt.date]
+    seconds : float
+    ok : bool
+    error : Optional[str]
+
+
+WARM_STEPS : List[WarmStep] = [
+
+    WarmStep("nav.compute_monthly_returns", lambda fund, date : compute_monthly_returns(None, None, fund), False),
+    WarmStep("simm.get_simm_all_history", lambda fund, date : get_simm_all_history(fund), False),
+    WarmStep("cash.load_all_cash", lambda fund, date : load_all_cash(fund), False),
+    WarmStep("greeks.read_history_greeks", lambda fund, date : read_history_greeks(date, fund), True),
+    WarmStep("leverages.read_history_leverages", lambda fund, date : read_history_leverages(date, fund), True),
+
+]
+
+
+def business_days (start : dt.date, end : dt.date) -> List[dt.date] :
+    """
+    Weekdays between start and end, both included (public holidays are not handled).
+    """
+    days = []
+    date = start
+
+    while date <= end :
+
+        if date.weekday() < 5 :
+            days.append(date)
+
+        date += dt.timedelta(days=1)
+
+    return days
+
+
+def _loaded (result : object) -> bool :
+    """
+    Readers return None, or a tuple starting with None, when nothing could be loaded.
+    """
+    if isinstance(result, tuple) :
+        return bool(result) and result[0] is not None
+
+    return result is not None
+
+
+def _label (step : str, fund : str, date : Optional[dt.date]) -> str :
+    return f"{step} {fund}" + (f" {date_to_str(date)}" if date is not None else "")
+
+
+def run_step (step : WarmStep, fund : str, date : Optional[dt.date]) -> WarmResult :
+
+    start = time.time()
+
+    try :
+
+        ok = _loaded(step.run(fund, date))
+        error = None if ok else "Nothing loaded"
+
+    except Exception as e :
+        ok, error = False, f"{type(e).__name__} : {e}"
+
+    result = WarmResult(step.name, fund, date, time.time() - start, ok, error)
+
+    if ok :
+        log(f"[+] [WARM] {_label(step.name, fund, date)} in {result.seconds:.2f} seconds", "info")
+
+    else :
+        log(f"[-] [WARM] {_label(step.name, fund, date)} failed after {result.seconds:.2f} seconds : {error}", "error")
+
+    return result
+
+
+def warm_caches (
+
+        start_date : Optional[str | dt.datetime | dt.date] = None,
+        end_date : Optional[str | dt.datetime | dt.date] = None,
+        funds : Optional[List[str]] = None,
+        steps : Optional[List[WarmStep]] = None,
+
+    ) -> List[WarmResult] :
+    """
+    Run every step for every fund (and business day of the range for dated steps).
+    """
+    end_date = previous_business_day(end_date)
+    start_date = end_date if start_date is None else str_to_date(start_date)
+
+    funds = [FUND_HV, FUND_WR] if funds is None else funds
+    steps = WARM_STEPS if steps is None else steps
+
+    dates = business_days(start_date, end_date)
+    results = []
+
+    # Sessions opened while warming keep the priority on the parse slots
+    with background_priority() :
+
+        for fund in funds :
+
+            for step in steps :
+
+                for date in (dates if step.per_date else [end_date]) :
+                    results.append(run_step(step, fund, date if step.per_date else None))
+
+    return results
+
+
+def format_report (results : List[WarmResult]) -> str :
+    """
+    Per step timings (total, slowest) and failures.
+    """
+    by_step : Dict[str, List[WarmResult]] = {}
+
+    for result in results :
+        by_step.setdefault(result.step, []).append(result)
+
+    lines = [f"{'step':<36} {'runs':>5} {'failed':>6} {'total s':>9} {'max s':>8}"]
+
+    for step, step_results in by_step.items() :
+
+        failed = sum(not r.ok for r in step_results)
+        total = sum(r.seconds for r in step_results)
+        slowest = max(r.seconds for r in step_results)
+
+        lines.append(f"{step:<36} {len(step_results):>5} {failed:>6} {total:>9.2f} {slowest:>8.2f}")
+
+    for result in results :
+
+        if not result.ok :
+            lines.append(f"[-] {_label(result.step, result.fund, result.date)} : {result.error}")
+
+    return "\n".join(lines)
+
+
+def main (argv : Optional[List[str]] = None) -> int :
+
+    parser = argparse.ArgumentParser(description="Warm the Sentinelle caches before the morning open.")
+
+    parser.add_argument("--start", help="First date (YYYY-MM-DD), the end date by default")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD), today by default (previous business day on weekends)")
+    parser.add_argument("--funds", nargs="+", help="Funds, by name or alias (HV, WR). Every fund by default")
+    parser.add_argument("--steps", nargs="+", help="Subset of steps to run, ex: greeks.read_history_greeks")
+
+    args = parser.parse_args(argv)
+
+    funds = [FUND_MAP.get(fund, fund) for fund in args.funds] if args.funds else None
+    steps = [step for step in WARM_STEPS if step.name in args.steps] if args.steps else None
+
+    unknown = sorted(set(args.steps or ()) - {step.name for step in WARM_STEPS})
+
+    if unknown :
+
+        parser.error(f"Unknown steps {unknown}, choose among : {[step.name for step in WARM_STEPS]}")
+
+    start = time.time()
+    results = warm_caches(args.start, args.end, funds, steps)
+
+    stats = governor_stats()
+
+    print(format_report(results))
+    print(f"Warmed in {time.time() - start:.2f} seconds ({stats['executed']} heavy operations, {stats['wait_seconds']:.2f} seconds queued)")
+
+    return 0 if results and all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__" :
+
+    sys.exit(main())
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import re
+import functools
+import threading
+
+from typing import Dict, List, Optional, Tuple
+
+from src.config.parameters import (
+
+    WATCHER_ENABLED,
+
+    GREEKS_ALL_FILENAME, GREEKS_COLUMNS, GREEKS_REGEX, GREEKS_OVERVIEW_COLUMNS, GREEKS_RISKS_EQUITY_COLUMNS,
+    GREEKS_GAMMA_PNL_REGEX, GREEKS_GAMMA_PNL_COLUMNS, GREEKS_DELTA_PNL_STRESS_REGEX, GREEKS_DELTA_PNL_STRESS_COLUMNS,
+    GREEKS_DELTA_STRESS_NAV_REGEX, GREEKS_DELTA_STRESS_NAV_COLUMNS, GREEKS_DELTA_STRESS_ABS_REGEX, GREEKS_DELTA_STRESS_ABS_COLUMNS,
+    GREEKS_LONG_SHORT_DELTA_REGEX, GREEKS_LONG_SHORT_DELTA_COLUMNS, GREEKS_VEGA_STRESS_PNL_REGEX, GREEKS_VEGA_STRESS_PNL_COLUMNS,
+    GREEKS_VEGA_BUCKET_REGEX, GREEKS_VEGA_BUCKET_COLUMNS, GREEKS_RISK_CREDIT_REGEX, GREEKS_RISK_CREDIT_COLUMNS,
+
+    LEVERAGES_ALL_FILENAME, LEVERAGES_COLUMNS, LEVERAGES_UNDERL_REGEX, LEVERAGES_UNDERL_COLUMNS,
+    LEVERAGES_TRADE_REGEX, LEVERAGES_TRADE_COLUMNS,
+
+    NAV_HIST_NAME_DEFAULT, NAV_HISTORY_COLUMNS, NAV_PORTFOLIO_REGEX, NAV_PORTFOLIO_COLUMNS,
+    NAV_ESTIMATE_HIST_NAME_DEFAULT, NAV_ESTIMATE_COLUMNS,
+
+    TRADE_RECAP_RAW_FILE_REGEX, TRADE_RECAP_MIN_COLUMNS,
+
+)
+from src.config.paths import (
+
+    GREEKS_FUNDS_DIR_PATHS, GREEKS_RISK_EQUITY, GREEKS_GAMMA_PNL_FUNDS_DIR_PATHS, GREEKS_DELTA_PNL_STRESS_FUNDS_DIR_PATHS,
+    GREEKS_DELTA_STRESS_NAV_FUNDS_DIR_PATHS, GREEKS_DELTA_STRESS_ABS_FUNDS_DIR_PATHS, GREEKS_LONG_SHORT_DELTA_FUNDS_DIR_PATHS,
+    GREEKS_VEGA_STRESS_PNL_FUNDS_DIR_PATHS, GREEKS_VEGA_BUCKET_FUNDS_DIR_PATHS, GREEKS_RISK_CREDIT_FUNDS_DIR_PATHS,
+
+    LEVERAGES_FUNDS_DIR_PATHS, LEVERAGES_UNDERL_FUNDS_DIR_PATHS, LEVERAGES_TRADE_FUNDS_DIR_PATHS,
+
+    NAV_PORTFOLIO_FUNDS_DIR_PATHS, NAV_ESTIMATE_FUNDS_DIR_PATHS,
+
+    TREADE_RECAP_DATA_RAW_DIR_ABS_PATH,
+
+)
+from src.utils.logger import log
+from src.utils.data_io import load_excel_to_dataframe
+from src.utils.excel_probe import validate_excel_columns
+from src.utils.load_plan import LoadPlan, planned_load
+from src.utils.cache import invalidate_source
+from src.utils.watcher import watch_directory, start_watcher, add_change_listener
+
+
+# Load options of the readers : the pre-load must ask for the exact same parse (columns, compact
+# hint), otherwise it warms a sidecar nobody reads
+_GREEKS_REPORT = {"validate" : True, "compact" : "greeks"}      # read_greeks_by_date
+_GREEKS_HISTORY = {"planned" : True, "compact" : "greeks"}      # read_history_greeks
+_PLAIN = {}
+
+# (directories by fund, filename regex, schema overrides, reader load options)
+WATCHED_REPORTS : List[Tuple[Dict, re.Pattern, Dict, Dict]] = [
+
+    (GREEKS_FUNDS_DIR_PATHS, GREEKS_REGEX, GREEKS_OVERVIEW_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_RISK_EQUITY, GREEKS_REGEX, GREEKS_RISKS_EQUITY_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_GAMMA_PNL_FUNDS_DIR_PATHS, GREEKS_GAMMA_PNL_REGEX, GREEKS_GAMMA_PNL_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_DELTA_PNL_STRESS_FUNDS_DIR_PATHS, GREEKS_DELTA_PNL_STRESS_REGEX, GREEKS_DELTA_PNL_STRESS_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_DELTA_STRESS_NAV_FUNDS_DIR_PATHS, GREEKS_DELTA_STRESS_NAV_REGEX, GREEKS_DELTA_STRESS_NAV_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_DELTA_STRESS_ABS_FUNDS_DIR_PATHS, GREEKS_DELTA_STRESS_ABS_REGEX, GREEKS_DELTA_STRESS_ABS_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_LONG_SHORT_DELTA_FUNDS_DIR_PATHS, GREEKS_LONG_SHORT_DELTA_REGEX, GREEKS_LONG_SHORT_DELTA_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_VEGA_STRESS_PNL_FUNDS_DIR_PATHS, GREEKS_VEGA_STRESS_PNL_REGEX, GREEKS_VEGA_STRESS_PNL_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_VEGA_BUCKET_FUNDS_DIR_PATHS, GREEKS_VEGA_BUCKET_REGEX, GREEKS_VEGA_BUCKET_COLUMNS, _GREEKS_REPORT),
+    (GREEKS_RISK_CREDIT_FUNDS_DIR_PATHS, GREEKS_RISK_CREDIT_REGEX, GREEKS_RISK_CREDIT_COLUMNS, _GREEKS_REPORT),
+
+    (LEVERAGES_UNDERL_FUNDS_DIR_PATHS, LEVERAGES_UNDERL_REGEX, LEVERAGES_UNDERL_COLUMNS, _PLAIN),
+    (LEVERAGES_TRADE_FUNDS_DIR_PATHS, LEVERAGES_TRADE_REGEX, LEVERAGES_TRADE_COLUMNS, _PLAIN),
+
+    (NAV_PORTFOLIO_FUNDS_DIR_PATHS, NAV_PORTFOLIO_REGEX, NAV_PORTFOLIO_COLUMNS, _PLAIN),
+
+]
+
+# (directories by fund, history filename, schema overrides, reader load options)
+# The SIMM workbook is only an export of the SIMM store, nothing to pre-load
+WATCHED_HISTORIES : List[Tuple[Dict, Optional[str], Dict, Dict]] = [
+
+    (GREEKS_FUNDS_DIR_PATHS, GREEKS_ALL_FILENAME, GREEKS_COLUMNS, _GREEKS_HISTORY),
+    (LEVERAGES_FUNDS_DIR_PATHS, LEVERAGES_ALL_FILENAME, LEVERAGES_COLUMNS, _PLAIN),
+    (NAV_PORTFOLIO_FUNDS_DIR_PATHS, NAV_HIST_NAME_DEFAULT, NAV_HISTORY_COLUMNS, _PLAIN),
+    (NAV_ESTIMATE_FUNDS_DIR_PATHS, NAV_ESTIMATE_HIST_NAME_DEFAULT, NAV_ESTIMATE_COLUMNS, _PLAIN),
+
+]
+
+
+_START_LOCK = threading.Lock()
+_STARTED = {"backend" : None}
+
+
+def _preload_excel (
+        
+        file_abs_path : str,
+        schema_overrides : Optional[Dict] = None,
+
+        with_columns : bool = True,
+        validate : bool = False,
+        planned : bool = False,
+        compact : Optional[str] = None,
+
+    ) -> None :
+    """
+    Parse a freshly arrived file once, the way its reader does, to warm the sidecar.
+
+    planned : the reader goes through planned_load, whose column set is sorted and validated.
+    validate : the reader drops the columns missing from the header before loading.
+    """
+    specific_cols = list(schema_overrides.keys()) if with_columns and schema_overrides is not None else None
+
+    if planned :
+
+        planned_load(file_abs_path, "Sheet1", schema_overrides, specific_cols, plan=LoadPlan(), compact=compact)
+        return
+
+    if validate :
+
+        ok, specific_cols, _ = validate_excel_columns(file_abs_path, specific_cols)
+
+        if not ok :
+            return
+
+    load_excel_to_dataframe(file_abs_path, specific_cols=specific_cols, schema_overrides=schema_overrides, compact=compact)
+
+
+def _evict_changed (dir_abs_path : str, file_abs_path : str) -> None :
+    """
+    Evict the cached results computed from the directory of a file that changed on disk :
+    readers pick their file from the listing, a new report replaces the one they resolved.
+    """
+    invalidate_source(dir_abs_path)
+
+
+def register_report_watches () -> int :
+    """
+    Register every configured report directory on the watcher.
+
+    Returns:
+        registered (int) : Number of (directory, pattern) registrations.
+    """
+    registered = 0
+
+    for paths_by_fund, regex, schema_overrides, options in WATCHED_REPORTS :
+
+        preload = functools.partial(_preload_excel, schema_overrides=schema_overrides, **options)
+
+        for dir_abs_path in paths_by_fund.values() :
+            registered += watch_directory(dir_abs_path, regex, preload)
+
+    for paths_by_fund, filename, schema_overrides, options in WATCHED_HISTORIES :
+
+        if not filename :
+            continue
+
+        regex = re.compile(re.escape(filename) + "$", re.IGNORECASE)
+        preload = functools.partial(_preload_excel, schema_overrides=schema_overrides, **options)
+
+        for dir_abs_path in paths_by_fund.values() :
+            registered += watch_directory(dir_abs_path, regex, preload)
+
+    # Trade recaps are read with the light schema only, no column projection
+    preload = functools.partial(_preload_excel, schema_overrides=TRADE_RECAP_MIN_COLUMNS, with_columns=False, compact="trade_recap")
+    registered += watch_directory(TREADE_RECAP_DATA_RAW_DIR_ABS_PATH, TRADE_RECAP_RAW_FILE_REGEX, preload)
+
+    return registered
+
+
+def start_report_watcher () -> Optional[str] :
+    """
+    Register the report directories and start the background watcher, once per process.
+    """
+    if not WATCHER_ENABLED :
+        return None
+
+    with _START_LOCK :
+
+        if _STARTED["backend"] is not None :
+            return _STARTED["backend"]
+
+        registered = register_report_watches()
+        add_change_listener(_evict_changed)
+
+        if registered == 0 :
+
+            log("[!] [WATCHER] No report directory available, watcher not started", "warning")
+            return None
+
+        _STARTED["backend"] = start_watcher()
+
+    return _STARTED["backend"]
@@ -12,6 +12,9 @@ from src.ui.pages.Reconciliation.render import render_reconciliation
 from src.ui.pages.Settlements.render import render_settlements
 from src.ui.pages.Recaps.render import render_recaps
 
+from src.core.data.watch import start_report_watcher
+from src.utils.result_store import load_manifest
+
 PAGES = [
 
     ("Risks",                   "exclamation-triangle-fill",    render_risks),
@@ -29,6 +32,12 @@ def app () :
 
     st.set_page_config(page_title="Heroics Sentinelle", layout="wide")
 
+    # Background watcher on the report directories (once per process)
+    start_report_watcher()
+
+    # Persisted results checked against their sources (once per process), frames reloaded on demand
+    load_manifest()
+
     logo = Path(__file__).parent / "assets" / "logos" / "heroics_sentinelle_logo.png"
     st.image(str(logo), width=300)
     
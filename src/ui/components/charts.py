@@ -11,12 +11,13 @@ import plotly.graph_objects as go
 from typing import Any, Optional, List, Tuple, Dict
 
 from src.utils.logger import log
+from src.utils.figure_cache import figure_cache
 from src.utils.formatters import str_to_datetime, str_to_date, filter_token_col_from_df
 
 
 # ---------- Expiries ---------- 
 
-@st.cache_data()
+@figure_cache()
 def expiries_plot (
     
         _dataframe : pl.DataFrame,
@@ -32,8 +33,6 @@ def expiries_plot (
     
     """
     if _dataframe is None or _dataframe.is_empty() :
-        
-        st.cache_data.clear()
         return None
     
     # Validate
@@ -87,7 +86,7 @@ def expiries_plot (
 
 # ---------- Performances ----------
 
-@st.cache_data()
+@figure_cache()
 def nav_estimate_performance_graph (
         
         _dataframe : pl.DataFrame,
@@ -110,7 +109,6 @@ def nav_estimate_performance_graph (
     if _dataframe is None :
         
         log("No dataframe entered. Returning a None chart...", "error")
-        st.cache_data.clear()
 
         return None
 
@@ -181,7 +179,7 @@ def nav_estimate_performance_graph (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def index_performance_graph (
         
         _dataframe : pl.DataFrame,
@@ -204,7 +202,6 @@ def index_performance_graph (
     if _dataframe is None :
         
         log("No dataframe entered. Returning a None chart...", "error")
-        st.cache_data.clear()
 
         return None
 
@@ -270,7 +267,7 @@ def index_performance_graph (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def mv_change_peformance_chart (
 
         _dataframe : Optional[pl.DataFrame] = None,
@@ -286,8 +283,6 @@ def mv_change_peformance_chart (
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     df_sorted = _dataframe.sort(y_column, descending=True)
@@ -336,7 +331,7 @@ def mv_change_peformance_chart (
 
 # ---------- Cash ----------
 
-@st.cache_data()
+@figure_cache()
 def cash_chart (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -350,7 +345,6 @@ def cash_chart (
     if _dataframe is None :
         
         log("[-] Error loading the dataframe to plot", "error")
-        st.cache_data.clear()
 
         return None
     
@@ -405,7 +399,7 @@ def cash_chart (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def history_criteria_graph (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -431,8 +425,6 @@ def history_criteria_graph (
     :type currency: str
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     df_eur = _dataframe.filter(pl.col("Currency") == currency)
@@ -483,7 +475,7 @@ def history_criteria_graph (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def simm_vs_ice_graph (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -497,8 +489,6 @@ def simm_vs_ice_graph (
     Affiche deux lignes : {metric}_ice vs {metric}_simm pour une bank donnée.
     """
     if _dataframe is None or _dataframe.is_empty() :
-        
-        st.cache_data.clear()
         return go.Figure()
 
     fig = go.Figure()
@@ -537,7 +527,7 @@ def simm_vs_ice_graph (
 
 # ---------- SIMM ----------
 
-@st.cache_data()
+@figure_cache()
 def simm_ctpy_im_vm_chart (
         
 
@@ -556,7 +546,6 @@ def simm_ctpy_im_vm_chart (
     if _dataframe is None :
         
         log("[-] Error loading the dataframe to SIMM chart", "error")
-        st.cache_data.clear()
 
         return None
     
@@ -581,7 +570,7 @@ def simm_ctpy_im_vm_chart (
 
 
 
-@st.cache_data()
+@figure_cache()
 def simm_over_time_chart (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -600,7 +589,6 @@ def simm_over_time_chart (
     if _dataframe is None :
         
         log(f"[-] Error loading the dataframe to {column} chart", "error")
-        st.cache_data.clear()
 
         return None
     
@@ -642,7 +630,7 @@ def simm_over_time_chart (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def total_nav_over_time_chart (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -658,8 +646,6 @@ def total_nav_over_time_chart (
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     date = str_to_date(date) if date is None else date
@@ -705,7 +691,7 @@ def total_nav_over_time_chart (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def im_mv_over_nav_with_rolling (
 
         _dataframe : Optional[pl.DataFrame] = None,
@@ -719,8 +705,6 @@ def im_mv_over_nav_with_rolling (
     
     """
     if _dataframe is None :
-        
-        st.cache_data.clear()
         return None
     
     column = "SIMM" if column == "IM" else column
@@ -795,7 +779,7 @@ def im_mv_over_nav_with_rolling (
 
 # ---------- Leverages ----------
 
-@st.cache_data()
+@figure_cache()
 def leverage_line_chart (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -812,15 +796,11 @@ def leverage_line_chart (
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         log("[-] No Dataframe available", "error")
 
         return None
     
     if not columns :
-        
-        st.cache_data.clear()
         log("[-] No columns provided to plot", "error")
         
         return None
@@ -886,7 +866,7 @@ def leverage_line_chart (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def leverage_per_underlying_histogram (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -905,7 +885,6 @@ def leverage_per_underlying_histogram (
     if _dataframe is None :
 
         log("Error during Leverage per Underlying histogram, DF is empty.")
-        st.cache_data.clear()
 
         return None
     
@@ -941,7 +920,7 @@ def leverage_per_underlying_histogram (
     return hist
 
 
-@st.cache_data()
+@figure_cache()
 def leverage_per_trade_histogram (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -962,7 +941,6 @@ def leverage_per_trade_histogram (
     if _dataframe is None :
 
         log("Error during Leverage per Underlying histogram, DF is empty.")
-        st.cache_data.clear()
 
         return None
 
@@ -1001,7 +979,7 @@ def leverage_per_trade_histogram (
 
 # ---------- Greeks ----------
 
-@st.cache_data(show_spinner=False)
+@figure_cache()
 def show_history_greeks_graph (
         
         _dataframe : Optional[pl.DataFrame] = None,
@@ -1018,8 +996,6 @@ def show_history_greeks_graph (
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
 
@@ -1109,7 +1085,7 @@ def show_history_greeks_graph (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def greeks_heatmap_graph (
 
         _dataframe : Optional[pl.DataFrame] = None,
@@ -1124,8 +1100,6 @@ def greeks_heatmap_graph (
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     _dataframe = _dataframe.to_pandas().set_index("Underlying")
@@ -1157,7 +1131,7 @@ def greeks_heatmap_graph (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def show_change_greeks_graph (
     
         _df_1 : Optional[pl.DataFrame] =  None,
@@ -1174,8 +1148,6 @@ def show_change_greeks_graph (
     
     """
     if _df_1 is None or _df_2 is None :
-
-        st.cache_data.clear()
         return None
 
     df_start_u = _df_1.filter(pl.col("Underlying") == underlying)
@@ -1230,7 +1202,7 @@ def show_change_greeks_graph (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def show_histogram_concentration (
 
         _dataframe : Optional[pl.DataFrame] = None,
@@ -1255,8 +1227,6 @@ def show_histogram_concentration (
     :type y_axis: str
     """
     if _dataframe is None :
-
-        st.cache_data.clean()
         return None
     
     df_grouped = _dataframe.group_by(x_axis).agg(
@@ -1265,8 +1235,6 @@ def show_histogram_concentration (
     
     df_grouped = df_grouped.sort(y_axis, descending=True)
 
-    print(df_grouped)
-
     fig = go.Figure()
 
     fig.add_trace(
@@ -1300,7 +1268,7 @@ def show_histogram_concentration (
     return fig
 
 
-@st.cache_data()
+@figure_cache()
 def show_piechart_concentration (
 
         _dataframe : Optional[pl.DataFrame] = None,
@@ -1328,8 +1296,6 @@ def show_piechart_concentration (
     """
 
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     df_grouped = _dataframe.group_by(by_column).agg(
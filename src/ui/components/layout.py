@@ -78,7 +78,6 @@ def sidebar (groupes : List[Dict[str, str]], title : str = "", logo_header_path
             icons=icons,
             styles=styles
         )
-        st.cache_data.clear()
 
         footer_aegis("http://localhost:9999")
 
@@ -30,8 +30,6 @@ def show_expiries_history (_dataframe : pl.DataFrame, md5 : str,  height : int =
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
 
     _dataframe = format_numeric_columns_to_string(_dataframe, decimals=4)
@@ -88,8 +86,6 @@ def display_payments_table (_dataframe : pl.DataFrame, md5 : str, height : int =
     
     """
     if _dataframe is None :
-        
-        st.cache_data.clear()
         return None
     
     _dataframe = format_numeric_columns_to_string(_dataframe)
@@ -137,8 +133,6 @@ def leverages_per_trades_tables (_dataframe : Optional[pl.DataFrame] = None, md5
     :type height: int
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     _dataframe = format_numeric_columns_to_string(_dataframe)
@@ -190,8 +184,6 @@ def show_screener_tarf_table (
     
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     gb = GridOptionsBuilder.from_dataframe(_dataframe)
@@ -225,8 +217,6 @@ def show_aum_details_table (_dataframe : Optional[pl.DataFrame] = None, md5 : Op
     """
 
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     _dataframe = format_numeric_columns_to_string(_dataframe)
@@ -273,8 +263,6 @@ def vega_stress_table (_dataframe : Optional[pl.DataFrame] = None, md5 : Optiona
     :type height: int
     """
     if _dataframe is None :
-
-        st.cache_data.clear()
         return None
     
     _dataframe = format_numeric_columns_to_string(_dataframe)
@@ -20,8 +20,9 @@ from src.core.data.recap import (
     clean_structure_from_dataframe,
 )
 from src.ui.components.text import center_h5
-from src.utils.data_io import load_excel_to_dataframe, polars_to_excel_bytes
-from src.utils.dates import monday_of_week, parse_date_any, parse_datetime_any
+from src.utils.data_io import load_many, polars_to_excel_bytes
+from src.utils.dates import monday_of_week
+from src.utils.catalog import catalog_entries, catalog_lookup, parse_date_timestamp
 
 
 SOURCE_DATE_COL = "Recap Date"
@@ -220,11 +221,19 @@ def find_week_trade_recap_files (
     """
     Return the latest generated recap file for each weekday in a Monday-Friday week.
     """
-    return [
-        found
-        for day in (monday + dt.timedelta(days=i) for i in range(5))
-        if (found := find_latest_trade_recap_file_for_date(day, dir_abs_path)) is not None
-    ]
+    dir_abs_path = TREADE_RECAP_DATA_RAW_DIR_ABS_PATH if dir_abs_path is None else dir_abs_path
+
+    # One range query on the directory index instead of one scan per day
+    entries = catalog_entries(
+        dir_abs_path,
+        TRADE_RECAP_RAW_FILE_REGEX,
+        start_date=monday,
+        end_date=monday + dt.timedelta(days=4),
+        parser=parse_date_timestamp,
+        extension=".xlsx",
+    )
+
+    return [(entry.date, entry.stamp[0], entry.name) for entry in entries]
 
 
 def find_latest_trade_recap_file_for_date (
@@ -238,33 +247,19 @@ def find_latest_trade_recap_file_for_date (
     """
     dir_abs_path = TREADE_RECAP_DATA_RAW_DIR_ABS_PATH if dir_abs_path is None else dir_abs_path
 
-    if not dir_abs_path or not os.path.isdir(dir_abs_path) :
-        return None
-
-    best: Optional[Tuple[dt.datetime, str]] = None
-
-    with os.scandir(dir_abs_path) as it :
-        for entry in it :
-            if not entry.is_file() or not entry.name.lower().endswith(".xlsx") :
-                continue
-
-            parsed = parse_trade_recap_filename(entry.name)
-
-            if parsed is None :
-                continue
-
-            trade_date, as_of = parsed
-
-            if trade_date != date :
-                continue
-
-            if best is None or as_of > best[0] :
-                best = (as_of, entry.name)
+    entry = catalog_lookup(
+        dir_abs_path,
+        TRADE_RECAP_RAW_FILE_REGEX,
+        date,
+        mode="eq",
+        parser=parse_date_timestamp,
+        extension=".xlsx",
+    )
 
-    if best is None :
+    if entry is None :
         return None
 
-    return date, best[0], best[1]
+    return date, entry.stamp[0], entry.name
 
 
 def parse_trade_recap_filename (filename : str) -> Optional[Tuple[dt.date, dt.datetime]]:
@@ -273,16 +268,16 @@ def parse_trade_recap_filename (filename : str) -> Optional[Tuple[dt.date, dt.da
     """
     match = TRADE_RECAP_RAW_FILE_REGEX.match(filename)
 
-    if not match or len(match.groups()) < 2 :
+    if not match :
         return None
 
-    trade_date_raw, as_of_raw = match.groups()[:2]
-    trade_date = parse_date_any(trade_date_raw)
-    as_of = parse_datetime_any(as_of_raw)
+    parsed = parse_date_timestamp(match)
 
-    if trade_date is None or as_of is None :
+    if parsed is None :
         return None
 
+    trade_date, (as_of,) = parsed
+
     return trade_date, as_of
 
 
@@ -298,12 +293,16 @@ def load_week_trade_recaps (
     dir_abs_path = TREADE_RECAP_DATA_RAW_DIR_ABS_PATH if dir_abs_path is None else dir_abs_path
     frames: List[pl.DataFrame] = []
 
-    for trade_date, as_of, filename in week_files :
-        full_path = os.path.join(dir_abs_path, filename)
-        dataframe, _ = load_excel_to_dataframe(
-            full_path,
-            schema_overrides=TRADE_RECAP_MIN_COLUMNS,
-        )
+    # The daily files are independent : parse them concurrently, results come back in order
+    results = load_many(
+        [
+            {"excel_file_abs_pth": os.path.join(dir_abs_path, filename), "schema_overrides": TRADE_RECAP_MIN_COLUMNS}
+            for _, _, filename in week_files
+        ]
+    )
+
+    for (trade_date, as_of, filename), result in zip(week_files, results) :
+        dataframe = result.dataframe
 
         if dataframe is None or dataframe.is_empty() :
             continue
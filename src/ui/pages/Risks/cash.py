@@ -9,11 +9,12 @@ import datetime as dt
 from typing import Optional, List, Dict
 
 # Add of CCYs from LibApi
-from src.config.paths import LIBAPI_ABS_PATH
+from src.config.paths import LIBAPI_ABS_PATH, CASH_FUNDS_FILE_PATHS
 sys.path.append(LIBAPI_ABS_PATH)
 
 from src.config.parameters import SIMM_MAPPING_COUNTERPARTIES, SIMM_MAPPING_COUNTERPARTIES_BANK_CODE
 from src.utils.dates import previous_business_day
+from src.utils.cache import invalidate_source
 from src.utils.formatters import str_to_date, format_numeric_columns_to_string
 
 from src.ui.components.text import center_bold_paragraph, center_h2, left, left_h5
@@ -62,6 +63,20 @@ def cash (
     return None
 
 
+def cash_demands (
+        
+        date : Optional[str | dt.date | dt.datetime] = None,
+        fundation : Optional[str] = None
+        
+    ) -> None :
+    """
+    Files the page reads through the load plan, declared before any section renders.
+    """
+    load_all_collateral(fundation)
+
+    return None
+
+
 # -------- Counterparty tables and charts --------
 
 def cash_amount_section (
@@ -103,7 +118,7 @@ def cash_amount_section (
             if refresh_result["success"] :
 
                 st.session_state[refresh_result_key] = refresh_result
-                st.cache_data.clear()
+                invalidate_source(CASH_FUNDS_FILE_PATHS.get(fundation))
                 st.rerun()
 
             st.error(refresh_result["message"])
@@ -51,6 +51,20 @@ def greeks (
     return None
 
 
+def greeks_demands (
+
+        date : Optional[str | dt.date | dt.datetime] = None,
+        fundation : Optional[str] = None
+    
+    ) -> None :
+    """
+    Files the page reads through the load plan, declared before any section renders.
+    """
+    read_history_greeks(date, fundation)
+
+    return None
+
+
 # ---------- Change (%) Greeks ----------
 
 def percentage_greeks_change_section (date, fundation) :
@@ -6,13 +6,13 @@ import datetime as dt
 
 from typing import Optional
 
-from src.core.data.leverages import read_history_leverages, read_underlying_leverages, read_trade_leverages
+from src.core.data.leverages import scan_history_leverages, read_underlying_leverages, read_trade_leverages
 
 from src.ui.components.charts import leverage_line_chart, leverage_per_underlying_histogram, leverage_per_trade_histogram
 from src.ui.components.text import center_h2, left_h5
 from src.ui.components.tables import leverages_per_trades_tables
 
-from src.utils.formatters import format_numeric_columns_to_string
+from src.utils.formatters import format_numeric_columns_to_string, str_to_date
 
 def leverages (
         
@@ -44,11 +44,23 @@ def leverage_analysis_graph_section (
     """
     
     """
-    dataframe, md5 = read_history_leverages(date, fundation)
-    print(dataframe)
+    columns = ["Gross Leverage", "Commitment Leverage"]
+
+    lazyframe, md5 = scan_history_leverages(date, fundation)
+    dataframe = None
+
+    if lazyframe is not None :
+
+        # Only the plotted columns and the dates up to the report date are materialised
+        dataframe = (
+            lazyframe
+            .select(["Date", *columns])
+            .filter(pl.col("Date") <= pl.lit(str_to_date(date)))
+            .collect()
+        )
 
     title = f"Leverage over time until {date}"
-    fig = leverage_line_chart(dataframe, md5, title, date, ["Gross Leverage", "Commitment Leverage"], "Date")
+    fig = leverage_line_chart(dataframe, md5, title, date, columns, "Date")
     
     st.plotly_chart(fig)
 
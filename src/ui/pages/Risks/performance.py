@@ -22,6 +22,8 @@ from src.ui.components.charts import (
 from src.ui.components.tables import show_aum_details_table
 
 from src.utils.dates import monday_of_week, previous_business_day, get_qtd_from_date, get_mtd_start
+from src.utils.display import format_display, SIGN_SUFFIX
+from src.utils.rolling_vol import VOL_WINDOWS, rolling_realized_vol, vol_column
 from src.utils.formatters import (
     date_to_str, str_to_date, format_numeric_columns_to_string, colorize_dataframe_positive_negatif_vals,
     str_to_datetime
@@ -33,11 +35,11 @@ from src.core.data.nav import (
     read_nav_estimate_by_fund, rename_nav_estimate_columns, estimated_gross_performance,
     compute_monthly_returns, compute_mv_change_by_dates, portfolio_allocation_analysis,
     get_estimated_nav_df_by_date, gav_performance_normalized_base_100, hardcode_performance_monthly_values,
-    index_performance_normalized_base_0, compute_yearly_returns, 
+    index_performance_normalized_base_0, compute_yearly_returns, compute_period_statistics,
 )
 from src.core.data.volatility import (
     read_realized_vol_by_dates, compute_realized_vol_by_dates, compute_annualized_realized_vol,
-    calculate_rv_estimated_perf
+    calculate_rv_estimated_perf, compute_rolling_realized_vol
 )
 from src.core.data.positions import (
     read_db_gross_data_by_date, asset_class_cascade_by_date
@@ -70,6 +72,9 @@ def performance (
 
     estimated_gross_perf_section(date, fundation)
     st.write('')
+
+    period_statistics_section(date, fundation)
+    st.write('')
     
     volatility_aum_n_nav_section(date, fundation)
     st.write('')
@@ -98,9 +103,8 @@ def estimated_gross_perf_section (
     """
     left_h3("Estimated Gross Performance (in %)")
 
-    result, md5 = estimated_gross_performance(fund=fundation, max_date=date)
-    dataframe, md5 = compute_monthly_returns(result, md5, fundation)
-    dataframe, md5 = compute_yearly_returns(dataframe, md5)
+    # Gross performance, monthly and yearly returns : nodes of the NAV graph, each computed once
+    dataframe, md5 = compute_yearly_returns(fund=fundation, max_date=date)
 
     month_cols = [c for c in dataframe.columns if c not in ["Year", "Total"]]
     dataframe, md5 = calculate_rv_estimated_perf(dataframe, md5, fundation, month_cols)
@@ -108,7 +112,8 @@ def estimated_gross_perf_section (
     #dataframe, md5 = hardcode_performance_monthly_values(dataframe, md5, fundation)
 
     month_cols = month_cols + ["Total", "RV"]
-    dataframe = format_numeric_columns_to_string(dataframe, month_cols)
+    # Signs taken from the numbers in the same pass, the Styler does not parse the strings back
+    dataframe = format_display(dataframe, month_cols, sign_suffix=SIGN_SUFFIX)
     styler  = colorize_dataframe_positive_negatif_vals(dataframe, month_cols)
 
     st.dataframe(styler)
@@ -116,6 +121,45 @@ def estimated_gross_perf_section (
     return None
 
 
+# ----------- Period Statistics Section -----------
+
+def period_statistics_section (
+        
+        date : Optional[str | dt.datetime | dt.date] = None,
+        fundation : Optional[str] = None,
+    
+    ) -> None :
+    """
+    Headline period returns of the fund and statistics table of the funds and indices,
+    all from one cached computation.
+    """
+    left_h3("Period Statistics")
+
+    stats = compute_period_statistics(as_of=date)
+
+    if stats is None :
+        return None
+
+    fund_stats = stats.filter(pl.col("series") == fundation)
+
+    for col, row in zip(st.columns(max(fund_stats.height, 1)), fund_stats.iter_rows(named=True)) :
+
+        value = " - " if row["return"] is None else f"{row['return'] * 100:.2f}%"
+        col.metric(f"{row['period']} (since {row['start_date']})", value)
+
+    table = stats.select(
+        "series", "period", "start_date", "end_date", "return", "vol", "max_drawdown",
+        "peak_date", "trough_date", "sharpe", "sortino",
+    )
+
+    kinds = {"return" : "percent", "vol" : "percent", "max_drawdown" : "percent", "sharpe" : "number", "sortino" : "number"}
+    table = format_display(table, kinds, sign_suffix=SIGN_SUFFIX)
+
+    st.dataframe(colorize_dataframe_positive_negatif_vals(table, ["return"]))
+
+    return None
+
+
 # ----------- AUM & NAV -----------
 
 def volatility_aum_n_nav_section (
@@ -374,8 +418,11 @@ def performance_charts_section (
 
     dataframe = dataframe_1.join(dataframe_2, on="Dates", how="full").sort("Dates")
 
+    # The figure cache keys the frame on its md5 : the joined frame depends on both sources
+    md5 = None if md5_1 is None or md5_2 is None else f"{md5_1}:{md5_2}"
+
     fig = nav_estimate_performance_graph(
-        dataframe, md5_1, fundation, start_date, end_date, list(dataframe.columns[:1]) + list(dataframe.columns[4:]), "Dates"
+        dataframe, md5, fundation, start_date, end_date, list(dataframe.columns[:1]) + list(dataframe.columns[4:]), "Dates"
     )
 
     if fig is None :
@@ -433,6 +480,17 @@ def anualised_volatility_section (
 
     st.metric(f"{fundation} Realized Volatility between {start_date} and {end_date}", f"{vol}%")
 
+    # Current rolling vols, from the incremental state of the fund's history
+    vols, _ = compute_rolling_realized_vol(fund=fundation)
+
+    if vols is not None and vols.height :
+
+        last = vols.row(-1, named=True)
+        labels = {vol_column(w) : f"{w}D" for w in VOL_WINDOWS} | {vol_column("ewma") : "EWMA"}
+
+        for col, (name, label) in zip(st.columns(len(labels)), labels.items()) :
+            col.metric(f"{label} vol ({last['Date']})", " - " if last[name] is None else f"{last[name]:.2f}%")
+
     return None
 
 
@@ -456,39 +514,26 @@ def realized_volatilty_chart_section (
     rename_cols = NAV_ESTIMATE_RENAME_COLUMNS if rename_cols is None else rename_cols
     columns = list(rename_cols.values())
 
-    dataframe, md5 = read_nav_estimate_by_fund(fundation)
-    rename_df , md5 = rename_nav_estimate_columns(dataframe, md5)
+    rename_df , md5 = rename_nav_estimate_columns(fundation=fundation)
 
     df_na = rename_df.drop_nulls(subset=columns)
-    df = df_na.sort("date")
-
-    for column in columns :
-        
-        df = df.with_columns(
-            [
-                pl.col(column).pct_change().alias(f"{column}_returns")
-            ]
-        )
 
-    annualization = (window ** 0.5) * 100
+    # Every column in one rolling pass, as series of a long frame
+    series = df_na.unpivot(index="date", on=columns, variable_name="series", value_name="value")
+    vols = rolling_realized_vol(series, "value", by=["series"], windows=(window,), ewma_lambda=None, log_returns=False)
 
-    for column in columns :
-
-        df = df.with_columns(
-            [
-                pl.col(f"{column}_returns")
-                .rolling_std(window_size=window, min_periods=window)
-                .mul(annualization)
-                .alias(f"VOL {column}"),
-            ]
-        )
+    df = (
+        vols
+        .pivot(on="series", index="date", values=vol_column(window))
+        .rename({column : f"VOL {column}" for column in columns})
+        .sort("date")
+    )
 
-        print(df)
-    
     specific_cols = [f"VOL {column}" for column in columns]
 
+    # The vols also depend on the window : part of the frame identity for the figure cache
     fig = nav_estimate_performance_graph(
-        df, md5, fundation, start_date, end_date, specific_cols, "date"
+        df, None if md5 is None else f"{md5}:{window}", fundation, start_date, end_date, specific_cols, "date"
     )
 
     st.plotly_chart(fig)
@@ -10,16 +10,17 @@ from streamlit_option_menu import option_menu
 from typing import Dict, Optional
 
 from src.utils.formatters import date_to_str
+from src.utils.load_plan import LoadPlan
 from src.config.parameters import FUND_NAME_MAP
 
 from src.ui.pages.Risks.expiries import expiries
 from src.ui.pages.Risks.performance import performance
-from src.ui.pages.Risks.screeners import screeners
+from src.ui.pages.Risks.screeners import screeners, screeners_demands
 from src.ui.pages.Risks.leverages import leverages
-from src.ui.pages.Risks.greeks import greeks
+from src.ui.pages.Risks.greeks import greeks, greeks_demands
 from src.ui.pages.Risks.concentration import concentration
 from src.ui.pages.Risks.simm import simm
-from src.ui.pages.Risks.cash import cash
+from src.ui.pages.Risks.cash import cash, cash_demands
 
 from src.ui.styles.base import risk_menu
 from src.ui.components.selector import date_selector
@@ -29,12 +30,12 @@ risk_subpages = [
     
     {"name" : "Expiries",       "page" : expiries,      "icon" : "calendar-check"},
     {"name" : "Performance",    "page" : performance,   "icon" : "cash-coin"},
-    {"name" : "Screeners",      "page" : screeners,     "icon" : "calendar-check"},
+    {"name" : "Screeners",      "page" : screeners,     "icon" : "calendar-check",  "demands" : screeners_demands},
     {"name" : "Leverages",      "page" : leverages,     "icon" : "gear"},
     {"name" : "Concentration",  "page" : concentration, "icon" : "bullseye"},
-    {"name" : "Greeks",         "page" : greeks,        "icon" : "bar-chart"},
+    {"name" : "Greeks",         "page" : greeks,        "icon" : "bar-chart",       "demands" : greeks_demands},
     {"name" : "SIMM",           "page" : simm,          "icon" : "bar-chart-line"},
-    {"name" : "Cash",           "page" : cash,          "icon" : "cash-stack"},
+    {"name" : "Cash",           "page" : cash,          "icon" : "cash-stack",      "demands" : cash_demands},
 
 ]
 
@@ -61,12 +62,9 @@ def render_risks (title : str = "Risks", fundation_map : Optional[Dict] = None)
     with date_col :
         
         date = date_selector(label="Select a date ")
-        st.cache_data.clear()
 
     fundation = fund_col.selectbox("Select a fund ", fund_options)
 
-    st.cache_data.clear()
-
     menu = option_menu(
 
         menu_title=None,
@@ -82,7 +80,16 @@ def render_risks (title : str = "Risks", fundation_map : Optional[Dict] = None)
     for subpage in risk_subpages :
 
         if subpage["name"] == menu and not subpage["page"] is None :
-            subpage["page"](date, fundation)
+
+            # Sections of the page share their file loads : every demand is declared before the first parse
+            with LoadPlan() as plan :
+
+                if subpage.get("demands") is not None :
+
+                    with plan.declaring() :
+                        subpage["demands"](date, fundation)
+
+                subpage["page"](date, fundation)
 
     return None
 
@@ -44,6 +44,20 @@ def screeners (
     return None
 
 
+def screeners_demands (
+    
+        date : Optional[str | dt.datetime | dt.date] = None,
+        fundation : Optional[str] = None
+    
+    ) -> None :
+    """
+    Files the page reads through the load plan, declared before any section renders.
+    """
+    read_db_gross_data_by_date(date, fundation)
+
+    return None
+
+
 # ---------- TARF section ----------
 
 def tarf_section (
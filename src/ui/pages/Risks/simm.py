@@ -89,17 +89,19 @@ def date_simm_bar_section (
 
     dataframe, md5 = get_simm_all_history(fundation)
     df_date, md5_date = get_simm_by_date_from_history(date, dataframe, md5)
-    """
+
     if df_date is None or df_date.is_empty() :
         
-        list = fetch_raw_simm_data_by_date(date, fundation)
-        df_date, md5_date = convert_raw_simm_to_dataframe(date, list)
+        raw_simm = fetch_raw_simm_data_by_date(date, fundation)
+        df_date, md5_date = convert_raw_simm_to_dataframe(date, raw_simm)
 
         if df_date is not None and not df_date.is_empty() :
             
-            updated = update_simm_history(df_date, dataframe, md5)
-            st.info("SIMM history sucessfully update" if updated else None)
-    """
+            updated = update_simm_history(df_date, fund=fundation)
+
+            if updated :
+                st.info("SIMM history successfully updated")
+    
     fig = simm_ctpy_im_vm_chart(df_date, md5_date, date, "Counterparty", ("IM", "MV"))
 
     if fig is None :
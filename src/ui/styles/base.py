@@ -51,4 +51,12 @@ screeners_js_code = JsCode(
         }, 50);
     }
     """
-    )
\ No newline at end of file
+    )
+
+# Colours of the AgGrid cells flagged by src.utils.display.aggrid_sign_class_rules
+sign_cells_custom_css = {
+
+    ".sign-positive": {"color": "green !important"},
+    ".sign-negative": {"color": "red !important"},
+
+}
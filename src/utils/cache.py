@@ -0,0 +1,559 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import pickle
+import hashlib
+import inspect
+import functools
+import threading
+import polars as pl
+import datetime as dt
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from src.config.parameters import SCOPED_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_TTL_SECONDS
+from src.utils.logger import log
+from src.utils.result_store import load_result, persist_result, drop_tagged
+from src.utils.catalog import recording_lookups, report_lookups, lookup_changed
+from src.utils.single_flight import single_flight
+
+
+# Arguments whose value names a namespace of the entry
+_FUND_ARGS = ("fund", "fundation")
+_DATE_ARGS = ("date",)
+
+# key -> _Entry, least recently used first
+_ENTRIES : OrderedDict[str, "_Entry"] = OrderedDict()
+
+# tag -> keys : "func:<name>", "fund:<fund>", "date:<YYYY-MM-DD>", "source:<dir>", "file:<path>"
+_INDEX : Dict[str, Set[str]] = {}
+
+# fingerprint -> (source files, parent fingerprints), least recently registered first
+_SOURCES : OrderedDict[str, Tuple[frozenset, frozenset]] = OrderedDict()
+
+_LOCK = threading.RLock()
+_STATS = {"hits" : 0, "misses" : 0, "disk_hits" : 0, "bypasses" : 0, "evictions" : 0, "expirations" : 0, "invalidations" : 0}
+_STATE = {"bytes" : 0}
+_FUNC_STATS : Dict[str, Dict[str, int]] = {}
+
+
+def _norm_path (path : str) -> str :
+    return os.path.normcase(os.path.abspath(path))
+
+
+def register_source (fingerprint : Any, *source_abs_paths : str) -> None :
+    """
+    Record the files a loaded frame (identified by its fingerprint) was read from.
+    """
+    if fingerprint is None or not source_abs_paths :
+        return
+
+    key = str(fingerprint)
+    files = frozenset(_norm_path(p) for p in source_abs_paths if p)
+
+    with _LOCK :
+
+        previous_files, parents = _SOURCES.pop(key, (frozenset(), frozenset()))
+        _SOURCES[key] = (previous_files | files, parents)
+
+        while len(_SOURCES) > SCOPED_CACHE_MAX_ENTRIES * 8 :
+            _SOURCES.popitem(last=False)
+
+
+def link_fingerprint (fingerprint : Any, *parent_fingerprints : Any) -> None :
+    """
+    Record that a derived frame was computed from other frames, so it depends on their sources.
+    """
+    if fingerprint is None :
+        return
+
+    key = str(fingerprint)
+    parents = frozenset(str(p) for p in parent_fingerprints if p is not None and str(p) != key)
+
+    if not parents :
+        return
+
+    with _LOCK :
+
+        files, previous_parents = _SOURCES.pop(key, (frozenset(), frozenset()))
+        _SOURCES[key] = (files, previous_parents | parents)
+
+        while len(_SOURCES) > SCOPED_CACHE_MAX_ENTRIES * 8 :
+            _SOURCES.popitem(last=False)
+
+
+def sources_of (fingerprint : Any) -> Set[str] :
+    """
+    Source files a fingerprint depends on, following derived links.
+    """
+    found, seen = set(), set()
+    stack = [str(fingerprint)] if fingerprint is not None else []
+
+    with _LOCK :
+
+        while stack :
+
+            key = stack.pop()
+
+            if key in seen or key not in _SOURCES :
+                continue
+
+            seen.add(key)
+
+            files, parents = _SOURCES[key]
+            found.update(files)
+            stack.extend(parents)
+
+    return found
+
+
+def _date_tag (value : Any) -> Optional[str] :
+
+    if isinstance(value, dt.datetime) :
+        return value.date().isoformat()
+
+    if isinstance(value, dt.date) :
+        return value.isoformat()
+
+    if isinstance(value, str) and value :
+        return value[:10]
+
+    return None
+
+
+def _fingerprints (value : Any) -> Iterable[str] :
+    """
+    Strings among the argument values, candidates for registered fingerprints.
+    """
+    if isinstance(value, (list, tuple, set, frozenset)) :
+
+        for item in value :
+            yield from _fingerprints(item)
+
+    elif isinstance(value, str) or type(value).__name__ == "LazyFingerprint" :
+        yield str(value)
+
+
+def _tags (func_name : str, arguments : Dict[str, Any]) -> frozenset :
+    """
+    Namespaces and source files of one call.
+    """
+    tags = {f"func:{func_name}"}
+
+    for name, value in arguments.items() :
+
+        if value is None :
+            continue
+
+        if name in _FUND_ARGS and isinstance(value, str) :
+            tags.add(f"fund:{value}")
+
+        elif name in _DATE_ARGS :
+
+            date = _date_tag(value)
+
+            if date is not None :
+                tags.add(f"date:{date}")
+
+        elif not name.startswith("_") :
+
+            for fingerprint in _fingerprints(value) :
+
+                for path in sources_of(fingerprint) :
+
+                    tags.add(f"file:{path}")
+                    tags.add(f"source:{os.path.dirname(path)}")
+
+    return frozenset(tags)
+
+
+def _call_key (func_name : str, arguments : Dict[str, Any]) -> str :
+    """
+    Digest of the call, underscore arguments skipped (same convention as st.cache_data).
+    """
+    hashed = [(name, value) for name, value in arguments.items() if not name.startswith("_")]
+
+    try :
+        raw = pickle.dumps((func_name, hashed), protocol=pickle.HIGHEST_PROTOCOL)
+
+    except Exception :
+        raw = repr((func_name, hashed)).encode("utf-8")
+
+    return hashlib.md5(raw).hexdigest()
+
+
+class _Entry (NamedTuple) :
+    value : Any
+    tags : frozenset
+    nbytes : int
+    expires : Optional[float]                       # monotonic deadline, None without TTL
+    files : Tuple[Tuple[str, int, int], ...]        # (path, size, mtime_ns) of the sources when stored
+    lookups : Tuple[Dict, ...] = ()                 # catalog lookups the value was computed from
+
+
+def _sizeof (value : Any) -> int :
+    """
+    Approximate memory held by a cached value : Arrow buffers for frames, shallow size otherwise.
+    """
+    if isinstance(value, (pl.DataFrame, pl.Series)) :
+        return int(value.estimated_size())
+
+    if isinstance(value, (list, tuple)) :
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+
+    if isinstance(value, dict) :
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value.values())
+
+    return sys.getsizeof(value)
+
+
+def _file_signature (path : str) -> Optional[Tuple[str, int, int]] :
+
+    try :
+        stat = os.stat(path)
+
+    except OSError :
+        return None
+
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def _files_changed (files : Tuple[Tuple[str, int, int], ...]) -> bool :
+    return any(_file_signature(path) != (path, size, mtime) for path, size, mtime in files)
+
+
+def _drop (key : str) -> None :
+    """
+    Remove one entry and its index edges, the lock must be held.
+    """
+    entry = _ENTRIES.pop(key)
+    _STATE["bytes"] -= entry.nbytes
+
+    for tag in entry.tags :
+
+        keys = _INDEX.get(tag)
+
+        if keys is None :
+            continue
+
+        keys.discard(key)
+
+        if not keys :
+            del _INDEX[tag]
+
+
+def _source_files (tags : frozenset) -> Tuple[Tuple[str, int, int], ...] :
+    """
+    Current (path, size, mtime_ns) of the source files an entry is tagged with.
+    """
+    return tuple(sig for sig in (_file_signature(tag[5:]) for tag in tags if tag.startswith("file:")) if sig is not None)
+
+
+def _store (
+
+        key : str,
+        value : Any,
+        tags : frozenset,
+        ttl : Optional[float],
+        files : Tuple[Tuple[str, int, int], ...],
+        lookups : Tuple[Dict, ...] = (),
+
+    ) -> None :
+
+    nbytes = _sizeof(value)
+
+    if nbytes > RESULT_CACHE_MAX_BYTES :
+
+        log(f"[!] [CACHE] Result of {nbytes} bytes over the budget of {RESULT_CACHE_MAX_BYTES} bytes, not cached", "warning")
+        return
+
+    expires = time.monotonic() + ttl if ttl is not None else None
+
+    with _LOCK :
+
+        if key in _ENTRIES :
+            _drop(key)
+
+        _ENTRIES[key] = _Entry(value, tags, nbytes, expires, files, lookups)
+        _STATE["bytes"] += nbytes
+
+        for tag in tags :
+            _INDEX.setdefault(tag, set()).add(key)
+
+        # Least recently used first, until both the entry count and the byte budget hold
+        while len(_ENTRIES) > SCOPED_CACHE_MAX_ENTRIES or _STATE["bytes"] > RESULT_CACHE_MAX_BYTES :
+
+            _drop(next(iter(_ENTRIES)))
+            _STATS["evictions"] += 1
+
+
+def _count (func_name : str, counter : str) -> None :
+
+    _STATS[counter] += 1
+    _FUNC_STATS.setdefault(func_name, {"hits" : 0, "misses" : 0, "bypasses" : 0})[counter] += 1
+
+
+def _lookup (key : str, func_name : str) -> Tuple[bool, Any] :
+    """
+    Cached value of a key, dropping it first if its TTL ran out, one of its source files moved or
+    one of the directory lookups it was computed from would now pick another file (newer intraday
+    report), whether or not the watcher saw the change.
+    """
+    with _LOCK :
+        entry = _ENTRIES.get(key)
+
+    # Sources are stat'ed outside the lock, network shares can be slow to answer. A lookup costs
+    # a stat of its directory while the listing is unchanged (catalog index)
+    stale = entry is not None and (
+
+        (entry.expires is not None and time.monotonic() >= entry.expires) or
+        (entry.files and _files_changed(entry.files)) or
+        any(lookup_changed(lookup) for lookup in entry.lookups)
+
+    )
+
+    with _LOCK :
+
+        if stale and _ENTRIES.get(key) is entry :
+
+            _drop(key)
+            _STATS["expirations"] += 1
+
+            entry = None
+
+        if entry is not None and key in _ENTRIES :
+
+            _ENTRIES.move_to_end(key)
+            _count(func_name, "hits")
+
+            # A cached call made while another result is computed : that result depends on the same lookups
+            report_lookups(entry.lookups)
+
+            return True, entry.value
+
+        _count(func_name, "misses")
+
+    return False, None
+
+
+def scoped_cache (
+        
+        func : Optional[Callable] = None,
+        *,
+        namespace : Optional[str] = None,
+        ttl : Optional[float] = None,
+        ignore : Tuple[str, ...] = (),
+        fingerprint : Optional[str] = None,
+        persist : bool = False,
+
+    ) -> Callable :
+    """
+    Memoize a function in the process-wide result cache, shared by every session.
+    Arguments starting with "_" are not hashed (same convention as st.cache_data).
+
+    Each entry is tagged with the namespaces of its call : the function, the fund and the date
+    arguments, and the source files (and their directories) of the fingerprints it was given
+    or returned. An entry whose source file moved on disk is recomputed.
+
+    The cached object itself is handed out, no copy : Polars frames are immutable, callers
+    must not mutate other values (dicts, lists) they get back. Chart builders use figure_cache,
+    which hands out a new figure on every call.
+    None results are not cached, so a missing input never needs a global clear.
+
+    Args:
+        namespace (str) : Extra namespace every entry of the function belongs to.
+        ttl (float) : Seconds an entry stays valid, RESULT_CACHE_TTL_SECONDS by default (0 or less for no TTL).
+        ignore (tuple) : Arguments left out of the key, ex: a frame identified by its fingerprint argument.
+        fingerprint (str) : Argument identifying the ignored ones. When an ignored argument is given
+            without it, the call bypasses the cache.
+        persist (bool) : Also spill the result to the result store, so that it survives a restart
+            as long as its source files are unchanged (frames, and tuples of frames and scalars only).
+
+    Usage:
+        @scoped_cache()
+        def chart (_dataframe, md5, fund, date) : ...
+
+        @scoped_cache(ignore=("dataframe",), fingerprint="md5")
+        def compute (dataframe, md5, fund) : ...
+    """
+    def decorator (function : Callable) -> Callable :
+
+        name = f"{function.__module__}.{function.__qualname__}"
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper (*args, **kwargs) :
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            arguments = dict(bound.arguments)
+
+            if any(arguments.get(arg) is not None for arg in ignore) :
+
+                if fingerprint is None or arguments.get(fingerprint) is None :
+
+                    with _LOCK :
+                        _count(name, "bypasses")
+
+                    return function(*args, **kwargs)
+
+            arguments = {arg : value for arg, value in arguments.items() if arg not in ignore}
+
+            return cached_call(name, arguments, functools.partial(function, *args, **kwargs), ttl, namespace, persist)
+
+        wrapper.cache_namespace = f"func:{name}"
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def cached_call (
+
+        name : str,
+        arguments : Dict[str, Any],
+        compute : Callable[[], Any],
+        ttl : Optional[float] = None,
+        namespace : Optional[str] = None,
+        persist : bool = False,
+
+    ) -> Any :
+    """
+    Value of compute() memoized under (name, arguments), in the same store and with the same tags
+    as scoped_cache. For callers building the key themselves (ex: nodes of a computation graph).
+    """
+    ttl = RESULT_CACHE_TTL_SECONDS if ttl is None else ttl
+    ttl = ttl if ttl > 0 else None
+
+    key = _call_key(name, arguments)
+    found, value = _lookup(key, name)
+
+    if found :
+        return value
+
+    # Concurrent misses of the same key (sessions opening the same page) share one computation
+    return single_flight((name, key), _compute, name, key, arguments, compute, ttl, namespace, persist)
+
+
+def _compute (
+
+        name : str,
+        key : str,
+        arguments : Dict[str, Any],
+        compute : Callable[[], Any],
+        ttl : Optional[float],
+        namespace : Optional[str],
+        persist : bool,
+
+    ) -> Any :
+
+    stored = load_result(key) if persist else None
+
+    if stored is not None :
+
+        with _LOCK :
+            _STATS["disk_hits"] += 1
+
+        lookups = tuple(stored["lookups"])
+        report_lookups(lookups)
+
+        _store(key, stored["value"], frozenset(stored["tags"]), stored["ttl"], tuple(stored["files"]), lookups)
+        return stored["value"]
+
+    # Files resolved from a directory listing are recorded : a newer one invalidates the persisted result
+    with recording_lookups() as lookups :
+        value = compute()
+
+    if value is not None :
+
+        tags = _tags(name, {**arguments, "<result>" : value})
+        tags = tags | {namespace} if namespace is not None else tags
+
+        files = _source_files(tags)
+        _store(key, value, tags, ttl, files, tuple(lookups))
+
+        if persist :
+            persist_result(key, name, value, list(tags), list(files), ttl, lookups=list(lookups))
+
+    return value
+
+
+def invalidate_namespace (namespace : str) -> int :
+    """
+    Evict every entry of a namespace, ex: "fund:HV", "date:2025-01-31", "source:<dir>", "func:<module.name>".
+
+    Returns:
+        evicted (int) : Number of in-memory entries evicted.
+    """
+    with _LOCK :
+
+        keys = list(_INDEX.get(namespace, ()))
+
+        for key in keys :
+            _drop(key)
+
+        _STATS["evictions"] += len(keys)
+        _STATS["invalidations"] += 1
+
+    # Persisted copies go with them, they would be reloaded after a restart otherwise
+    dropped = drop_tagged(namespace)
+
+    if keys or dropped :
+        log(f"[*] [CACHE] Evicted {len(keys)} entries ({dropped} persisted) of {namespace}", "debug")
+
+    return len(keys)
+
+
+def invalidate_source (source_abs_path : str) -> int :
+    """
+    Evict the entries depending on a source file, or on any file of a source directory.
+    Entries of other sources stay cached.
+    """
+    if not source_abs_path :
+        return 0
+
+    path = _norm_path(source_abs_path)
+    tag = f"source:{path}" if os.path.isdir(path) else f"file:{path}"
+
+    return invalidate_namespace(tag)
+
+
+def clear_cache () -> None :
+    """
+    Drop every entry and every counter.
+    """
+    with _LOCK :
+
+        _ENTRIES.clear()
+        _INDEX.clear()
+        _SOURCES.clear()
+        _FUNC_STATS.clear()
+
+        _STATE["bytes"] = 0
+
+        for counter in _STATS :
+            _STATS[counter] = 0
+
+
+def cache_stats () -> Dict :
+    """
+    Cache counters, globally and per function.
+    """
+    with _LOCK :
+
+        lookups = _STATS["hits"] + _STATS["misses"]
+
+        return {
+
+            "entries" : len(_ENTRIES),
+            "namespaces" : len(_INDEX),
+            "bytes" : _STATE["bytes"],
+            "max_bytes" : RESULT_CACHE_MAX_BYTES,
+            **_STATS,
+            "hit_rate" : _STATS["hits"] / lookups if lookups else 0.0,
+            "functions" : {name : dict(counters) for name, counters in _FUNC_STATS.items()},
+
+        }
@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import re
+import threading
+import polars as pl
+
+from typing import Dict, List, Optional, Tuple
+
+from src.config.parameters import CAST_SNIFF_SAMPLE_SIZE
+from src.utils.logger import log
+from src.utils.fingerprint import file_family
+from src.utils.formatters import date_cast_expr_from_utf8, numeric_cast_expr_from_utf8
+
+
+DEFAULT_DATE_FORMATS = [
+
+    "%d/%m/%Y",      # 30/10/2025
+    "%Y-%m-%d",      # 2025-10-30
+    "%b %e, %Y",     # Oct 30, 2025 (space-padded day)
+    "%b %-d, %Y",    # Oct 9, 2025 (no zero-pad)
+    "%Y.%m.%d",      # 2025.10.30
+
+]
+
+EXCEL_SERIAL = "excel_serial"
+
+_NUMERIC_JUNK = "%€$£"
+
+# (source family, column, kind) -> inferred spec : date format, EXCEL_SERIAL, or numeric (decimal, junk, parentheses)
+_INFERRED : Dict[Tuple, object] = {}
+_LOCK = threading.Lock()
+
+_STATS = {"inferred" : 0, "remembered" : 0, "single_pass" : 0, "fallback" : 0}
+
+
+def _remember_key (source : Optional[str], column : str, kind : str) -> Optional[Tuple] :
+    return (file_family(source), column, kind) if source else None
+
+
+def _recall (key : Optional[Tuple]) :
+
+    if key is None :
+        return None
+
+    with _LOCK :
+
+        spec = _INFERRED.get(key)
+
+        if spec is not None :
+            _STATS["remembered"] += 1
+
+        return spec
+
+
+def _store (key : Optional[Tuple], spec) -> None :
+
+    if key is None :
+        return
+
+    with _LOCK :
+
+        if spec is None :
+            _INFERRED.pop(key, None)
+
+        else :
+            _INFERRED[key] = spec
+
+
+def _sample (series : pl.Series, size : int) -> pl.Series :
+    """
+    Distinct non-empty strings, spread over the whole column.
+    """
+    values = series.cast(pl.Utf8, strict=False).drop_nulls()
+    values = values.filter(values.str.strip_chars() != "")
+
+    if values.len() > size * 10 :
+        values = values.gather_every(values.len() // (size * 10))
+
+    return values.unique(maintain_order=True).head(size)
+
+
+def _genuine_nulls (series : pl.Series) -> int :
+    """
+    Nulls and blank strings : cells no parser can turn into a value.
+    """
+    text = series.cast(pl.Utf8, strict=False)
+
+    return text.null_count() + int((text.str.strip_chars() == "").sum() or 0)
+
+
+# ---------------- Dates ----------------
+
+
+def _clean_date_text (expr : pl.Expr, messy : bool) -> pl.Expr :
+
+    expr = expr.cast(pl.Utf8, strict=False)
+
+    if messy :
+        expr = expr.str.replace_all("\u00A0", " ").str.replace_all(r"[ ]{2,}", " ")
+
+    return expr.str.strip_chars()
+
+
+def sniff_date_format (
+
+        series : pl.Series,
+        formats : Optional[List[str]] = None,
+        allow_us_mdy : bool = False,
+        enable_excel_serial : bool = True,
+        sample_size : Optional[int] = None,
+
+    ) -> Optional[Tuple[str, bool]] :
+    """
+    Infer the single format of a column of date strings from a sample.
+
+    Formats are tried in the same priority order as the multi-pass parser, so a
+    format covering the whole column gives exactly the multi-pass result.
+
+    Returns:
+        (format, messy) : format is a strptime format or EXCEL_SERIAL, messy tells whether
+            NBSP / repeated spaces must be normalised. None for mixed or unknown formats.
+    """
+    sample_size = CAST_SNIFF_SAMPLE_SIZE if sample_size is None else sample_size
+
+    fmts = list(formats or DEFAULT_DATE_FORMATS)
+
+    if allow_us_mdy :
+        fmts.append("%m/%d/%Y")
+
+    sample = _sample(series, sample_size)
+
+    if sample.is_empty() :
+        return None
+
+    messy = bool(sample.str.contains("\u00A0| {2,}").any())
+    text = sample.to_frame("v").select(_clean_date_text(pl.col("v"), messy)).to_series()
+
+    for fmt in fmts :
+
+        parsed = text.str.strptime(pl.Date, format=fmt, strict=False, exact=False)
+
+        if parsed.null_count() == 0 :
+            return fmt, messy
+
+    if enable_excel_serial and text.cast(pl.Float64, strict=False).null_count() == 0 :
+        return EXCEL_SERIAL, messy
+
+    return None
+
+
+def _parse_date (series : pl.Series, spec : Tuple[str, bool], to_datetime : bool) -> pl.Series :
+
+    fmt, messy = spec
+    dtype = pl.Datetime if to_datetime else pl.Date
+
+    if fmt == EXCEL_SERIAL :
+
+        days = series.cast(pl.Utf8, strict=False).str.strip_chars().cast(pl.Float64, strict=False).round(0).cast(pl.Int64)
+        expr = (pl.datetime(1899, 12, 30) + pl.duration(days=pl.col("v"))).cast(dtype, strict=False)
+
+        return days.to_frame("v").select(expr).to_series().alias(series.name)
+
+    return (
+
+        series.to_frame("v")
+        .select(_clean_date_text(pl.col("v"), messy).str.strptime(dtype, format=fmt, strict=False, exact=False))
+        .to_series()
+        .alias(series.name)
+
+    )
+
+
+def cast_date_column (
+
+        series : pl.Series,
+        to_datetime : bool = False,
+        formats : Optional[List[str]] = None,
+        allow_us_mdy : bool = False,
+        enable_excel_serial : bool = True,
+        source : Optional[str] = None,
+
+    ) -> pl.Series :
+    """
+    Parse a column of date strings with a single inferred format.
+
+    The format is remembered per (source family, column) : the next loads of the same
+    report skip inference. Cells the format does not parse (mixed column) send the
+    column to the multi-pass parser, date_cast_expr_from_utf8.
+
+    Args:
+        series (pl.Series) : Utf8 column.
+        source (str) : Path of the file the column comes from, None to not remember.
+
+    Returns:
+        parsed (pl.Series) : Date (or Datetime) column, same name.
+    """
+    key = _remember_key(source, series.name, "datetime" if to_datetime else "date")
+    spec = _recall(key)
+
+    if spec is None :
+
+        spec = sniff_date_format(series, formats, allow_us_mdy, enable_excel_serial)
+
+        with _LOCK :
+            _STATS["inferred"] += 1
+
+    if spec is not None :
+
+        parsed = _parse_date(series, spec, to_datetime)
+
+        if parsed.null_count() in (series.null_count(), _genuine_nulls(series)) :
+
+            _store(key, spec)
+
+            with _LOCK :
+                _STATS["single_pass"] += 1
+
+            return parsed
+
+    fallback = (
+
+        series.to_frame()
+        .select(date_cast_expr_from_utf8(series.name, to_datetime=to_datetime, formats=formats, allow_us_mdy=allow_us_mdy, enable_excel_serial=enable_excel_serial))
+        .to_series()
+
+    )
+
+    # The single format still covers every cell the multi-pass parser can read : keep it
+    if spec is not None and fallback.null_count() == parsed.null_count() :
+
+        _store(key, spec)
+        return parsed
+
+    _store(key, None)
+
+    with _LOCK :
+        _STATS["fallback"] += 1
+
+    log(f"[*] [CAST] Mixed date formats in {series.name} ({source}), multi-pass parse", "debug")
+
+    return fallback
+
+
+# ---------------- Numbers ----------------
+
+
+def _decimal_vote (value : str) -> Optional[str] :
+    """
+    Decimal separator of one cleaned number, None when it can not tell (integers, "1,234").
+    """
+    last_dot, last_comma = value.rfind("."), value.rfind(",")
+
+    if last_dot >= 0 and last_comma >= 0 :
+        return "." if last_dot > last_comma else ","
+
+    sep = "." if last_dot >= 0 else "," if last_comma >= 0 else None
+
+    if sep is None :
+        return None
+
+    # Repeated separator : thousands, so the decimal is the other one
+    if value.count(sep) > 1 :
+        return "," if sep == "." else "."
+
+    # Exactly three digits after a single separator : thousands or decimals, can not tell
+    if re.fullmatch(r"\d{3}", value[value.rfind(sep) + 1 :]) :
+        return None
+
+    return sep
+
+
+def sniff_numeric_locale (
+
+        series : pl.Series,
+        sample_size : Optional[int] = None,
+
+    ) -> Optional[Tuple[str, str, bool]] :
+    """
+    Infer the numeric locale of a column of number strings from a sample.
+
+    Returns:
+        (decimal, junk, parentheses) : decimal separator ("." or ","), characters to strip
+            (spaces, currency / percent signs, thousands separator) and whether "(123)" negatives
+            occur. ("", "", False) when the values cast as they are. None for mixed locales.
+    """
+    sample_size = CAST_SNIFF_SAMPLE_SIZE if sample_size is None else sample_size
+
+    sample = _sample(series, sample_size).str.strip_chars()
+
+    if sample.is_empty() :
+        return None
+
+    if sample.cast(pl.Float64, strict=False).null_count() == 0 :
+        return "", "", False
+
+    votes = set()
+    junk = set()
+    parentheses = False
+
+    for value in sample.to_list() :
+
+        if re.search(r"\s", value) :
+            junk.add(" ")
+
+        junk.update(c for c in _NUMERIC_JUNK if c in value)
+
+        if "(" in value :
+            parentheses = True
+
+        cleaned = re.sub(r"[\s%€$£()+-]", "", value)
+
+        if not re.fullmatch(r"[\d.,]+", cleaned) :
+            continue
+
+        vote = _decimal_vote(cleaned)
+
+        if vote is not None :
+            votes.add(vote)
+
+    if len(votes) > 1 :
+        return None
+
+    decimal = votes.pop() if votes else "."
+    junk.add("," if decimal == "." else ".")
+
+    return decimal, "".join(sorted(junk)), parentheses
+
+
+def _parse_numeric (series : pl.Series, spec : Tuple[str, str, bool], target_dtype : pl.PolarsDataType, int_rounding : str) -> pl.Series :
+
+    decimal, junk, parentheses = spec
+    text = pl.col("v").cast(pl.Utf8, strict=False).str.strip_chars()
+
+    if junk :
+
+        junk_class = "".join("\\s" if c == " " else re.escape(c) for c in junk)
+        text = text.str.replace_all(f"[{junk_class}]", "")
+
+    if parentheses :
+        text = text.str.replace(r"^\((.*)\)$", "-$1")
+
+    if decimal == "," :
+        text = text.str.replace(",", ".", literal=True)
+
+    values = series.to_frame("v").select(text.cast(pl.Float64, strict=False)).to_series()
+
+    if target_dtype in (pl.Float32, pl.Float64) :
+        return values.cast(target_dtype).alias(series.name)
+
+    # Same integer rounding as numeric_cast_expr_from_utf8
+    if int_rounding == "nearest" :
+        rounded = values.round(0)
+
+    elif int_rounding == "floor" :
+        rounded = values.floor()
+
+    elif int_rounding == "ceil" :
+        rounded = values.ceil()
+
+    elif int_rounding == "truncate" :
+        rounded = values.to_frame("v").select(pl.when(pl.col("v") < 0).then(pl.col("v").ceil()).otherwise(pl.col("v").floor())).to_series()
+
+    else :
+        raise ValueError('int_rounding must be "nearest" | "floor" | "ceil" | "truncate"')
+
+    return rounded.cast(target_dtype, strict=False).alias(series.name)
+
+
+def cast_numeric_column (
+
+        series : pl.Series,
+        target_dtype : pl.PolarsDataType,
+        int_rounding : str = "nearest",
+        source : Optional[str] = None,
+
+    ) -> pl.Series :
+    """
+    Parse a column of number strings with a single inferred locale.
+
+    The locale (decimal separator, currency / percent signs, parentheses negatives) is
+    remembered per (source family, column). Mixed locales fall back to the multi-pass
+    cleaner, numeric_cast_expr_from_utf8 with a dot decimal.
+
+    Args:
+        series (pl.Series) : Utf8 column.
+        target_dtype (pl.DataType) : Float or integer dtype.
+        source (str) : Path of the file the column comes from, None to not remember.
+
+    Returns:
+        parsed (pl.Series) : Numeric column, same name.
+    """
+    key = _remember_key(source, series.name, "numeric")
+    spec = _recall(key)
+
+    if spec is None :
+
+        spec = sniff_numeric_locale(series)
+
+        with _LOCK :
+            _STATS["inferred"] += 1
+
+    if spec is not None :
+
+        parsed = _parse_numeric(series, spec, target_dtype, int_rounding)
+
+        if parsed.null_count() in (series.null_count(), _genuine_nulls(series)) :
+
+            _store(key, spec)
+
+            with _LOCK :
+                _STATS["single_pass"] += 1
+
+            return parsed
+
+    fallback = series.to_frame().select(numeric_cast_expr_from_utf8(series.name, target_dtype, ".", int_rounding)).to_series()
+
+    if spec is not None and fallback.null_count() >= parsed.null_count() :
+
+        _store(key, spec)
+        return parsed
+
+    _store(key, None)
+
+    with _LOCK :
+        _STATS["fallback"] += 1
+
+    log(f"[*] [CAST] Mixed numeric formats in {series.name} ({source}), multi-pass parse", "debug")
+
+    return fallback
+
+
+def casting_stats () -> Dict :
+    """
+    Inference counters : inferred, remembered (inference skipped), single_pass, fallback.
+    """
+    with _LOCK :
+        return {"formats" : len(_INFERRED), **_STATS}
+
+
+def forget_formats () -> None :
+    """
+    Drop every remembered format.
+    """
+    with _LOCK :
+        _INFERRED.clear()
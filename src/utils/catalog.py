@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+import bisect
+import importlib
+import threading
+import datetime as dt
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.config.parameters import CATALOG_MAX_AGE_SECONDS
+from src.utils.logger import log
+from src.utils.formatters import str_to_date
+from src.utils.dates import parse_date_any, parse_datetime_any
+
+
+class CatalogEntry (NamedTuple) :
+    """
+    Best file of a directory for one date.
+    """
+    date : dt.date
+    stamp : Tuple           # intraday sort key (hh, mm) / timestamp, from the filename
+    mtime : float
+    name : str
+    path : str
+
+
+class _CatalogIndex (NamedTuple) :
+
+    dir_mtime_ns : int
+    built_at : float
+    dates : List[dt.date]                   # sorted
+    best : Dict[dt.date, CatalogEntry]
+
+
+_INDEXES : Dict[Tuple, _CatalogIndex] = {}
+_LOCK = threading.Lock()
+
+# Lookups made while a cached result is computed : a persisted result replays them to know
+# whether a newer file would be picked now (see recording_lookups, lookup_changed)
+_RECORDER : ContextVar[Optional[List[Dict]]] = ContextVar("sentinelle_catalog_lookups", default=None)
+
+
+# ---------------- Filename parsers ----------------
+# A parser receives the regex match and returns (date, intraday sort key) or None.
+
+
+def parse_date_hh_mm (match : re.Match) -> Optional[Tuple[dt.date, Tuple]] :
+    """
+    Groups : ("YYYY-MM-DD", "HH", "MM") (greeks, NAV, leverages, concentration).
+    """
+    date_str, hh, mm = match.groups()[:3]
+
+    return str_to_date(date_str), (int(hh), int(mm))
+
+
+def parse_date_hhmm (match : re.Match) -> Optional[Tuple[dt.date, Tuple]] :
+    """
+    Groups : ("YYYY-MM-DD", "HH-MM") (expiries).
+    """
+    date_str, hhmm_str = match.group(1), match.group(2)
+    parts = hhmm_str.split("-")
+
+    if len(parts) != 2 :
+        return None
+
+    return str_to_date(date_str), (int(parts[0]), int(parts[1]))
+
+
+def parse_compact_timestamp (match : re.Match) -> Optional[Tuple[dt.date, Tuple]] :
+    """
+    Group : "YYYYMMDDTHHMMSS.fff" (screeners, positions).
+    """
+    ts = match.group(1)
+
+    return str_to_date(ts[0:8], "%Y%m%d"), (ts[9:11], ts[11:13], ts)
+
+
+def parse_date_timestamp (match : re.Match) -> Optional[Tuple[dt.date, Tuple]] :
+    """
+    Groups : (trade date, as-of timestamp) in any of the known formats (trade recaps).
+    """
+    if len(match.groups()) < 2 :
+        return None
+
+    trade_date_raw, as_of_raw = match.groups()[:2]
+
+    trade_date = parse_date_any(trade_date_raw)
+    as_of = parse_datetime_any(as_of_raw)
+
+    if trade_date is None or as_of is None :
+        return None
+
+    return trade_date, (as_of,)
+
+
+# ---------------- Index ----------------
+
+
+def _index_key (
+
+        dir_abs_path : str,
+        regex : re.Pattern,
+        parser : Callable,
+        extension : Optional[str],
+        match_stem : bool,
+
+    ) -> Tuple :
+
+    return (
+        os.path.normcase(os.path.abspath(dir_abs_path)),
+        regex.pattern,
+        regex.flags,
+        f"{parser.__module__}.{parser.__qualname__}",
+        extension.lower() if extension else None,
+        match_stem,
+    )
+
+
+def _build_index (
+
+        dir_abs_path : str,
+        regex : re.Pattern,
+        parser : Callable,
+        extension : Optional[str],
+        match_stem : bool,
+        dir_mtime_ns : int,
+
+    ) -> _CatalogIndex :
+    """
+    Single scan of the directory : best file per date, by (filename stamp, mtime).
+    """
+    start = time.time()
+    best : Dict[dt.date, CatalogEntry] = {}
+
+    extension = extension.lower() if extension else None
+
+    with os.scandir(dir_abs_path) as it :
+
+        for entry in it :
+
+            if not entry.is_file() :
+                continue
+
+            name = entry.name
+
+            if extension is not None and not name.lower().endswith(extension) :
+                continue
+
+            m = regex.match(os.path.splitext(name)[0] if match_stem else name)
+
+            if not m :
+                continue
+
+            try :
+                parsed = parser(m)
+
+            except (ValueError, TypeError, IndexError) :
+                continue
+
+            if parsed is None :
+                continue
+
+            date, stamp = parsed
+            mtime = entry.stat().st_mtime
+
+            current = best.get(date)
+
+            if current is None or (stamp, mtime) > (current.stamp, current.mtime) :
+                best[date] = CatalogEntry(date, stamp, mtime, name, entry.path)
+
+    log(f"[*] [CATALOG] Indexed {len(best)} dates in {time.time() - start:.2f} seconds from {dir_abs_path}", "debug")
+
+    return _CatalogIndex(dir_mtime_ns, time.time(), sorted(best), best)
+
+
+def _get_index (
+
+        dir_abs_path : str,
+        regex : re.Pattern,
+        parser : Callable,
+        extension : Optional[str],
+        match_stem : bool,
+
+    ) -> Optional[_CatalogIndex] :
+    """
+    Return the index of a directory, rebuilt only when the directory mtime moved
+    (file added / removed / renamed) or the index is older than CATALOG_MAX_AGE_SECONDS.
+    """
+    try :
+        dir_mtime_ns = os.stat(dir_abs_path).st_mtime_ns
+
+    except OSError :
+        return None
+
+    key = _index_key(dir_abs_path, regex, parser, extension, match_stem)
+    index = _INDEXES.get(key)
+
+    if index is not None and index.dir_mtime_ns == dir_mtime_ns and time.time() - index.built_at < CATALOG_MAX_AGE_SECONDS :
+        return index
+
+    with _LOCK :
+
+        index = _INDEXES.get(key)
+
+        if index is not None and index.dir_mtime_ns == dir_mtime_ns and time.time() - index.built_at < CATALOG_MAX_AGE_SECONDS :
+            return index
+
+        # The mtime is taken before the scan : a change during the scan triggers a rebuild on next call
+        index = _build_index(dir_abs_path, regex, parser, extension, match_stem, dir_mtime_ns)
+        _INDEXES[key] = index
+
+    return index
+
+
+def catalog_lookup (
+
+        dir_abs_path : Optional[str],
+        regex : re.Pattern,
+        date : Optional[str | dt.date | dt.datetime] = None,
+        mode : str = "eq",  # "eq", "le", "ge", "latest"
+
+        parser : Callable = parse_date_hh_mm,
+        extension : Optional[str] = None,
+        match_stem : bool = False,
+
+    ) -> Optional[CatalogEntry] :
+    """
+    Find the best file of a directory for a target date.
+
+    Args:
+        dir_abs_path (str) : Directory to look into.
+        regex (re.Pattern) : Filename pattern, its groups are read by the parser.
+        date (str | date) : Target date ("YYYY-MM-DD" when given as a string).
+        mode (str) :
+            - "eq" : exact date only
+            - "le" : latest date <= target date
+            - "ge" : earliest date >= target date
+            - "latest" : most recent date, whatever the target
+        parser (Callable) : Filename parser, see parse_* in this module.
+        extension (str) : Only consider files with this extension.
+        match_stem (bool) : Match the regex against the filename without extension.
+
+    Returns:
+        entry (CatalogEntry | None) : Best file for the resolved date, or None.
+    """
+    if mode not in ("eq", "le", "ge", "latest") :
+        raise ValueError(f"Unknown mode '{mode}'. Use 'eq', 'le', 'ge' or 'latest'.")
+
+    entry = _resolve(dir_abs_path, regex, date, mode, parser, extension, match_stem)
+    lookups = _RECORDER.get()
+
+    if lookups is not None and dir_abs_path :
+
+        lookups.append({
+
+            "dir" : dir_abs_path,
+            "pattern" : regex.pattern,
+            "flags" : regex.flags,
+            "parser" : f"{parser.__module__}:{parser.__qualname__}",
+            "extension" : extension,
+            "match_stem" : match_stem,
+            "date" : None if mode == "latest" else str_to_date(date).isoformat(),
+            "mode" : mode,
+            "name" : entry.name if entry is not None else None,
+
+        })
+
+    return entry
+
+
+def _resolve (
+
+        dir_abs_path : Optional[str],
+        regex : re.Pattern,
+        date : Optional[str | dt.date | dt.datetime],
+        mode : str,
+        parser : Callable,
+        extension : Optional[str],
+        match_stem : bool,
+
+    ) -> Optional[CatalogEntry] :
+
+    if not dir_abs_path or not os.path.isdir(dir_abs_path) :
+        return None
+
+    index = _get_index(dir_abs_path, regex, parser, extension, match_stem)
+
+    if index is None or not index.dates :
+        return None
+
+    if mode == "latest" :
+        return index.best[index.dates[-1]]
+
+    target = str_to_date(date)
+
+    # The exact date is preferred for every mode
+    if target in index.best :
+        return index.best[target]
+
+    if mode == "le" :
+
+        i = bisect.bisect_right(index.dates, target)
+        return index.best[index.dates[i - 1]] if i > 0 else None
+
+    if mode == "ge" :
+
+        i = bisect.bisect_left(index.dates, target)
+        return index.best[index.dates[i]] if i < len(index.dates) else None
+
+    return None
+
+
+@contextmanager
+def recording_lookups () :
+    """
+    Collect the catalog lookups made in the block (worker threads started with a copy of the context included).
+    Lookups of a nested recording are also reported to the enclosing one.
+
+    Usage:
+        with recording_lookups() as lookups :
+            value = compute()
+    """
+    outer = _RECORDER.get()
+    lookups = []
+    token = _RECORDER.set(lookups)
+
+    try :
+        yield lookups
+
+    finally :
+
+        _RECORDER.reset(token)
+
+        if outer is not None :
+            outer.extend(lookups)
+
+
+def report_lookups (lookups : List[Dict]) -> None :
+    """
+    Add lookups made earlier (a cached result served again) to the active recording, if any.
+    """
+    recorder = _RECORDER.get()
+
+    if recorder is not None and lookups :
+        recorder.extend(lookups)
+
+
+def lookup_changed (lookup : Dict) -> bool :
+    """
+    Whether a recorded lookup would resolve to another file now (a newer intraday version, a file removed...).
+    """
+    try :
+
+        module, qualname = lookup["parser"].split(":", 1)
+        parser = importlib.import_module(module)
+
+        for attr in qualname.split(".") :
+            parser = getattr(parser, attr)
+
+        regex = re.compile(lookup["pattern"], lookup["flags"])
+        entry = _resolve(lookup["dir"], regex, lookup["date"], lookup["mode"], parser, lookup["extension"], lookup["match_stem"])
+
+    except Exception :
+        return True
+
+    return (entry.name if entry is not None else None) != lookup["name"]
+
+
+def catalog_entries (
+
+        dir_abs_path : Optional[str],
+        regex : re.Pattern,
+        start_date : Optional[str | dt.date | dt.datetime] = None,
+        end_date : Optional[str | dt.date | dt.datetime] = None,
+
+        parser : Callable = parse_date_hh_mm,
+        extension : Optional[str] = None,
+        match_stem : bool = False,
+
+    ) -> List[CatalogEntry] :
+    """
+    Best file per date between start_date and end_date (both included), sorted by date.
+    """
+    if not dir_abs_path or not os.path.isdir(dir_abs_path) :
+        return []
+
+    index = _get_index(dir_abs_path, regex, parser, extension, match_stem)
+
+    if index is None :
+        return []
+
+    lo = 0 if start_date is None else bisect.bisect_left(index.dates, str_to_date(start_date))
+    hi = len(index.dates) if end_date is None else bisect.bisect_right(index.dates, str_to_date(end_date))
+
+    return [index.best[d] for d in index.dates[lo:hi]]
+
+
+def invalidate_catalog (dir_abs_path : Optional[str] = None) -> int :
+    """
+    Drop the index of one directory (all of them if None).
+
+    Returns:
+        dropped (int) : Number of indexes dropped.
+    """
+    with _LOCK :
+
+        if dir_abs_path is None :
+
+            dropped = len(_INDEXES)
+            _INDEXES.clear()
+
+            return dropped
+
+        target = os.path.normcase(os.path.abspath(dir_abs_path))
+        keys = [k for k in _INDEXES if k[0] == target]
+
+        for k in keys :
+            del _INDEXES[k]
+
+    return len(keys)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import warnings
+import threading
+import polars as pl
+
+from typing import Dict, Optional
+
+from src.config.parameters import COMPACTION_ENABLED, COMPACTION_HINTS
+from src.utils.logger import log
+
+
+_STATS = {"frames" : 0, "bytes_before" : 0, "bytes_after" : 0}
+_LOCK = threading.Lock()
+
+
+def enable_global_string_cache () -> None :
+    """
+    Categoricals of different files must share their dictionary to be joined or concatenated.
+    Recent Polars versions do it by default (the call is then a deprecated no-op).
+    """
+    with warnings.catch_warnings() :
+
+        warnings.simplefilter("ignore", DeprecationWarning)
+
+        if hasattr(pl, "enable_string_cache") :
+            pl.enable_string_cache()
+
+
+enable_global_string_cache()
+
+
+def _smallest_int (series : pl.Series) -> Optional[pl.DataType] :
+    """
+    Narrowest signed integer type holding every value of the series, None if it is already the narrowest.
+    """
+    low, high = series.min(), series.max()
+
+    if low is None or high is None :
+        return None
+
+    for dtype, bits in ((pl.Int8, 8), (pl.Int16, 16), (pl.Int32, 32)) :
+
+        if -(2 ** (bits - 1)) <= low and high < 2 ** (bits - 1) :
+            return dtype if dtype != series.dtype else None
+
+    return None
+
+
+def compact_dataframe (
+
+        dataframe : Optional[pl.DataFrame],
+        hints : Optional[str | Dict] = None,
+        source : Optional[str] = None,
+
+    ) -> Optional[pl.DataFrame] :
+    """
+    Shrink the columns a source declares as compactable in COMPACTION_HINTS.
+
+    Hints (all optional, columns absent from the frame are skipped) :
+        - "categorical" : low-cardinality strings -> pl.Categorical
+        - "enum" : {column : [categories]} -> pl.Enum, values outside the list become null
+        - "float32" : ratios and percentages -> pl.Float32
+        - "shrink_int" : integers -> the narrowest integer type holding their range
+
+    Args:
+        hints (str | dict) : Name of a COMPACTION_HINTS entry, or the hints themselves.
+        source (str) : File the frame was read from, for the log.
+
+    Returns:
+        dataframe (pl.DataFrame | None) : Compacted frame (the input itself when nothing applies).
+    """
+    if dataframe is None or hints is None or not COMPACTION_ENABLED :
+        return dataframe
+
+    hints = COMPACTION_HINTS.get(hints, {}) if isinstance(hints, str) else hints
+    schema = dataframe.schema
+
+    exprs = []
+
+    for col in hints.get("categorical", []) :
+
+        if col in schema and schema[col] == pl.Utf8 :
+            exprs.append(pl.col(col).cast(pl.Categorical))
+
+    for col, categories in hints.get("enum", {}).items() :
+
+        if col in schema and schema[col] == pl.Utf8 :
+            exprs.append(pl.col(col).cast(pl.Enum(categories), strict=False))
+
+    for col in hints.get("float32", []) :
+
+        if col in schema and schema[col] == pl.Float64 :
+            exprs.append(pl.col(col).cast(pl.Float32))
+
+    for col in hints.get("shrink_int", []) :
+
+        if col in schema and schema[col].is_integer() :
+
+            dtype = _smallest_int(dataframe[col])
+
+            if dtype is not None :
+                exprs.append(pl.col(col).cast(dtype))
+
+    if not exprs :
+        return dataframe
+
+    before = dataframe.estimated_size()
+    compacted = dataframe.with_columns(exprs)
+    after = compacted.estimated_size()
+
+    with _LOCK :
+
+        _STATS["frames"] += 1
+        _STATS["bytes_before"] += before
+        _STATS["bytes_after"] += after
+
+    log(f"[*] [COMPACT] {len(exprs)} columns compacted, {before / 1024 ** 2:.2f} MB -> {after / 1024 ** 2:.2f} MB ({before - after} bytes saved) for {source}", "info")
+
+    return compacted
+
+
+def compaction_stats () -> Dict :
+    """
+    Frames compacted and bytes saved since startup.
+    """
+    with _LOCK :
+        return {**_STATS, "bytes_saved" : _STATS["bytes_before"] - _STATS["bytes_after"]}
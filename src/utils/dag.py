@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import pickle
+import hashlib
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from src.utils.cache import cached_call, cache_stats, link_fingerprint
+from src.utils.logger import log
+
+
+class Node (NamedTuple) :
+    name : str
+    function : Callable
+    deps : Tuple[str, ...]
+    params : Tuple[str, ...]
+    fingerprint : Optional[Callable]        # sources only : cheap identity of the input (ex: file_fingerprint)
+    persist : bool
+
+
+def _digest (*parts : Any) -> str :
+
+    try :
+        raw = pickle.dumps(parts, protocol=pickle.HIGHEST_PROTOCOL)
+
+    except Exception :
+        raw = repr(parts).encode("utf-8")
+
+    return hashlib.md5(raw).hexdigest()
+
+
+class ComputeGraph :
+    """
+    Named computations and their dependencies, each memoized on the fingerprints of its inputs.
+
+    A source node loads a file and returns (frame, md5), like the loaders. Its memo key is a cheap
+    identity of the file (a stat), so a page asking for it again does not even open the sidecar.
+    A derived node receives the frames of its dependencies and returns a frame, its fingerprint is
+    the digest of its name, parameters and input fingerprints. A changed file therefore moves the
+    fingerprints of the nodes downstream of it only, every other node stays cached.
+
+    Usage:
+        graph = ComputeGraph("nav")
+
+        @graph.source("estimates", params=("fund",), fingerprint=lambda fund : file_fingerprint(path_of(fund)))
+        def estimates (fund) : return load_excel_to_dataframe(path_of(fund))
+
+        @graph.node("gross", deps=("estimates",), params=("fund",))
+        def gross (estimates, fund) : return ...
+
+        dataframe, md5 = graph.get("gross", fund="HV")
+    """
+
+    def __init__ (self, name : str) :
+
+        self.name = name
+        self.nodes : Dict[str, Node] = {}
+
+
+    def _register (self, node : Node) -> None :
+
+        missing = [dep for dep in node.deps if dep not in self.nodes]
+
+        if missing :
+            raise ValueError(f"Node {node.name} of {self.name} depends on unknown nodes {missing}")
+
+        self.nodes[node.name] = node
+
+
+    def source (self, name : str, params : Tuple[str, ...] = (), fingerprint : Optional[Callable] = None, persist : bool = False) -> Callable :
+        """
+        Register a loader. fingerprint(**params) must change whenever the loaded frame would.
+        """
+        def decorator (function : Callable) -> Callable :
+
+            self._register(Node(name, function, (), tuple(params), fingerprint, persist))
+            return function
+
+        return decorator
+
+
+    def node (self, name : str, deps : Tuple[str, ...] = (), params : Tuple[str, ...] = (), persist : bool = False) -> Callable :
+        """
+        Register a computation : function(*dependency frames, **params) -> frame.
+        """
+        def decorator (function : Callable) -> Callable :
+
+            self._register(Node(name, function, tuple(deps), tuple(params), None, persist))
+            return function
+
+        return decorator
+
+
+    def get (self, name : str, **params) -> Tuple[Any, Optional[str]] :
+        """
+        Value and fingerprint of a node, (None, None) if it or one of its inputs could not be loaded.
+        Each node only sees the parameters it declares.
+        """
+        node = self.nodes[name]
+        own = {param : params.get(param) for param in node.params}
+
+        cache_name = f"dag:{self.name}.{name}"
+
+        if not node.deps :
+            return self._get_source(node, own, cache_name)
+
+        inputs = [self.get(dep, **params) for dep in node.deps]
+
+        if any(value is None for value, _ in inputs) :
+            return None, None
+
+        fingerprints = [fingerprint for _, fingerprint in inputs]
+        fingerprint = _digest(cache_name, sorted(own.items()), fingerprints)
+
+        # Files of the inputs become files of this node (tags, invalidation, staleness checks)
+        link_fingerprint(fingerprint, *fingerprints)
+
+        value = cached_call(
+
+            cache_name,
+            {**own, "inputs" : fingerprints},
+            lambda : node.function(*(value for value, _ in inputs), **own),
+            persist=node.persist,
+
+        )
+
+        return (None, None) if value is None else (value, fingerprint)
+
+
+    def _get_source (self, node : Node, own : Dict[str, Any], cache_name : str) -> Tuple[Any, Optional[str]] :
+
+        identity = node.fingerprint(**own) if node.fingerprint is not None else None
+
+        if identity is None :
+
+            # No cheap identity (missing file...) : plain load, not memoized here
+            log(f"[!] [DAG] No fingerprint for {cache_name} {own}, loading without memo", "debug")
+            value, md5 = node.function(**own)
+
+            return (None, None) if value is None else (value, md5)
+
+        def load () :
+
+            value, md5 = node.function(**own)
+
+            # Not memoized when nothing was loaded
+            return None if value is None else (value, md5)
+
+        result = cached_call(cache_name, {**own, "identity" : identity}, load, persist=node.persist)
+
+        return (None, None) if result is None else result
+
+
+    def stats (self) -> Dict[str, Dict[str, int]] :
+        """
+        Hits and computations (misses) per node since startup.
+        """
+        prefix = f"dag:{self.name}."
+        functions = cache_stats()["functions"]
+
+        return {
+
+            name : dict(functions.get(prefix + name, {"hits" : 0, "misses" : 0, "bypasses" : 0}))
+            for name in self.nodes
+
+        }
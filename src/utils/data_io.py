@@ -3,19 +3,27 @@ from __future__ import annotations
 import os
 import io
 import time
-import hashlib
 import openpyxl
 import itertools
+import contextvars
 import xlwings as xw
 import polars as pl
 import pandas as pd
 
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, NamedTuple, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from openpyxl.utils import get_column_letter
 from src.config.parameters import *
 from src.config.paths import *
 from src.utils.logger import *
-from src.utils.formatters import numeric_cast_expr_from_utf8, date_cast_expr_from_utf8
+from src.utils.casting import cast_date_column, cast_numeric_column
+from src.utils.sidecar import sidecar_key, sidecar_enabled, read_sidecar, scan_sidecar, write_sidecar
+from src.utils.fingerprint import file_fingerprint
+from src.utils.cache import register_source
+from src.utils.single_flight import single_flight
+from src.utils.mirror import mirrored
+from src.utils.compaction import compact_dataframe
+from src.utils.governor import governed, heavy
 
 
 def polars_to_excel_bytes (dataframe : pl.DataFrame, sheet_name : str = "Sheet1") -> bytes :
@@ -30,6 +38,19 @@ def polars_to_excel_bytes (dataframe : pl.DataFrame, sheet_name : str = "Sheet1"
         return output.getvalue()
 
 
+def _source_stat (source_abs_path : str) -> Tuple[Optional[os.stat_result], Optional[Tuple[int, int]]] :
+    """
+    Stat of a source taken before reading it, and the (size, mtime_ns) version the mirror must serve.
+    """
+    try :
+        stat = os.stat(source_abs_path)
+
+    except OSError :
+        return None, None
+
+    return stat, (stat.st_size, stat.st_mtime_ns)
+
+
 def load_excel_to_dataframe (
         
         excel_file_abs_pth : str,
@@ -39,16 +60,24 @@ def load_excel_to_dataframe (
         cast_num : bool = True,
         allow_us_mdy: bool = False,        # set True if you truly expect mm/dd/yyyy
         date_formats: Optional[List[str]] = None,
+        use_sidecar : Optional[bool] = None,
+        compact : Optional[str | Dict] = None,
         
     ) -> Tuple[Optional[pl.DataFrame], Optional[str]]  :
     """
     Loads an Excel file and returns it as a Polars dataframe, applying schema overrides.
 
+    The parsed result is kept as a columnar sidecar (Arrow IPC) keyed on the file
+    identity and the parse arguments, so that later loads of an unchanged file are
+    a memory-mapped read instead of a full Excel parse.
+
     Args:
         excel_file_abs_pth (str): Absolute path to the Excel file.
         sheet_name (str): Sheet name to read from.
         specific_cols (list): List of columns to import. If None, then all columns
         schema_overrides (dict): Dictionary mapping column names to Polars types.
+        use_sidecar (bool): Bypass (False) or force (True) the sidecar cache. None follows SIDECAR_CACHE_ENABLED.
+        compact (str | dict): COMPACTION_HINTS entry (or hints) to shrink the dtypes with once parsed.
 
     Returns:
         df (pl.DataFrame | None) : Loaded dataframe, or None if an error occurs.
@@ -61,6 +90,75 @@ def load_excel_to_dataframe (
     if sheet_name is None or sheet_name == "" :
         sheet_name = 0 # The default sheet index
 
+    # One stat for the whole load : the sidecar key, the fingerprint and the mirrored copy follow the same version
+    stat, expect = _source_stat(excel_file_abs_pth)
+
+    key = None
+
+    if sidecar_enabled(use_sidecar) :
+
+        start = time.time()
+
+        key = sidecar_key(
+            
+            excel_file_abs_pth,
+            sheet_name=sheet_name,
+            specific_cols=specific_cols,
+            schema_overrides=schema_overrides,
+            stat=stat,
+            cast_num=cast_num,
+            allow_us_mdy=allow_us_mdy,
+            date_formats=date_formats,
+            **({"compact" : compact} if compact is not None else {}),
+        
+        )
+
+        df, md5_hash = read_sidecar(key)
+
+        if df is not None :
+
+            log(f"[*] [SIDECAR] Read in {time.time() - start:.2f} seconds for {excel_file_abs_pth}", "info")
+            register_source(md5_hash, excel_file_abs_pth)
+
+            return df, md5_hash
+
+    # File identity (taken before parsing) : a stat instead of hashing the loaded frame
+    md5_hash = file_fingerprint(excel_file_abs_pth, sheet_name, specific_cols, schema_overrides, cast_num, allow_us_mdy, date_formats, *([compact] if compact is not None else []), stat=stat)
+    register_source(md5_hash, excel_file_abs_pth)
+
+    if md5_hash is None :
+        return _parse_excel(excel_file_abs_pth, sheet_name, specific_cols, schema_overrides, cast_num, allow_us_mdy, date_formats, compact, key, md5_hash, expect)
+
+    # Sessions asking for the same file and arguments at the same time share one parse
+    return single_flight(
+
+        ("excel", md5_hash),
+        _parse_excel,
+        excel_file_abs_pth, sheet_name, specific_cols, schema_overrides, cast_num, allow_us_mdy, date_formats, compact, key, md5_hash, expect,
+
+    )
+
+
+@governed("excel")
+def _parse_excel (
+
+        excel_file_abs_pth : str,
+        sheet_name : str | int,
+        specific_cols : Optional[List],
+        schema_overrides : Optional[Dict],
+        cast_num : bool,
+        allow_us_mdy : bool,
+        date_formats : Optional[List[str]],
+        compact : Optional[str | Dict],
+        key : Optional[str],
+        md5_hash : Optional[str],
+        expect : Optional[Tuple[int, int]] = None,
+
+    ) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
+    """
+    Full Excel parse, casts and compaction, written to the sidecar (key None : no sidecar).
+    expect is the (size, mtime_ns) the key and fingerprint were built from.
+    """
     try :
 
         # sving the time of execution
@@ -68,7 +166,7 @@ def load_excel_to_dataframe (
         
         df = pl.read_excel(
 
-            source=excel_file_abs_pth,
+            source=mirrored(excel_file_abs_pth, expect),
             sheet_name=sheet_name,
             columns=specific_cols,              # If None, pl manage this case
             schema_overrides=None if cast_num is True else schema_overrides   # If None, Polars manages this case
@@ -77,16 +175,16 @@ def load_excel_to_dataframe (
 
         if cast_num is False or schema_overrides is None :
 
-            csv_bytes = df.write_csv().encode("utf-8")
-            md5_hash = hashlib.md5(csv_bytes).hexdigest()
-
             log(f"[*] [POLARS] Read in {time.time() - start:.2f} seconds from {excel_file_abs_pth}", "info")
+
+            df = compact_dataframe(df, compact, excel_file_abs_pth)
+            write_sidecar(key, df, md5_hash)
             
             return df, md5_hash
 
 
         actual = dict(zip(df.columns, df.dtypes))
-        exprs: list[pl.Expr] = []
+        exprs: list[pl.Expr | pl.Series] = []
 
         for col, target_dtype in schema_overrides.items() :
 
@@ -99,20 +197,21 @@ def load_excel_to_dataframe (
             if actual_dtype == target_dtype :
                 continue
 
-            # If the column is a Date (in string format)
-            is_target_date = target_dtype in (pl.Date, pl.datetime)
+            # If the column is a Date (in string format) : one parse with the inferred format
+            is_target_date = target_dtype in (pl.Date, pl.Datetime)
 
             if is_target_date and actual_dtype == pl.Utf8 :
 
                 exprs.append(
 
-                    date_cast_expr_from_utf8(
+                    cast_date_column(
 
-                        col,
-                        to_datetime=(target_dtype == pl.datetime),
+                        df[col],
+                        to_datetime=(target_dtype == pl.Datetime),
                         formats=date_formats,
                         allow_us_mdy=allow_us_mdy,
-                        enable_excel_serial=True
+                        enable_excel_serial=True,
+                        source=excel_file_abs_pth,
 
                     )
 
@@ -120,7 +219,7 @@ def load_excel_to_dataframe (
 
                 continue
                         
-            # If target is numeric and actual is Utf8 → clean+cast from string
+            # If target is numeric and actual is Utf8 → one parse with the inferred locale
             is_target_float = target_dtype in (pl.Float32, pl.Float64)
             is_target_int = target_dtype in (pl.Int8, pl.Int16, pl.Int32, pl.Int64, pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64)
             
@@ -128,11 +227,11 @@ def load_excel_to_dataframe (
                 
                 exprs.append(
 
-                    numeric_cast_expr_from_utf8(
-                        col,
+                    cast_numeric_column(
+                        df[col],
                         target_dtype,
-                        decimal=".",            # change to "," if your inputs are EU-style
                         int_rounding="nearest", # or "truncate"/"floor"/"ceil"
+                        source=excel_file_abs_pth,
                     )
 
                 )
@@ -145,11 +244,11 @@ def load_excel_to_dataframe (
         if exprs :
             df = df.with_columns(exprs)
 
-        csv_bytes = df.write_csv().encode("utf-8")
-        md5_hash = hashlib.md5(csv_bytes).hexdigest()
-
         log(f"[*] [POLARS] Read in {time.time() - start:.2f} seconds from {excel_file_abs_pth}", "info")
 
+        df = compact_dataframe(df, compact, excel_file_abs_pth)
+        write_sidecar(key, df, md5_hash)
+
         return df, md5_hash
     
     except Exception as e :
@@ -159,6 +258,162 @@ def load_excel_to_dataframe (
         return None, None
 
 
+def scan_excel_to_lazyframe (
+        
+        excel_file_abs_pth : str,
+        sheet_name : str = "Sheet1",
+        specific_cols : Optional[List] = None,
+        schema_overrides : Optional[Dict] = None,
+        cast_num : bool = True,
+        allow_us_mdy: bool = False,
+        date_formats: Optional[List[str]] = None,
+        
+    ) -> Tuple[Optional[pl.LazyFrame], Optional[str]]  :
+    """
+    Lazy counterpart of load_excel_to_dataframe, over the columnar sidecar of the file.
+
+    The Excel file is parsed once (on a sidecar miss), then every call returns a
+    pl.LazyFrame on the memory-mapped copy : .filter() and .select() chained by
+    the caller are pushed down into the scan, and only the selected columns and
+    matching rows are materialised at .collect().
+
+    Args:
+        Same as load_excel_to_dataframe.
+
+    Returns:
+        (lf, md5) : Lazy frame and the same fingerprint load_excel_to_dataframe returns, or (None, None).
+    """
+    if not os.path.isfile(excel_file_abs_pth) :
+        
+        log(f"[-] File not found : {excel_file_abs_pth}", "error")
+        return None, None
+
+    if sheet_name is None or sheet_name == "" :
+        sheet_name = 0 # The default sheet index
+
+    if not sidecar_enabled() :
+
+        df, md5_hash = load_excel_to_dataframe(excel_file_abs_pth, sheet_name, specific_cols, schema_overrides, cast_num, allow_us_mdy, date_formats)
+        return (df.lazy(), md5_hash) if df is not None else (None, None)
+
+    key = sidecar_key(
+
+        excel_file_abs_pth,
+        sheet_name=sheet_name,
+        specific_cols=specific_cols,
+        schema_overrides=schema_overrides,
+        cast_num=cast_num,
+        allow_us_mdy=allow_us_mdy,
+        date_formats=date_formats,
+
+    )
+
+    lazyframe, md5_hash = scan_sidecar(key)
+
+    if lazyframe is not None :
+        return lazyframe, md5_hash
+
+    # Miss : parse once, which writes the sidecar
+    df, md5_hash = load_excel_to_dataframe(excel_file_abs_pth, sheet_name, specific_cols, schema_overrides, cast_num, allow_us_mdy, date_formats, use_sidecar=True)
+
+    if df is None :
+        return None, None
+
+    lazyframe, _ = scan_sidecar(key)
+
+    # Sidecar could not be written (disk full, read-only cache dir) : stay lazy over the parsed frame
+    return (lazyframe if lazyframe is not None else df.lazy()), md5_hash
+
+
+class LoadResult (NamedTuple) :
+    """
+    Outcome of one file of a load_many batch.
+    """
+    path : Optional[str]
+    dataframe : Optional[pl.DataFrame]
+    md5 : Optional[str]
+    seconds : float
+    error : Optional[str]
+
+
+def _load_spec (spec : Tuple | Dict) -> LoadResult :
+    """
+    Load one spec, never raises : failures are reported in the result.
+    """
+    kwargs = dict(spec) if isinstance(spec, dict) else dict(zip(("excel_file_abs_pth", "sheet_name", "specific_cols", "schema_overrides"), spec))
+    path = kwargs.get("excel_file_abs_pth")
+
+    start = time.time()
+
+    try :
+
+        df, md5_hash = load_excel_to_dataframe(**kwargs)
+        error = None if df is not None else "File could not be loaded"
+
+    except Exception as e :
+        df, md5_hash, error = None, None, f"{type(e).__name__} : {e}"
+
+    return LoadResult(path, df, md5_hash, time.time() - start, error)
+
+
+def load_many (
+
+        specs : List[Tuple | Dict],
+        max_workers : Optional[int] = None,
+        use_processes : bool = False,
+
+    ) -> List[LoadResult] :
+    """
+    Load several Excel files concurrently, a batch takes about as long as its slowest file.
+
+    Args:
+        specs (list) : One entry per file, either a tuple (path, sheet_name, specific_cols, schema_overrides)
+            (trailing items may be omitted) or a dict of load_excel_to_dataframe keyword arguments.
+        max_workers (int) : Pool size, LOAD_MANY_MAX_WORKERS by default.
+        use_processes (bool) : Parse in worker processes instead of threads. Threads are enough
+            for the calamine engine, which parses without the GIL.
+
+    Returns:
+        results (list) : LoadResult per spec, in the order of specs.
+    """
+    max_workers = LOAD_MANY_MAX_WORKERS if max_workers is None else max_workers
+
+    if not specs :
+        return []
+
+    start = time.time()
+    workers = max(1, min(max_workers, len(specs)))
+
+    if workers == 1 :
+        results = [_load_spec(spec) for spec in specs]
+
+    else :
+
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+        with pool(max_workers=workers) as executor :
+
+            if use_processes :
+                results = list(executor.map(_load_spec, specs))
+
+            else :
+                # Workers keep the caller's context (governor priority, load plan)
+                futures = [executor.submit(contextvars.copy_context().run, _load_spec, spec) for spec in specs]
+                results = [future.result() for future in futures]
+
+    failed = sum(r.error is not None for r in results)
+    slowest = max(r.seconds for r in results)
+
+    log(f"[*] [POLARS] Loaded {len(results) - failed}/{len(results)} files in {time.time() - start:.2f} seconds (slowest {slowest:.2f}) on {workers} workers", "info")
+
+    for result in results :
+
+        if result.error is not None :
+            log(f"[-] Failed to load {result.path} : {result.error}", "error")
+
+    return results
+
+
 def load_csv_to_dataframe (
         
         csv_abs_path : str,
@@ -186,19 +441,24 @@ def load_csv_to_dataframe (
 
         start = time.time()
 
-        df = pl.read_csv(
+        # Stat before reading : the fingerprint names the version the frame is read from
+        stat, expect = _source_stat(csv_abs_path)
+        md5_hash = file_fingerprint(csv_abs_path, specific_cols, schema_overrides, stat=stat) if stat is not None else None
 
-            source=csv_abs_path,
-            columns=specific_cols,
-            schema_overrides=schema_overrides,
+        # Threads come from the shared Polars pool, the governor caps the concurrent reads
+        with heavy("csv") :
 
-            low_memory=False,   # In order to get speed lecture
-            n_threads=4         # In order to get speed lecture
+            df = pl.read_csv(
 
-        )
+                source=mirrored(csv_abs_path, expect),
+                columns=specific_cols,
+                schema_overrides=schema_overrides,
 
-        csv_bytes = df.write_csv().encode("utf-8")
-        md5_hash = hashlib.md5(csv_bytes).hexdigest()
+                low_memory=False,   # In order to get speed lecture
+
+            )
+
+        register_source(md5_hash, csv_abs_path)
 
         log(f"[*] [POLARS] Read in {time.time() - start:.2f} seconds from CSV {csv_abs_path}", "info")
 
@@ -237,15 +497,19 @@ def load_json_to_dataframe (
             
         start = time.time()
 
-        df = pl.read_json(
+        stat, expect = _source_stat(json_abs_path)
+        md5_hash = file_fingerprint(json_abs_path, schema_overrides, stat=stat) if stat is not None else None
 
-            source=json_abs_path,
-            schema_overrides=schema_overrides
+        with heavy("json") :
 
-        )
+            df = pl.read_json(
+
+                source=mirrored(json_abs_path, expect),
+                schema_overrides=schema_overrides
+
+            )
 
-        csv_bytes = df.write_csv().encode("utf-8")
-        md5_hash = hashlib.md5(csv_bytes).hexdigest()
+        register_source(md5_hash, json_abs_path)
 
         log(f"[*] [POLARS] Read in {time.time() - start:.2f} seconds from JSON {json_abs_path}", "info")
 
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import math
+import polars as pl
+
+from typing import Dict, List, Optional
+
+
+# Display kinds : scale applied to the value, decimals and suffix of the string
+DISPLAY_KINDS : Dict[str, Dict] = {
+
+    "number" : {"decimals" : 2, "scale" : 1.0, "suffix" : ""},
+    "integer" : {"decimals" : 0, "scale" : 1.0, "suffix" : ""},
+    "percent" : {"decimals" : 2, "scale" : 100.0, "suffix" : "%"},        # 0.0123 -> "1.23%"
+    "percent_points" : {"decimals" : 2, "scale" : 1.0, "suffix" : "%"},   # 1.23 -> "1.23%"
+    "bps" : {"decimals" : 0, "scale" : 10_000.0, "suffix" : " bp"},       # 0.0123 -> "123 bp"
+
+}
+
+POSITIVE_CLASS = "positive"
+NEGATIVE_CLASS = "negative"
+SIGN_SUFFIX = "__sign"
+
+
+def number_to_string_expr (
+
+        expr : pl.Expr,
+
+        decimals : int = 2,
+        thousand_sep : str = ",",
+        decimal_sep : str = ".",
+
+        scale : float = 1.0,
+        suffix : str = "",
+        null : str = " - ",
+        groups : int = 7,
+
+    ) -> pl.Expr :
+    """
+    Fixed precision, thousand separated string of a numeric expression, with string expressions only.
+    Example: 1234567.891 -> "1,234,567.89"
+
+    Values are rounded half away from zero on integer units, value * 10 ** decimals (no "-0.00") :
+    0.125 -> "0.13", 2.675 -> "2.68", -0.005 -> "-0.01", where "{:.2f}" rounds the exact binary value
+    (2.675 -> "2.67"). Null, NaN and values too large for 64-bit units are shown as `null`. `groups` is the number of 3-digit groups handled
+    (7 covers every 64-bit value), format_display passes the smallest one the data needs.
+    """
+    value = expr.cast(pl.Float64, strict=False)
+    value = value * scale if scale != 1.0 else value
+
+    factor = 10 ** decimals
+    units = (value.abs() * factor).round(0, mode="half_away_from_zero").cast(pl.Int64, strict=False)
+
+    integer = units // factor
+
+    if thousand_sep :
+
+        # Digit groups from the top one : a row below 1000^(k+1) restarts at its group k (unpadded)
+        text = (integer // 1000 ** (groups - 1)).cast(pl.Utf8)
+
+        for k in range(groups - 2, -1, -1) :
+
+            group = (integer // 1000 ** k % 1000).cast(pl.Utf8)
+
+            text = (
+                pl.when(integer >= 1000 ** (k + 1))
+                .then(pl.concat_str([text, pl.lit(thousand_sep), group.str.zfill(3)]))
+                .otherwise(group)
+            )
+
+        integer = text
+
+    else :
+        integer = integer.cast(pl.Utf8)
+
+    sign = pl.when((value < 0) & (units > 0)).then(pl.lit("-")).otherwise(pl.lit(""))
+
+    parts = [sign, integer]
+
+    if decimals > 0 :
+        parts += [pl.lit(decimal_sep), (units % factor).cast(pl.Utf8).str.zfill(decimals)]
+
+    if suffix :
+        parts.append(pl.lit(suffix))
+
+    return (
+        pl.when(value.is_null() | value.is_nan() | units.is_null())
+        .then(pl.lit(null))
+        .otherwise(pl.concat_str(parts))
+    )
+
+
+def display_string_to_number_expr (
+
+        expr : pl.Expr,
+
+        thousand_sep : str = ",",
+        decimal_sep : str = ".",
+
+    ) -> pl.Expr :
+    """
+    Numeric value of a display string ("1,234.50", "-1.23%", "12 bp"), null for placeholders.
+    """
+    text = expr.cast(pl.Utf8).str.strip_chars()
+
+    if thousand_sep :
+        text = text.str.replace_all(thousand_sep, "", literal=True)
+
+    text = text.str.replace_all(r"\s|%|bp$", "")
+
+    if decimal_sep != "." :
+        text = text.str.replace_all(decimal_sep, ".", literal=True)
+
+    return text.cast(pl.Float64, strict=False)
+
+
+def sign_class_expr (expr : pl.Expr) -> pl.Expr :
+    """
+    Sign class of a numeric expression : "positive" (zero included), "negative", null for null / NaN.
+    """
+    value = expr.cast(pl.Float64, strict=False)
+
+    return (
+        pl.when(value.is_null() | value.is_nan()).then(pl.lit(None, dtype=pl.Utf8))
+        .when(value < 0).then(pl.lit(NEGATIVE_CLASS))
+        .otherwise(pl.lit(POSITIVE_CLASS))
+    )
+
+
+def numeric_columns (dataframe : pl.DataFrame) -> List[str] :
+    return [col for col, dtype in dataframe.schema.items() if dtype.is_numeric()]
+
+
+def format_display (
+
+        dataframe : pl.DataFrame,
+        columns : Optional[List[str] | Dict[str, str | Dict]] = None,
+
+        kind : str = "number",
+        decimals : Optional[int] = None,
+        thousand_sep : str = ",",
+        decimal_sep : str = ".",
+        null : str = " - ",
+
+        sign_suffix : Optional[str] = None,
+
+    ) -> pl.DataFrame :
+    """
+    Format columns into display strings in a single with_columns pass.
+
+    Args:
+        columns : Columns to format with `kind` (all numeric columns if None), or a {column : kind or options}
+            mapping, options being a dict of number_to_string_expr arguments with an optional "kind".
+        sign_suffix (str) : When set, adds a "<column><sign_suffix>" sign class column for every formatted
+            column, computed from the numbers before formatting.
+    """
+    if columns is None :
+        columns = numeric_columns(dataframe)
+
+    if not isinstance(columns, dict) :
+        columns = {col : kind for col in columns}
+
+    defaults = {"thousand_sep" : thousand_sep, "decimal_sep" : decimal_sep, "null" : null}
+    options = {}
+
+    for col, spec in columns.items() :
+
+        if isinstance(spec, str) :
+            options[col] = {**defaults, **DISPLAY_KINDS[spec], **({"decimals" : decimals} if decimals is not None else {})}
+
+        else :
+            spec = dict(spec)
+            options[col] = {**defaults, **DISPLAY_KINDS[spec.pop("kind", kind)], **spec}
+
+    # Largest magnitude per column (one scan) : only the digit groups the data needs are built
+    largest = dataframe.select([
+        (pl.col(col).cast(pl.Float64, strict=False).abs().max() * options[col]["scale"]).alias(col)
+        for col in options
+    ]).row(0, named=True) if options else {}
+
+    exprs = []
+
+    for col, opts in options.items() :
+
+        if "groups" not in opts and largest[col] is not None and math.isfinite(largest[col]) :
+            opts["groups"] = min(7, max(1, (len(str(int(largest[col]) + 1)) + 2) // 3))
+
+        exprs.append(number_to_string_expr(pl.col(col), **opts).alias(col))
+
+        if sign_suffix is not None :
+            exprs.append(sign_class_expr(pl.col(col)).alias(f"{col}{sign_suffix}"))
+
+    return dataframe.with_columns(exprs)
+
+
+def aggrid_sign_class_rules (
+
+        columns : List[str],
+        sign_suffix : str = SIGN_SUFFIX,
+        css_prefix : str = "sign-",
+
+    ) -> Dict[str, Dict[str, str]] :
+    """
+    AgGrid cellClassRules per column, reading the sign class columns of format_display(sign_suffix=...).
+
+    Usage:
+        for col, rules in aggrid_sign_class_rules(cols).items() :
+            gb.configure_column(col, cellClassRules=rules)
+            gb.configure_column(f"{col}__sign", hide=True)
+    """
+    return {
+
+        col : {
+            f"{css_prefix}{cls}" : f"data && data['{col}{sign_suffix}'] === '{cls}'"
+            for cls in (POSITIVE_CLASS, NEGATIVE_CLASS)
+        }
+        for col in columns
+
+    }
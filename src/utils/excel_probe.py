@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import time
+import openpyxl
+import threading
+
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.config.parameters import EXCEL_PROBE_CACHE_MAX_ENTRIES
+from src.utils.logger import log
+from src.utils.mirror import mirrored
+
+
+class WorkbookProbe (NamedTuple) :
+    """
+    Layout of a workbook, without its data.
+    """
+    path : str
+    sheets : List[str]
+    dimensions : Dict[str, Tuple[Optional[int], Optional[int]]]    # sheet -> (rows, columns), as declared by the file
+    headers : Dict[str, List[str]]                                 # sheet -> first row, empty cells skipped
+
+
+# (path, size, mtime_ns) -> WorkbookProbe, least recently used first
+_PROBES : OrderedDict[Tuple, WorkbookProbe] = OrderedDict()
+_LOCK = threading.Lock()
+
+_STATS = {"hits" : 0, "misses" : 0}
+
+
+def _read_probe (file_abs_path : str, expect : Optional[Tuple[int, int]] = None) -> WorkbookProbe :
+    """
+    Read sheet names, declared dimensions and header rows. The read-only workbook
+    streams the first row of each sheet, data rows are never parsed.
+    expect is the (size, mtime_ns) the probe is cached under.
+    """
+    workbook = openpyxl.load_workbook(mirrored(file_abs_path, expect), read_only=True, data_only=True)
+
+    try :
+
+        dimensions, headers = {}, {}
+
+        for worksheet in workbook.worksheets :
+
+            first_row = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+
+            dimensions[worksheet.title] = (worksheet.max_row, worksheet.max_column)
+            headers[worksheet.title] = [str(v).strip() for v in first_row if v is not None and str(v).strip() != ""]
+
+        return WorkbookProbe(file_abs_path, list(workbook.sheetnames), dimensions, headers)
+
+    finally :
+        workbook.close()
+
+
+def probe_workbook (file_abs_path : Optional[str]) -> Optional[WorkbookProbe] :
+    """
+    Sheet names, dimensions and header rows of a workbook, cached on the file identity.
+
+    Returns:
+        probe (WorkbookProbe | None) : None if the file is missing or can not be opened as .xlsx.
+    """
+    try :
+        stat = os.stat(file_abs_path)
+
+    except (OSError, TypeError) :
+        return None
+
+    key = (os.path.normcase(os.path.abspath(file_abs_path)), stat.st_size, stat.st_mtime_ns)
+
+    with _LOCK :
+
+        probe = _PROBES.get(key)
+
+        if probe is not None :
+
+            _PROBES.move_to_end(key)
+            _STATS["hits"] += 1
+
+            return probe
+
+        _STATS["misses"] += 1
+
+    start = time.time()
+
+    try :
+        probe = _read_probe(file_abs_path, (stat.st_size, stat.st_mtime_ns))
+
+    except Exception as e :
+
+        log(f"[!] [PROBE] Can not probe {file_abs_path} : {e}", "warning")
+        return None
+
+    log(f"[*] [PROBE] Probed {len(probe.sheets)} sheets in {time.time() - start:.2f} seconds from {file_abs_path}", "debug")
+
+    with _LOCK :
+
+        _PROBES[key] = probe
+
+        while len(_PROBES) > EXCEL_PROBE_CACHE_MAX_ENTRIES :
+            _PROBES.popitem(last=False)
+
+    return probe
+
+
+def sheet_columns (
+
+        file_abs_path : str,
+        sheet_name : Optional[str | int] = None,
+
+    ) -> Optional[List[str]] :
+    """
+    Header row of one sheet (first sheet when sheet_name is None or 0).
+
+    Returns:
+        columns (list | None) : None if the workbook can not be probed or the sheet does not exist.
+    """
+    probe = probe_workbook(file_abs_path)
+
+    if probe is None or not probe.sheets :
+        return None
+
+    if sheet_name is None or sheet_name == "" :
+        sheet_name = 0
+
+    if isinstance(sheet_name, int) :
+        return probe.headers[probe.sheets[sheet_name]] if sheet_name < len(probe.sheets) else None
+
+    return probe.headers.get(sheet_name)
+
+
+def validate_excel_columns (
+
+        file_abs_path : str,
+        columns : Optional[List[str]] = None,
+        sheet_name : Optional[str | int] = "Sheet1",
+        required : Optional[List[str]] = None,
+
+    ) -> Tuple[bool, Optional[List[str]], List[str]] :
+    """
+    Check a workbook against the columns a reader is about to ask for, before the full parse.
+
+    Files that can not be probed (.xls, protected, ...) are let through unchanged,
+    the full read stays the judge for them.
+
+    Args:
+        columns (list) : Columns the reader wants, None for all.
+        sheet_name (str | int) : Sheet to read.
+        required (list) : Columns without which the file is useless.
+
+    Returns:
+        (ok, columns, missing) :
+            - ok : False if the sheet is missing or a required column is absent
+            - columns : requested columns present in the header, in the requested order (None for all)
+            - missing : requested columns absent from the header (schema drift)
+    """
+    probe = probe_workbook(file_abs_path)
+
+    if probe is None :
+        return True, columns, []
+
+    available = sheet_columns(file_abs_path, sheet_name)
+
+    if available is None :
+
+        log(f"[-] [PROBE] Sheet {sheet_name} not found in {file_abs_path} (sheets : {probe.sheets})", "error")
+        return False, None, list(columns or [])
+
+    available_set = set(available)
+
+    missing_required = [c for c in (required or []) if c not in available_set]
+
+    if missing_required :
+
+        log(f"[-] [PROBE] Required columns missing in {file_abs_path} : {missing_required}", "error")
+        return False, None, missing_required
+
+    if columns is None :
+        return True, None, []
+
+    present = [c for c in columns if c in available_set]
+    missing = [c for c in columns if c not in available_set]
+
+    if missing :
+        log(f"[!] [PROBE] Schema drift in {file_abs_path}, columns not found : {missing}", "warning")
+
+    return bool(present), present, missing
+
+
+def probe_stats () -> Dict :
+    """
+    Probe cache counters.
+    """
+    with _LOCK :
+        return {"entries" : len(_PROBES), **_STATS}
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import time
+import inspect
+import functools
+import threading
+import polars as pl
+import plotly.io as pio
+import plotly.graph_objects as go
+
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.cache import cached_call
+from src.utils.formatters import dataframe_fingerprint
+from src.utils.logger import log
+
+
+_LOCK = threading.Lock()
+_STATS : Dict[str, Dict[str, float]] = {}
+
+
+def figure_from_spec (spec : str) -> go.Figure :
+    """
+    Editable figure of a cached JSON spec.
+
+    The spec was serialised from a validated figure : it is loaded without validating the traces
+    again, then validation is switched back on so that the caller's edits are checked as usual.
+    Every call returns a new figure, edits never reach the cached spec.
+    """
+    fig = go.Figure(json.loads(spec), _validate=False)
+
+    fig._validate = True
+    fig._layout_obj._validate = True
+
+    for trace in fig.data :
+        trace._validate = True
+
+    return fig
+
+
+def _function_stats (name : str) -> Dict[str, float] :
+    return _STATS.setdefault(name, {"hits" : 0, "misses" : 0, "build_seconds" : 0.0, "saved_seconds" : 0.0})
+
+
+def figure_cache (
+
+        func : Optional[Callable] = None,
+        *,
+        ttl : Optional[float] = None,
+        namespace : Optional[str] = None,
+
+    ) -> Callable :
+    """
+    Cache the serialised JSON of a chart function's figure, keyed on the function and its arguments :
+    the md5 arguments (md5, md5_1...) identify the frames, with their shape and columns, along with
+    the display options. Without any md5, the frames are identified by their content.
+
+    Stored in the shared result cache (same tags, byte budget and TTL as scoped_cache), so an md5
+    argument ties the figure to its source files. A hit skips the figure construction and the
+    validation of its traces (see figure_from_spec). None figures are not cached.
+
+    A frame derived from several sources or from other options than the arguments (joins, windows)
+    must be passed with an md5 combining them.
+
+    Usage:
+        @figure_cache()
+        def chart (_dataframe, md5, fund, height=800) -> go.Figure : ...
+    """
+    def decorator (function : Callable) -> Callable :
+
+        name = f"figure:{function.__module__}.{function.__qualname__}"
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper (*args, **kwargs) :
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            arguments = {arg : value for arg, value in bound.arguments.items() if not arg.startswith("_")}
+
+            frames = [(arg, value) for arg, value in bound.arguments.items() if arg.startswith("_") and isinstance(value, pl.DataFrame)]
+            keyed = any(value is not None for arg, value in arguments.items() if arg.startswith("md5"))
+
+            # Frames (underscore arguments) : the md5 arguments stand for their content, row hashing otherwise
+            arguments["<frames>"] = [
+
+                (arg, value.shape, value.columns) if keyed else (arg, dataframe_fingerprint(value), value.columns)
+                for arg, value in frames
+
+            ]
+
+            built = []
+
+            def build () :
+
+                start = time.perf_counter()
+                fig = function(*args, **kwargs)
+
+                if fig is None :
+                    return None
+
+                spec = pio.to_json(fig, validate=False)
+                seconds = time.perf_counter() - start
+
+                built.append(seconds)
+
+                return spec, seconds
+
+            start = time.perf_counter()
+            cached = cached_call(name, arguments, build, ttl, namespace)
+            elapsed = time.perf_counter() - start
+
+            with _LOCK :
+
+                stats = _function_stats(name)
+
+                if built :
+
+                    stats["misses"] += 1
+                    stats["build_seconds"] += built[0]
+
+                elif cached is not None :
+
+                    stats["hits"] += 1
+                    stats["saved_seconds"] += max(0.0, cached[1] - elapsed)
+
+            if cached is None :
+                return None
+
+            if built :
+                log(f"[*] [FIGURE] {name} built and serialised in {built[0]:.3f} seconds ({len(cached[0]) / 1024:.0f} KB)", "debug")
+
+            return figure_from_spec(cached[0])
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def figure_cache_stats () -> Dict :
+    """
+    Hits, misses, hit rate, time spent building and serialising figures, and time saved by the hits.
+    """
+    with _LOCK :
+
+        functions = {name : dict(stats) for name, stats in _STATS.items()}
+
+    hits = sum(s["hits"] for s in functions.values())
+    misses = sum(s["misses"] for s in functions.values())
+
+    return {
+
+        "hits" : hits,
+        "misses" : misses,
+        "hit_rate" : hits / (hits + misses) if hits + misses else 0.0,
+        "build_seconds" : sum(s["build_seconds"] for s in functions.values()),
+        "saved_seconds" : sum(s["saved_seconds"] for s in functions.values()),
+        "functions" : functions,
+
+    }
+
+
+def reset_figure_cache_stats () -> None :
+
+    with _LOCK :
+        _STATS.clear()
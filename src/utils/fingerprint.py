@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import re
+import json
+import hashlib
+import threading
+import polars as pl
+
+from typing import Callable, Optional
+
+from src.utils.formatters import dataframe_fingerprint
+
+
+def file_fingerprint (source_abs_path : str, *parts, stat : Optional[os.stat_result] = None) -> Optional[str] :
+    """
+    Fingerprint of a file straight from disk, based on its identity (inode, size, mtime)
+    and on whatever else changes the loaded frame (sheet, columns, schema, ...).
+
+    Costs a single stat, whatever the size of the file. Computed eagerly on purpose : loaders stat
+    before reading, so that the fingerprint names the version the frame was read from. Only frames
+    derived in memory get a LazyFingerprint (frame_fingerprint).
+
+    Args:
+        source_abs_path (str) : Absolute path of the source file.
+        *parts : Extra parse arguments mixed into the fingerprint.
+        stat (os.stat_result) : Stat already taken by the caller, none is taken then.
+
+    Returns:
+        fingerprint (str | None) : Hex digest, or None if the file can not be stat'ed.
+    """
+    if stat is None :
+
+        try :
+            stat = os.stat(source_abs_path)
+
+        except OSError :
+            return None
+
+    payload = [
+
+        os.path.normcase(os.path.abspath(source_abs_path)),
+        stat.st_ino,
+        stat.st_size,
+        stat.st_mtime_ns,
+        [str(p) if not isinstance(p, dict) else {str(k) : str(v) for k, v in p.items()} for p in parts],
+
+    ]
+
+    raw = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+
+    return hashlib.md5(raw).hexdigest()
+
+
+def file_family (source_abs_path : str) -> str :
+    """
+    Identity shared by the successive versions of a daily report : same directory,
+    same filename once digits (dates, timestamps) are masked.
+    """
+    dir_abs_path, name = os.path.split(os.path.normcase(os.path.abspath(source_abs_path)))
+
+    return os.path.join(dir_abs_path, re.sub(r"\d", "#", name))
+
+
+class LazyFingerprint :
+    """
+    Fingerprint computed on first use only.
+
+    Behaves like the hex string it stands for (str(), ==, hash, pickling), so it
+    can be passed wherever an md5 string was expected. st.cache_data hashes it
+    through __reduce__, which is the moment the digest is actually computed.
+    """
+    __slots__ = ("_compute", "_value", "_lock")
+
+    def __init__ (self, compute : Callable[[], str]) :
+
+        self._compute = compute
+        self._value = None
+        self._lock = threading.Lock()
+
+
+    @property
+    def value (self) -> str :
+
+        if self._value is None :
+
+            with self._lock :
+
+                if self._value is None :
+
+                    self._value = self._compute()
+                    self._compute = None
+
+        return self._value
+
+
+    @property
+    def is_computed (self) -> bool :
+        return self._value is not None
+
+
+    def __str__ (self) -> str :
+        return self.value
+
+    def __repr__ (self) -> str :
+        return f"LazyFingerprint({self.value if self.is_computed else '...'})"
+
+    def __format__ (self, spec : str) -> str :
+        return format(self.value, spec)
+
+    def __eq__ (self, other) -> bool :
+        return self.value == str(other) if isinstance(other, (str, LazyFingerprint)) else NotImplemented
+
+    def __hash__ (self) -> int :
+        return hash(self.value)
+
+    def __reduce__ (self) :
+        return (str, (self.value,))
+
+
+def _frame_digest (dataframe : pl.DataFrame) -> str :
+    """
+    Native row hashing, with an Arrow IPC digest for dtypes hash_rows does not support.
+    """
+    try :
+        return dataframe_fingerprint(dataframe)
+
+    except Exception :
+        return hashlib.md5(dataframe.write_ipc(None).getvalue()).hexdigest()
+
+
+def frame_fingerprint (dataframe : Optional[pl.DataFrame]) -> Optional[LazyFingerprint] :
+    """
+    Lazy fingerprint of a derived frame (filtered, reshaped, fetched from an API, ...).
+
+    Args:
+        dataframe (pl.DataFrame) : Frame to fingerprint.
+
+    Returns:
+        fingerprint (LazyFingerprint | None) : None if there is no frame.
+    """
+    if dataframe is None :
+        return None
+
+    return LazyFingerprint(lambda : _frame_digest(dataframe))
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import os
 import re
-import math
 import time
 import hashlib
 import calendar
@@ -15,6 +14,10 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
 from src.utils.logger import log
+from src.utils.display import (
+    SIGN_SUFFIX, POSITIVE_CLASS, NEGATIVE_CLASS,
+    format_display, number_to_string_expr, display_string_to_number_expr, sign_class_expr,
+)
 
 
 def date_to_str (date : Optional[str | dt.date | dt.datetime] = None, format : str = "%Y-%m-%d") -> str :
@@ -186,20 +189,9 @@ def format_numeric_column (dataframe : pl.DataFrame, column : str, round_v : int
     Returns:
         pd.DataFrame: A copy of the DataFrame with the formatted column as strings
     """
-    df_cols = pl.col(column).cast(pl.Utf8)
-    no_commas = df_cols.col.str.replace(",", "")
+    as_float = display_string_to_number_expr(pl.col(column))
 
-    as_float = no_commas.cast(pl.Float64)
-    rounded = as_float.round(round_v)
-
-    fmt_string = f"{{:,.{round_v}f}}"
-
-    formatted = rounded.map_elements(
-
-        lambda x: fmt_string.format(x) if x is not None else None,
-        return_dtype=pl.Utf8
-
-    )
+    formatted = number_to_string_expr(as_float, decimals=round_v, null=None)
 
     new_df = dataframe.with_columns([
         formatted.alias(column)
@@ -255,62 +247,26 @@ def get_most_recent_file_for_date (
     
     ) -> Optional[str] :
     """
-    
+    Latest file (by "YYYY-MM-DD" / "HH-MM" in the stem) of the fund directory for the date.
     """
-    start = time.time()
-
-    date = date_to_str(date)
-    target_day = dt.datetime.strptime(date, "%Y-%m-%d").date()
-
-    dir_abs_path = directory_map.get(fundation)
-
-    # Track best candidate as (timestamp, path)
-    best_ts : Optional[dt.datetime] = None
-    best_path : Optional[Path] = None
-
-    root = Path(dir_abs_path)
-    with os.scandir(root) as it :
-
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-
-            name = entry.name
-
-            if not name.lower().endswith(extension) :
-                continue
-
-            stem = os.path.splitext(name)[0]
-            m = regex.match(stem)
-
-            if not m :
-                continue
-
-            day_str, hhmm_str = m.group(1), m.group(2)
-
-            try :
-
-                d = dt.datetime.strptime(day_str, "%Y-%m-%d").date()
-                t = dt.datetime.strptime(hhmm_str, "%H-%M").time()
-
-            except ValueError :
-
-                continue
+    # Local import : the catalog itself relies on this module
+    from src.utils.catalog import catalog_lookup, parse_date_hhmm
 
-            if d != target_day :
-                continue
-
-            ts = dt.datetime.combine(d, t)
-
-            if (best_ts is None) or ts > best_ts :
+    start = time.time()
 
-                best_ts = ts
-                best_path = Path(entry.path)
+    entry = catalog_lookup(
+        directory_map.get(fundation),
+        regex,
+        date_to_str(date),
+        mode="eq",
+        parser=parse_date_hhmm,
+        extension=extension,
+        match_stem=True,
+    )
 
     log(f"[*] Search done in {time.time() - start:.2f} seconds")
     
-    return best_path
+    return Path(entry.path) if entry is not None else None
 
 
 def get_most_recent_file (
@@ -322,57 +278,25 @@ def get_most_recent_file (
     
     ) -> Optional[str] :
     """
-    
+    Latest file (by "YYYY-MM-DD" / "HH-MM" in the stem) of the fund directory.
     """
-    start = time.time()
-
-    dir_abs_path = directory_map.get(fundation)
-
-    root = Path(dir_abs_path)
-
-    # Track best candidate as (timestamp, path)
-    best_ts : Optional[dt.datetime] = None
-    best_path : Optional[Path] = None
-
-    with os.scandir(root) as it :
-
-        for entry in it :
-
-            if not entry.is_file() :
-                continue
-
-            name = entry.name
-
-            if not name.lower().endswith(extension) :
-                continue
+    # Local import : the catalog itself relies on this module
+    from src.utils.catalog import catalog_lookup, parse_date_hhmm
 
-            stem = os.path.splitext(name)[0]
-            m = regex.match(stem)
-
-            if not m :
-                continue
-            
-            day_str, hhmm_str = m.group(1), m.group(2)
-
-            try :
-
-                d = dt.datetime.strptime(day_str, "%Y-%m-%d").date()
-                t = dt.datetime.strptime(hhmm_str, "%H-%M").time()
-
-            except ValueError :
-
-                continue
-
-            ts = dt.datetime.combine(d, t)
-
-            if (best_ts is None) or ts > best_ts :
+    start = time.time()
 
-                best_ts = ts
-                best_path = Path(entry.path)
+    entry = catalog_lookup(
+        directory_map.get(fundation),
+        regex,
+        mode="latest",
+        parser=parse_date_hhmm,
+        extension=extension,
+        match_stem=True,
+    )
 
     log(f"[*] Search most recent file done in {time.time() - start:.2f} seconds")
     
-    return best_path
+    return Path(entry.path) if entry is not None else None
 
 
 def date_cast_expr_from_utf8 (
@@ -533,7 +457,7 @@ def exclude_token_cols_from_df(dataframe : pl.DataFrame, column : str, token : s
 
     filtered_cols = dataframe.filter(
 
-        ~pl.col(column).str.contains(regex)
+        ~pl.col(column).cast(pl.Utf8).str.contains(regex)
 
     )
     return filtered_cols
@@ -558,7 +482,7 @@ def filter_token_col_from_df (dataframe : pl.DataFrame, column : str, token : st
 
     clean_df = dataframe.filter(
 
-        pl.col(column).str.contains(regex)
+        pl.col(column).cast(pl.Utf8).str.contains(regex)
 
     )
 
@@ -597,47 +521,10 @@ def format_numeric_columns_to_string(
     Convert numeric columns into human-readable formatted strings.
     Example: 1234567.89 -> "1,234,567.89"
 
-    If `columns=None`, all numeric columns are formatted.
+    If `columns=None`, all numeric columns are formatted. Null and NaN values are shown as " - ".
+    One vectorized pass (Polars string expressions), see src.utils.display.
     """
-    # 1. Detect numeric columns if none provided
-    if columns is None:
-    
-        numeric_types = {
-
-            pl.Int8, pl.Int16, pl.Int32, pl.Int64, pl.Int128,
-            pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
-            pl.Float32, pl.Float64,
-        }
-
-        columns = [c for c, t in df.schema.items() if t in numeric_types]
-
-    fmt = f"{{:,.{decimals}f}}"  # Python formatting
-
-    exprs = []
-    for col in columns :
-
-        exprs.append(
-        
-            pl.col(col)
-            .cast(pl.Float64, strict=False)        # ensure float
-            .map_elements(
-        
-                lambda x, f=fmt: (
-                    " - "
-                    if x is None or (isinstance(x, float) and math.isnan(x))
-                    else 
-                    f.format(x)
-                    .replace(",", thousand_sep)
-                    .replace(".", decimal_sep)
-                    if x is not None else None
-                ),
-        
-                return_dtype=pl.Utf8,
-            )
-            .alias(col)
-        )
-
-    return df.with_columns(exprs)
+    return format_display(df, columns, decimals=decimals, thousand_sep=thousand_sep, decimal_sep=decimal_sep)
 
 
 def normalize_fx_dict (raw_fx : Optional[Dict[str, float]] = None, ends_with : str = "-X", start_with = "EUR") -> Optional[Dict[str, float]] :
@@ -675,58 +562,55 @@ def colorize_dataframe_positive_negatif_vals (
         
         dataframe : Optional[pl.DataFrame],
         columns : Optional[List[str]] = None,
+
+        sign_suffix : str = SIGN_SUFFIX,
     
     ) :
     """
-    Docstring for colorize_dataframe_positive_negatif_vals
-    
-    :param dataframe: Description
-    :type dataframe: Optional[pl.DataFrame]
+    Pandas Styler with positive values (zero included) in green and negative values in red.
+
+    Signs are read from the "<column><sign_suffix>" columns of format_display(..., sign_suffix=...) when
+    present (then hidden), otherwise from the values, numbers or display strings. The colours are computed
+    as one Polars frame and applied in one Styler call. Cells are centred by the td table style rather
+    than per cell properties.
     """
-    dataframe = dataframe.to_pandas()
+    columns = [c for c in dataframe.columns if not c.endswith(sign_suffix)] if columns is None else columns
+    sign_cols = [c for c in dataframe.columns if c.endswith(sign_suffix)]
 
-    def colorize (val) :
-        """
-        Docstring for colorize
-        
-        :param val: Description
-        """
-        if pd.isna(val):
-            return ""
-        
-        s = str(val).strip()
+    def sign (col : str) -> pl.Expr :
 
-        # your placeholder (and other common placeholders)
-        if s in {"-", " -", "—", "", "nan", "NaN", "None", "null"}:
-            return ""
-        
-        s_norm = s.replace(" ", "").replace(",", "")
+        if f"{col}{sign_suffix}" in dataframe.columns :
+            return pl.col(f"{col}{sign_suffix}")
 
-        # If you may have "%" like "1.23%", handle it:
-        if s_norm.endswith("%"):
-            s_norm = s_norm[:-1]
+        value = pl.col(col) if dataframe.schema[col].is_numeric() else display_string_to_number_expr(pl.col(col))
 
-        try:
-            x = float(s_norm)
-        except Exception:
-            return ""
+        return sign_class_expr(value)
 
-        
-        return "color: green;" if float(val) >= 0 else "color: red;"
+    colors = dataframe.select([
+    
+        pl.when(sign(col) == POSITIVE_CLASS).then(pl.lit("color: green;"))
+        .when(sign(col) == NEGATIVE_CLASS).then(pl.lit("color: red;"))
+        .otherwise(pl.lit(""))
+        .alias(col)
+    
+        for col in columns
+    
+    ]).to_pandas()
+
+    dataframe = dataframe.drop(sign_cols).to_pandas()
+    colors.index = dataframe.index
 
     styled = (
         dataframe
         .style
-        .applymap(colorize, subset=columns)
+        .apply(lambda _ : colors, axis=None, subset=columns)
         .set_table_styles(
             [
                 {"selector": "th", "props": [("text-align", "center")]},
                 {"selector": "td", "props": [("text-align", "center")]},
             ]
         )
-        .set_properties(**{"text-align": "center"})
     )
     
 
     return styled
-
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import polars as pl
+
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from src.utils.logger import log
+
+
+FX_RATE_SCHEMA = {"from_ccy" : pl.Utf8, "to_ccy" : pl.Utf8, "rate" : pl.Float64}
+
+
+def fx_edges_from_quotes (quotes : Optional[Dict[str, float]], quote_ccy : str = "EUR") -> pl.DataFrame :
+    """
+    Directed rates (1 from_ccy = rate to_ccy) of a quotes dict, with their inverses.
+
+    Keys are either currencies quoted against quote_ccy, as in the Cash-updater cache
+    ({"USD" : 1.08} : 1 EUR = 1.08 USD), or pairs ({"EURUSD" : 1.08} : 1 EUR = 1.08 USD).
+    Null, zero and unparsable quotes are skipped.
+    """
+    rows = []
+
+    for key, value in (quotes or {}).items() :
+
+        try :
+            rate = float(value)
+
+        except (TypeError, ValueError) :
+            continue
+
+        if rate == 0.0 or rate != rate :
+            continue
+
+        key = str(key).upper()
+
+        if len(key) == 3 :
+            rows.append((quote_ccy, key, rate))
+
+        elif len(key) == 6 :
+            rows.append((key[:3], key[3:], rate))
+
+    edges = pl.DataFrame(rows, schema=FX_RATE_SCHEMA, orient="row")
+
+    inverses = edges.select(
+
+        pl.col("to_ccy").alias("from_ccy"),
+        pl.col("from_ccy").alias("to_ccy"),
+        (1.0 / pl.col("rate")).alias("rate"),
+
+    )
+
+    return (
+        pl.concat([edges, inverses])
+        .filter(pl.col("from_ccy") != pl.col("to_ccy"))
+        .unique(subset=["from_ccy", "to_ccy"], keep="first", maintain_order=True)
+    )
+
+
+def build_fx_rate_table (
+
+        currencies : Iterable[str],
+        base_ccy : str = "EUR",
+        quotes : Optional[Dict[str, float]] = None,
+
+        quote_ccy : str = "EUR",
+        pivots : Tuple[str, ...] = ("USD", "EUR"),
+        fetch_missing : Optional[Callable[[str, str], Optional[float]]] = None,
+
+    ) -> pl.DataFrame :
+    """
+    One rate per currency to convert amounts into base_ccy (amount * rate), for every currency at once.
+
+    Resolution order : same currency (1.0), direct or inverse quote, cross through the first pivot
+    quoted on both legs (USD, then EUR), then fetch_missing(ccy, base_ccy) once per remaining currency.
+
+    Returns:
+        rates (pl.DataFrame) : currency, rate (null when unresolved), source ("identity", "direct", "cross", "fetched").
+    """
+    targets = pl.DataFrame({"currency" : list(currencies)}, schema={"currency" : pl.Utf8}).drop_nulls().unique(maintain_order=True)
+    edges = fx_edges_from_quotes(quotes, quote_ccy)
+
+    direct = (
+        edges.filter(pl.col("to_ccy") == base_ccy)
+        .select(pl.col("from_ccy").alias("currency"), pl.col("rate").alias("direct"))
+    )
+
+    pivot_rank = pl.DataFrame({"pivot" : list(pivots), "rank" : list(range(len(pivots)))}, schema={"pivot" : pl.Utf8, "rank" : pl.Int64})
+
+    cross = (
+        edges.filter(pl.col("to_ccy").is_in(pivots))
+        .select(pl.col("from_ccy").alias("currency"), pl.col("to_ccy").alias("pivot"), pl.col("rate").alias("leg_1"))
+        .join(
+            edges.filter(pl.col("from_ccy").is_in(pivots) & (pl.col("to_ccy") == base_ccy))
+            .select(pl.col("from_ccy").alias("pivot"), pl.col("rate").alias("leg_2")),
+            on="pivot",
+        )
+        .join(pivot_rank, on="pivot")
+        .sort("rank")
+        .group_by("currency", maintain_order=True)
+        .agg((pl.col("leg_1") * pl.col("leg_2")).first().alias("cross"))
+    )
+
+    rates = (
+        targets
+        .join(direct, on="currency", how="left")
+        .join(cross, on="currency", how="left")
+        .with_columns(
+
+            pl.when(pl.col("currency") == base_ccy).then(pl.lit(1.0))
+            .otherwise(pl.coalesce("direct", "cross"))
+            .alias("rate"),
+
+            pl.when(pl.col("currency") == base_ccy).then(pl.lit("identity"))
+            .when(pl.col("direct").is_not_null()).then(pl.lit("direct"))
+            .when(pl.col("cross").is_not_null()).then(pl.lit("cross"))
+            .otherwise(pl.lit(None, dtype=pl.Utf8))
+            .alias("source"),
+
+        )
+        .select("currency", "rate", "source")
+    )
+
+    missing = rates.filter(pl.col("rate").is_null())["currency"].to_list()
+
+    if missing and fetch_missing is not None :
+
+        fetched = {ccy : fetch_missing(ccy, base_ccy) for ccy in missing}
+        fetched = pl.DataFrame(
+
+            {"currency" : list(fetched), "fetched" : [float(r) if r else None for r in fetched.values()]},
+            schema={"currency" : pl.Utf8, "fetched" : pl.Float64},
+
+        )
+
+        rates = (
+            rates.join(fetched, on="currency", how="left")
+            .with_columns(
+                pl.when(pl.col("rate").is_null() & pl.col("fetched").is_not_null()).then(pl.lit("fetched")).otherwise(pl.col("source")).alias("source"),
+                pl.coalesce("rate", "fetched").alias("rate"),
+            )
+            .drop("fetched")
+        )
+
+    return rates
+
+
+def convert_to_base_ccy (
+
+        dataframe : pl.DataFrame,
+        rates : pl.DataFrame,
+
+        amount_cols : Tuple[str, ...] = ("amount",),
+        currency_col : str = "currency",
+        base_ccy : str = "EUR",
+        missing_rate : Optional[float] = None,
+
+    ) -> Tuple[pl.DataFrame, pl.DataFrame] :
+    """
+    Convert amount columns to base_ccy with one join on the rate table and one expression.
+
+    Args:
+        missing_rate (float) : Rate used for the rows of unresolved currencies (null amounts if None).
+
+    Returns:
+        dataframe (pl.DataFrame) : Converted amounts, currency set to base_ccy.
+        missing (pl.DataFrame) : Unresolved currencies with their row counts, reported in one log line.
+    """
+    joined = dataframe.join(
+
+        rates.select(pl.col("currency").alias(currency_col), pl.col("rate").alias("__fx_rate")),
+        on=currency_col,
+        how="left",
+
+    )
+
+    missing = (
+        joined.filter(pl.col("__fx_rate").is_null())
+        .group_by(currency_col)
+        .agg(pl.len().alias("rows"))
+        .sort(currency_col)
+    )
+
+    if missing.height :
+
+        fallback = "null amounts" if missing_rate is None else f"rate {missing_rate}"
+        log(f"[!] [FX] No rate to {base_ccy} for {missing.height} currencies ({missing['rows'].sum()} rows), using {fallback} : {missing.rows()}", "warning")
+
+    rate = pl.col("__fx_rate") if missing_rate is None else pl.col("__fx_rate").fill_null(missing_rate)
+
+    converted = joined.with_columns(
+
+        [(pl.col(col).cast(pl.Float64) * rate).alias(col) for col in amount_cols] + [pl.lit(base_ccy).alias(currency_col)]
+
+    ).drop("__fx_rate")
+
+    return converted, missing
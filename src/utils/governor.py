@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import time
+import heapq
+import itertools
+import functools
+import threading
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+from src.config.parameters import GOVERNOR_ENABLED, GOVERNOR_MAX_CONCURRENT
+from src.utils.logger import log
+
+
+# Lower runs first : a session waiting on a page beats the warming of tomorrow's caches
+INTERACTIVE = 0
+BACKGROUND = 10
+
+PRIORITY_NAMES = {INTERACTIVE : "interactive", BACKGROUND : "background"}
+
+_PRIORITY : ContextVar[int] = ContextVar("sentinelle_priority", default=INTERACTIVE)
+
+# Waits above this are logged
+_SLOW_WAIT_SECONDS = 1.0
+
+
+def current_priority () -> int :
+    return _PRIORITY.get()
+
+
+@contextmanager
+def at_priority (priority : int) -> Iterator[None] :
+    """
+    Heavy operations started inside the block (in this thread or in load_many workers) queue at this priority.
+    """
+    token = _PRIORITY.set(priority)
+
+    try :
+        yield
+
+    finally :
+        _PRIORITY.reset(token)
+
+
+def background_priority () :
+    return at_priority(BACKGROUND)
+
+
+def _percentile (values : List[float], q : float) -> float :
+
+    if not values :
+        return 0.0
+
+    values = sorted(values)
+
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Governor :
+    """
+    Cap on the heavy Polars operations (parses, large collects) running at once across every session.
+
+    Extra work waits in a priority queue (lowest priority value first, then arrival order),
+    a finishing operation hands its slot directly to the next one in line. A thread already
+    holding a slot runs nested heavy operations without queueing again.
+    """
+
+    def __init__ (self, max_concurrent : Optional[int] = None, enabled : Optional[bool] = None) :
+
+        self.max_concurrent = GOVERNOR_MAX_CONCURRENT if max_concurrent is None else max_concurrent
+        self.enabled = GOVERNOR_ENABLED if enabled is None else enabled
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self._running = 0
+        self._queue : List[List] = []
+        self._seq = itertools.count()
+
+        self._waits : Dict[str, Deque[float]] = {}
+        self.stats = {"executed" : 0, "queued" : 0, "max_queue_depth" : 0, "wait_seconds" : 0.0, "max_wait_seconds" : 0.0}
+        self.workloads : Dict[str, int] = {}
+
+
+    def _acquire (self, priority : int) -> float :
+
+        with self._lock :
+
+            if self._running < self.max_concurrent and not self._queue :
+
+                self._running += 1
+                return 0.0
+
+            event = threading.Event()
+            heapq.heappush(self._queue, [priority, next(self._seq), event])
+
+            self.stats["queued"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._queue))
+
+        start = time.monotonic()
+        event.wait()
+
+        return time.monotonic() - start
+
+
+    def _release (self) -> None :
+
+        with self._lock :
+
+            if self._queue :
+                # The slot goes to the next in line, the running count does not move
+                heapq.heappop(self._queue)[2].set()
+
+            else :
+                self._running -= 1
+
+
+    @contextmanager
+    def slot (self, workload : str, priority : Optional[int] = None) -> Iterator[None] :
+        """
+        Run the block once a slot is free.
+        """
+        if not self.enabled or getattr(self._local, "held", False) :
+
+            yield
+            return
+
+        priority = current_priority() if priority is None else priority
+        waited = self._acquire(priority)
+
+        name = PRIORITY_NAMES.get(priority, str(priority))
+
+        with self._lock :
+
+            self.stats["executed"] += 1
+            self.stats["wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+
+            self.workloads[workload] = self.workloads.get(workload, 0) + 1
+            self._waits.setdefault(name, deque(maxlen=1024)).append(waited)
+
+        if waited >= _SLOW_WAIT_SECONDS :
+            log(f"[*] [GOVERNOR] {workload} ({name}) waited {waited:.2f} seconds for a slot", "debug")
+
+        self._local.held = True
+
+        try :
+            yield
+
+        finally :
+
+            self._local.held = False
+            self._release()
+
+
+    def usage (self) -> Dict :
+        """
+        Slots, running operations, queue depth (current and highest), and wait times per priority (recent p50/p95).
+        """
+        with self._lock :
+
+            waits = {
+
+                name : {"count" : len(values), "p50_seconds" : _percentile(list(values), 0.50), "p95_seconds" : _percentile(list(values), 0.95)}
+                for name, values in self._waits.items()
+
+            }
+
+            return {
+
+                "enabled" : self.enabled,
+                "max_concurrent" : self.max_concurrent,
+                "running" : self._running,
+                "queue_depth" : len(self._queue),
+                **self.stats,
+                "waits" : waits,
+                "workloads" : dict(self.workloads),
+
+            }
+
+
+_GOVERNOR : Optional[Governor] = None
+_GOVERNOR_LOCK = threading.Lock()
+
+
+def get_governor () -> Governor :
+    """
+    Process-wide governor, shared by every Streamlit session.
+    """
+    global _GOVERNOR
+
+    with _GOVERNOR_LOCK :
+
+        if _GOVERNOR is None :
+            _GOVERNOR = Governor()
+
+        return _GOVERNOR
+
+
+def heavy (workload : str, priority : Optional[int] = None) :
+    """
+    Context manager around a heavy operation, ex: with heavy("excel") : df = pl.read_excel(...)
+    """
+    return get_governor().slot(workload, priority)
+
+
+def governed (workload : str) -> Callable :
+    """
+    Decorator form of heavy().
+    """
+    def decorator (function : Callable) -> Callable :
+
+        @functools.wraps(function)
+        def wrapper (*args, **kwargs) :
+
+            with heavy(workload) :
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def governor_stats () -> Dict :
+    return get_governor().usage()
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import os
+import hashlib
+import threading
+import polars as pl
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.logger import log
+from src.utils.data_io import load_many
+from src.utils.excel_probe import validate_excel_columns
+from src.utils.cache import link_fingerprint
+
+
+class LoadDemand (NamedTuple) :
+    """
+    Columns one section needs from one sheet of one file.
+    """
+    path : str
+    sheet_name : Optional[str | int]
+    columns : Optional[Tuple[str, ...]]             # None for all columns
+    schema : Tuple[Tuple[str, Any], ...]            # (column, dtype) the section expects
+    options : Tuple[Tuple[str, Any], ...]           # other load_excel_to_dataframe arguments (cast_num, ...)
+
+
+_ACTIVE : ContextVar[Optional["LoadPlan"]] = ContextVar("sentinelle_load_plan", default=None)
+
+
+def _freeze (value : Any) -> Any :
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _group_key (path : str, sheet_name : Optional[str | int], options : Tuple) -> Tuple :
+    return (os.path.normcase(os.path.abspath(path)), sheet_name, options)
+
+
+class LoadPlan :
+    """
+    Collects the column demands of the sections of a page, then parses every
+    file once with the union of its demands. Each section gets a column
+    selection of the shared frame (no copy of the column buffers).
+
+    Usage:
+        with LoadPlan() as plan :       # readers called inside pick the active plan up
+
+            with plan.declaring() :     # readers only declare their demands, nothing is parsed
+                page_demands()
+
+            render_page()               # the first get parses every declared file once
+
+        plan = LoadPlan()               # or explicitly, declaring everything first
+        a = plan.need(path, "Trade Legs", schema_a)
+        b = plan.need(path, "Trade Legs", schema_b)
+        plan.load()
+        df_a, md5_a = plan.get(a)
+    """
+
+    def __init__ (self, max_workers : Optional[int] = None) :
+
+        self.max_workers = max_workers
+
+        self._groups : Dict[Tuple, Dict] = {}
+        self._frames : Dict[Tuple, Tuple[Optional[pl.DataFrame], Optional[str]]] = {}
+        self._lock = threading.RLock()
+        self._tokens : List = []
+        self._declaring = 0
+
+        self.stats = {"demands" : 0, "files_loaded" : 0, "served" : 0}
+
+
+    def __enter__ (self) -> "LoadPlan" :
+
+        self._tokens.append(_ACTIVE.set(self))
+        return self
+
+
+    def __exit__ (self, *exc) -> None :
+        _ACTIVE.reset(self._tokens.pop())
+
+
+    @property
+    def is_declaring (self) -> bool :
+        return self._declaring > 0
+
+
+    @contextmanager
+    def declaring (self) :
+        """
+        Inside the block, planned_load records the demand and returns (None, None) without parsing.
+        """
+        with self._lock :
+            self._declaring += 1
+
+        try :
+            yield self
+
+        finally :
+
+            with self._lock :
+                self._declaring -= 1
+
+
+    def need (
+
+            self,
+            path : str,
+            sheet_name : Optional[str | int] = "Sheet1",
+            schema_overrides : Optional[Dict] = None,
+            columns : Optional[List[str]] = None,
+            **options,
+
+        ) -> LoadDemand :
+        """
+        Declare the columns a section needs (all the schema columns by default, every column if both are None).
+        """
+        columns = list(schema_overrides.keys()) if columns is None and schema_overrides is not None else columns
+        options = tuple(sorted((k, _freeze(v)) for k, v in options.items()))
+
+        demand = LoadDemand(
+            path,
+            sheet_name,
+            tuple(columns) if columns is not None else None,
+            tuple((schema_overrides or {}).items()),
+            options,
+        )
+
+        key = _group_key(path, sheet_name, options)
+
+        with self._lock :
+
+            self.stats["demands"] += 1
+            group = self._groups.setdefault(key, {"demand" : demand, "schema" : {}, "declared" : set(), "all" : False})
+
+            if demand.columns is None :
+                group["all"] = True
+
+            else :
+
+                schema = dict(demand.schema)
+
+                for col in demand.columns :
+
+                    group["schema"].setdefault(col, schema.get(col))
+                    group["declared"].add(col)
+
+            # A demand arriving after the load, for a column the frame does not have : load again with the union
+            frame = self._frames.get(key)
+
+            if frame is not None and frame[0] is not None and demand.columns is not None :
+
+                if any(col not in frame[0].columns and col not in group.get("absent", ()) for col in demand.columns) :
+
+                    log(f"[!] [PLAN] Columns of {path} asked after its load, parsed again (declare them first)", "warning")
+                    del self._frames[key]
+
+        return demand
+
+
+    def load (self) -> int :
+        """
+        Parse every file with pending demands, concurrently, each with the union of its columns.
+
+        Returns:
+            loaded (int) : Number of files parsed.
+        """
+        with self._lock :
+
+            pending = [(key, group) for key, group in self._groups.items() if key not in self._frames]
+
+            if not pending :
+                return 0
+
+            specs, keys = [], []
+
+            for key, group in pending :
+
+                demand = group["demand"]
+
+                # Sorted : the same demands give the same parse (and sidecar) whatever the order sections ran in
+                columns = None if group["all"] else sorted(group["schema"].keys())
+
+                ok, columns, missing = validate_excel_columns(demand.path, columns, demand.sheet_name)
+
+                if not ok :
+
+                    self._frames[key] = (None, None)
+                    continue
+
+                group["absent"] = set(missing)
+                schema_overrides = {c : t for c, t in group["schema"].items() if t is not None and (columns is None or c in columns)}
+
+                specs.append({
+
+                    "excel_file_abs_pth" : demand.path,
+                    "sheet_name" : demand.sheet_name,
+                    "specific_cols" : columns,
+                    "schema_overrides" : schema_overrides or None,
+                    **dict(demand.options),
+
+                })
+                keys.append(key)
+
+            results = load_many(specs, max_workers=self.max_workers)
+
+            for key, result in zip(keys, results) :
+                self._frames[key] = (result.dataframe, result.md5)
+
+            self.stats["files_loaded"] += len(results)
+
+        return len(results)
+
+
+    def get (self, demand : LoadDemand) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
+        """
+        Frame of a demand, loading the pending files first if needed.
+
+        Returns:
+            (df, md5) : Selection of the declared columns (those present in the file), cast to the
+                dtypes the section declared when another section asked for a different one.
+        """
+        key = _group_key(demand.path, demand.sheet_name, demand.options)
+
+        with self._lock :
+
+            if key not in self._frames :
+                self.load()
+
+            dataframe, md5 = self._frames.get(key, (None, None))
+            self.stats["served"] += 1
+
+        if dataframe is None :
+            return None, None
+
+        if demand.columns is None :
+            return dataframe, md5
+
+        columns = [c for c in demand.columns if c in dataframe.columns]
+        selection = dataframe.select(columns)
+
+        casts = {c : t for c, t in demand.schema if t is not None and c in columns and selection.schema[c] != t}
+
+        if casts :
+            selection = selection.cast(casts, strict=False)
+
+        # Sections sharing a file must not share a fingerprint : their frames differ
+        digest = hashlib.md5(f"{md5}|{columns}|{sorted(casts.items(), key=str)}".encode("utf-8")).hexdigest()
+        link_fingerprint(digest, md5)
+
+        return selection, digest
+
+
+def active_plan () -> Optional[LoadPlan] :
+    """
+    Plan opened with `with LoadPlan() :` in the current context, if any.
+    """
+    return _ACTIVE.get()
+
+
+def planned_load (
+
+        path : str,
+        sheet_name : Optional[str | int] = "Sheet1",
+        schema_overrides : Optional[Dict] = None,
+        columns : Optional[List[str]] = None,
+        plan : Optional[LoadPlan] = None,
+        **options,
+
+    ) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
+    """
+    Drop-in for load_excel_to_dataframe going through the active plan.
+
+    Without a plan the file is loaded on its own with the columns asked. Inside
+    `plan.declaring()` the demand is only recorded and (None, None) is returned.
+    """
+    plan = active_plan() if plan is None else plan
+    plan = LoadPlan() if plan is None else plan
+
+    try :
+
+        demand = plan.need(path, sheet_name, schema_overrides, columns, **options)
+
+        if plan.is_declaring :
+            return None, None
+
+        return plan.get(demand)
+
+    except Exception as e :
+
+        log(f"[-] [PLAN] Failed to load {path} : {e}", "error")
+        return None, None
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import os
+import time
+import shutil
+import hashlib
+import threading
+
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from src.config.parameters import (
+    MIRROR_ENABLED, MIRROR_MAX_BYTES, MIRROR_VERIFY_SECONDS, MIRROR_HOT_ACCESSES, MIRROR_REFRESH_SECONDS,
+    MIRROR_MAX_FAILURES, MIRROR_COOLDOWN_SECONDS,
+)
+from src.config.paths import MIRROR_DIR_ABS_PATH
+from src.utils.logger import log
+
+
+class _SourceChanged (Exception) :
+    """
+    The source moved while it was being copied.
+    """
+
+
+class _Copy :
+
+    __slots__ = ("local", "size", "mtime_ns", "verified", "accesses")
+
+    def __init__ (self, local : str, size : int, mtime_ns : int) :
+
+        self.local = local
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.verified = time.monotonic()
+        self.accesses = 0
+
+
+class LocalMirror :
+    """
+    Read-through copy of network-share files on a local disk.
+
+    The first access copies the file, later accesses are served locally as long as
+    the source keeps its size and mtime (checked at most every verify_seconds, or right
+    away when the caller expects another version than the copy).
+    Files read often are refreshed in the background, so the reader never pays the copy.
+    When copies keep failing the mirror steps aside for a cooldown and the source path is served.
+
+    stat and copy are injectable, to test against a share with artificial latency.
+    """
+
+    def __init__ (
+
+            self,
+            root_abs_path : Optional[str] = None,
+            max_bytes : Optional[int] = None,
+            verify_seconds : Optional[float] = None,
+            hot_accesses : Optional[int] = None,
+            stat : Callable = os.stat,
+            copy : Callable = shutil.copy2,
+
+        ) :
+
+        self.root = MIRROR_DIR_ABS_PATH if root_abs_path is None else root_abs_path
+        self.max_bytes = MIRROR_MAX_BYTES if max_bytes is None else max_bytes
+        self.verify_seconds = MIRROR_VERIFY_SECONDS if verify_seconds is None else verify_seconds
+        self.hot_accesses = MIRROR_HOT_ACCESSES if hot_accesses is None else hot_accesses
+
+        self._stat = stat
+        self._copy = copy
+
+        # source path -> _Copy, least recently used first
+        self._copies : OrderedDict[str, _Copy] = OrderedDict()
+        self._lock = threading.RLock()
+        self._path_locks : Dict[str, threading.Lock] = {}
+
+        self._failures = 0
+        self._down_until = 0.0
+
+        self.stats = {"hits" : 0, "copies" : 0, "refreshes" : 0, "evictions" : 0, "fallbacks" : 0, "changed" : 0, "bytes" : 0}
+
+
+    @property
+    def healthy (self) -> bool :
+        return time.monotonic() >= self._down_until
+
+
+    def _local_path (self, source_abs_path : str) -> str :
+        """
+        One directory per source path, the file keeps its name (engines look at the extension).
+        """
+        digest = hashlib.sha1(source_abs_path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, digest, os.path.basename(source_abs_path))
+
+
+    def _failed (self, source_abs_path : str, error : Exception) -> str :
+
+        with self._lock :
+
+            self._failures += 1
+            self.stats["fallbacks"] += 1
+
+            if self._failures >= MIRROR_MAX_FAILURES :
+
+                self._down_until = time.monotonic() + MIRROR_COOLDOWN_SECONDS
+                self._failures = 0
+
+                log(f"[!] [MIRROR] {MIRROR_MAX_FAILURES} failures in a row, serving the shares directly for {MIRROR_COOLDOWN_SECONDS:.0f} seconds", "warning")
+
+        log(f"[!] [MIRROR] Serving {source_abs_path} directly : {error}", "warning")
+
+        return source_abs_path
+
+
+    def _fetch (self, source_abs_path : str, size : int, mtime_ns : int) -> _Copy :
+        """
+        Copy the source next to its previous copy, then swap it in once the source
+        is found unchanged after the copy (a copy racing a write is thrown away).
+        """
+        local = self._local_path(source_abs_path)
+        tmp_path = local + f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+
+        try :
+
+            self._copy(source_abs_path, tmp_path)
+            after = self._stat(source_abs_path)
+
+            if (after.st_size, after.st_mtime_ns) != (size, mtime_ns) :
+                raise _SourceChanged(f"{source_abs_path} changed during the copy")
+
+            os.replace(tmp_path, local)
+
+        finally :
+
+            if os.path.exists(tmp_path) :
+                os.remove(tmp_path)
+
+        return _Copy(local, size, mtime_ns)
+
+
+    def _evict (self) -> None :
+        """
+        Remove the least recently used copies until the mirror fits in max_bytes, the lock must be held.
+        """
+        while self.stats["bytes"] > self.max_bytes and len(self._copies) > 1 :
+
+            source, copy = self._copies.popitem(last=False)
+            self.stats["bytes"] -= copy.size
+            self.stats["evictions"] += 1
+
+            try :
+                os.remove(copy.local)
+
+            except OSError :
+                pass
+
+
+    def path (
+
+            self,
+            source_abs_path : Optional[str],
+            expect : Optional[Tuple[int, int]] = None,
+
+        ) -> Optional[str] :
+        """
+        Local path to read instead of source_abs_path (the source itself when the mirror can not serve it).
+
+        Args:
+            expect (tuple) : (size, mtime_ns) of the source the caller keyed its result on. Only a copy of
+                that version is served : an older copy is replaced, and if the source already moved past
+                it the source itself is returned.
+        """
+        if not source_abs_path or not self.healthy :
+
+            if source_abs_path :
+
+                with self._lock :
+                    self.stats["fallbacks"] += 1
+
+            return source_abs_path
+
+        source_abs_path = os.path.normcase(os.path.abspath(source_abs_path))
+
+        with self._lock :
+
+            copy = self._copies.get(source_abs_path)
+            path_lock = self._path_locks.setdefault(source_abs_path, threading.Lock())
+
+            if copy is not None :
+
+                copy.accesses += 1
+                self._copies.move_to_end(source_abs_path)
+
+                expected = expect is None or (copy.size, copy.mtime_ns) == tuple(expect)
+
+                # Verified recently (and the version asked for) : no round trip to the share at all
+                if expected and time.monotonic() - copy.verified < self.verify_seconds and os.path.isfile(copy.local) :
+
+                    self.stats["hits"] += 1
+                    return copy.local
+
+        with path_lock :
+
+            try :
+                stat = self._stat(source_abs_path)
+
+            except OSError :
+                return source_abs_path          # missing source : let the reader report it
+
+            except Exception as e :
+                return self._failed(source_abs_path, e)
+
+            current = (stat.st_size, stat.st_mtime_ns)
+
+            if expect is not None and current != tuple(expect) :
+
+                with self._lock :
+                    self.stats["changed"] += 1
+
+                return source_abs_path
+
+            with self._lock :
+                copy = self._copies.get(source_abs_path)
+
+            if copy is not None and (copy.size, copy.mtime_ns) == current and os.path.isfile(copy.local) :
+
+                with self._lock :
+
+                    copy.verified = time.monotonic()
+                    self.stats["hits"] += 1
+
+                return copy.local
+
+            try :
+                fresh = self._fetch(source_abs_path, stat.st_size, stat.st_mtime_ns)
+
+            except _SourceChanged as e :
+
+                # Being rewritten : not a mirror failure, the next read copies the settled file
+                with self._lock :
+                    self.stats["changed"] += 1
+
+                log(f"[*] [MIRROR] {e}, serving the source", "debug")
+
+                return source_abs_path
+
+            except Exception as e :
+                return self._failed(source_abs_path, e)
+
+            with self._lock :
+
+                previous = self._copies.pop(source_abs_path, None)
+
+                fresh.accesses = previous.accesses + 1 if previous is not None else 1
+                self._copies[source_abs_path] = fresh
+
+                self.stats["bytes"] += fresh.size - (previous.size if previous is not None else 0)
+                self.stats["copies"] += 1
+                self._failures = 0
+
+                self._evict()
+
+            return fresh.local
+
+
+    def refresh_hot (self) -> int :
+        """
+        Re-copy the hot files whose source changed, so that their next reader finds them local.
+
+        Returns:
+            refreshed (int) : Number of files copied again.
+        """
+        if not self.healthy :
+            return 0
+
+        with self._lock :
+            hot = [source for source, copy in self._copies.items() if copy.accesses >= self.hot_accesses]
+
+        refreshed = 0
+
+        for source in hot :
+
+            with self._lock :
+                copy = self._copies.get(source)
+
+            if copy is None :
+                continue
+
+            # Forces the stat (and the copy if the source moved)
+            copy.verified = 0.0
+            local = self.path(source)
+
+            with self._lock :
+
+                current = self._copies.get(source)
+
+                if local != source and current is not copy :
+
+                    refreshed += 1
+                    self.stats["refreshes"] += 1
+
+        return refreshed
+
+
+    def usage (self) -> Dict :
+
+        with self._lock :
+            return {"entries" : len(self._copies), "healthy" : self.healthy, **self.stats}
+
+
+_MIRROR : Optional[LocalMirror] = None
+_MIRROR_LOCK = threading.Lock()
+_REFRESHER : Dict[str, Optional[threading.Thread]] = {"thread" : None}
+
+
+def get_mirror () -> Optional[LocalMirror] :
+    """
+    Process-wide mirror, None if MIRROR_ENABLED is off.
+    """
+    global _MIRROR
+
+    if not MIRROR_ENABLED :
+        return None
+
+    with _MIRROR_LOCK :
+
+        if _MIRROR is None :
+
+            _MIRROR = LocalMirror()
+            _start_refresher(_MIRROR)
+
+        return _MIRROR
+
+
+def _start_refresher (mirror : LocalMirror) -> None :
+
+    def loop () :
+
+        while True :
+
+            time.sleep(MIRROR_REFRESH_SECONDS)
+
+            try :
+                mirror.refresh_hot()
+
+            except Exception as e :
+                log(f"[!] [MIRROR] Background refresh failed : {e}", "warning")
+
+    thread = threading.Thread(target=loop, name="sentinelle-mirror", daemon=True)
+    thread.start()
+
+    _REFRESHER["thread"] = thread
+
+
+def mirrored (
+
+        source_abs_path : Optional[str],
+        expect : Optional[Tuple[int, int]] = None,
+
+    ) -> Optional[str] :
+    """
+    Path to read a source file from : its local copy when the mirror is enabled and healthy, itself otherwise.
+    `expect` is the (size, mtime_ns) the caller keyed its result on, see LocalMirror.path.
+    """
+    mirror = get_mirror()
+
+    return source_abs_path if mirror is None else mirror.path(source_abs_path, expect)
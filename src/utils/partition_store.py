@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+import threading
+import polars as pl
+import datetime as dt
+
+from typing import List, Optional, Tuple
+
+from src.utils.logger import log
+from src.utils.formatters import str_to_date
+from src.utils.cache import register_source
+
+
+# Layout : <root>/<partition>/<YYYY-MM>/<YYYY-MM-DD>.parquet
+# One file per date : an upsert is a single atomic rename, and a date range only opens its own files.
+STORE_EXTENSION = ".parquet"
+
+MONTH_FORMAT = "%Y-%m"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def _partition_dir (root_abs_path : str, partition : str) -> str :
+    return os.path.join(root_abs_path, str(partition).replace(os.sep, "_"))
+
+
+def _date_file (root_abs_path : str, partition : str, date : dt.date) -> str :
+    return os.path.join(_partition_dir(root_abs_path, partition), date.strftime(MONTH_FORMAT), date.strftime(DATE_FORMAT) + STORE_EXTENSION)
+
+
+def _list_dir (dir_abs_path : str) -> List[str] :
+
+    try :
+        return os.listdir(dir_abs_path)
+
+    except OSError :
+        return []
+
+
+def store_dates (
+
+        root_abs_path : Optional[str],
+        partition : str,
+        start_date : Optional[str | dt.date | dt.datetime] = None,
+        end_date : Optional[str | dt.date | dt.datetime] = None,
+
+    ) -> List[Tuple[dt.date, str]] :
+    """
+    Dates stored in a partition between start_date and end_date (both included).
+
+    Month directories outside the range are skipped without being listed.
+
+    Returns:
+        dates (list) : Sorted (date, file_abs_path).
+    """
+    if not root_abs_path :
+        return []
+
+    start = str_to_date(start_date) if start_date is not None else None
+    end = str_to_date(end_date) if end_date is not None else None
+
+    start_month = start.strftime(MONTH_FORMAT) if start is not None else None
+    end_month = end.strftime(MONTH_FORMAT) if end is not None else None
+
+    partition_dir = _partition_dir(root_abs_path, partition)
+    dates = []
+
+    for month in _list_dir(partition_dir) :
+
+        # "YYYY-MM" sorts like the dates it holds
+        if (start_month is not None and month < start_month) or (end_month is not None and month > end_month) :
+            continue
+
+        month_dir = os.path.join(partition_dir, month)
+
+        for name in _list_dir(month_dir) :
+
+            if not name.endswith(STORE_EXTENSION) :
+                continue
+
+            try :
+                date = dt.datetime.strptime(name[: -len(STORE_EXTENSION)], DATE_FORMAT).date()
+
+            except ValueError :
+                continue
+
+            if (start is not None and date < start) or (end is not None and date > end) :
+                continue
+
+            dates.append((date, os.path.join(month_dir, name)))
+
+    return sorted(dates)
+
+
+def upsert_date (
+
+        root_abs_path : str,
+        partition : str,
+        date : str | dt.date | dt.datetime,
+        dataframe : pl.DataFrame,
+
+    ) -> bool :
+    """
+    Store the rows of one date, replacing whatever was stored for it.
+
+    The file is written aside then renamed over the previous one : readers see
+    either the old rows or the new ones, and replaying the same upsert is a no-op.
+    Concurrent upserts of different dates never touch the same file.
+
+    Returns:
+        success (bool)
+    """
+    date = str_to_date(date)
+    file_abs_path = _date_file(root_abs_path, partition, date)
+    tmp_abs_path = f"{file_abs_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try :
+
+        os.makedirs(os.path.dirname(file_abs_path), exist_ok=True)
+
+        dataframe.write_parquet(tmp_abs_path)
+        os.replace(tmp_abs_path, file_abs_path)
+
+    except Exception as e :
+
+        log(f"[-] [STORE] Failed to write {date} in {partition} : {e}", "error")
+
+        try :
+            os.remove(tmp_abs_path)
+
+        except OSError :
+            pass
+
+        return False
+
+    log(f"[+] [STORE] {dataframe.height} rows stored for {date} in {partition}", "info")
+
+    return True
+
+
+def delete_date (
+
+        root_abs_path : str,
+        partition : str,
+        date : str | dt.date | dt.datetime,
+
+    ) -> bool :
+    """
+    Remove the rows of one date.
+
+    Returns:
+        removed (bool) : False if nothing was stored for that date.
+    """
+    try :
+        os.remove(_date_file(root_abs_path, partition, str_to_date(date)))
+
+    except OSError :
+        return False
+
+    return True
+
+
+def scan_store (
+
+        root_abs_path : Optional[str],
+        partition : str,
+        start_date : Optional[str | dt.date | dt.datetime] = None,
+        end_date : Optional[str | dt.date | dt.datetime] = None,
+
+    ) -> Tuple[Optional[pl.LazyFrame], Optional[str]] :
+    """
+    Lazy scan over the dates of a partition between start_date and end_date.
+
+    Returns:
+        (lf, md5) : md5 follows the identity of the files scanned. (None, None) if nothing is stored.
+    """
+    dates = store_dates(root_abs_path, partition, start_date, end_date)
+    signature = []
+
+    for date, file_abs_path in dates :
+
+        try :
+            stat = os.stat(file_abs_path)
+
+        except OSError :
+            continue
+
+        signature.append((file_abs_path, stat.st_size, stat.st_mtime_ns))
+
+    if not signature :
+        return None, None
+
+    lazyframe = pl.concat([pl.scan_parquet(path) for path, _, _ in signature], how="diagonal_relaxed")
+    md5 = hashlib.md5(json.dumps(signature).encode("utf-8")).hexdigest()
+    register_source(md5, *(path for path, _, _ in signature))
+
+    return lazyframe, md5
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+import datetime as dt
+import polars as pl
+
+from typing import Dict, Optional, Sequence
+
+from src.utils.formatters import str_to_date
+from src.utils.dates import monday_of_week
+
+
+PERIODS = ("WTD", "MTD", "QTD", "YTD", "ITD")
+TRADING_DAYS = 252
+
+
+def period_starts (as_of : Optional[str | dt.date | dt.datetime] = None) -> Dict[str, Optional[dt.date]] :
+    """
+    First day of each standard period containing as_of (None for inception to date).
+    """
+    as_of = str_to_date(as_of)
+
+    return {
+
+        "WTD" : monday_of_week(as_of),
+        "MTD" : as_of.replace(day=1),
+        "QTD" : dt.date(as_of.year, 3 * ((as_of.month - 1) // 3) + 1, 1),
+        "YTD" : dt.date(as_of.year, 1, 1),
+        "ITD" : None,
+
+    }
+
+
+def _period_aggs (
+
+        period : str,
+        start : Optional[dt.date],
+        date_col : str,
+        value_col : str,
+        risk_free : float,
+        annualization : int,
+
+    ) -> list :
+    """
+    Statistics of one period : from the base (last value before the period, first value of the period
+    when there is none) to the last value.
+    """
+    d, v, r = pl.col(date_col), pl.col(value_col), pl.col("return")
+
+    if start is None :
+        base_value, base_date = v.first(), d.first()
+
+    else :
+        before = d < pl.lit(start)
+        base_value = pl.coalesce(v.filter(before).last(), v.filter(~before).first())
+        base_date = pl.coalesce(d.filter(before).last(), d.filter(~before).first())
+
+    window = d >= base_date
+    values, dates = v.filter(window), d.filter(window)
+    returns = r.filter(d > base_date)
+
+    drawdown = values / values.cum_max() - 1.0
+    trough = drawdown.arg_min()
+    max_drawdown = drawdown.min()
+
+    trough_date = dates.get(trough)
+    peak_date = dates.filter((values == values.cum_max().get(trough)) & (dates <= trough_date)).first()
+
+    scale = math.sqrt(annualization)
+    excess = returns.mean() * annualization - risk_free
+
+    vol = returns.std() * scale
+    downside = returns.clip(upper_bound=0.0).pow(2).mean().sqrt() * scale
+
+    return [
+
+        pl.lit(period).alias("period"),
+        base_date.alias("start_date"),
+        d.last().alias("end_date"),
+        base_value.alias("start_value"),
+        v.last().alias("end_value"),
+        returns.count().alias("observations"),
+        (v.last() / base_value - 1.0).alias("return"),
+        vol.alias("vol"),
+        max_drawdown.alias("max_drawdown"),
+        pl.when(max_drawdown < 0).then(peak_date).alias("peak_date"),
+        pl.when(max_drawdown < 0).then(trough_date).alias("trough_date"),
+        pl.when(vol > 0).then(excess / vol).alias("sharpe"),
+        pl.when(downside > 0).then(excess / downside).alias("sortino"),
+
+    ]
+
+
+def period_statistics (
+
+        series : pl.DataFrame | pl.LazyFrame,
+        value_col : str,
+        as_of : Optional[str | dt.date | dt.datetime] = None,
+
+        date_col : str = "date",
+        by : Optional[Sequence[str]] = None,
+
+        periods : Sequence[str] = PERIODS,
+        risk_free : float = 0.0,
+        annualization : int = TRADING_DAYS,
+
+    ) -> pl.DataFrame :
+    """
+    Return, annualised vol, max drawdown (with peak and trough dates), Sharpe and Sortino of every
+    standard period (WTD, MTD, QTD, YTD, ITD) ending at as_of, for every series, in one lazy query.
+
+    A period's return runs from the last value before its first day (the previous close, as the quick
+    date selectors start YTD / QTD / MTD) to the last value up to as_of. Vol, Sharpe (excess over the
+    annual risk_free rate) and Sortino use the simple daily returns of the period, drawdowns the values
+    from the base on. Several values for one date : the last one is kept.
+
+    Returns:
+        stats (pl.DataFrame) : by..., period, start_date, end_date, start_value, end_value, observations,
+            return, vol, max_drawdown, peak_date, trough_date, sharpe, sortino (fractions, not %).
+    """
+    by = [] if by is None else list(by)
+
+    as_of = str_to_date(as_of)
+    starts = period_starts(as_of)
+
+    lf = (
+        series.lazy()
+        .select(*by, pl.col(date_col).cast(pl.Date), pl.col(value_col).cast(pl.Float64))
+        .drop_nulls([date_col, value_col])
+        .filter(pl.col(date_col) <= pl.lit(as_of))
+        .sort([*by, date_col], maintain_order=True)
+        .unique([*by, date_col], keep="last", maintain_order=True)
+    )
+
+    previous = pl.col(value_col).shift(1).over(by) if by else pl.col(value_col).shift(1)
+    lf = lf.with_columns((pl.col(value_col) / previous - 1.0).alias("return"))
+
+    queries = []
+
+    for period in periods :
+
+        aggs = _period_aggs(period, starts[period], date_col, value_col, risk_free, annualization)
+        queries.append(lf.group_by(by, maintain_order=True).agg(aggs) if by else lf.select(aggs))
+
+    return pl.concat(queries, how="vertical").collect()
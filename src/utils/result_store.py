@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import threading
+import polars as pl
+import datetime as dt
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.parameters import RESULT_STORE_ENABLED, RESULT_STORE_MAX_BYTES
+from src.config.paths import RESULT_STORE_DIR_ABS_PATH
+from src.utils.logger import log
+from src.utils.catalog import lookup_changed
+
+
+RESULT_EXTENSION = ".arrow"
+MANIFEST_FILENAME = "manifest.json"
+
+# store dir -> manifest (key -> entry), loaded and validated once per process
+_MANIFESTS : Dict[str, Dict[str, Dict]] = {}
+_LOCK = threading.RLock()
+
+_STATS = {"loaded" : 0, "written" : 0, "dropped" : 0}
+
+
+def _file_signature (path : str) -> Optional[List] :
+
+    try :
+        stat = os.stat(path)
+
+    except OSError :
+        return None
+
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+
+def _is_valid (entry : Dict, store_dir : str) -> bool :
+    """
+    An entry is valid while its TTL runs, its source files are unchanged, the directory
+    lookups it was computed from still pick the same files and its frames are on disk.
+    """
+    if entry.get("expires") is not None and time.time() >= entry["expires"] :
+        return False
+
+    if any(_file_signature(path) != [path, size, mtime] for path, size, mtime in entry["files"]) :
+        return False
+
+    if any(lookup_changed(lookup) for lookup in entry.get("lookups", ())) :
+        return False
+
+    return all(os.path.isfile(os.path.join(store_dir, part["frame"])) for part in entry["parts"] if "frame" in part)
+
+
+def _unique_lookups (lookups : Optional[List[Dict]]) -> List[Dict] :
+
+    unique = {}
+
+    for lookup in lookups or () :
+        unique.setdefault(json.dumps(lookup, sort_keys=True, default=str), lookup)
+
+    return list(unique.values())
+
+
+def _remove_files (entry : Dict, store_dir : str) -> None :
+
+    for part in entry.get("parts", []) :
+
+        if "frame" in part :
+
+            try :
+                os.remove(os.path.join(store_dir, part["frame"]))
+
+            except OSError :
+                pass
+
+
+def _write_manifest (manifest : Dict, store_dir : str) -> None :
+
+    path = os.path.join(store_dir, MANIFEST_FILENAME)
+    tmp_path = path + f".{os.getpid()}.tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f :
+        json.dump(manifest, f)
+
+    os.replace(tmp_path, path)
+
+
+def load_manifest (store_dir : Optional[str] = None) -> Dict[str, Dict] :
+    """
+    Manifest of the store, read once per process. Entries whose sources changed since they
+    were written are dropped with their files, the frames of the others stay on disk until asked for.
+    """
+    store_dir = RESULT_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    with _LOCK :
+
+        if store_dir in _MANIFESTS :
+            return _MANIFESTS[store_dir]
+
+        manifest = {}
+        path = os.path.join(store_dir, MANIFEST_FILENAME)
+
+        if os.path.isfile(path) :
+
+            try :
+
+                with open(path, "r", encoding="utf-8") as f :
+                    manifest = json.load(f)
+
+            except Exception as e :
+                log(f"[!] [RESULTS] Unreadable manifest {path}, starting empty : {e}", "warning")
+
+        stale = [key for key, entry in manifest.items() if not _is_valid(entry, store_dir)]
+
+        for key in stale :
+            _remove_files(manifest.pop(key), store_dir)
+
+        if stale :
+
+            _STATS["dropped"] += len(stale)
+            _write_manifest(manifest, store_dir)
+
+        log(f"[*] [RESULTS] Manifest of {store_dir} : {len(manifest)} valid entries, {len(stale)} stale dropped", "info")
+
+        _MANIFESTS[store_dir] = manifest
+
+        return manifest
+
+
+def _encode (key : str, value : Any) -> Optional[Tuple[str, List[Dict], Dict[str, pl.DataFrame]]] :
+    """
+    Split a result into frames (written as IPC) and JSON scalars. None if the result does not fit.
+    """
+    shape = "frame" if isinstance(value, pl.DataFrame) else "tuple" if isinstance(value, tuple) else "list" if isinstance(value, list) else None
+
+    if shape is None :
+        return None
+
+    items = [value] if shape == "frame" else list(value)
+    parts, frames = [], {}
+
+    for i, item in enumerate(items) :
+
+        if isinstance(item, pl.DataFrame) :
+
+            name = f"{key}.{i}{RESULT_EXTENSION}"
+            frames[name] = item
+            parts.append({"frame" : name})
+
+        elif isinstance(item, dt.datetime) :
+            parts.append({"datetime" : item.isoformat()})
+
+        elif isinstance(item, dt.date) :
+            parts.append({"date" : item.isoformat()})
+
+        elif item is None or isinstance(item, (str, int, float, bool)) :
+            parts.append({"value" : item})
+
+        elif type(item).__name__ == "LazyFingerprint" :
+            parts.append({"value" : str(item)})
+
+        else :
+            return None
+
+    return shape, parts, frames
+
+
+def _decode (shape : str, parts : List[Dict], store_dir : str) -> Any :
+
+    items = []
+
+    for part in parts :
+
+        if "frame" in part :
+            # Uncompressed IPC : memory-mapped by the scan
+            items.append(pl.scan_ipc(os.path.join(store_dir, part["frame"])).collect())
+
+        elif "datetime" in part :
+            items.append(dt.datetime.fromisoformat(part["datetime"]))
+
+        elif "date" in part :
+            items.append(dt.date.fromisoformat(part["date"]))
+
+        else :
+            items.append(part["value"])
+
+    return items[0] if shape == "frame" else tuple(items) if shape == "tuple" else items
+
+
+def persist_result (
+
+        key : str,
+        func_name : str,
+        value : Any,
+        tags : List[str],
+        files : List[Tuple[str, int, int]],
+        ttl : Optional[float] = None,
+        store_dir : Optional[str] = None,
+        lookups : Optional[List[Dict]] = None,
+
+    ) -> bool :
+    """
+    Spill a computed result to the store : its frames as Arrow IPC files, the rest in the manifest.
+
+    Only results backed by source files are persisted, the manifest can not tell otherwise
+    whether they are still valid after a restart. `lookups` are the catalog lookups (see
+    catalog.recording_lookups) that picked those files, replayed when the entry is checked.
+    """
+    store_dir = RESULT_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    if not RESULT_STORE_ENABLED or not files :
+        return False
+
+    encoded = _encode(key, value)
+
+    if encoded is None :
+        return False
+
+    shape, parts, frames = encoded
+    tmp_suffix = f".{os.getpid()}.tmp"
+
+    try :
+
+        os.makedirs(store_dir, exist_ok=True)
+        nbytes = 0
+
+        for name, frame in frames.items() :
+
+            path = os.path.join(store_dir, name)
+
+            frame.write_ipc(path + tmp_suffix, compression="uncompressed")
+            os.replace(path + tmp_suffix, path)
+
+            nbytes += os.path.getsize(path)
+
+    except Exception as e :
+
+        log(f"[!] [RESULTS] Could not persist {func_name} : {e}", "warning")
+        return False
+
+    entry = {
+
+        "func" : func_name,
+        "tags" : sorted(tags),
+        "files" : [list(sig) for sig in files],
+        "lookups" : _unique_lookups(lookups),
+        "shape" : shape,
+        "parts" : parts,
+        "bytes" : nbytes,
+        "created" : time.time(),
+        "expires" : time.time() + ttl if ttl is not None else None,
+
+    }
+
+    with _LOCK :
+
+        manifest = load_manifest(store_dir)
+        manifest[key] = entry
+
+        _evict(manifest, store_dir)
+        _write_manifest(manifest, store_dir)
+
+        _STATS["written"] += 1
+
+    return True
+
+
+def _evict (manifest : Dict[str, Dict], store_dir : str) -> None :
+    """
+    Drop the oldest entries until the store fits in RESULT_STORE_MAX_BYTES, the lock must be held.
+    """
+    total = sum(entry["bytes"] for entry in manifest.values())
+
+    for key in sorted(manifest, key=lambda k : manifest[k]["created"]) :
+
+        if total <= RESULT_STORE_MAX_BYTES :
+            break
+
+        entry = manifest.pop(key)
+        total -= entry["bytes"]
+
+        _remove_files(entry, store_dir)
+        _STATS["dropped"] += 1
+
+
+def load_result (key : str, store_dir : Optional[str] = None) -> Optional[Dict] :
+    """
+    Reload a persisted result if its sources are unchanged.
+
+    Returns:
+        result (dict | None) : {"value", "tags", "files", "lookups", "ttl"} or None on a miss.
+    """
+    store_dir = RESULT_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    if not RESULT_STORE_ENABLED :
+        return None
+
+    with _LOCK :
+        entry = load_manifest(store_dir).get(key)
+
+    if entry is None :
+        return None
+
+    if not _is_valid(entry, store_dir) :
+
+        drop_results([key], store_dir)
+        return None
+
+    try :
+        value = _decode(entry["shape"], entry["parts"], store_dir)
+
+    except Exception as e :
+
+        log(f"[!] [RESULTS] Unreadable result {key}, dropping it : {e}", "warning")
+        drop_results([key], store_dir)
+
+        return None
+
+    with _LOCK :
+        _STATS["loaded"] += 1
+
+    ttl = entry["expires"] - time.time() if entry.get("expires") is not None else None
+
+    return {"value" : value, "tags" : entry["tags"], "files" : [tuple(sig) for sig in entry["files"]], "lookups" : entry.get("lookups", []), "ttl" : ttl}
+
+
+def drop_results (keys : List[str], store_dir : Optional[str] = None) -> int :
+    """
+    Remove entries from the store.
+    """
+    store_dir = RESULT_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    with _LOCK :
+
+        manifest = load_manifest(store_dir)
+        dropped = [manifest.pop(key) for key in keys if key in manifest]
+
+        for entry in dropped :
+            _remove_files(entry, store_dir)
+
+        if dropped :
+
+            _STATS["dropped"] += len(dropped)
+            _write_manifest(manifest, store_dir)
+
+    return len(dropped)
+
+
+def drop_tagged (tag : str, store_dir : Optional[str] = None) -> int :
+    """
+    Remove the entries of a namespace (same tags as the in-memory cache).
+    """
+    store_dir = RESULT_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    if not RESULT_STORE_ENABLED :
+        return 0
+
+    with _LOCK :
+        keys = [key for key, entry in load_manifest(store_dir).items() if tag in entry["tags"]]
+
+    return drop_results(keys, store_dir)
+
+
+def result_store_stats (store_dir : Optional[str] = None) -> Dict :
+    """
+    Entries, bytes and counters of the store.
+    """
+    store_dir = RESULT_STORE_DIR_ABS_PATH if store_dir is None else store_dir
+
+    with _LOCK :
+
+        manifest = load_manifest(store_dir) if RESULT_STORE_ENABLED else {}
+
+        return {"entries" : len(manifest), "bytes" : sum(e["bytes"] for e in manifest.values()), **_STATS}
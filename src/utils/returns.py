@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import calendar
+import polars as pl
+
+from typing import Dict, Optional, Sequence, Tuple
+
+
+# Frequency -> (group_by_dynamic window, previous period must be the calendar-adjacent one)
+# Daily returns chain on the previous observation : weekends and holidays do not break them.
+FREQUENCIES : Dict[str, Tuple[str, bool]] = {
+
+    "daily" : ("1d", False),
+    "weekly" : ("1w", True),
+    "monthly" : ("1mo", True),
+    "quarterly" : ("1q", True),
+    "yearly" : ("1y", True),
+
+}
+
+SINCE_INCEPTION = "since_inception"
+
+GRID_COLUMNS : Dict[str, Dict[int, str]] = {
+
+    "monthly" : {m : calendar.month_abbr[m] for m in range(1, 13)},
+    "quarterly" : {q : f"Q{q}" for q in range(1, 5)},
+
+}
+
+
+def _period_returns (
+
+        lf : pl.LazyFrame,
+        frequency : str,
+        date_col : str,
+        value_col : str,
+        by : Sequence[str],
+
+    ) -> pl.LazyFrame :
+    """
+    One row per (by, period) : compounded return from the previous period's last value
+    (first value of the period when there is no usable previous period) to the period's last value.
+    """
+    every, contiguous = FREQUENCIES[frequency]
+
+    periods = (
+        lf.group_by_dynamic(
+            date_col,
+            every=every,
+            group_by=list(by) or None,
+            start_by="monday" if every == "1w" else "window",
+        )
+        .agg(
+            pl.col(date_col).last().alias("end_date"),
+            pl.len().alias("observations"),
+            pl.col(value_col).first().alias("first_value"),
+            pl.col(value_col).last().alias("end_value"),
+        )
+        .rename({date_col : "period"})
+    )
+
+    def previous (col : str) -> pl.Expr :
+        return pl.col(col).shift(1).over(by) if by else pl.col(col).shift(1)
+
+    prev_end = previous("end_value")
+
+    if contiguous :
+        prev_end = pl.when(previous("period") == pl.col("period").dt.offset_by(f"-{every}")).then(prev_end)
+
+    valid = (pl.col("observations") >= 2) | ((pl.col("observations") == 1) & pl.col("prev_end").is_not_null())
+
+    return (
+        periods
+        .with_columns(prev_end.alias("prev_end"))
+        .with_columns(pl.coalesce("prev_end", "first_value").alias("start_value"))
+        .with_columns(
+            pl.lit(frequency).alias("frequency"),
+            pl.when(valid).then(pl.col("end_value") / pl.col("start_value") - 1.0).alias("return"),
+        )
+    )
+
+
+def _since_inception (
+
+        lf : pl.LazyFrame,
+        date_col : str,
+        value_col : str,
+        by : Sequence[str],
+
+    ) -> pl.LazyFrame :
+
+    aggs = [
+        pl.col(date_col).first().alias("period"),
+        pl.col(date_col).last().alias("end_date"),
+        pl.len().alias("observations"),
+        pl.col(value_col).first().alias("start_value"),
+        pl.col(value_col).last().alias("end_value"),
+    ]
+
+    inception = lf.group_by(list(by), maintain_order=True).agg(aggs) if by else lf.select(aggs)
+
+    return inception.with_columns(
+        pl.lit(SINCE_INCEPTION).alias("frequency"),
+        pl.when(pl.col("observations") >= 2).then(pl.col("end_value") / pl.col("start_value") - 1.0).alias("return"),
+    )
+
+
+def compute_returns (
+
+        series : pl.DataFrame | pl.LazyFrame,
+        value_col : str,
+
+        date_col : str = "date",
+        by : Optional[Sequence[str]] = None,
+        frequencies : Sequence[str] = ("daily", "weekly", "monthly", "quarterly", "yearly", SINCE_INCEPTION),
+
+    ) -> pl.DataFrame :
+    """
+    Returns of NAV / GAV series at several frequencies, in one lazy query.
+
+    Each period's return compounds from the last value of the previous period when it is the adjacent
+    one (first value of the period otherwise) to its last value, so a period with a single observation
+    and no previous period has no return. Series are split by the `by` columns (fund, share class...).
+
+    Returns:
+        returns (pl.DataFrame) : Tidy long table : by..., frequency, period (window start, first date for
+            since inception), end_date, observations, start_value, end_value, return (fraction).
+    """
+    by = [] if by is None else list(by)
+
+    lf = (
+        series.lazy()
+        .select(*by, date_col, value_col)
+        .drop_nulls([date_col, value_col])
+        .with_columns(pl.col(value_col).cast(pl.Float64))
+        .sort([*by, date_col])
+    )
+
+    columns = [*by, "frequency", "period", "end_date", "observations", "start_value", "end_value", "return"]
+
+    queries = [
+        (_since_inception(lf, date_col, value_col, by) if frequency == SINCE_INCEPTION else _period_returns(lf, frequency, date_col, value_col, by))
+        .select(columns)
+        for frequency in frequencies
+    ]
+
+    return pl.concat(queries, how="vertical").collect()
+
+
+def calendar_grid (
+
+        returns : pl.DataFrame,
+        frequency : str = "monthly",
+
+        by : Optional[Sequence[str]] = None,
+        year_col : str = "Year",
+        total_col : Optional[str] = "Total",
+        scale : float = 100.0,
+
+    ) -> pl.DataFrame :
+    """
+    Calendar grid of a compute_returns table : one row per (by, year), one column per month (Jan..Dec)
+    or quarter (Q1..Q4), plus the yearly return in `total_col` when given.
+
+    Periods without a return are NaN, years without a yearly return have a null total.
+    """
+    by = [] if by is None else list(by)
+    labels = GRID_COLUMNS[frequency]
+
+    periods = (
+        returns
+        .filter(pl.col("frequency") == frequency)
+        .select(
+            *by,
+            pl.col("period").dt.year().cast(pl.Int64).alias(year_col),
+            (pl.col("period").dt.month() if frequency == "monthly" else pl.col("period").dt.quarter())
+            .replace_strict(labels, return_dtype=pl.Utf8)
+            .alias("label"),
+            (pl.col("return") * scale).alias("return"),
+        )
+    )
+
+    grid = periods.pivot(on="label", index=[*by, year_col], values="return")
+
+    grid = grid.with_columns([pl.lit(None, dtype=pl.Float64).alias(label) for label in labels.values() if label not in grid.columns])
+    grid = grid.select(*by, year_col, *[pl.col(label).cast(pl.Float64).fill_null(float("nan")) for label in labels.values()])
+
+    if total_col is not None :
+
+        totals = (
+            returns
+            .filter(pl.col("frequency") == "yearly")
+            .select(*by, pl.col("period").dt.year().cast(pl.Int64).alias(year_col), (pl.col("return") * scale).alias(total_col))
+        )
+
+        grid = grid.join(totals, on=[*by, year_col], how="left")
+
+    return grid.sort([*by, year_col])
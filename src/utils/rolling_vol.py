@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import math
+import datetime as dt
+import polars as pl
+
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+
+VOL_WINDOWS = (20, 60, 120, 252)
+EWMA_LAMBDA = 0.94              # RiskMetrics daily decay
+TRADING_DAYS = 252
+
+
+def vol_column (window : int | str) -> str :
+    return f"vol_{window}d" if isinstance(window, int) else f"vol_{window}"
+
+
+def rolling_realized_vol (
+
+        series : pl.DataFrame | pl.LazyFrame,
+        value_col : str,
+
+        date_col : str = "date",
+        by : Optional[Sequence[str]] = None,
+
+        windows : Sequence[int] = VOL_WINDOWS,
+        ewma_lambda : Optional[float] = EWMA_LAMBDA,
+        log_returns : bool = True,
+        annualization : int = TRADING_DAYS,
+
+    ) -> pl.DataFrame :
+    """
+    Annualised realized vol time series (in %) for every window and estimator, in one rolling pass.
+
+    Close-to-close : sample std of the daily returns over the last `window` returns (null until full).
+    EWMA : RiskMetrics zero-mean variance, var_t = lambda * var_t-1 + (1 - lambda) * r_t^2.
+
+    Several values for one date (intraday estimates) : the last one is kept.
+
+    Returns:
+        vols (pl.DataFrame) : by..., date_col, value_col, return, vol_<window>d..., vol_ewma.
+    """
+    by = [] if by is None else list(by)
+
+    def per_series (expr : pl.Expr) -> pl.Expr :
+        return expr.over(by) if by else expr
+
+    ret = (pl.col(value_col) / pl.col(value_col).shift(1))
+    ret = ret.log() if log_returns else ret - 1.0
+
+    scale = math.sqrt(annualization) * 100.0
+
+    vols = [
+        per_series(pl.col("return").rolling_std(window_size=window, min_samples=window)).mul(scale).alias(vol_column(window))
+        for window in windows
+    ]
+
+    if ewma_lambda is not None :
+        vols.append(
+            per_series(pl.col("return").pow(2).ewm_mean(alpha=1.0 - ewma_lambda, adjust=False, ignore_nulls=True)).sqrt().mul(scale).alias(vol_column("ewma"))
+        )
+
+    return (
+        series.lazy()
+        .select(*by, date_col, pl.col(value_col).cast(pl.Float64))
+        .drop_nulls([date_col, value_col])
+        .sort([*by, date_col], maintain_order=True)
+        .unique([*by, date_col], keep="last", maintain_order=True)
+        .with_columns(per_series(ret).alias("return"))
+        .with_columns(vols)
+        .collect()
+    )
+
+
+class RollingVolState :
+    """
+    Incremental state of rolling_realized_vol for one series : a new day's value updates every
+    window and the EWMA in O(1), from running sums over the last returns.
+
+    A value for the last date again (intraday estimate revised) replaces that day instead of adding one.
+
+    Usage:
+        state = RollingVolState.from_history(history, "NAV Estimate")
+        row = state.update(dt.date(2025, 1, 3), 101.2)      # {"date" : ..., "NAV Estimate" : ..., "vol_20d" : ..., ...}
+    """
+
+    def __init__ (
+
+            self,
+            windows : Sequence[int] = VOL_WINDOWS,
+            ewma_lambda : Optional[float] = EWMA_LAMBDA,
+            log_returns : bool = True,
+            annualization : int = TRADING_DAYS,
+            date_col : str = "date",
+            value_col : str = "value",
+
+        ) :
+
+        self.windows = tuple(windows)
+        self.ewma_lambda = ewma_lambda
+        self.log_returns = log_returns
+        self.scale = math.sqrt(annualization) * 100.0
+        self.date_col = date_col
+        self.value_col = value_col
+
+        # One more return than the largest window : the one a revised day puts back into the windows
+        self.returns = deque(maxlen=max(self.windows, default=0) + 1)
+        self.sums = {window : [0.0, 0.0] for window in self.windows}
+
+        self.last_date = None
+        self.last_value = None
+        self.previous_value = None
+
+        self.ewma_var = None
+        self.previous_ewma_var = None
+
+
+    @classmethod
+    def from_history (
+
+            cls,
+            series : pl.DataFrame,
+            value_col : str,
+            date_col : str = "date",
+            **kwargs,
+
+        ) -> "RollingVolState" :
+        """
+        State after the whole history : replays the returns once, with the same cleaning as rolling_realized_vol.
+        """
+        state = cls(date_col=date_col, value_col=value_col, **kwargs)
+
+        history = series.select(date_col, pl.col(value_col).cast(pl.Float64)).drop_nulls().sort(date_col, maintain_order=True)
+
+        for date, value in history.iter_rows() :
+            state.update(date, value)
+
+        return state
+
+
+    def _return (self, value : float, previous : float) -> float :
+        return math.log(value / previous) if self.log_returns else value / previous - 1.0
+
+
+    def _add (self, ret : float) -> None :
+
+        for window, sums in self.sums.items() :
+
+            if len(self.returns) >= window :
+
+                evicted = self.returns[-window]
+                sums[0] -= evicted
+                sums[1] -= evicted * evicted
+
+            sums[0] += ret
+            sums[1] += ret * ret
+
+        self.returns.append(ret)
+
+
+    def _remove_last (self) -> None :
+
+        ret = self.returns.pop()
+
+        for window, sums in self.sums.items() :
+
+            sums[0] -= ret
+            sums[1] -= ret * ret
+
+            if len(self.returns) >= window :
+
+                restored = self.returns[-window]
+                sums[0] += restored
+                sums[1] += restored * restored
+
+
+    def update (self, date : dt.date | dt.datetime, value : float) -> Dict :
+        """
+        Add (or revise, for the last date) one observation and return the vols at that date.
+        """
+        if self.last_date is not None and date < self.last_date :
+            raise ValueError(f"Observation for {date} older than the state ({self.last_date})")
+
+        if date == self.last_date :
+
+            if self.previous_value is not None :
+                self._remove_last()
+
+            self.ewma_var = self.previous_ewma_var
+            previous = self.previous_value
+
+        else :
+
+            self.previous_value = self.last_value
+            self.previous_ewma_var = self.ewma_var
+            previous = self.last_value
+
+        self.last_date = date
+        self.last_value = value
+
+        ret = None
+
+        if previous is not None :
+
+            ret = self._return(value, previous)
+            self._add(ret)
+
+            if self.ewma_lambda is not None :
+                self.ewma_var = ret * ret if self.ewma_var is None else self.ewma_lambda * self.ewma_var + (1.0 - self.ewma_lambda) * ret * ret
+
+        return {self.date_col : date, self.value_col : value, "return" : ret, **self.vols()}
+
+
+    def vols (self) -> Dict[str, Optional[float]] :
+        """
+        Current annualised vols (in %), null for windows not yet full.
+        """
+        vols = {}
+
+        for window, (total, squares) in self.sums.items() :
+
+            if len(self.returns) < window or window < 2 :
+                vols[vol_column(window)] = None
+                continue
+
+            variance = (squares - total * total / window) / (window - 1)
+            vols[vol_column(window)] = math.sqrt(max(variance, 0.0)) * self.scale
+
+        if self.ewma_lambda is not None :
+            vols[vol_column("ewma")] = None if self.ewma_var is None else math.sqrt(self.ewma_var) * self.scale
+
+        return vols
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+import polars as pl
+
+from typing import Dict, Optional, List, Tuple
+
+from src.config.parameters import SIDECAR_CACHE_ENABLED, SIDECAR_CACHE_MAX_BYTES
+from src.config.paths import SIDECAR_DIR_ABS_PATH
+from src.utils.logger import log
+
+
+SIDECAR_EXTENSION = ".arrow"
+SIDECAR_MD5_EXTENSION = ".md5"
+
+
+def sidecar_key (
+
+        source_abs_path : str,
+        sheet_name : Optional[str | int] = None,
+        specific_cols : Optional[List] = None,
+        schema_overrides : Optional[Dict] = None,
+        *,
+        stat : Optional[os.stat_result] = None,
+        **options,
+
+    ) -> Optional[str] :
+    """
+    Build the sidecar key of a parsed source file.
+
+    The key changes as soon as the file is rewritten (mtime / size) or the
+    parse arguments change, so a stale copy can never be served.
+
+    Args:
+        source_abs_path (str) : Absolute path of the source (Excel) file.
+        sheet_name (str | int) : Sheet parsed.
+        specific_cols (list) : Projected columns, None for all.
+        schema_overrides (dict) : Column name -> Polars dtype.
+        stat (os.stat_result) : Stat already taken by the caller, so that every key of one load follows the same version.
+        **options : Any other argument that changes the parsed result (cast_num, date formats, ...).
+
+    Returns:
+        key (str | None) : Hex digest, or None if the file can not be stat'ed.
+    """
+    if stat is None :
+
+        try :
+            stat = os.stat(source_abs_path)
+
+        except OSError :
+            return None
+
+    payload = {
+
+        "path" : os.path.normcase(os.path.abspath(source_abs_path)),
+        "mtime_ns" : stat.st_mtime_ns,
+        "size" : stat.st_size,
+        "sheet" : sheet_name,
+        "columns" : list(specific_cols) if specific_cols is not None else None,
+        "schema" : {str(k) : str(v) for k, v in schema_overrides.items()} if schema_overrides else None,
+        "options" : {k : str(v) for k, v in sorted(options.items())},
+
+    }
+
+    raw = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+
+    return hashlib.sha1(raw).hexdigest()
+
+
+def scan_sidecar (
+
+        key : Optional[str],
+        sidecar_dir : Optional[str] = None,
+
+    ) -> Tuple[Optional[pl.LazyFrame], Optional[str]] :
+    """
+    Lazy scan over a sidecar copy : projections and filters are pushed into the
+    memory-mapped read, untouched columns are never materialised.
+
+    Returns:
+        (lf, md5) : (None, None) on a miss.
+    """
+    sidecar_dir = SIDECAR_DIR_ABS_PATH if sidecar_dir is None else sidecar_dir
+
+    if key is None :
+        return None, None
+
+    data_path = os.path.join(sidecar_dir, key + SIDECAR_EXTENSION)
+    md5_path = os.path.join(sidecar_dir, key + SIDECAR_MD5_EXTENSION)
+
+    if not (os.path.isfile(data_path) and os.path.isfile(md5_path)) :
+        return None, None
+
+    try :
+
+        with open(md5_path, "r", encoding="utf-8") as f :
+            md5_hash = f.read().strip()
+
+        # Touch the entry so that eviction stays LRU
+        os.utime(data_path, None)
+
+        # Uncompressed IPC on a local disk is memory-mapped by the scan
+        return pl.scan_ipc(data_path), md5_hash
+
+    except Exception as e :
+
+        log(f"[!] Unreadable sidecar {data_path}, ignoring it : {e}", "warning")
+        return None, None
+
+
+def read_sidecar (
+
+        key : Optional[str],
+        sidecar_dir : Optional[str] = None,
+
+    ) -> Tuple[Optional[pl.DataFrame], Optional[str]] :
+    """
+    Read a sidecar copy (memory-mapped) and its stored fingerprint.
+
+    Returns:
+        (df, md5) : (None, None) on a miss.
+    """
+    lazyframe, md5_hash = scan_sidecar(key, sidecar_dir)
+
+    if lazyframe is None :
+        return None, None
+
+    try :
+        return lazyframe.collect(), md5_hash
+
+    except Exception as e :
+
+        log(f"[!] Unreadable sidecar for key {key}, ignoring it : {e}", "warning")
+        return None, None
+
+
+def write_sidecar (
+
+        key : Optional[str],
+        dataframe : Optional[pl.DataFrame],
+        md5_hash : Optional[str],
+        sidecar_dir : Optional[str] = None,
+        max_bytes : Optional[int] = None,
+
+    ) -> bool :
+    """
+    Persist a parsed dataframe as an uncompressed Arrow IPC file (required for memory-mapping).
+
+    The write goes through a temporary file and an atomic rename, so that a
+    concurrent reader never sees a partial file.
+    """
+    sidecar_dir = SIDECAR_DIR_ABS_PATH if sidecar_dir is None else sidecar_dir
+    max_bytes = SIDECAR_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    if key is None or dataframe is None or md5_hash is None :
+        return False
+
+    data_path = os.path.join(sidecar_dir, key + SIDECAR_EXTENSION)
+    md5_path = os.path.join(sidecar_dir, key + SIDECAR_MD5_EXTENSION)
+
+    tmp_suffix = f".{os.getpid()}.tmp"
+
+    try :
+
+        os.makedirs(sidecar_dir, exist_ok=True)
+
+        dataframe.write_ipc(data_path + tmp_suffix, compression="uncompressed")
+
+        with open(md5_path + tmp_suffix, "w", encoding="utf-8") as f :
+            f.write(md5_hash)
+
+        os.replace(md5_path + tmp_suffix, md5_path)
+        os.replace(data_path + tmp_suffix, data_path)
+
+    except Exception as e :
+
+        log(f"[!] Could not write sidecar for key {key} : {e}", "warning")
+
+        for path in (data_path + tmp_suffix, md5_path + tmp_suffix) :
+
+            if os.path.isfile(path) :
+                os.remove(path)
+
+        return False
+
+    evict_sidecars(max_bytes=max_bytes, sidecar_dir=sidecar_dir)
+
+    return True
+
+
+def sidecar_usage (sidecar_dir : Optional[str] = None) -> Dict :
+    """
+    Size and number of entries currently held in the sidecar directory.
+    """
+    sidecar_dir = SIDECAR_DIR_ABS_PATH if sidecar_dir is None else sidecar_dir
+
+    entries, total = 0, 0
+
+    if not os.path.isdir(sidecar_dir) :
+        return {"entries" : 0, "bytes" : 0}
+
+    with os.scandir(sidecar_dir) as it :
+
+        for entry in it :
+
+            if entry.is_file() :
+
+                total += entry.stat().st_size
+                entries += entry.name.endswith(SIDECAR_EXTENSION)
+
+    return {"entries" : entries, "bytes" : total}
+
+
+def evict_sidecars (
+
+        max_bytes : Optional[int] = None,
+        sidecar_dir : Optional[str] = None,
+
+    ) -> int :
+    """
+    Remove the least recently used sidecars until the directory fits in max_bytes.
+
+    Returns:
+        removed (int) : Number of evicted entries.
+    """
+    sidecar_dir = SIDECAR_DIR_ABS_PATH if sidecar_dir is None else sidecar_dir
+    max_bytes = SIDECAR_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    if not os.path.isdir(sidecar_dir) :
+        return 0
+
+    entries = []
+    total = 0
+
+    with os.scandir(sidecar_dir) as it :
+
+        for entry in it :
+
+            if not entry.name.endswith(SIDECAR_EXTENSION) :
+                continue
+
+            stat = entry.stat()
+            md5_path = entry.path[: -len(SIDECAR_EXTENSION)] + SIDECAR_MD5_EXTENSION
+
+            size = stat.st_size + (os.path.getsize(md5_path) if os.path.isfile(md5_path) else 0)
+            total += size
+
+            entries.append((stat.st_mtime_ns, entry.path, md5_path, size))
+
+    if total <= max_bytes :
+        return 0
+
+    removed = 0
+
+    for _, data_path, md5_path, size in sorted(entries) :
+
+        if total <= max_bytes :
+            break
+
+        try :
+
+            # Drop the fingerprint first : without it the entry is a miss anyway
+            if os.path.isfile(md5_path) :
+                os.remove(md5_path)
+
+            os.remove(data_path)
+
+        except OSError as e :
+
+            # Still memory-mapped somewhere (Windows), retry on next eviction
+            log(f"[!] Could not evict sidecar {data_path} : {e}", "warning")
+            continue
+
+        total -= size
+        removed += 1
+
+    if removed :
+        log(f"[*] [SIDECAR] Evicted {removed} entries, {total} bytes left", "info")
+
+    return removed
+
+
+def clear_sidecars (sidecar_dir : Optional[str] = None) -> int :
+    """
+    Remove every sidecar copy.
+    """
+    return evict_sidecars(max_bytes=-1, sidecar_dir=sidecar_dir)
+
+
+def sidecar_enabled (use_sidecar : Optional[bool] = None) -> bool :
+    """
+    Resolve the per-call bypass switch against the global setting.
+    """
+    return SIDECAR_CACHE_ENABLED if use_sidecar is None else bool(use_sidecar)
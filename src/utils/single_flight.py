@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import time
+import pickle
+import hashlib
+import inspect
+import functools
+import threading
+
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils.logger import log
+
+
+class _Flight :
+    """
+    One call in progress : the leader runs it, followers wait on the event.
+    """
+    __slots__ = ("event", "value", "error", "waiters")
+
+    def __init__ (self) :
+
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+_FLIGHTS : Dict[Hashable, _Flight] = {}
+_LOCK = threading.Lock()
+
+_STATS : Dict[str, Dict[str, float]] = {}
+
+
+def _namespace_stats (namespace : str) -> Dict[str, float] :
+    return _STATS.setdefault(namespace, {"calls" : 0, "executions" : 0, "shared" : 0, "max_waiters" : 0, "wait_seconds" : 0.0, "max_wait_seconds" : 0.0})
+
+
+def single_flight (key : Hashable, function : Callable, *args, **kwargs) -> Any :
+    """
+    Run function(*args, **kwargs) once for concurrent callers of the same key.
+
+    The first caller executes it, the callers arriving while it runs wait and get
+    its result (or its exception). A call arriving after it finished runs again.
+
+    Args:
+        key (hashable) : Identity of the work, its first item names the metrics namespace if it is a tuple.
+    """
+    namespace = str(key[0]) if isinstance(key, tuple) and key else "default"
+
+    with _LOCK :
+
+        stats = _namespace_stats(namespace)
+        stats["calls"] += 1
+
+        flight = _FLIGHTS.get(key)
+        leader = flight is None
+
+        if leader :
+
+            flight = _Flight()
+            _FLIGHTS[key] = flight
+
+            stats["executions"] += 1
+
+        else :
+
+            flight.waiters += 1
+
+            stats["shared"] += 1
+            stats["max_waiters"] = max(stats["max_waiters"], flight.waiters)
+
+    if not leader :
+
+        start = time.monotonic()
+        flight.event.wait()
+        waited = time.monotonic() - start
+
+        with _LOCK :
+
+            stats["wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+        if flight.error is not None :
+            raise flight.error
+
+        return flight.value
+
+    try :
+        flight.value = function(*args, **kwargs)
+
+    except BaseException as e :
+
+        flight.error = e
+        raise
+
+    finally :
+
+        with _LOCK :
+            _FLIGHTS.pop(key, None)
+
+        # Followers released first : nothing after this point may leave them waiting
+        flight.event.set()
+
+        if flight.waiters :
+
+            try :
+                log(f"[*] [FLIGHT] {namespace} result shared with {flight.waiters} concurrent callers", "debug")
+
+            except Exception :
+                pass
+
+    return flight.value
+
+
+def _call_key (name : str, arguments : Dict[str, Any]) -> str :
+
+    try :
+        raw = pickle.dumps((name, sorted(arguments.items())), protocol=pickle.HIGHEST_PROTOCOL)
+
+    except Exception :
+        raw = repr((name, sorted(arguments.items(), key=str))).encode("utf-8")
+
+    return hashlib.md5(raw).hexdigest()
+
+
+def deduplicated (func : Optional[Callable] = None, *, namespace : Optional[str] = None) -> Callable :
+    """
+    Decorator form of single_flight, keyed on the call arguments (those starting with "_" are not hashed).
+
+    Usage:
+        @deduplicated(namespace="ice")
+        def fetch (date, fund) : ...
+    """
+    def decorator (function : Callable) -> Callable :
+
+        name = f"{function.__module__}.{function.__qualname__}"
+        label = name if namespace is None else namespace
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper (*args, **kwargs) :
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            key = _call_key(name, {k : v for k, v in bound.arguments.items() if not k.startswith("_")})
+
+            return single_flight((label, key), function, *args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def single_flight_stats () -> Dict[str, Dict[str, float]] :
+    """
+    Per namespace : calls, executions, calls served by another one's execution (shared),
+    largest number of concurrent waiters and time spent waiting.
+    """
+    with _LOCK :
+        return {namespace : dict(stats) for namespace, stats in _STATS.items()}
+
+
+def reset_single_flight_stats () -> None :
+
+    with _LOCK :
+        _STATS.clear()
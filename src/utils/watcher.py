@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config.parameters import WATCHER_BACKEND, WATCHER_POLL_SECONDS, WATCHER_SETTLE_SECONDS
+from src.utils.logger import log
+from src.utils.catalog import invalidate_catalog
+
+try :
+    # Native notifications (inotify on Linux, ReadDirectoryChangesW on Windows)
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+
+except ImportError :
+    Observer, FileSystemEventHandler = None, object
+
+
+# dir (normcase) -> {"path" : dir, "rules" : [(regex | None, [callbacks])]}
+_WATCHES : Dict[str, Dict] = {}
+
+# dir (normcase) -> {filename : (size, mtime_ns)}
+_SNAPSHOTS : Dict[str, Dict[str, Tuple[int, int]]] = {}
+
+# path -> (dir key, signature, last change seen at)
+_PENDING : Dict[str, Tuple[str, Optional[Tuple[int, int]], float]] = {}
+
+# Called with (dir_abs_path, file_abs_path) for every settled change, whatever the rules
+_LISTENERS : List[Callable[[str, str], None]] = []
+
+_LOCK = threading.RLock()
+_WAKE = threading.Event()
+_STOP = threading.Event()
+
+_STATE = {"thread" : None, "observer" : None, "preloader" : None, "backend" : None, "events" : 0, "dispatched" : 0, "last_poll" : None}
+
+
+def _dir_key (dir_abs_path : str) -> str :
+    return os.path.normcase(os.path.abspath(dir_abs_path))
+
+
+def _signature (path : str) -> Optional[Tuple[int, int]] :
+
+    try :
+        stat = os.stat(path)
+
+    except OSError :
+        return None
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _snapshot (dir_abs_path : str) -> Dict[str, Tuple[int, int]] :
+
+    snapshot = {}
+
+    try :
+
+        with os.scandir(dir_abs_path) as it :
+
+            for entry in it :
+
+                if entry.is_file() :
+
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+    except OSError as e :
+        log(f"[!] [WATCHER] Can not list {dir_abs_path} : {e}", "warning")
+
+    return snapshot
+
+
+def watch_directory (
+
+        dir_abs_path : Optional[str],
+        regex : Optional[re.Pattern] = None,
+        on_change : Optional[Callable[[str], None]] = None,
+
+    ) -> bool :
+    """
+    Watch a directory for new or modified files.
+
+    Every settled change invalidates the catalog index of the directory, then
+    calls on_change(file_abs_path) for files matching regex (all files if None).
+    Typically on_change pre-loads the file with the exact arguments its reader
+    uses, so that the sidecar is warm before the first user asks for it.
+
+    Files already present when the directory is registered are not reported.
+
+    Returns:
+        registered (bool) : False if the directory is not configured or missing.
+    """
+    if not dir_abs_path or not os.path.isdir(dir_abs_path) :
+        return False
+
+    key = _dir_key(dir_abs_path)
+
+    with _LOCK :
+
+        watch = _WATCHES.get(key)
+
+        if watch is None :
+
+            watch = {"path" : dir_abs_path, "rules" : []}
+
+            _WATCHES[key] = watch
+            _SNAPSHOTS[key] = _snapshot(dir_abs_path)
+
+            if _STATE["observer"] is not None :
+                _schedule(dir_abs_path)
+
+        for rule_regex, callbacks in watch["rules"] :
+
+            if (rule_regex.pattern if rule_regex else None) == (regex.pattern if regex else None) :
+
+                if on_change is not None and on_change not in callbacks :
+                    callbacks.append(on_change)
+
+                break
+
+        else :
+            watch["rules"].append((regex, [on_change] if on_change is not None else []))
+
+    return True
+
+
+def add_change_listener (listener : Callable[[str, str], None]) -> None :
+    """
+    Subscribe to every settled change, as listener(dir_abs_path, file_abs_path).
+    """
+    with _LOCK :
+
+        if listener not in _LISTENERS :
+            _LISTENERS.append(listener)
+
+
+def notify_change (file_abs_path : str) -> None :
+    """
+    Queue a path as changed (used by native notifications, also handy for producers in-process).
+    """
+    key = _dir_key(os.path.dirname(file_abs_path))
+
+    if key not in _WATCHES :
+        return
+
+    # Stat outside the lock : slow on a network share
+    sig = _signature(file_abs_path)
+
+    with _LOCK :
+
+        _STATE["events"] += 1
+        _PENDING[file_abs_path] = (key, sig, time.monotonic())
+
+    _WAKE.set()
+
+
+def _poll () -> None :
+    """
+    Diff every watched directory against its last snapshot.
+    """
+    with _LOCK :
+        watches = list(_WATCHES.items())
+
+    for key, watch in watches :
+
+        current = _snapshot(watch["path"])
+        previous = _SNAPSHOTS.get(key, {})
+
+        now = time.monotonic()
+
+        with _LOCK :
+
+            for name, sig in current.items() :
+
+                if previous.get(name) != sig :
+
+                    path = os.path.join(watch["path"], name)
+
+                    if path not in _PENDING :
+                        _PENDING[path] = (key, sig, now)
+
+            for name in previous.keys() - current.keys() :
+
+                path = os.path.join(watch["path"], name)
+                _PENDING[path] = (key, None, now)
+
+            _SNAPSHOTS[key] = current
+
+    _STATE["last_poll"] = time.time()
+
+
+def _flush (settle_seconds : float) -> None :
+    """
+    Dispatch changes whose file did not move for settle_seconds (producers write Excel files in several steps).
+
+    The pending files are stat'ed outside the lock : on a slow share, event handlers and
+    dispatches are not held up meanwhile.
+    """
+    with _LOCK :
+        pending = list(_PENDING.items())
+
+    checked = [(path, entry, _signature(path)) for path, entry in pending]
+
+    now = time.monotonic()
+    ready = []
+
+    with _LOCK :
+
+        for path, entry, current in checked :
+
+            # Queued again while stat'ing : the newer entry is checked on the next flush
+            if _PENDING.get(path) is not entry :
+                continue
+
+            key, sig, seen = entry
+
+            if current != sig :
+
+                _PENDING[path] = (key, current, now)
+                continue
+
+            if now - seen >= settle_seconds :
+
+                ready.append((key, path, current))
+                del _PENDING[path]
+
+    for key, path, sig in ready :
+        _dispatch(key, path, sig)
+
+
+def _dispatch (key : str, path : str, sig : Optional[Tuple[int, int]]) -> None :
+
+    with _LOCK :
+
+        watch = _WATCHES.get(key)
+
+        if watch is None :
+            return
+
+        rules = [(regex, list(callbacks)) for regex, callbacks in watch["rules"]]
+        listeners = list(_LISTENERS)
+
+        if sig is not None :
+            _SNAPSHOTS.setdefault(key, {})[os.path.basename(path)] = sig
+
+    invalidate_catalog(watch["path"])
+    _STATE["dispatched"] += 1
+
+    log(f"[*] [WATCHER] {'Changed' if sig is not None else 'Removed'} : {path}", "debug")
+
+    for listener in listeners :
+
+        try :
+            listener(watch["path"], path)
+
+        except Exception as e :
+            log(f"[!] [WATCHER] Listener failed on {path} : {e}", "warning")
+
+    # Nothing to pre-load for a removed file
+    if sig is None :
+        return
+
+    name = os.path.basename(path)
+    callbacks = [callback for regex, rule_callbacks in rules if regex is None or regex.match(name) for callback in rule_callbacks]
+
+    if not callbacks :
+        return
+
+    preloader = _STATE["preloader"]
+
+    # Parses run on their own worker : a slow one does not delay the detection of other changes
+    if preloader is None :
+        _preload(path, callbacks)
+
+    else :
+        preloader.submit(_preload, path, callbacks)
+
+
+def _preload (path : str, callbacks : List[Callable[[str], None]]) -> None :
+
+    name = os.path.basename(path)
+
+    for callback in callbacks :
+
+        start = time.time()
+
+        try :
+
+            callback(path)
+            log(f"[+] [WATCHER] Pre-loaded {name} in {time.time() - start:.2f} seconds", "info")
+
+        except Exception as e :
+            log(f"[!] [WATCHER] Pre-load failed on {path} : {e}", "warning")
+
+
+class _EventHandler (FileSystemEventHandler) :
+
+    def on_created (self, event) :
+
+        if not event.is_directory :
+            notify_change(event.src_path)
+
+    def on_modified (self, event) :
+
+        if not event.is_directory :
+            notify_change(event.src_path)
+
+    def on_moved (self, event) :
+
+        if not event.is_directory :
+
+            notify_change(event.src_path)
+            notify_change(event.dest_path)
+
+    def on_deleted (self, event) :
+
+        if not event.is_directory :
+            notify_change(event.src_path)
+
+
+def _schedule (dir_abs_path : str) -> None :
+
+    try :
+        _STATE["observer"].schedule(_EventHandler(), dir_abs_path, recursive=False)
+
+    except Exception as e :
+        log(f"[!] [WATCHER] Native watch unavailable on {dir_abs_path}, polling only : {e}", "warning")
+
+
+def _run (poll_seconds : float, settle_seconds : float) -> None :
+
+    next_poll = 0.0
+
+    while not _STOP.is_set() :
+
+        if time.monotonic() >= next_poll :
+
+            _poll()
+            next_poll = time.monotonic() + poll_seconds
+
+        _flush(settle_seconds)
+
+        with _LOCK :
+            has_pending = bool(_PENDING)
+
+        timeout = min(settle_seconds, poll_seconds) if has_pending else max(0.0, next_poll - time.monotonic())
+
+        _WAKE.wait(timeout)
+        _WAKE.clear()
+
+
+def start_watcher (
+
+        backend : Optional[str] = None,
+        poll_seconds : Optional[float] = None,
+        settle_seconds : Optional[float] = None,
+
+    ) -> str :
+    """
+    Start the background watcher (idempotent).
+
+    Args:
+        backend (str) : "auto" (native notifications when watchdog is installed, plus polling),
+            "native" or "poll". Polling always runs as a safety net : network shares do not
+            forward remote writes to inotify.
+        poll_seconds (float) : Directory rescan interval.
+        settle_seconds (float) : Quiet time before a changed file is dispatched.
+
+    Returns:
+        backend (str) : Backend actually running ("native" or "poll").
+    """
+    backend = WATCHER_BACKEND if backend is None else backend
+    poll_seconds = WATCHER_POLL_SECONDS if poll_seconds is None else poll_seconds
+    settle_seconds = WATCHER_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+
+    with _LOCK :
+
+        if _STATE["thread"] is not None and _STATE["thread"].is_alive() :
+            return _STATE["backend"]
+
+        _STOP.clear()
+        _STATE["backend"] = "poll"
+        _STATE["preloader"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentinelle-preload")
+
+        if backend in ("auto", "native") and Observer is not None :
+
+            observer = Observer()
+            observer.daemon = True
+
+            _STATE["observer"] = observer
+
+            for watch in _WATCHES.values() :
+                _schedule(watch["path"])
+
+            observer.start()
+            _STATE["backend"] = "native"
+
+        elif backend == "native" :
+            log("[!] [WATCHER] watchdog is not installed, falling back to polling", "warning")
+
+        thread = threading.Thread(target=_run, args=(poll_seconds, settle_seconds), name="sentinelle-watcher", daemon=True)
+        thread.start()
+
+        _STATE["thread"] = thread
+
+    log(f"[+] [WATCHER] Started ({_STATE['backend']}) on {len(_WATCHES)} directories", "info")
+
+    return _STATE["backend"]
+
+
+def stop_watcher (timeout : float = 5.0) -> None :
+    """
+    Stop the background watcher and its native observer.
+    """
+    with _LOCK :
+
+        thread, observer, preloader = _STATE["thread"], _STATE["observer"], _STATE["preloader"]
+        _STATE["thread"], _STATE["observer"], _STATE["preloader"] = None, None, None
+
+    _STOP.set()
+    _WAKE.set()
+
+    if observer is not None :
+
+        observer.stop()
+        observer.join(timeout)
+
+    if thread is not None :
+        thread.join(timeout)
+
+    if preloader is not None :
+        preloader.shutdown(wait=False, cancel_futures=True)
+
+
+def watcher_status () -> Dict :
+    """
+    Running state and counters of the watcher.
+    """
+    with _LOCK :
+
+        return {
+
+            "running" : _STATE["thread"] is not None and _STATE["thread"].is_alive(),
+            "backend" : _STATE["backend"],
+            "directories" : len(_WATCHES),
+            "pending" : len(_PENDING),
+            "events" : _STATE["events"],
+            "dispatched" : _STATE["dispatched"],
+            "last_poll" : _STATE["last_poll"],
+
+        }
@@ -0,0 +1,102 @@
+import pytest
+import datetime as dt
+
+import src.core.data.warm as warm
+from src.core.data.warm import WarmStep, WarmResult, business_days, _loaded, run_step, format_report, main
+
+
+def _step(name, result=None, error=None, per_date=False):
+    """
+    Stub step returning `result`, or raising `error`.
+    """
+    def run(fund, date):
+        if error is not None:
+            raise error
+        return result
+
+    return WarmStep(name, run, per_date)
+
+
+def test_business_days_skip_weekends():
+    """
+    Weekdays of the range, both ends included.
+    """
+    days = business_days(dt.date(2025, 1, 30), dt.date(2025, 2, 4))
+
+    assert days == [dt.date(2025, 1, 30), dt.date(2025, 1, 31), dt.date(2025, 2, 3), dt.date(2025, 2, 4)]
+    assert business_days(dt.date(2025, 2, 1), dt.date(2025, 2, 2)) == []
+    assert business_days(dt.date(2025, 2, 4), dt.date(2025, 2, 3)) == []
+
+
+def test_loaded():
+    """
+    None, an empty tuple or a tuple starting with None means nothing was loaded.
+    """
+    assert _loaded(None) is False
+    assert _loaded(()) is False
+    assert _loaded((None, None)) is False
+
+    assert _loaded(("frame", "md5")) is True
+    assert _loaded("frame") is True
+
+
+def test_run_step_captures_errors():
+    """
+    Exceptions and empty loads are reported in the result, never raised.
+    """
+    ok = run_step(_step("ok", result=("frame", "md5")), "HV", None)
+    empty = run_step(_step("empty", result=(None, None)), "HV", dt.date(2025, 1, 31))
+    failed = run_step(_step("failed", error=ValueError("boom")), "WR", None)
+
+    assert ok.ok and ok.error is None
+    assert not empty.ok and empty.error == "Nothing loaded" and empty.date == dt.date(2025, 1, 31)
+    assert not failed.ok and failed.error == "ValueError : boom"
+
+
+def test_format_report():
+    """
+    One line per step (runs, failures, timings), then one line per failure.
+    """
+    results = [
+        WarmResult("greeks", "HV", dt.date(2025, 1, 30), 1.5, True, None),
+        WarmResult("greeks", "HV", dt.date(2025, 1, 31), 2.5, False, "Nothing loaded"),
+        WarmResult("simm", "WR", None, 0.25, True, None),
+    ]
+
+    lines = format_report(results).splitlines()
+
+    assert lines[0].split() == ["step", "runs", "failed", "total", "s", "max", "s"]
+    assert lines[1].split() == ["greeks", "2", "1", "4.00", "2.50"]
+    assert lines[2].split() == ["simm", "1", "0", "0.25", "0.25"]
+    assert lines[3] == "[-] greeks HV 2025-01-31 : Nothing loaded"
+    assert len(lines) == 4
+
+
+def test_main_exit_code_and_steps(monkeypatch, capsys):
+    """
+    0 when every step loaded, 1 otherwise. Unknown --steps are rejected before anything runs.
+    """
+    calls = []
+
+    def recording(name, result):
+        def run(fund, date):
+            calls.append((name, fund, date))
+            return result
+        return WarmStep(name, run, False)
+
+    monkeypatch.setattr(warm, "WARM_STEPS", [recording("good", ("frame", "md5")), recording("bad", None)])
+
+    assert main(["--funds", "HV", "--steps", "good"]) == 0
+    assert [call[0] for call in calls] == ["good"]
+
+    assert main(["--funds", "HV"]) == 1
+    assert "bad" in capsys.readouterr().out
+
+    calls.clear()
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--steps", "good", "missing"])
+
+    assert exit_info.value.code == 2
+    assert calls == []
+    assert "missing" in capsys.readouterr().err
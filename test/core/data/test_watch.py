@@ -0,0 +1,72 @@
+import os
+import pytest
+import polars as pl
+
+from src.utils.sidecar import sidecar_usage
+from src.utils.data_io import load_excel_to_dataframe
+from src.utils.excel_probe import validate_excel_columns
+from src.utils.load_plan import planned_load
+from src.core.data.watch import _preload_excel, _GREEKS_REPORT, _GREEKS_HISTORY
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir(monkeypatch):
+    """
+    Fixture to create a temporary directory for tests, with its own sidecar cache.
+    """
+    import src.utils.sidecar as sidecar
+
+    tmp_dir = tempfile.mkdtemp()
+    monkeypatch.setattr(sidecar, "SIDECAR_DIR_ABS_PATH", os.path.join(tmp_dir, "sidecar"))
+
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def _write_greeks(path):
+    pl.DataFrame({"Underlying": ["SPX", "SX5E"], "Delta % NAV": [1.5, -0.5], "Date": ["2025-01-02", "2025-01-02"]}).write_excel(path)
+
+
+def _entries(temp_dir):
+    return sidecar_usage(os.path.join(temp_dir, "sidecar"))["entries"]
+
+
+def test_history_preload_warms_the_planned_read(temp_dir):
+    """
+    The pre-load of a history read through planned_load lands on the sidecar the reader asks for.
+    """
+    source = os.path.join(temp_dir, "greeks_all.xlsx")
+    _write_greeks(source)
+
+    schema = {"Underlying": pl.Utf8, "Date": pl.Utf8, "Delta % NAV": pl.Float64}
+
+    _preload_excel(source, schema_overrides=schema, **_GREEKS_HISTORY)
+    assert _entries(temp_dir) == 1
+
+    dataframe, _ = planned_load(source, "Sheet1", schema, list(schema.keys()), compact="greeks")
+
+    assert dataframe is not None and dataframe.height == 2
+    assert _entries(temp_dir) == 1
+
+
+def test_report_preload_warms_the_validated_read(temp_dir):
+    """
+    A report with a drifted column : the pre-load drops it like the reader does, same sidecar.
+    """
+    source = os.path.join(temp_dir, "greeks_report.xlsx")
+    _write_greeks(source)
+
+    schema = {"Underlying": pl.Utf8, "Delta % NAV": pl.Float64, "Gamma % NAV": pl.Float64}
+
+    _preload_excel(source, schema_overrides=schema, **_GREEKS_REPORT)
+    assert _entries(temp_dir) == 1
+
+    ok, specific_cols, _ = validate_excel_columns(source, list(schema.keys()))
+    dataframe, _ = load_excel_to_dataframe(source, schema_overrides=schema, specific_cols=specific_cols, compact="greeks")
+
+    assert ok and dataframe.columns == ["Underlying", "Delta % NAV"]
+    assert _entries(temp_dir) == 1
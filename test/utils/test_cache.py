@@ -0,0 +1,269 @@
+import os
+import pytest
+import polars as pl
+
+from src.utils.cache import *
+
+import time
+import datetime as dt
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests, with an empty cache.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    clear_cache()
+
+    yield tmp_dir
+
+    clear_cache()
+    shutil.rmtree(tmp_dir)
+
+
+def test_invalidate_source_evicts_only_dependents(temp_dir):
+    """
+    Invalidating one file evicts the results computed from it, the others stay cached.
+    """
+    dir_a, dir_b = os.path.join(temp_dir, "a"), os.path.join(temp_dir, "b")
+    os.makedirs(dir_a)
+    os.makedirs(dir_b)
+
+    path_a, path_b = os.path.join(dir_a, "a.csv"), os.path.join(dir_b, "b.csv")
+    pl.DataFrame({"x": [1, 2]}).write_csv(path_a)
+    pl.DataFrame({"x": [3, 4]}).write_csv(path_b)
+
+    calls = []
+
+    @scoped_cache()
+    def total(_dataframe, md5, fund=None, date=None):
+        calls.append(md5)
+        return _dataframe["x"].sum()
+
+    df_a, md5_a = pl.read_csv(path_a), "md5_a"
+    df_b, md5_b = pl.read_csv(path_b), "md5_b"
+
+    # Done by the loaders
+    register_source(md5_a, path_a)
+    register_source(md5_b, path_b)
+
+    assert total(df_a, md5_a, "HV", "2025-01-31") == 3
+    assert total(df_b, md5_b, "WR", "2025-01-31") == 7
+    assert total(df_a, md5_a, "HV", "2025-01-31") == 3
+    assert len(calls) == 2
+
+    assert invalidate_source(path_a) == 1
+
+    total(df_a, md5_a, "HV", "2025-01-31")
+    total(df_b, md5_b, "WR", "2025-01-31")
+    assert calls == [md5_a, md5_b, md5_a]
+
+    # Directory and namespace scopes
+    assert invalidate_source(dir_b) == 1
+    assert invalidate_namespace("fund:HV") == 1
+    assert invalidate_namespace("date:2025-01-31") == 0
+
+    stats = cache_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 3)
+
+
+def test_derived_fingerprint_and_none_results(temp_dir):
+    """
+    Derived fingerprints follow their parents' sources, None results are not cached.
+    """
+    path = os.path.join(temp_dir, "source.csv")
+    pl.DataFrame({"x": [1, 2]}).write_csv(path)
+
+    register_source("md5", path)
+    link_fingerprint("derived", "md5")
+
+    assert sources_of("derived") == {os.path.normcase(os.path.abspath(path))}
+
+    calls = []
+
+    @scoped_cache()
+    def maybe(md5):
+        calls.append(md5)
+        return None if md5 == "missing" else len(calls)
+
+    maybe("missing")
+    maybe("missing")
+    maybe("derived")
+    maybe("derived")
+
+    assert calls == ["missing", "missing", "derived"]
+    assert invalidate_source(path) == 1
+
+
+def test_frames_shared_budget_and_ttl(temp_dir, monkeypatch):
+    """
+    Frames are handed out without copy, the byte budget evicts the least recently used
+    entries, and an entry expires after its TTL or when its source file changes.
+    """
+    import src.utils.cache as cache
+
+    path = os.path.join(temp_dir, "source.csv")
+    pl.DataFrame({"x": [1, 2]}).write_csv(path)
+    register_source("md5", path)
+
+    @scoped_cache(ignore=("dataframe",), fingerprint="md5", ttl=3600)
+    def frame(dataframe=None, md5=None, n=0):
+        return pl.DataFrame({"x": list(range(1000))}), md5
+
+    first, _ = frame(None, "md5", 1)
+    again, _ = frame(pl.DataFrame(), "md5", 1)
+    assert first is again
+
+    # A frame without its fingerprint can not be keyed
+    frame(pl.DataFrame(), None, 1)
+    assert cache_stats()["bypasses"] == 1
+
+    # Room for two frames only
+    monkeypatch.setattr(cache, "RESULT_CACHE_MAX_BYTES", 2 * first.estimated_size() + 1000)
+
+    frame(None, "md5", 2)
+    frame(None, "md5", 3)
+
+    stats = cache_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert frame(None, "md5", 1)[0] is not first
+
+    # The source moved : recomputed
+    os.utime(path, ns=(0, 0))
+    entry = frame(None, "md5", 3)[0]
+    assert cache_stats()["expirations"] == 1
+
+    @scoped_cache(ttl=0.01)
+    def short(n):
+        return [n]
+
+    value = short(1)
+    time.sleep(0.02)
+    assert short(1) is not value
+    assert frame(None, "md5", 3)[0] is entry
+
+
+def test_persisted_results_survive_restart(temp_dir, monkeypatch):
+    """
+    A persisted result is reloaded from the store after a restart, until its source changes.
+    """
+    import src.utils.result_store as result_store
+
+    store_dir = os.path.join(temp_dir, "results")
+    monkeypatch.setattr(result_store, "RESULT_STORE_DIR_ABS_PATH", store_dir)
+    monkeypatch.setattr(result_store, "_MANIFESTS", {})
+
+    path = os.path.join(temp_dir, "source.csv")
+    pl.DataFrame({"x": [1, 2]}).write_csv(path)
+
+    calls = []
+
+    @scoped_cache(persist=True)
+    def compute(md5, date):
+        calls.append(md5)
+        return pl.DataFrame({"x": [1, 2]}), md5, date
+
+    def restart():
+        clear_cache()
+        result_store._MANIFESTS.clear()
+        register_source("md5", path)
+
+    restart()
+    compute("md5", dt.date(2025, 1, 31))
+
+    restart()
+    frame, md5, date = compute("md5", dt.date(2025, 1, 31))
+
+    assert calls == ["md5"]
+    assert cache_stats()["disk_hits"] == 1
+    assert frame["x"].to_list() == [1, 2] and (md5, date) == ("md5", dt.date(2025, 1, 31))
+
+    # Source rewritten while the app was down : dropped at startup, recomputed
+    os.utime(path, ns=(0, 0))
+    restart()
+
+    assert result_store.load_manifest() == {}
+    compute("md5", dt.date(2025, 1, 31))
+    assert calls == ["md5", "md5"]
+
+
+def test_persisted_listing_results_follow_new_files(temp_dir, monkeypatch):
+    """
+    A result computed from the file a directory lookup picked is dropped when a newer intraday file lands.
+    """
+    import re
+    import src.utils.result_store as result_store
+    from src.utils.catalog import catalog_lookup, invalidate_catalog
+
+    store_dir = os.path.join(temp_dir, "results")
+    monkeypatch.setattr(result_store, "RESULT_STORE_DIR_ABS_PATH", store_dir)
+    monkeypatch.setattr(result_store, "_MANIFESTS", {})
+
+    reports = os.path.join(temp_dir, "reports")
+    os.makedirs(reports)
+
+    regex = re.compile(r"^(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})_greeks\.csv$")
+    pl.DataFrame({"x": [1]}).write_csv(os.path.join(reports, "2025-01-31_09-00_greeks.csv"))
+
+    calls = []
+
+    @scoped_cache(persist=True)
+    def latest(date):
+        entry = catalog_lookup(reports, regex, date, mode="le")
+        register_source(entry.name, entry.path)
+        calls.append(entry.name)
+        return pl.read_csv(entry.path), entry.name
+
+    def restart():
+        clear_cache()
+        invalidate_catalog()
+        result_store._MANIFESTS.clear()
+
+    latest(dt.date(2025, 1, 31))
+
+    restart()
+    assert latest(dt.date(2025, 1, 31))[1] == "2025-01-31_09-00_greeks.csv"
+    assert len(calls) == 1
+
+    # Newer version of the day written while the app was down
+    pl.DataFrame({"x": [2]}).write_csv(os.path.join(reports, "2025-01-31_17-30_greeks.csv"))
+    restart()
+
+    assert result_store.load_manifest() == {}
+    assert latest(dt.date(2025, 1, 31))[1] == "2025-01-31_17-30_greeks.csv"
+    assert len(calls) == 2
+
+
+def test_cached_listing_results_follow_new_files(temp_dir):
+    """
+    In memory too : a newer intraday file picked by the lookup drops the entry, no watcher needed.
+    """
+    import re
+    from src.utils.catalog import catalog_lookup
+
+    reports = os.path.join(temp_dir, "reports_live")
+    os.makedirs(reports)
+
+    regex = re.compile(r"^(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})_greeks\.csv$")
+    pl.DataFrame({"x": [1]}).write_csv(os.path.join(reports, "2025-01-31_09-00_greeks.csv"))
+
+    calls = []
+
+    @scoped_cache()
+    def latest(date):
+        entry = catalog_lookup(reports, regex, date, mode="le")
+        register_source(entry.name, entry.path)
+        calls.append(entry.name)
+        return pl.read_csv(entry.path), entry.name
+
+    latest(dt.date(2025, 1, 31))
+    latest(dt.date(2025, 1, 31))
+    assert len(calls) == 1
+
+    pl.DataFrame({"x": [2]}).write_csv(os.path.join(reports, "2025-01-31_17-30_greeks.csv"))
+
+    assert latest(dt.date(2025, 1, 31))[1] == "2025-01-31_17-30_greeks.csv"
+    assert len(calls) == 2
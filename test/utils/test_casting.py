@@ -0,0 +1,64 @@
+import datetime as dt
+import polars as pl
+
+from src.utils.casting import *
+from src.utils.formatters import date_cast_expr_from_utf8, numeric_cast_expr_from_utf8
+
+
+def _multi_pass(series, expr):
+    return series.to_frame().select(expr).to_series()
+
+
+def test_date_single_format_is_remembered():
+    """
+    A single-format column is parsed with one format, remembered for the next loads of the source.
+    """
+    forget_formats()
+
+    series = pl.Series("Date", ["2025-10-30", "2025-10-31", None, "2025-11-03"])
+    expected = _multi_pass(series, date_cast_expr_from_utf8("Date"))
+
+    assert sniff_date_format(series) == ("%Y-%m-%d", False)
+
+    parsed = cast_date_column(series, source="/data/report_2025_10_30.xlsx")
+    assert parsed.equals(expected)
+    assert parsed.to_list()[0] == dt.date(2025, 10, 30)
+
+    remembered = casting_stats()["remembered"]
+    cast_date_column(series, source="/data/report_2025_10_31.xlsx")
+    assert casting_stats()["remembered"] == remembered + 1
+
+
+def test_date_mixed_formats_fall_back():
+    """
+    Mixed or Excel-serial columns give the same result as the multi-pass parser.
+    """
+    mixed = pl.Series("Date", ["30/10/2025", "2025-10-31", "Nov 3, 2025", "45000"])
+    assert sniff_date_format(mixed) is None
+    assert cast_date_column(mixed).equals(_multi_pass(mixed, date_cast_expr_from_utf8("Date")))
+
+    serial = pl.Series("Date", ["45000", "45001"])
+    assert sniff_date_format(serial) == (EXCEL_SERIAL, False)
+    assert cast_date_column(serial).equals(_multi_pass(serial, date_cast_expr_from_utf8("Date")))
+
+
+def test_numeric_locales():
+    """
+    Dot and comma decimals, currency signs and parentheses negatives are parsed in a single pass.
+    """
+    dot = pl.Series("Amount", ["1,234.50", "(12.00)", "€ 3.25", None])
+    assert sniff_numeric_locale(dot)[0] == "."
+    assert cast_numeric_column(dot, pl.Float64).to_list() == [1234.5, -12.0, 3.25, None]
+    assert cast_numeric_column(dot, pl.Float64).equals(_multi_pass(dot, numeric_cast_expr_from_utf8("Amount", pl.Float64)))
+
+    comma = pl.Series("Amount", ["1.234,50", "12,75", "-3,1"])
+    assert sniff_numeric_locale(comma)[0] == ","
+    assert cast_numeric_column(comma, pl.Float64).to_list() == [1234.5, 12.75, -3.1]
+
+    plain = pl.Series("Amount", ["1.5", "2", "-3"])
+    assert sniff_numeric_locale(plain) == ("", "", False)
+    assert cast_numeric_column(plain, pl.Int64).to_list() == [2, 2, -3]
+
+    mixed = pl.Series("Amount", ["1.234,50", "1,234.50"])
+    assert sniff_numeric_locale(mixed) is None
+    assert cast_numeric_column(mixed, pl.Float64).equals(_multi_pass(mixed, numeric_cast_expr_from_utf8("Amount", pl.Float64)))
@@ -0,0 +1,90 @@
+import os
+import re
+import pytest
+import datetime as dt
+
+from src.utils.catalog import *
+
+import tempfile
+import shutil
+
+
+REGEX = re.compile(r"^greeks_(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})\.xlsx$")
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+    invalidate_catalog()
+
+
+def _touch(directory, name):
+
+    with open(os.path.join(directory, name), "w") as f:
+        f.write("x")
+
+
+def test_catalog_modes(temp_dir):
+    """
+    eq / le / ge / latest resolve to the latest intraday file of the chosen date.
+    """
+    for name in [
+        "greeks_2025-01-02_09-00.xlsx",
+        "greeks_2025-01-02_17-30.xlsx",
+        "greeks_2025-01-06_08-00.xlsx",
+        "greeks_2025-01-08_10-15.xlsx",
+        "other_2025-01-09_10-15.xlsx",
+    ]:
+        _touch(temp_dir, name)
+
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-02").name == "greeks_2025-01-02_17-30.xlsx"
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-03") is None
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-03", mode="le").date == dt.date(2025, 1, 2)
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-03", mode="ge").date == dt.date(2025, 1, 6)
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-09", mode="ge") is None
+    assert catalog_lookup(temp_dir, REGEX, "2024-12-31", mode="le") is None
+    assert catalog_lookup(temp_dir, REGEX, mode="latest").name == "greeks_2025-01-08_10-15.xlsx"
+
+    week = catalog_entries(temp_dir, REGEX, start_date="2025-01-06", end_date="2025-01-10")
+    assert [e.date for e in week] == [dt.date(2025, 1, 6), dt.date(2025, 1, 8)]
+
+    with pytest.raises(ValueError):
+        catalog_lookup(temp_dir, REGEX, "2025-01-02", mode="closest")
+
+
+def test_catalog_invalidation(temp_dir):
+    """
+    A new file is picked up once the directory mtime moves.
+    """
+    _touch(temp_dir, "greeks_2025-01-02_09-00.xlsx")
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-02").name == "greeks_2025-01-02_09-00.xlsx"
+
+    _touch(temp_dir, "greeks_2025-01-02_18-00.xlsx")
+    os.utime(temp_dir, ns=(0, os.stat(temp_dir).st_mtime_ns + 10 ** 9))
+
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-02").name == "greeks_2025-01-02_18-00.xlsx"
+    assert catalog_lookup(os.path.join(temp_dir, "missing"), REGEX, "2025-01-02") is None
+
+
+def test_catalog_parsers(temp_dir):
+    """
+    Compact timestamps and (trade date, as-of) filenames are indexed on the same date axis.
+    """
+    _touch(temp_dir, "screener_20250102T093001.123.xlsx")
+    _touch(temp_dir, "screener_20250102T170000.000.xlsx")
+    _touch(temp_dir, "recap_2025_01_03_2025_01_03T18_05.xlsx")
+
+    screeners = re.compile(r"^screener_(\d{8}T\d{6}\.\d{3})")
+    recaps = re.compile(r"^recap_(\d{4}_\d{2}_\d{2})_(\d{4}_\d{2}_\d{2}T\d{2}_\d{2})")
+
+    entry = catalog_lookup(temp_dir, screeners, dt.date(2025, 1, 2), parser=parse_compact_timestamp)
+    assert entry.name == "screener_20250102T170000.000.xlsx"
+
+    entry = catalog_lookup(temp_dir, recaps, dt.date(2025, 1, 3), parser=parse_date_timestamp, extension=".xlsx")
+    assert entry.stamp == (dt.datetime(2025, 1, 3, 18, 5),)
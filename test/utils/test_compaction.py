@@ -0,0 +1,51 @@
+import polars as pl
+
+from src.utils.compaction import *
+
+
+def _legs(n=3000):
+
+    return pl.DataFrame({
+        "Asset Class": ["Equity", "FX", "Rates"] * (n // 3),
+        "Counterparty": ["UBS", "GS"] * (n // 2),
+        "Weight %": [0.125] * n,
+        "Fixings": list(range(n)),
+        "Notional": [1e6] * n,
+    })
+
+
+def test_compaction_shrinks_declared_columns():
+    """
+    Declared columns change dtype, undeclared ones are left alone and the frame gets smaller.
+    """
+    df = _legs()
+    hints = {
+        "categorical": ["Asset Class", "Missing"],
+        "enum": {"Counterparty": ["UBS", "GS"]},
+        "float32": ["Weight %"],
+        "shrink_int": ["Fixings"],
+    }
+
+    before = compaction_stats()["bytes_saved"]
+    out = compact_dataframe(df, hints, "legs.xlsx")
+
+    assert out.schema["Asset Class"] == pl.Categorical
+    assert out.schema["Counterparty"] == pl.Enum(["UBS", "GS"])
+    assert out.schema["Weight %"] == pl.Float32
+    assert out.schema["Fixings"] == pl.Int16
+    assert out.schema["Notional"] == pl.Float64
+
+    assert out.estimated_size() < df.estimated_size()
+    assert compaction_stats()["bytes_saved"] > before
+
+    assert out["Asset Class"].cast(pl.Utf8).to_list() == df["Asset Class"].to_list()
+    assert out.filter(pl.col("Counterparty") == "GS").height == df.height // 2
+
+
+def test_compaction_without_hints_is_identity():
+
+    df = _legs(6)
+
+    assert compact_dataframe(df, None) is df
+    assert compact_dataframe(df, "unknown source") is df
+    assert compact_dataframe(None, {"float32": ["Weight %"]}) is None
@@ -0,0 +1,128 @@
+import os
+import pytest
+import polars as pl
+
+from src.utils.dag import *
+from src.utils.cache import clear_cache, register_source
+from src.utils.fingerprint import file_fingerprint
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests, with an empty cache.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    clear_cache()
+
+    yield tmp_dir
+
+    clear_cache()
+    shutil.rmtree(tmp_dir)
+
+
+def _graph(temp_dir, calls):
+    """
+    prices (per fund) -> returns -> rebased, index -> rebased_index
+    """
+    graph = ComputeGraph("test")
+
+    def path(fund):
+        return os.path.join(temp_dir, f"{fund}.csv")
+
+    def load(file_abs_path):
+        if not os.path.isfile(file_abs_path):
+            return None, None  # as the loaders do
+        calls.append(os.path.basename(file_abs_path))
+        md5 = file_fingerprint(file_abs_path)
+        register_source(md5, file_abs_path)
+        return pl.read_csv(file_abs_path), md5
+
+    @graph.source("prices", params=("fund",), fingerprint=lambda fund: file_fingerprint(path(fund)))
+    def prices(fund):
+        return load(path(fund))
+
+    @graph.source("index", fingerprint=lambda: file_fingerprint(path("index")))
+    def index():
+        return load(path("index"))
+
+    @graph.node("returns", deps=("prices",), params=("fund",))
+    def returns(prices, fund):
+        calls.append("returns")
+        return prices.with_columns((pl.col("nav") / pl.col("nav").shift(1) - 1).alias("ret"))
+
+    @graph.node("rebased", deps=("prices",), params=("fund", "base"))
+    def rebased(prices, fund, base):
+        calls.append("rebased")
+        return prices.with_columns(pl.col("nav") / pl.col("nav").first() * base)
+
+    @graph.node("rebased_index", deps=("index",))
+    def rebased_index(index):
+        calls.append("rebased_index")
+        return index.with_columns(pl.col("nav") / pl.col("nav").first() * 100)
+
+    return graph
+
+
+def _write(temp_dir, name, values):
+    pl.DataFrame({"nav": values}).write_csv(os.path.join(temp_dir, f"{name}.csv"))
+
+
+def test_nodes_reuse_upstream_work(temp_dir):
+    """
+    Every downstream node shares the one load of its source, a second request computes nothing.
+    """
+    _write(temp_dir, "HV", [100.0, 101.0, 99.0])
+    calls = []
+    graph = _graph(temp_dir, calls)
+
+    returns, md5_returns = graph.get("returns", fund="HV")
+    rebased, _ = graph.get("rebased", fund="HV", base=100.0)
+
+    assert calls == ["HV.csv", "returns", "rebased"]
+    assert returns["ret"][1] == pytest.approx(0.01)
+    assert rebased["nav"].to_list() == pytest.approx([100.0, 101.0, 99.0])
+
+    again, md5_again = graph.get("returns", fund="HV")
+
+    assert again is returns and md5_again == md5_returns
+    assert calls == ["HV.csv", "returns", "rebased"]
+    assert graph.stats()["returns"]["misses"] == 1 and graph.stats()["returns"]["hits"] == 1
+
+
+def test_changed_file_recomputes_affected_nodes_only(temp_dir):
+    """
+    A new version of one source moves the fingerprints downstream of it, the other nodes stay cached.
+    """
+    _write(temp_dir, "HV", [100.0, 101.0])
+    _write(temp_dir, "index", [50.0, 55.0])
+    calls = []
+    graph = _graph(temp_dir, calls)
+
+    _, md5_before = graph.get("returns", fund="HV")
+    graph.get("rebased_index")
+    calls.clear()
+
+    _write(temp_dir, "HV", [100.0, 102.0, 104.0])
+    os.utime(os.path.join(temp_dir, "HV.csv"), ns=(1, 1))
+
+    returns, md5_after = graph.get("returns", fund="HV")
+    graph.get("rebased_index")
+
+    assert calls == ["HV.csv", "returns"]
+    assert md5_after != md5_before
+    assert returns.height == 3
+
+
+def test_missing_source_is_not_memoized(temp_dir):
+
+    calls = []
+    graph = _graph(temp_dir, calls)
+
+    with pytest.raises(ValueError):
+        graph.node("orphan", deps=("unknown",))(lambda x: x)
+
+    assert graph.get("returns", fund="WR") == (None, None)
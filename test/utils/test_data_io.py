@@ -1,4 +1,5 @@
 import os
+import time
 import pytest
 import polars as pl
 
@@ -137,3 +138,92 @@ def test_export_dataframe_to_json(temp_dir):
     result_df = pl.read_json(test_file)
     assert result_df.shape[0] == 3, "Incorrect number of rows in the JSON file"
     assert "col1" in result_df.columns, "Column 'col1' is missing in the JSON"
+
+
+def test_scan_excel_to_lazyframe(temp_dir, monkeypatch):
+    """
+    Test the scan_excel_to_lazyframe function.
+    """
+    import datetime as dt
+    import src.utils.sidecar as sidecar
+
+    monkeypatch.setattr(sidecar, "SIDECAR_DIR_ABS_PATH", os.path.join(temp_dir, "sidecar"))
+
+    test_file = os.path.join(temp_dir, "test_scan.xlsx")
+
+    df = pl.DataFrame({
+        "Date": [dt.date(2024, 1, 1), dt.date(2024, 6, 1), dt.date(2025, 1, 1)],
+        "col1": [1.0, 2.0, 3.0],
+        "col2": ["a", "b", "c"],
+    })
+    df.write_excel(test_file)
+
+    lazy_df, md5 = scan_excel_to_lazyframe(test_file, sheet_name="Sheet1")
+    eager_df, eager_md5 = load_excel_to_dataframe(test_file, sheet_name="Sheet1")
+
+    assert isinstance(lazy_df, pl.LazyFrame), "A LazyFrame is expected"
+    assert md5 == eager_md5, "Lazy and eager loads must share the fingerprint"
+
+    result_df = lazy_df.filter(pl.col("Date") >= dt.date(2024, 6, 1)).select("col1").collect()
+
+    assert result_df.columns == ["col1"], "Projection not applied"
+    assert result_df["col1"].to_list() == [2.0, 3.0], "Predicate not applied"
+    assert lazy_df.collect().equals(eager_df), "Lazy and eager loads differ"
+
+    assert scan_excel_to_lazyframe(os.path.join(temp_dir, "missing.xlsx")) == (None, None)
+
+
+def test_load_many(temp_dir):
+    """
+    Test the load_many function : results in order, failures captured per file.
+    """
+    paths = []
+
+    for i in range(4):
+
+        path = os.path.join(temp_dir, f"test_many_{i}.xlsx")
+        pl.DataFrame({"col1": [i, i + 1], "col2": [float(i), 0.5]}).write_excel(path)
+        paths.append(path)
+
+    missing = os.path.join(temp_dir, "missing.xlsx")
+    specs = [(p, "Sheet1", ["col1"]) for p in paths] + [{"excel_file_abs_pth": missing}]
+
+    results = load_many(specs, max_workers=4)
+
+    assert [r.path for r in results] == paths + [missing], "Results must follow the order of the specs"
+
+    for i, result in enumerate(results[:4]):
+
+        assert result.error is None
+        assert result.dataframe.columns == ["col1"]
+        assert result.dataframe["col1"].to_list() == [i, i + 1]
+        assert result.seconds >= 0
+
+    assert results[-1].dataframe is None and results[-1].error is not None, "A missing file must be reported, not raised"
+    assert load_many([]) == []
+
+
+def test_csv_fingerprint_taken_before_the_read(temp_dir, monkeypatch):
+    """
+    A CSV rewritten while it is read : the fingerprint names the version stat'ed before, never the new one.
+    """
+    from src.utils import data_io
+    from src.utils.fingerprint import file_fingerprint
+
+    source = os.path.join(temp_dir, "source.csv")
+    pl.DataFrame({"col1": [1, 2]}).write_csv(source)
+
+    before = file_fingerprint(source, None, None)
+    read_csv = pl.read_csv
+
+    def rewriting_read_csv(*args, **kwargs):
+        pl.DataFrame({"col1": [1, 2, 3]}).write_csv(source)
+        os.utime(source, ns=(time.time_ns(), time.time_ns() + 10**9))
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(data_io.pl, "read_csv", rewriting_read_csv)
+
+    _, md5 = load_csv_to_dataframe(source)
+
+    assert md5 == before
+    assert md5 != file_fingerprint(source, None, None)
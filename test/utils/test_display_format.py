@@ -0,0 +1,73 @@
+import pytest
+import polars as pl
+
+from src.utils.display import *
+from src.utils.formatters import format_numeric_columns_to_string, colorize_dataframe_positive_negatif_vals
+
+
+def test_numbers_formatted_like_python():
+    """
+    Same strings as "{:,.2f}" : thousand groups, fixed precision, sign, placeholder for null / NaN.
+    """
+    values = [0.0, 1.0, -1.5, 999.999, 1000.0, 123456.78, -1234567.891, 0.004, -0.004, None, float("nan")]
+    df = pl.DataFrame({"x": values, "n": list(range(len(values)))})
+
+    formatted = format_numeric_columns_to_string(df, ["x"])
+
+    expected = [" - " if v is None or v != v else f"{v:,.2f}".replace("-0.00", "0.00") for v in values]
+
+    assert formatted["x"].to_list() == expected
+    assert formatted["n"].to_list() == list(range(len(values)))
+
+    other = format_numeric_columns_to_string(df, ["x"], decimals=0, thousand_sep=".", decimal_sep=",")
+    assert other["x"][6] == "-1.234.568"
+
+
+def test_ties_rounded_half_away_from_zero():
+    """
+    Ties of the scaled value go away from zero, on both signs and whatever the parity.
+    """
+    df = pl.DataFrame({"x": [0.125, 2.675, -0.005, 0.005, -2.675]})
+    assert format_display(df)["x"].to_list() == ["0.13", "2.68", "-0.01", "0.01", "-2.68"]
+
+    df = pl.DataFrame({"x": [0.5, 1.5, 2.5, -2.5, -0.5]})
+    assert format_display(df, kind="integer")["x"].to_list() == ["1", "2", "3", "-3", "-1"]
+
+
+def test_kinds_and_sign_classes():
+
+    df = pl.DataFrame({"ret": [0.0123, -0.5, None], "amount": [1234.5, -2.0, 0.0]})
+
+    out = format_display(df, {"ret": "percent", "amount": {"kind": "bps", "scale": 1.0, "decimals": 1}}, sign_suffix=SIGN_SUFFIX)
+
+    assert out["ret"].to_list() == ["1.23%", "-50.00%", " - "]
+    assert out["amount"].to_list() == ["1,234.5 bp", "-2.0 bp", "0.0 bp"]
+    assert out["ret__sign"].to_list() == ["positive", "negative", None]
+    assert out["amount__sign"].to_list() == ["positive", "negative", "positive"]
+
+    # Display strings parse back to their numbers
+    parsed = out.select(display_string_to_number_expr(pl.col("ret")), display_string_to_number_expr(pl.col("amount")))
+    assert parsed.rows() == [(1.23, 1234.5), (-50.0, -2.0), (None, 0.0)]
+
+    rules = aggrid_sign_class_rules(["ret"])
+    assert rules["ret"]["sign-negative"] == "data && data['ret__sign'] === 'negative'"
+
+
+def _colors(styler):
+    styler._compute()
+    return {cell: dict(props).get("color") for cell, props in styler.ctx.items() if dict(props).get("color")}
+
+
+def test_styler_uses_sign_columns():
+
+    df = pl.DataFrame({"Year": ["2024", "2025"], "Jan": [1234.5, -0.5], "Feb": [None, 2.0]})
+
+    with_signs = format_display(df, ["Jan", "Feb"], sign_suffix=SIGN_SUFFIX)
+    styler = colorize_dataframe_positive_negatif_vals(with_signs, ["Jan", "Feb"])
+
+    assert list(styler.data.columns) == ["Year", "Jan", "Feb"]
+    assert _colors(styler) == {(0, 1): "green", (1, 1): "red", (1, 2): "green"}
+
+    # Without sign columns the display strings are parsed
+    plain = colorize_dataframe_positive_negatif_vals(format_display(df, ["Jan", "Feb"]), ["Jan", "Feb"])
+    assert _colors(plain) == _colors(styler)
@@ -0,0 +1,64 @@
+import os
+import pytest
+import polars as pl
+
+from src.utils.excel_probe import *
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def test_probe_workbook(temp_dir):
+    """
+    The probe reads sheets, dimensions and headers, and is cached on the file identity.
+    """
+    source = os.path.join(temp_dir, "source.xlsx")
+    pl.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]}).write_excel(source, worksheet="Data")
+
+    probe = probe_workbook(source)
+
+    assert probe.sheets == ["Data"]
+    assert probe.headers["Data"] == ["col1", "col2"]
+    assert probe.dimensions["Data"] == (4, 2)
+
+    hits = probe_stats()["hits"]
+    assert probe_workbook(source) is probe
+    assert probe_stats()["hits"] == hits + 1
+
+    assert sheet_columns(source, 0) == ["col1", "col2"]
+    assert sheet_columns(source, "Sheet1") is None
+    assert probe_workbook(os.path.join(temp_dir, "missing.xlsx")) is None
+
+
+def test_validate_excel_columns(temp_dir):
+    """
+    Drifted columns are reported and dropped, missing sheets or required columns reject the file.
+    """
+    source = os.path.join(temp_dir, "source.xlsx")
+    pl.DataFrame({"col1": [1], "col2": [2]}).write_excel(source)
+
+    assert validate_excel_columns(source, ["col2", "col1"]) == (True, ["col2", "col1"], [])
+    assert validate_excel_columns(source, ["col1", "gone"]) == (True, ["col1"], ["gone"])
+    assert validate_excel_columns(source, None) == (True, None, [])
+
+    assert not validate_excel_columns(source, ["col1"], sheet_name="Other")[0]
+    assert not validate_excel_columns(source, ["col1"], required=["gone"])[0]
+
+    # Files that can not be probed are let through to the full read
+    not_excel = os.path.join(temp_dir, "source.xls")
+
+    with open(not_excel, "w") as f:
+        f.write("not a workbook")
+
+    assert validate_excel_columns(not_excel, ["col1"]) == (True, ["col1"], [])
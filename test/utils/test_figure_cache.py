@@ -0,0 +1,110 @@
+import json
+import pytest
+import polars as pl
+import plotly.graph_objects as go
+
+from src.utils.figure_cache import *
+from src.utils.cache import clear_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    reset_figure_cache_stats()
+    yield
+    clear_cache()
+
+
+def test_figure_served_from_cached_json():
+    """
+    Same data and options : the figure is built once, then served from its JSON.
+    Other data or other options build a new one.
+    """
+    calls = []
+
+    @figure_cache()
+    def chart(_dataframe, md5, title=None):
+        calls.append(title)
+        if _dataframe.is_empty():
+            return None
+        fig = go.Figure(go.Scatter(x=_dataframe["x"].to_list(), y=_dataframe["y"].to_list()))
+        fig.update_layout(title=title)
+        return fig
+
+    df = pl.DataFrame({"x": [1, 2, 3], "y": [1.0, 4.0, 9.0]})
+
+    first = chart(df, "md5", "Delta")
+    second = chart(df, "md5", "Delta")
+
+    assert isinstance(second, go.Figure)
+    assert calls == ["Delta"]
+    assert second.to_dict() == first.to_dict()
+    assert list(second.to_dict()["data"][0]["y"]) == [1.0, 4.0, 9.0]
+    assert json.loads(second.to_json())["layout"]["title"]["text"] == "Delta"
+
+    chart(df, "md5", "Gamma")
+    chart(df.with_columns(pl.col("y") * 2), "md5-2", "Delta")
+
+    assert calls == ["Delta", "Gamma", "Delta"]
+
+    assert chart(df.clear(), "md5", "Delta") is None
+    assert chart(df.clear(), "md5", "Delta") is None
+
+    stats = figure_cache_stats()
+
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["hit_rate"] == pytest.approx(0.25)
+    assert stats["build_seconds"] > 0
+
+
+def test_edits_on_a_served_figure_stay_local():
+    """
+    A served figure is a regular, validated go.Figure : the caller's edits apply to it only.
+    """
+    @figure_cache()
+    def chart(_dataframe, md5):
+        return go.Figure(go.Scatter(x=_dataframe["x"].to_list(), y=_dataframe["y"].to_list()))
+
+    df = pl.DataFrame({"x": [1, 2], "y": [3.0, 4.0]})
+
+    chart(df, "md5")
+    edited = chart(df, "md5")
+
+    edited.update_layout(title="Edited")
+    edited.add_trace(go.Bar(x=[1], y=[2]))
+
+    assert edited.to_dict()["layout"]["title"] == {"text": "Edited"}
+    assert len(edited.data) == 2
+
+    with pytest.raises(ValueError):
+        edited.update_layout(not_a_property=1)
+
+    again = chart(df, "md5")
+
+    assert again.layout.title.text is None
+    assert len(again.data) == 1
+
+
+def test_frames_keyed_on_md5_or_content():
+    """
+    With an md5 the frame rows are not hashed again, without one the content identifies the frame.
+    """
+    calls = []
+
+    @figure_cache()
+    def chart(_dataframe, md5=None):
+        calls.append(md5)
+        return go.Figure(go.Scatter(y=_dataframe["y"].to_list()))
+
+    df = pl.DataFrame({"y": [1.0, 2.0]})
+    doubled = df.with_columns(pl.col("y") * 2)
+
+    chart(df, "md5")
+    chart(doubled, "md5")
+    assert calls == ["md5"]
+
+    chart(df)
+    chart(doubled)
+    chart(doubled)
+    assert calls == ["md5", None, None]
@@ -0,0 +1,62 @@
+import os
+import time
+import pickle
+import pytest
+import polars as pl
+
+from src.utils.fingerprint import *
+from src.utils.formatters import dataframe_fingerprint
+
+import tempfile
+import shutil
+
+
+@pytest.fixture(scope="module")
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def test_file_fingerprint(temp_dir):
+    """
+    The file fingerprint follows the file identity and the parse arguments.
+    """
+    test_file = os.path.join(temp_dir, "test_csv.csv")
+    pl.DataFrame({"col1": [1, 2, 3]}).write_csv(test_file)
+
+    first = file_fingerprint(test_file, "Sheet1")
+
+    assert first == file_fingerprint(test_file, "Sheet1")
+    assert first != file_fingerprint(test_file, "Sheet2")
+
+    time.sleep(0.01)
+    pl.DataFrame({"col1": [1, 2, 3, 4]}).write_csv(test_file)
+
+    assert first != file_fingerprint(test_file, "Sheet1")
+    assert file_fingerprint(os.path.join(temp_dir, "missing.csv")) is None
+
+
+def test_frame_fingerprint_is_lazy():
+    """
+    The row hash is only computed when the fingerprint is used, and behaves like its hex string.
+    """
+    df = pl.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+
+    fingerprint = frame_fingerprint(df)
+    assert not fingerprint.is_computed
+
+    expected = dataframe_fingerprint(df)
+
+    assert fingerprint == expected
+    assert fingerprint.is_computed
+    assert str(fingerprint) == expected and f"{fingerprint}" == expected
+    assert hash(fingerprint) == hash(expected)
+    assert pickle.loads(pickle.dumps(frame_fingerprint(df))) == expected
+
+    assert frame_fingerprint(df.with_columns(pl.col("col1") + 1)) != fingerprint
+    assert frame_fingerprint(None) is None
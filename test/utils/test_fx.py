@@ -0,0 +1,58 @@
+import pytest
+import polars as pl
+
+from src.utils.fx import *
+
+
+# Cash-updater cache : 1 EUR = x CCY
+QUOTES = {"USD": 1.10, "GBP": 0.85, "EUR": 1.0, "JPY": None, "USDHKD": 7.8}
+
+
+def test_rate_table_direct_inverse_and_cross():
+    """
+    Every currency resolved at once : identity, quotes against EUR (inverted), cross via USD.
+    """
+    rates = build_fx_rate_table(["EUR", "USD", "GBP", "HKD", "JPY"], "EUR", QUOTES)
+    by_ccy = {ccy: (rate, source) for ccy, rate, source in rates.iter_rows()}
+
+    assert by_ccy["EUR"] == (1.0, "identity")
+    assert by_ccy["USD"][0] == pytest.approx(1 / 1.10) and by_ccy["USD"][1] == "direct"
+    assert by_ccy["GBP"][0] == pytest.approx(1 / 0.85)
+    assert by_ccy["HKD"][0] == pytest.approx(1 / 7.8 / 1.10) and by_ccy["HKD"][1] == "cross"
+    assert by_ccy["JPY"] == (None, None)
+
+    # To another base : GBP -> USD crosses through EUR
+    usd = build_fx_rate_table(["GBP"], "USD", QUOTES)
+    assert usd["rate"][0] == pytest.approx(1.10 / 0.85)
+
+
+def test_missing_rates_fetched_once_per_currency():
+
+    calls = []
+
+    def fetch(ccy, base):
+        calls.append((ccy, base))
+        return 0.0062 if ccy == "JPY" else None
+
+    rates = build_fx_rate_table(["JPY", "CHF", "JPY"], "EUR", QUOTES, fetch_missing=fetch)
+
+    assert sorted(calls) == [("CHF", "EUR"), ("JPY", "EUR")]
+    assert rates.filter(pl.col("currency") == "JPY")["source"][0] == "fetched"
+    assert rates.filter(pl.col("currency") == "CHF")["rate"][0] is None
+
+
+def test_convert_every_row_with_one_join():
+
+    legs = pl.DataFrame({
+        "bookName": ["A", "A", "B", "C"],
+        "currency": ["USD", "EUR", "GBP", "CHF"],
+        "amount": [110.0, 50.0, -85.0, 10.0],
+    })
+
+    rates = build_fx_rate_table(legs["currency"], "EUR", QUOTES)
+    converted, missing = convert_to_base_ccy(legs, rates, base_ccy="EUR", missing_rate=1.0)
+
+    assert converted["amount"].to_list() == pytest.approx([100.0, 50.0, -100.0, 10.0])
+    assert converted["currency"].unique().to_list() == ["EUR"]
+    assert converted.columns == legs.columns
+    assert missing.rows() == [("CHF", 1)]
@@ -0,0 +1,115 @@
+import time
+import threading
+
+from src.utils.governor import *
+
+
+def _hold(governor, release, workload="hold"):
+    """
+    Thread holding the only slot until release is set.
+    """
+    started = threading.Event()
+
+    def run():
+        with governor.slot(workload):
+            started.set()
+            release.wait()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    started.wait()
+
+    return thread
+
+
+def _wait_queue_depth(governor, depth):
+
+    deadline = time.monotonic() + 5
+    while governor.usage()["queue_depth"] < depth and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_concurrency_is_capped():
+    """
+    No more than max_concurrent operations run at once, the extra ones queue.
+    """
+    governor = Governor(max_concurrent=2, enabled=True)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def work():
+        with governor.slot("groupby"):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = governor.usage()
+
+    assert peak[0] == 2
+    assert stats["executed"] == 8
+    assert stats["queued"] >= 6
+    assert stats["running"] == 0 and stats["queue_depth"] == 0
+    assert stats["workloads"] == {"groupby": 8}
+
+
+def test_interactive_overtakes_background():
+    """
+    Work queued at the interactive priority runs before background work queued earlier.
+    """
+    governor = Governor(max_concurrent=1, enabled=True)
+    release = threading.Event()
+    holder = _hold(governor, release)
+
+    order = []
+
+    def queued(name, priority):
+        with governor.slot(name, priority):
+            order.append(name)
+
+    threads = []
+    for name, priority in (("warm-1", BACKGROUND), ("warm-2", BACKGROUND), ("page", INTERACTIVE)):
+        thread = threading.Thread(target=queued, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        _wait_queue_depth(governor, len(threads))
+
+    assert governor.usage()["queue_depth"] == 3
+
+    release.set()
+    for t in [holder, *threads]:
+        t.join()
+
+    assert order == ["page", "warm-1", "warm-2"]
+    assert set(governor.usage()["waits"]) == {"interactive", "background"}
+
+
+def test_nested_operations_do_not_queue_again():
+    """
+    A thread holding a slot runs nested heavy operations directly (no deadlock with one slot).
+    """
+    governor = Governor(max_concurrent=1, enabled=True)
+
+    with governor.slot("outer"):
+        with governor.slot("inner"):
+            pass
+
+    assert governor.usage()["executed"] == 1
+
+
+def test_priority_follows_context():
+
+    assert current_priority() == INTERACTIVE
+
+    with background_priority():
+        assert current_priority() == BACKGROUND
+
+    assert current_priority() == INTERACTIVE
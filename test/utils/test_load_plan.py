@@ -0,0 +1,113 @@
+import os
+import pytest
+import polars as pl
+
+from src.utils.load_plan import *
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir(monkeypatch):
+    """
+    Fixture to create a temporary directory for tests, with its own sidecar cache.
+    """
+    import src.utils.sidecar as sidecar
+
+    tmp_dir = tempfile.mkdtemp()
+    monkeypatch.setattr(sidecar, "SIDECAR_DIR_ABS_PATH", os.path.join(tmp_dir, "sidecar"))
+
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def _write_legs(path):
+    pl.DataFrame({"a": [1, 2], "b": [3.0, 4.0], "c": ["x", "y"]}).write_excel(path, worksheet="Trade Legs")
+
+
+def test_plan_loads_each_file_once(temp_dir):
+    """
+    Two sections asking different columns of the same sheet share one parse.
+    """
+    source = os.path.join(temp_dir, "legs.xlsx")
+    _write_legs(source)
+
+    plan = LoadPlan()
+
+    first = plan.need(source, "Trade Legs", {"a": pl.Int64, "b": pl.Float64})
+    second = plan.need(source, "Trade Legs", {"b": pl.Int64, "c": pl.Utf8})
+
+    assert plan.load() == 1
+
+    df_1, md5_1 = plan.get(first)
+    df_2, md5_2 = plan.get(second)
+
+    assert df_1.columns == ["a", "b"] and df_1["b"].dtype == pl.Float64
+    assert df_2.columns == ["b", "c"] and df_2["b"].dtype == pl.Int64
+    assert md5_1 != md5_2
+    assert plan.stats["files_loaded"] == 1
+
+
+def test_planned_load_uses_active_plan(temp_dir):
+    """
+    Readers called inside `with LoadPlan()` go through it, missing columns are dropped.
+    """
+    source = os.path.join(temp_dir, "legs.xlsx")
+    _write_legs(source)
+
+    with LoadPlan() as plan:
+
+        assert active_plan() is plan
+
+        df_1, _ = planned_load(source, "Trade Legs", {"a": pl.Int64, "gone": pl.Utf8})
+        df_2, _ = planned_load(source, "Trade Legs", {"a": pl.Int64, "gone": pl.Utf8})
+
+    assert active_plan() is None
+    assert df_1.columns == ["a"] and df_2.equals(df_1)
+    assert plan.stats["files_loaded"] == 1
+
+    assert planned_load(source, "Missing sheet", {"a": pl.Int64}) == (None, None)
+
+
+def test_declared_demands_share_one_parse(temp_dir):
+    """
+    Demands declared first are parsed once with their union, whatever order the sections ask in.
+    """
+    source = os.path.join(temp_dir, "legs.xlsx")
+    _write_legs(source)
+
+    with LoadPlan() as plan:
+
+        with plan.declaring():
+
+            assert planned_load(source, "Trade Legs", {"c": pl.Utf8}) == (None, None)
+            assert planned_load(source, "Trade Legs", {"b": pl.Float64, "a": pl.Int64}) == (None, None)
+
+        assert plan.stats["files_loaded"] == 0
+
+        df_1, _ = planned_load(source, "Trade Legs", {"b": pl.Float64, "a": pl.Int64})
+        df_2, _ = planned_load(source, "Trade Legs", {"c": pl.Utf8})
+
+    assert df_1.columns == ["b", "a"] and df_2.columns == ["c"]
+    assert plan.stats["files_loaded"] == 1
+
+
+def test_plan_without_learning_between_plans(temp_dir):
+    """
+    A plan only loads what it was asked for, earlier plans do not widen it.
+    """
+    source = os.path.join(temp_dir, "legs.xlsx")
+    _write_legs(source)
+
+    first = LoadPlan()
+    first.get(first.need(source, "Trade Legs", {"a": pl.Int64, "c": pl.Utf8}))
+
+    second = LoadPlan()
+    demand = second.need(source, "Trade Legs", {"b": pl.Float64})
+    second.load()
+
+    frame, _ = second._frames[next(iter(second._frames))]
+    assert frame.columns == ["b"]
+    assert second.get(demand)[0].columns == ["b"]
@@ -0,0 +1,141 @@
+import os
+import time
+import pytest
+import shutil
+import polars as pl
+
+from src.utils.mirror import *
+
+import tempfile
+
+
+LATENCY = 0.05
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+class SlowShare:
+    """
+    Local directory behind an artificial network latency, counting round trips.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def stat(self, path):
+        self.calls += 1
+        time.sleep(LATENCY)
+        return os.stat(path)
+
+    def copy(self, source, target):
+        self.calls += 1
+        time.sleep(LATENCY)
+        return shutil.copy2(source, target)
+
+
+def test_mirror_serves_local_copies(temp_dir):
+    """
+    First read copies, later reads are local until the source changes.
+    """
+    share_dir = os.path.join(temp_dir, "share")
+    os.makedirs(share_dir)
+
+    source = os.path.join(share_dir, "report.csv")
+    pl.DataFrame({"x": [1, 2]}).write_csv(source)
+
+    share = SlowShare()
+    mirror = LocalMirror(os.path.join(temp_dir, "mirror"), verify_seconds=60, stat=share.stat, copy=share.copy)
+
+    # stat, copy, stat again to check the source did not move during the copy
+    local = mirror.path(source)
+    assert local != source and share.calls == 3
+
+    start = time.perf_counter()
+    assert mirror.path(source) == local
+    assert time.perf_counter() - start < LATENCY and share.calls == 3
+
+    assert pl.read_csv(local)["x"].to_list() == [1, 2]
+
+    # Source rewritten : the next verification copies it again
+    pl.DataFrame({"x": [3]}).write_csv(source)
+    os.utime(source, ns=(0, 0))
+
+    mirror.verify_seconds = 0
+    assert pl.read_csv(mirror.path(source))["x"].to_list() == [3]
+    assert mirror.usage()["copies"] == 2
+
+
+def test_mirror_budget_and_fallback(temp_dir, monkeypatch):
+    """
+    The least recently used copies go once over budget, failing copies fall back to the source.
+    """
+    import src.utils.mirror as mirror_module
+
+    sources = []
+
+    for i in range(3):
+        path = os.path.join(temp_dir, f"report_{i}.bin")
+        with open(path, "wb") as f:
+            f.write(b"x" * 1000)
+        sources.append(path)
+
+    mirror = LocalMirror(os.path.join(temp_dir, "mirror"), max_bytes=2500)
+
+    locals_ = [mirror.path(path) for path in sources]
+    usage = mirror.usage()
+
+    assert usage["evictions"] == 1 and usage["bytes"] == 2000
+    assert not os.path.exists(locals_[0]) and os.path.exists(locals_[2])
+
+    def broken_copy(source, target):
+        raise OSError("share unreachable")
+
+    monkeypatch.setattr(mirror_module, "MIRROR_MAX_FAILURES", 2)
+
+    broken = LocalMirror(os.path.join(temp_dir, "broken"), copy=broken_copy)
+
+    assert broken.path(sources[0]) == os.path.normcase(sources[0])
+    assert broken.path(sources[1]) == os.path.normcase(sources[1])
+    assert not broken.healthy and broken.path(sources[2]) == sources[2]
+
+
+def test_mirror_serves_the_expected_version(temp_dir):
+    """
+    A copy is only served for the (size, mtime) the caller keyed on, a copy racing a write is thrown away.
+    """
+    source = os.path.join(temp_dir, "report.csv")
+    pl.DataFrame({"x": [1, 2]}).write_csv(source)
+    first = os.stat(source)
+
+    mirror = LocalMirror(os.path.join(temp_dir, "mirror"), verify_seconds=60)
+    local = mirror.path(source, expect=(first.st_size, first.st_mtime_ns))
+    assert local != source
+
+    # Rewritten within verify_seconds : the caller's new key gets the new contents, not the old copy
+    pl.DataFrame({"x": [3, 4, 5]}).write_csv(source)
+    os.utime(source, ns=(first.st_atime_ns, first.st_mtime_ns + 10**9))
+    second = os.stat(source)
+
+    assert pl.read_csv(mirror.path(source, expect=(second.st_size, second.st_mtime_ns)))["x"].to_list() == [3, 4, 5]
+    assert mirror.usage()["copies"] == 2
+
+    # A caller still holding the previous version is sent to the source
+    assert mirror.path(source, expect=(first.st_size, first.st_mtime_ns)) == os.path.normcase(os.path.abspath(source))
+
+    # The source moves during the copy : not recorded, the source is served and the previous copy kept
+    def racing_copy(src, dst):
+        shutil.copy2(src, dst)
+        os.utime(src, ns=(second.st_atime_ns, second.st_mtime_ns + 10**9))
+
+    racing = LocalMirror(os.path.join(temp_dir, "racing"), copy=racing_copy)
+
+    assert racing.path(source) == os.path.normcase(os.path.abspath(source))
+    assert racing.usage()["changed"] == 1 and racing.usage()["entries"] == 0 and racing.healthy
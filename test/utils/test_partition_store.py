@@ -0,0 +1,65 @@
+import os
+import pytest
+import polars as pl
+import datetime as dt
+
+from src.utils.partition_store import *
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def _rows(date, values):
+    return pl.DataFrame({"Date": [date] * len(values), "IM": values})
+
+
+def test_upsert_is_idempotent(temp_dir):
+    """
+    Upserting a date replaces its rows, replaying the same upsert changes nothing.
+    """
+    day = dt.date(2025, 3, 14)
+
+    assert upsert_date(temp_dir, "HV", day, _rows(day, [1.0, 2.0]))
+    assert upsert_date(temp_dir, "HV", day, _rows(day, [3.0]))
+    assert upsert_date(temp_dir, "HV", day, _rows(day, [3.0]))
+
+    lf, md5 = scan_store(temp_dir, "HV")
+
+    assert lf.collect()["IM"].to_list() == [3.0]
+    assert md5 is not None
+    assert not any(name.endswith(".tmp") for _, _, files in os.walk(temp_dir) for name in files)
+
+
+def test_scan_prunes_dates_and_partitions(temp_dir):
+    """
+    Only the files of the requested range and partition are scanned.
+    """
+    days = [dt.date(2025, 1, 31), dt.date(2025, 2, 3), dt.date(2025, 2, 4), dt.date(2025, 3, 3)]
+
+    for i, day in enumerate(days):
+        upsert_date(temp_dir, "HV", day, _rows(day, [float(i)]))
+
+    upsert_date(temp_dir, "WR", days[1], _rows(days[1], [99.0]))
+
+    in_range = store_dates(temp_dir, "HV", "2025-02-01", "2025-02-28")
+    assert [d for d, _ in in_range] == days[1:3]
+
+    lf, _ = scan_store(temp_dir, "HV", days[1], days[1])
+    assert lf.collect()["IM"].to_list() == [1.0]
+
+    assert scan_store(temp_dir, "HV", "2026-01-01") == (None, None)
+
+    assert delete_date(temp_dir, "HV", days[0])
+    assert not delete_date(temp_dir, "HV", days[0])
+    assert [d for d, _ in store_dates(temp_dir, "HV")] == days[1:]
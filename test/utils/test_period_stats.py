@@ -0,0 +1,96 @@
+import math
+import datetime as dt
+import numpy as np
+import pytest
+import polars as pl
+
+from src.utils.period_stats import *
+
+
+AS_OF = dt.date(2025, 5, 14)       # Wednesday
+
+
+def _series(seed, start=dt.date(2023, 6, 1), end=AS_OF + dt.timedelta(days=10)):
+    rng = np.random.default_rng(seed)
+    dates = pl.date_range(start, end, "1d", eager=True)
+    dates = dates.filter(dates.dt.weekday() <= 5)
+    return pl.DataFrame({"date": dates, "value": 100 * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))})
+
+
+def _reference(frame, start):
+    """
+    Period statistics recomputed with a filter per period.
+    """
+    frame = frame.filter(pl.col("date") <= AS_OF)
+    before = frame.filter(pl.col("date") < start) if start else frame.head(0)
+    base = before.tail(1) if before.height else frame.filter(pl.col("date") >= (start or dt.date.min)).head(1)
+    window = frame.filter(pl.col("date") >= base["date"][0])
+
+    values = window["value"].to_numpy()
+    returns = values[1:] / values[:-1] - 1
+    peaks = np.maximum.accumulate(values)
+    drawdowns = values / peaks - 1
+    trough = int(np.argmin(drawdowns))
+    peak = int(np.argmax(values[: trough + 1]))
+
+    vol = returns.std(ddof=1) * math.sqrt(252)
+    downside = math.sqrt(np.mean(np.minimum(returns, 0) ** 2)) * math.sqrt(252)
+
+    return {
+        "start_date": base["date"][0],
+        "return": values[-1] / values[0] - 1,
+        "vol": vol,
+        "max_drawdown": drawdowns.min(),
+        "peak_date": window["date"][peak] if drawdowns.min() < 0 else None,
+        "trough_date": window["date"][trough] if drawdowns.min() < 0 else None,
+        "sharpe": returns.mean() * 252 / vol,
+        "sortino": returns.mean() * 252 / downside if downside > 0 else None,
+    }
+
+
+def test_period_starts():
+
+    assert period_starts(AS_OF) == {
+        "WTD": dt.date(2025, 5, 12), "MTD": dt.date(2025, 5, 1), "QTD": dt.date(2025, 4, 1),
+        "YTD": dt.date(2025, 1, 1), "ITD": None,
+    }
+
+
+def test_every_period_matches_a_filter_per_period_for_several_series():
+
+    funds = {"HV": _series(1), "WR": _series(2, start=dt.date(2025, 2, 10)), "SX5E Index": _series(3)}
+    stacked = pl.concat([frame.with_columns(pl.lit(name).alias("series")) for name, frame in funds.items()])
+
+    stats = period_statistics(stacked, "value", AS_OF, by=["series"])
+
+    assert stats.height == len(funds) * len(PERIODS)
+    assert stats["end_date"].unique().to_list() == [AS_OF]
+
+    starts = period_starts(AS_OF)
+
+    for name, frame in funds.items():
+        for period in PERIODS:
+
+            row = stats.filter((pl.col("series") == name) & (pl.col("period") == period)).row(0, named=True)
+            expected = _reference(frame, starts[period])
+
+            for key, value in expected.items():
+                assert row[key] == (pytest.approx(value) if isinstance(value, float) else value), (name, period, key)
+
+    # YTD starts from the last close of the previous year, a fund launched in February from its first value
+    ytd = stats.filter(pl.col("period") == "YTD")
+    assert dict(ytd.select("series", "start_date").iter_rows()) == {
+        "HV": dt.date(2024, 12, 31), "WR": dt.date(2025, 2, 10), "SX5E Index": dt.date(2024, 12, 31),
+    }
+
+
+def test_single_series_without_drawdown():
+
+    rising = pl.DataFrame({"date": [dt.datetime(2025, 5, d, 17) for d in (9, 12, 13, 14)], "nav": [100.0, 101.0, 102.0, 103.0]})
+
+    wtd = period_statistics(rising, "nav", AS_OF, periods=("WTD",)).row(0, named=True)
+
+    assert wtd["start_date"] == dt.date(2025, 5, 9)
+    assert wtd["return"] == pytest.approx(0.03)
+    assert wtd["max_drawdown"] == 0.0
+    assert wtd["peak_date"] is None and wtd["trough_date"] is None and wtd["sortino"] is None
@@ -0,0 +1,114 @@
+import math
+import calendar
+import datetime as dt
+import numpy as np
+import pytest
+import polars as pl
+
+from src.utils.returns import *
+
+
+def _legacy_monthly_grid(gross, column):
+    """
+    Previous nav.compute_monthly_returns + compute_yearly_returns (year / month buckets in Python dicts).
+    """
+    def bucket_returns(keys, name):
+        grouped = (
+            gross.group_by(keys)
+            .agg(pl.len().alias("rows"), pl.col(column).first().alias("first_nav"), pl.col(column).last().alias("last_nav"))
+            .sort(keys)
+        )
+        result = {}
+        prev_key, prev_last = None, None
+        for row in grouped.iter_rows(named=True):
+            key = tuple(row[k] for k in keys)
+            expected = (key[0] - 1,) if len(key) == 1 else ((key[0] - 1, 12) if key[1] == 1 else (key[0], key[1] - 1))
+            base = prev_last if prev_key == expected else None
+            start = base if base is not None else row["first_nav"]
+            valid = row["rows"] >= 2 or (row["rows"] == 1 and base is not None)
+            result[key] = ((row["last_nav"] / start) - 1.0) * 100.0 if valid else None
+            prev_key, prev_last = key, row["last_nav"]
+        return result
+
+    monthly = bucket_returns(["year", "month"], "monthly")
+    yearly = bucket_returns(["year"], "yearly")
+
+    rows = []
+    for year in sorted(set(gross["year"].to_list())):
+        row = {"Year": year}
+        for m in range(1, 13):
+            value = monthly.get((year, m))
+            row[calendar.month_abbr[m]] = math.nan if value is None else value
+        row["Total"] = yearly.get((year,))
+        rows.append(row)
+
+    return pl.DataFrame(rows)
+
+
+def _nav_series(seed, start, days, skip_month=None):
+    rng = np.random.default_rng(seed)
+    dates = pl.date_range(start, start + dt.timedelta(days=days), "1d", eager=True)
+    dates = dates.filter(dates.dt.weekday() <= 5)
+    if skip_month is not None:
+        dates = dates.filter(~((dates.dt.year() == skip_month[0]) & (dates.dt.month() == skip_month[1])))
+    nav = 100 * np.cumprod(1 + rng.normal(0, 0.004, len(dates)))
+    return pl.DataFrame({"date": dates, "NAV Estimate": nav}).with_columns(
+        pl.col("date").dt.year().alias("year"), pl.col("date").dt.month().alias("month")
+    )
+
+
+@pytest.mark.parametrize("start, days, skip", [
+    (dt.date(2022, 3, 15), 900, None),
+    (dt.date(2023, 1, 31), 500, (2023, 6)),     # gap month : July starts from its own first value
+    (dt.date(2024, 12, 31), 40, None),          # single observation in the first month
+])
+def test_monthly_grid_matches_previous_outputs(start, days, skip):
+
+    gross = _nav_series(1, start, days, skip)
+
+    returns = compute_returns(gross, "NAV Estimate", frequencies=("monthly", "yearly"))
+    grid = calendar_grid(returns)
+    legacy = _legacy_monthly_grid(gross, "NAV Estimate")
+
+    assert grid.columns == legacy.columns
+    assert grid["Year"].to_list() == legacy["Year"].to_list()
+
+    for col in legacy.columns[1:]:
+        for new, old in zip(grid[col].to_list(), legacy[col].to_list()):
+            if old is None or (isinstance(old, float) and math.isnan(old)):
+                assert new is None or math.isnan(new)
+            else:
+                assert new == pytest.approx(old, rel=1e-12)
+
+
+def test_all_frequencies_for_several_funds_in_one_pass():
+
+    hv = _nav_series(1, dt.date(2024, 1, 1), 400).with_columns(pl.lit("HV").alias("fund"), pl.lit("A").alias("share_class"))
+    wr = _nav_series(2, dt.date(2024, 6, 3), 200).with_columns(pl.lit("WR").alias("fund"), pl.lit("B").alias("share_class"))
+    series = pl.concat([hv, wr])
+
+    returns = compute_returns(series, "NAV Estimate", by=["fund", "share_class"])
+
+    assert set(returns["frequency"].unique()) == {"daily", "weekly", "monthly", "quarterly", "yearly", SINCE_INCEPTION}
+
+    for fund, frame in (("HV", hv), ("WR", wr)):
+
+        mine = returns.filter(pl.col("fund") == fund)
+        nav = frame["NAV Estimate"]
+
+        # Compounded daily returns = since inception = compounded monthly returns
+        daily = mine.filter(pl.col("frequency") == "daily")["return"].drop_nulls()
+        monthly = mine.filter(pl.col("frequency") == "monthly")["return"].drop_nulls()
+        inception = mine.filter(pl.col("frequency") == SINCE_INCEPTION)["return"][0]
+
+        assert inception == pytest.approx(nav[-1] / nav[0] - 1)
+        assert (1 + daily).product() - 1 == pytest.approx(inception)
+        assert (1 + monthly).product() - 1 == pytest.approx(inception)
+
+        # Weeks start on Monday
+        weekly = mine.filter(pl.col("frequency") == "weekly")
+        assert weekly["period"].dt.weekday().unique().to_list() == [1]
+
+    quarters = calendar_grid(returns, "quarterly", by=["fund", "share_class"], total_col=None)
+    assert quarters.columns == ["fund", "share_class", "Year", "Q1", "Q2", "Q3", "Q4"]
+    assert quarters.select("fund", "Year").rows() == [("HV", 2024), ("HV", 2025), ("WR", 2024)]
@@ -0,0 +1,141 @@
+import math
+import datetime as dt
+import numpy as np
+import pytest
+import polars as pl
+
+from src.utils.rolling_vol import *
+
+
+def _nav(seed=0, days=400, start=dt.date(2023, 1, 2)):
+    rng = np.random.default_rng(seed)
+    dates = [start + dt.timedelta(days=i) for i in range(days)]
+    return pl.DataFrame({"date": dates, "nav": 100 * np.cumprod(1 + rng.normal(0, 0.01, days))})
+
+
+def test_windows_match_the_full_window_std():
+    """
+    Every window and the EWMA in one pass, each point equal to a recomputation on its window.
+    """
+    nav = _nav()
+    vols = rolling_realized_vol(nav, "nav")
+
+    returns = np.log(nav["nav"].to_numpy()[1:] / nav["nav"].to_numpy()[:-1])
+    scale = math.sqrt(252) * 100
+
+    for window in VOL_WINDOWS:
+        column = vols[vol_column(window)]
+        assert column.null_count() == window
+        assert column[-1] == pytest.approx(np.std(returns[-window:], ddof=1) * scale)
+        assert column[window] == pytest.approx(np.std(returns[:window], ddof=1) * scale)
+
+    var = returns[0] ** 2
+    for r in returns[1:]:
+        var = EWMA_LAMBDA * var + (1 - EWMA_LAMBDA) * r ** 2
+    assert vols["vol_ewma"][-1] == pytest.approx(math.sqrt(var) * scale)
+
+
+def test_several_series_in_one_pass():
+
+    both = pl.concat([_nav(1).with_columns(pl.lit("HV").alias("fund")), _nav(2).with_columns(pl.lit("WR").alias("fund"))])
+
+    vols = rolling_realized_vol(both, "nav", by=["fund"], windows=(20,))
+    alone = rolling_realized_vol(_nav(2), "nav", windows=(20,))
+
+    assert vols.filter(pl.col("fund") == "WR")["vol_20d"].to_list() == pytest.approx(alone["vol_20d"].to_list(), nan_ok=True)
+
+
+def test_incremental_updates_match_the_batch_series():
+
+    nav = _nav(days=300)
+    history, new_days = nav.head(260), nav.tail(40)
+
+    state = RollingVolState.from_history(history, "nav")
+    rows = [state.update(date, value) for date, value in new_days.iter_rows()]
+
+    batch = rolling_realized_vol(nav, "nav").tail(40)
+
+    for col in [vol_column(w) for w in VOL_WINDOWS] + ["vol_ewma"]:
+        assert [row[col] for row in rows] == pytest.approx(batch[col].to_list(), rel=1e-9, nan_ok=True)
+
+    # Revised estimate for the last day replaces it
+    last_date = rows[-1]["date"]
+    revised = state.update(last_date, rows[-1]["nav"] * 1.01)
+
+    expected = rolling_realized_vol(nav.with_columns(
+        pl.when(pl.col("date") == last_date).then(pl.col("nav") * 1.01).otherwise(pl.col("nav")).alias("nav")
+    ), "nav").row(-1, named=True)
+
+    for col in [vol_column(w) for w in VOL_WINDOWS] + ["vol_ewma"]:
+        assert revised[col] == pytest.approx(expected[col], rel=1e-9)
+
+    with pytest.raises(ValueError):
+        state.update(last_date - dt.timedelta(days=5), 100.0)
+
+
+def test_fund_history_updated_incrementally():
+
+    from src.core.data import volatility
+
+    nav = _nav(days=320).with_columns(pl.col("date").cast(pl.Datetime), pl.col("nav").alias("NAV"))
+    cols = {"HV": "NAV"}
+
+    volatility._VOL_STATES.clear()
+    volatility.compute_rolling_realized_vol(nav.head(300), "md5-300", "HV", funds_cols=cols)
+    incremental, _ = volatility.compute_rolling_realized_vol(nav, "md5-320", "HV", funds_cols=cols)
+
+    volatility._VOL_STATES.clear()
+    full, _ = volatility.compute_rolling_realized_vol(nav, "md5-320", "HV", funds_cols=cols)
+
+    assert incremental["Date"].to_list() == full["Date"].to_list()
+    assert incremental["vol_252d"].to_list() == pytest.approx(full["vol_252d"].to_list(), rel=1e-9, nan_ok=True)
+
+    # Same source : served from the state without touching the history
+    again, _ = volatility.compute_rolling_realized_vol(nav.head(10), "md5-320", "HV", funds_cols=cols)
+    assert again is full
+
+
+def test_fund_history_without_its_last_day_recomputed():
+    """
+    The state's last day is gone from the new history : no revision of the last row, a full pass.
+    """
+    from src.core.data import volatility
+
+    nav = _nav(days=320).with_columns(pl.col("date").cast(pl.Datetime), pl.col("nav").alias("NAV"))
+    cols = {"HV": "NAV"}
+
+    volatility._VOL_STATES.clear()
+    volatility.compute_rolling_realized_vol(nav.head(300), "md5-300", "HV", funds_cols=cols)
+
+    dropped = pl.concat([nav.head(299), nav.slice(300)])
+    updated, _ = volatility.compute_rolling_realized_vol(dropped, "md5-dropped", "HV", funds_cols=cols)
+
+    volatility._VOL_STATES.clear()
+    full, _ = volatility.compute_rolling_realized_vol(dropped, "md5-dropped", "HV", funds_cols=cols)
+
+    assert updated["Date"].to_list() == full["Date"].to_list()
+    assert updated["vol_20d"].to_list() == pytest.approx(full["vol_20d"].to_list(), rel=1e-9, nan_ok=True)
+
+
+def test_fund_history_with_restated_past_recomputed():
+    """
+    An earlier NAV restated along with new days : the state's sums are stale, a full pass.
+    """
+    from src.core.data import volatility
+
+    nav = _nav(days=320).with_columns(pl.col("date").cast(pl.Datetime), pl.col("nav").alias("NAV"))
+    cols = {"HV": "NAV"}
+
+    volatility._VOL_STATES.clear()
+    volatility.compute_rolling_realized_vol(nav.head(300), "md5-300", "HV", funds_cols=cols)
+
+    restated = nav.with_columns(
+        pl.when(pl.int_range(pl.len()) == 150).then(pl.col("NAV") * 1.05).otherwise(pl.col("NAV")).alias("NAV")
+    )
+    updated, _ = volatility.compute_rolling_realized_vol(restated, "md5-restated", "HV", funds_cols=cols)
+
+    volatility._VOL_STATES.clear()
+    full, _ = volatility.compute_rolling_realized_vol(restated, "md5-restated", "HV", funds_cols=cols)
+
+    assert updated["vol_252d"].to_list() == pytest.approx(full["vol_252d"].to_list(), rel=1e-9, nan_ok=True)
+    assert updated["vol_20d"].to_list() == pytest.approx(full["vol_20d"].to_list(), rel=1e-9, nan_ok=True)
@@ -0,0 +1,104 @@
+import os
+import time
+import pytest
+import polars as pl
+
+from src.utils.sidecar import *
+from src.utils.data_io import load_excel_to_dataframe
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def test_sidecar_roundtrip(temp_dir):
+    """
+    A written sidecar is read back with the same content and fingerprint.
+    """
+    source = os.path.join(temp_dir, "source.xlsx")
+    sidecar_dir = os.path.join(temp_dir, "sidecar")
+
+    df = pl.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+    df.write_excel(source)
+
+    key = sidecar_key(source, sheet_name="Sheet1")
+
+    assert read_sidecar(key, sidecar_dir=sidecar_dir) == (None, None)
+    assert write_sidecar(key, df, "abc", sidecar_dir=sidecar_dir)
+
+    cached, md5 = read_sidecar(key, sidecar_dir=sidecar_dir)
+
+    assert md5 == "abc"
+    assert cached.equals(df)
+
+
+def test_sidecar_key_changes_with_file_and_args(temp_dir):
+    """
+    The key follows the file identity and the parse arguments.
+    """
+    source = os.path.join(temp_dir, "source.xlsx")
+
+    pl.DataFrame({"col1": [1, 2, 3]}).write_excel(source)
+    key = sidecar_key(source, sheet_name="Sheet1")
+
+    assert key == sidecar_key(source, sheet_name="Sheet1")
+    assert key != sidecar_key(source, sheet_name="Sheet1", specific_cols=["col1"])
+    assert key != sidecar_key(source, sheet_name="Sheet1", schema_overrides={"col1": pl.Float64})
+
+    time.sleep(0.01)
+    pl.DataFrame({"col1": [1, 2, 3, 4]}).write_excel(source)
+
+    assert key != sidecar_key(source, sheet_name="Sheet1")
+    assert sidecar_key(os.path.join(temp_dir, "missing.xlsx")) is None
+
+
+def test_sidecar_eviction(temp_dir):
+    """
+    Eviction removes the least recently used entries first.
+    """
+    df = pl.DataFrame({"col1": list(range(1000))})
+
+    for i, key in enumerate(["old", "mid", "new"]):
+
+        write_sidecar(key, df, "x", sidecar_dir=temp_dir, max_bytes=10 ** 9)
+        os.utime(os.path.join(temp_dir, key + SIDECAR_EXTENSION), (i, i))
+
+    one_entry = sidecar_usage(temp_dir)["bytes"] // 3
+
+    assert evict_sidecars(max_bytes=one_entry, sidecar_dir=temp_dir) == 2
+    assert read_sidecar("new", sidecar_dir=temp_dir)[0] is not None
+    assert read_sidecar("old", sidecar_dir=temp_dir)[0] is None
+
+    clear_sidecars(temp_dir)
+    assert sidecar_usage(temp_dir)["entries"] == 0
+
+
+def test_load_excel_uses_sidecar(temp_dir, monkeypatch):
+    """
+    A second load of an unchanged file is served from the sidecar with the same contract.
+    """
+    import src.utils.sidecar as sidecar
+
+    monkeypatch.setattr(sidecar, "SIDECAR_DIR_ABS_PATH", os.path.join(temp_dir, "sidecar"))
+
+    source = os.path.join(temp_dir, "source.xlsx")
+    pl.DataFrame({"col1": [1, 2, 3], "col2": [4.0, 5.0, 6.0]}).write_excel(source)
+
+    first, first_md5 = load_excel_to_dataframe(source, use_sidecar=True)
+    assert sidecar_usage(os.path.join(temp_dir, "sidecar"))["entries"] == 1
+
+    second, second_md5 = load_excel_to_dataframe(source, use_sidecar=True)
+    bypass, bypass_md5 = load_excel_to_dataframe(source, use_sidecar=False)
+
+    assert second.equals(first) and bypass.equals(first)
+    assert second_md5 == first_md5 == bypass_md5
@@ -0,0 +1,143 @@
+import os
+import time
+import pytest
+import threading
+import polars as pl
+
+from src.utils.single_flight import *
+from src.utils import data_io
+
+import tempfile
+import shutil
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    reset_single_flight_stats()
+
+    yield tmp_dir
+
+    shutil.rmtree(tmp_dir)
+
+
+def test_concurrent_loads_parse_once(temp_dir, monkeypatch):
+    """
+    N sessions loading the same workbook at the same time trigger exactly one parse.
+    """
+    source = os.path.join(temp_dir, "source.xlsx")
+    pl.DataFrame({"col1": [1, 2, 3]}).write_excel(source)
+
+    parses = []
+    read_excel = pl.read_excel
+
+    def slow_read_excel(*args, **kwargs):
+        parses.append(kwargs.get("source"))
+        time.sleep(0.3)
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(data_io.pl, "read_excel", slow_read_excel)
+
+    n = 8
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def session(i):
+        barrier.wait()
+        results[i] = data_io.load_excel_to_dataframe(source, use_sidecar=False)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(parses) == 1
+    assert all(df is results[0][0] and md5 == results[0][1] for df, md5 in results)
+
+    stats = single_flight_stats()["excel"]
+    assert (stats["calls"], stats["executions"], stats["shared"]) == (n, 1, n - 1)
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_errors_reach_every_waiter(temp_dir):
+    """
+    Waiters get the leader's exception, and the next call runs again.
+    """
+    calls = []
+    release = threading.Event()
+
+    @deduplicated(namespace="api")
+    def fetch(date):
+        calls.append(date)
+        release.wait(1)
+        raise ValueError("down")
+
+    errors = []
+
+    def caller():
+        try:
+            fetch("2025-01-31")
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.2)
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and len(errors) == 3
+
+    with pytest.raises(ValueError):
+        fetch("2025-01-31")
+
+    assert len(calls) == 2
+
+
+def test_waiters_released_when_logging_fails(temp_dir, monkeypatch):
+    """
+    A failing logger in the leader does not leave the followers waiting.
+    """
+    import src.utils.single_flight as single_flight_module
+
+    def broken_log(*args, **kwargs):
+        raise OSError("log file unavailable")
+
+    monkeypatch.setattr(single_flight_module, "log", broken_log)
+
+    release = threading.Event()
+
+    @deduplicated(namespace="broken_log")
+    def fetch(date):
+        release.wait(1)
+        return date
+
+    results = []
+
+    def caller():
+        results.append(fetch("2025-01-31"))
+
+    threads = [threading.Thread(target=caller, daemon=True) for _ in range(3)]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.2)
+    release.set()
+
+    for thread in threads:
+        thread.join(5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert results == ["2025-01-31"] * 3
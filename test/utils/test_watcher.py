@@ -0,0 +1,170 @@
+import os
+import re
+import time
+import pytest
+import threading
+
+import src.utils.watcher as watcher
+from src.utils.catalog import catalog_lookup, invalidate_catalog
+
+import tempfile
+import shutil
+
+
+REGEX = re.compile(r"^greeks_(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})\.xlsx$")
+
+
+@pytest.fixture()
+def temp_dir():
+    """
+    Fixture to create a temporary directory for tests.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+
+    watcher.stop_watcher()
+    watcher._WATCHES.clear()
+    watcher._SNAPSHOTS.clear()
+    watcher._PENDING.clear()
+
+    shutil.rmtree(tmp_dir)
+    invalidate_catalog()
+
+
+def _wait_for(condition, timeout=5.0):
+
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+
+        if condition():
+            return True
+
+        time.sleep(0.02)
+
+    return False
+
+
+def test_watcher_polling_preloads_new_files(temp_dir):
+    """
+    A new matching file invalidates the directory listing and is pre-loaded once settled.
+    """
+    with open(os.path.join(temp_dir, "greeks_2025-01-02_09-00.xlsx"), "w") as f:
+        f.write("x")
+
+    preloaded = []
+
+    assert watcher.watch_directory(temp_dir, REGEX, preloaded.append)
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-02").name == "greeks_2025-01-02_09-00.xlsx"
+
+    assert watcher.start_watcher(backend="poll", poll_seconds=0.05, settle_seconds=0.1) == "poll"
+
+    new_file = os.path.join(temp_dir, "greeks_2025-01-02_18-00.xlsx")
+
+    with open(new_file, "w") as f:
+        f.write("x")
+
+    with open(os.path.join(temp_dir, "notes.txt"), "w") as f:
+        f.write("x")
+
+    assert _wait_for(lambda: preloaded == [new_file])
+    assert catalog_lookup(temp_dir, REGEX, "2025-01-02").name == "greeks_2025-01-02_18-00.xlsx"
+
+    status = watcher.watcher_status()
+
+    assert status["running"] and status["backend"] == "poll"
+    assert status["dispatched"] >= 2
+
+
+def test_watcher_ignores_existing_files(temp_dir):
+    """
+    Files present at registration time are not reported as new.
+    """
+    with open(os.path.join(temp_dir, "greeks_2025-01-02_09-00.xlsx"), "w") as f:
+        f.write("x")
+
+    preloaded = []
+    watcher.watch_directory(temp_dir, REGEX, preloaded.append)
+    watcher.start_watcher(backend="poll", poll_seconds=0.05, settle_seconds=0.05)
+
+    time.sleep(0.3)
+
+    assert preloaded == []
+    assert not watcher.watch_directory(os.path.join(temp_dir, "missing"), REGEX)
+
+
+def test_slow_preload_does_not_delay_detection(temp_dir):
+    """
+    Pre-loads run on their own worker : a change elsewhere is detected while a parse is running.
+    """
+    slow_dir, other_dir = os.path.join(temp_dir, "slow"), os.path.join(temp_dir, "other")
+    os.makedirs(slow_dir)
+    os.makedirs(other_dir)
+
+    release = threading.Event()
+    started, changed = [], []
+
+    def slow_preload(path):
+        started.append(path)
+        release.wait(5)
+
+    def listener(dir_abs_path, file_abs_path):
+        changed.append(file_abs_path)
+
+    watcher.watch_directory(slow_dir, REGEX, slow_preload)
+    watcher.watch_directory(other_dir, REGEX)
+    watcher.add_change_listener(listener)
+
+    try:
+
+        watcher.start_watcher(backend="poll", poll_seconds=0.05, settle_seconds=0.05)
+
+        with open(os.path.join(slow_dir, "greeks_2025-01-02_18-00.xlsx"), "w") as f:
+            f.write("x")
+
+        assert _wait_for(lambda: len(started) == 1)
+
+        other_file = os.path.join(other_dir, "greeks_2025-01-02_18-00.xlsx")
+
+        with open(other_file, "w") as f:
+            f.write("x")
+
+        assert _wait_for(lambda: other_file in changed, timeout=2.0)
+
+    finally:
+
+        release.set()
+        watcher._LISTENERS.remove(listener)
+
+
+def test_flush_stats_outside_the_lock(temp_dir, monkeypatch):
+    """
+    A slow stat of a pending file (network share) does not hold the watcher lock.
+    """
+    stat = watcher._signature
+    in_stat = threading.Event()
+
+    def slow_signature(path):
+        in_stat.set()
+        time.sleep(0.5)
+        return stat(path)
+
+    watcher.watch_directory(temp_dir, REGEX)
+    path = os.path.join(temp_dir, "greeks_2025-01-02_18-00.xlsx")
+
+    with watcher._LOCK:
+        watcher._PENDING[path] = (watcher._dir_key(temp_dir), None, time.monotonic())
+
+    monkeypatch.setattr(watcher, "_signature", slow_signature)
+
+    flush = threading.Thread(target=watcher._flush, args=(10.0,))
+    flush.start()
+
+    assert in_stat.wait(2)
+
+    start = time.monotonic()
+    watcher.watcher_status()
+
+    assert time.monotonic() - start < 0.25
+
+    flush.join()